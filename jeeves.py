@@ -11,6 +11,7 @@ import signal
 import threading
 import traceback
 import importlib.util
+import hashlib
 import yaml
 import shutil
 import functools
@@ -56,6 +57,31 @@ def load_config():
         print(f"[boot] error loading config.yaml: {e}", file=sys.stderr)
         return {}
 
+def diff_config(old, new, prefix=""):
+    """
+    Returns the dotted key paths whose values differ between two config trees.
+    Nested dicts are walked key by key; anything else is compared by value.
+    """
+    if not isinstance(old, dict) or not isinstance(new, dict):
+        return [prefix] if old != new and prefix else []
+
+    changed = []
+    for key in sorted(set(old) | set(new), key=str):
+        path = f"{prefix}.{key}" if prefix else str(key)
+        if key not in old or key not in new:
+            changed.append(path)
+        else:
+            changed.extend(diff_config(old[key], new[key], path))
+    return changed
+
+def config_paths_overlap(changed_paths, keys):
+    """True if any changed path equals, contains, or lies under one of the given keys."""
+    for path in changed_paths:
+        for key in keys:
+            if path == key or path.startswith(f"{key}.") or key.startswith(f"{path}."):
+                return True
+    return False
+
 # ----- Multi-File State Manager -----
 class MultiFileStateManager:
     """
@@ -263,11 +289,18 @@ class MultiFileStateManager:
 # Backward compatibility: StateManager is now an alias
 StateManager = MultiFileStateManager
 
+RELATIVE_IMPORT_RE = re.compile(r"^[ \t]*from[ \t]+(\.+)(\w*)[ \t]+import[ \t]+\(?([\w \t,]*)", re.MULTILINE)
+
 class PluginManager:
     def __init__(self, bot):
         self.bot = bot
         self.plugins = {}
         self.modules = {}
+        self.unavailable = set()  # Modules whose setup() declined or failed to load
+        self._fingerprints = {}   # {path: (mtime, sha1)} for every file under modules/
+
+    def _blacklist(self):
+        return {f.strip() for f in self.bot.config.get("core", {}).get("module_blacklist", [])}
 
     def unload_all(self):
         for name in list(self.plugins.keys()):
@@ -277,13 +310,14 @@ class PluginManager:
         self.unload_all()
         self.plugins = {}
         self.modules = {}
+        self.unavailable = set()
         loaded_names = []
         
         self.bot.log_debug(f"[plugins] Loading modules from: {ROOT / 'modules'}")
         module_files = list(ROOT.glob("modules/*.py"))
         self.bot.log_debug(f"[plugins] Found {len(module_files)} python files in modules directory.")
         
-        blacklist = {f.strip() for f in self.bot.config.get("core", {}).get("module_blacklist", [])}
+        blacklist = self._blacklist()
         if blacklist:
             self.bot.log_debug(f"[plugins] Blacklist active: {', '.join(sorted(list(blacklist)))}")
 
@@ -295,25 +329,231 @@ class PluginManager:
             
             if self.load_module(name):
                 loaded_names.append(name)
-        
+
+        self._fingerprints = self._scan_sources()
         return loaded_names
 
+    def reload_module(self, name: str) -> bool:
+        """Unloads and re-imports a single module, leaving the others untouched."""
+        self.unload_module(name)
+        return self.load_module(name)
+
+    def sync_blacklist(self):
+        """
+        Applies the current module_blacklist without a full reload: newly
+        blacklisted modules are unloaded and newly allowed ones are loaded.
+        Returns (loaded, unloaded) name lists.
+        """
+        blacklist = self._blacklist()
+        unloaded = [name for name in list(self.plugins) if f"{name}.py" in blacklist and self.unload_module(name)]
+        loaded = []
+        for py in sorted(ROOT.glob("modules/*.py")):
+            name = py.stem
+            if name in self.plugins or py.name in blacklist or name in ("__init__", "base"):
+                continue
+            if self.load_module(name):
+                loaded.append(name)
+        return loaded, unloaded
+
+    def retry_unavailable(self):
+        """Retries modules that declined to load (e.g. a missing API key). Returns loaded names."""
+        return [name for name in sorted(self.unavailable) if self.load_module(name)]
+
+    # --- Hot reload ---
+
+    def _fingerprint(self, path, previous=None):
+        """(mtime, sha1) for a file. The hash is reused when the mtime has not moved."""
+        mtime = path.stat().st_mtime
+        if previous and previous[0] == mtime:
+            return previous
+        return (mtime, hashlib.sha1(path.read_bytes()).hexdigest())
+
+    def _scan_sources(self):
+        fingerprints = {}
+        for path in ROOT.glob("modules/**/*.py"):
+            try:
+                fingerprints[path] = self._fingerprint(path, self._fingerprints.get(path))
+            except OSError:
+                continue
+        return fingerprints
+
+    def _source_dependencies(self, path, seen=None):
+        """
+        Every file under modules/ that `path` pulls in through relative imports,
+        including `path` itself. A package dependency (e.g. quest_pkg) pulls in
+        all of its files.
+        """
+        seen = set() if seen is None else seen
+        if path in seen or not path.exists():
+            return seen
+        seen.add(path)
+        modules_dir = ROOT / "modules"
+        try:
+            source = path.read_text(encoding="utf-8")
+        except OSError:
+            return seen
+
+        for dots, module, names in RELATIVE_IMPORT_RE.findall(source):
+            base_dir = path.parent
+            for _ in range(len(dots) - 1):
+                base_dir = base_dir.parent
+            targets = [module] if module else [n.strip() for n in names.split(",") if n.strip()]
+            for target in targets:
+                candidate = base_dir / target
+                if modules_dir not in candidate.parents:
+                    continue
+                if candidate.is_dir():
+                    for sub in sorted(candidate.glob("**/*.py")):
+                        self._source_dependencies(sub, seen)
+                else:
+                    self._source_dependencies(candidate.with_suffix(".py"), seen)
+        return seen
+
+    def _purge_imported(self, changed_paths):
+        """
+        Drop stale sys.modules entries so changed helpers and packages are re-imported.
+        Helpers that import a changed file (base imports http_utils, ...) go too, so
+        reloaded plugins never see a mix of old and new copies. Returns the purged names.
+        """
+        modules_dir = ROOT / "modules"
+        stale = set(changed_paths)
+        for path in modules_dir.glob("*.py"):
+            if not self._has_setup(path) and self._source_dependencies(path) & set(changed_paths):
+                stale.add(path)
+        prefixes = set()
+        for path in stale:
+            rel = path.relative_to(modules_dir).with_suffix("")
+            # Purge the whole top-level package so unchanged siblings don't keep stale references.
+            prefixes.add(f"modules.{rel.parts[0]}")
+        purged = set()
+        for mod_name in list(sys.modules):
+            if any(mod_name == prefix or mod_name.startswith(f"{prefix}.") for prefix in prefixes):
+                del sys.modules[mod_name]
+                purged.add(mod_name)
+        return purged
+
+    def _configure_helpers(self, purged):
+        """Re-applies core settings to helpers whose module-level state a purge reset."""
+        if "modules.http_utils" not in purged:
+            return
+        try:
+            from modules.http_utils import configure_circuit_breakers, configure_http_cache
+            core = self.bot.config.get("core", {})
+            configure_http_cache(core.get("http_cache"), CONFIG_DIR)
+            configure_circuit_breakers(core.get("http_circuit_breaker"))
+        except Exception as e:
+            self.bot.log_debug(f"[plugins] Could not reconfigure http_utils: {e}")
+
+    def _discard_runtime(self, name, runtime):
+        """Closes what a failed reload's export_runtime handed over (e.g. weather2's HTTP sessions)."""
+        for value in (runtime or {}).values():
+            close = getattr(value, "close", None)
+            if callable(close):
+                try:
+                    close()
+                except Exception as e:
+                    self.bot.log_debug(f"[plugins] Error closing runtime of {name}: {e}")
+
+    def reload_changed(self):
+        """
+        Hot reload: re-imports only the modules whose source (or whose imported
+        helpers/packages) changed since the last load, handing runtime state from
+        the old instance to the new one via export_runtime/import_runtime.
+        Returns a dict of reloaded/loaded/unloaded/failed module names.
+        """
+        summary = {"reloaded": [], "loaded": [], "unloaded": [], "failed": []}
+        current = self._scan_sources()
+        changed = {path for path, fp in current.items() if self._fingerprints.get(path) != fp}
+        removed = set(self._fingerprints) - set(current)
+        self._fingerprints = current
+        if not changed and not removed:
+            return summary
+
+        modules_dir = ROOT / "modules"
+        self.bot.log_debug(
+            f"[plugins] Hot reload: changed files: {', '.join(sorted(str(p.relative_to(modules_dir)) for p in changed | removed))}"
+        )
+        self._configure_helpers(self._purge_imported(changed | removed))
+
+        blacklist = self._blacklist()
+        touched = changed | removed
+        for name in sorted(set(self.plugins) | self.unavailable):
+            py_path = modules_dir / f"{name}.py"
+            if not py_path.exists():
+                if self.unload_module(name):
+                    summary["unloaded"].append(name)
+                self.unavailable.discard(name)
+                continue
+            if not (self._source_dependencies(py_path) & touched):
+                continue
+            if name not in self.plugins:
+                if self.load_module(name):
+                    summary["loaded"].append(name)
+                continue
+
+            runtime = None
+            old = self.plugins[name]
+            if hasattr(old, "export_runtime"):
+                try:
+                    runtime = old.export_runtime()
+                except Exception as e:
+                    self.bot.log_debug(f"[plugins] export_runtime failed for {name}: {e}")
+            self.unload_module(name)
+            if self.load_module(name, runtime=runtime):
+                summary["reloaded"].append(name)
+            else:
+                summary["failed"].append(name)
+                if name not in self.plugins:
+                    self._discard_runtime(name, runtime)
+
+        # Brand-new plugin files
+        for path in sorted(changed):
+            if path.parent != modules_dir or path.name in blacklist:
+                continue
+            name = path.stem
+            if name in self.plugins or name in self.unavailable or name in summary["failed"]:
+                continue
+            if name in ("__init__", "base") or not self._has_setup(path):
+                continue
+            if self.load_module(name):
+                summary["loaded"].append(name)
+
+        self.bot.log_debug(f"[plugins] Hot reload complete: {summary}")
+        return summary
+
+    @staticmethod
+    def _has_setup(path):
+        try:
+            return re.search(r"^(?:def setup\(|from \.\w+ import setup)", path.read_text(encoding="utf-8"), re.MULTILINE) is not None
+        except OSError:
+            return False
+
     def unload_module(self, name: str) -> bool:
         """Unloads a single module by name."""
         if name in self.plugins:
             obj = self.plugins[name]
+            events = getattr(self.bot, "events", None)
+            if events is not None:
+                # Let queued events reach the old instance before it saves state.
+                events.flush(owner=name)
             if hasattr(obj, "on_unload"):
                 try:
                     obj.on_unload()
                 except Exception as e:
                     self.bot.log_debug(f"[plugins] error unloading {name}: {e}")
+            if events is not None:
+                events.unsubscribe_owner(name)
             del self.plugins[name]
+            self.modules.pop(name, None)
             self.bot.log_debug(f"[plugins] Unloaded module: {name}")
             return True
         return False
 
-    def load_module(self, name: str) -> bool:
-        """Loads a single module by name."""
+    def load_module(self, name: str, runtime=None) -> bool:
+        """
+        Loads a single module by name. If `runtime` is given (from the previous
+        instance's export_runtime), it is passed to import_runtime before on_load.
+        """
         if name in self.plugins or name in ("__init__", "base"):
             return False
 
@@ -321,6 +561,10 @@ class PluginManager:
         if not py_path.exists():
             self.bot.log_debug(f"[plugins] FAILED to load {name}: file not found at {py_path}")
             return False
+        if not self._has_setup(py_path):
+            # Helpers (http_utils, geocache, ...) are imported by the plugins that use
+            # them; executing them again here would reset their shared module state.
+            return False
 
         try:
             spec = importlib.util.spec_from_file_location(f"modules.{name}", py_path)
@@ -332,11 +576,20 @@ class PluginManager:
                 instance = mod.setup(self.bot)
                 if instance:
                     self.plugins[name] = instance
+                    self.modules[name] = mod
+                    self.unavailable.discard(name)
+                    if runtime is not None and hasattr(instance, "import_runtime"):
+                        try:
+                            instance.import_runtime(runtime)
+                        except Exception as e:
+                            self.bot.log_debug(f"[plugins] import_runtime failed for {name}: {e}")
                     if hasattr(instance, "on_load"):
                         instance.on_load()
                     self.bot.log_debug(f"[plugins] Loaded module: {name}")
                     return True
+                self.unavailable.add(name)
         except Exception as e:
+            self.unavailable.add(name)
             self.bot.log_debug(f"[plugins] FAILED to load {name}: {e}\n{traceback.format_exc()}")
         
         return False
@@ -467,6 +720,10 @@ class Jeeves(SingleServerIRCBot):
     def core_reload_plugins(self):
         return self.pm.load_all()
 
+    def core_hot_reload_plugins(self):
+        """Reloads only modules whose source files changed, keeping the rest running."""
+        return self.pm.reload_changed()
+
     def core_reload_config(self):
         self.log_debug("[core] Validating and reloading configuration from config.yaml...")
         try:
@@ -474,25 +731,81 @@ class Jeeves(SingleServerIRCBot):
             if not success or not new_config:
                 self.log_debug("[core] ERROR: Configuration validation failed during reload")
                 return False
+            old_config = self.config
             self.config = new_config
-            for name, instance in self.pm.plugins.items():
-                if hasattr(instance, "on_config_reload"):
-                    instance.on_config_reload(self.config.get(name, {}))
+            self.last_config_reload = self._apply_config_changes(diff_config(old_config, new_config))
             self.log_debug("[core] Configuration reloaded and validated successfully")
             return True
         except Exception as e:
             self.log_debug(f"[core] FAILED to reload configuration from state: {e}")
             return False
 
+    def _apply_config_changes(self, changed_paths):
+        """
+        Notifies or restarts only the modules affected by a config diff.
+
+        A module is restarted when a changed path touches one of its
+        `config_restart_keys`; otherwise it gets `on_config_reload` if its own
+        section or one of its `config_sections` changed. Everyone else is left alone.
+        """
+        summary = {"changed": changed_paths, "notified": [], "restarted": [], "loaded": [], "unloaded": []}
+        if not changed_paths:
+            self.log_debug("[core] Config reload: no changes detected")
+            return summary
+        self.log_debug(f"[core] Config reload: changed keys: {', '.join(changed_paths)}")
+
+        for name, instance in list(self.pm.plugins.items()):
+            try:
+                restart_keys = getattr(instance, "config_restart_keys", ())
+                if restart_keys and config_paths_overlap(changed_paths, restart_keys):
+                    if self.pm.reload_module(name):
+                        summary["restarted"].append(name)
+                    continue
+                watched = (name,) + tuple(getattr(instance, "config_sections", ()))
+                if hasattr(instance, "on_config_reload") and config_paths_overlap(changed_paths, watched):
+                    instance.on_config_reload(self.config.get(name, {}))
+                    summary["notified"].append(name)
+            except Exception as e:
+                self.log_debug(f"[core] Config reload error in {name}: {e}\n{traceback.format_exc()}")
+
+        if config_paths_overlap(changed_paths, ("core.module_blacklist",)):
+            loaded, unloaded = self.pm.sync_blacklist()
+            summary["loaded"].extend(loaded)
+            summary["unloaded"].extend(unloaded)
+        if config_paths_overlap(changed_paths, ("api_keys",)):
+            summary["loaded"].extend(self.pm.retry_unavailable())
+
+        self.log_debug(
+            f"[core] Config reload: notified={summary['notified']} restarted={summary['restarted']} "
+            f"loaded={summary['loaded']} unloaded={summary['unloaded']}"
+        )
+        return summary
+
+    def describe_last_config_reload(self) -> str:
+        """One-line summary of what the most recent config reload touched."""
+        summary = getattr(self, "last_config_reload", None)
+        if not summary:
+            return "No configuration reload has run yet."
+        if not summary["changed"]:
+            return "No configuration changes detected."
+        sections = sorted({path.split(".", 1)[0] for path in summary["changed"]})
+        parts = [f"Changed sections: {', '.join(sections)}."]
+        for label, key in (("Notified", "notified"), ("Restarted", "restarted"),
+                           ("Loaded", "loaded"), ("Unloaded", "unloaded")):
+            if summary[key]:
+                parts.append(f"{label}: {', '.join(sorted(summary[key]))}.")
+        return " ".join(parts)
+
     def core_reset_and_reload_config(self):
-        """Core function to reload config from config.yaml and reload plugins."""
+        """
+        Core function to reload config from config.yaml. Only modules touched by
+        the diff are notified or restarted; use core_reload_plugins for a full reload.
+        """
         self.log_debug("[core] Reloading configuration from config.yaml...")
         try:
             if not self.core_reload_config():
                 return False
 
-            self.core_reload_plugins()
-
             self.log_debug("[core] Configuration has been reloaded from config.yaml.")
             return True
         except Exception as e:
@@ -834,6 +1147,45 @@ class Jeeves(SingleServerIRCBot):
 # --- Global State Manager Instance ---
 state_manager = None
 
+def save_for_shutdown(bot, manager):
+    """
+    Writes everything held in memory to disk before exiting. Modules are
+    unloaded before the final save, since several (achievements, translate,
+    ...) only hand their state to the state manager from on_unload.
+    """
+    # Persist long-running cooldowns (no-op unless core.persist_cooldowns)
+    try:
+        from modules.cooldowns import persist_cooldowns
+        persist_cooldowns(bot)
+    except Exception as e:
+        bot.log_debug(f"[core] Error persisting cooldowns: {e}")
+
+    # Keep geocoding results learned since the last periodic save
+    try:
+        from modules.geocache import persist_geocode_cache
+        persist_geocode_cache(bot)
+    except Exception as e:
+        bot.log_debug(f"[core] Error persisting geocode cache: {e}")
+
+    # Deliver queued bus events (achievement progress etc.) before unloading
+    events = getattr(bot, "events", None)
+    if events is not None:
+        try:
+            events.close()
+        except Exception as e:
+            bot.log_debug(f"[core] Error flushing event bus: {e}")
+
+    # Unload all modules; each saves its state on the way out
+    if bot and bot.pm:
+        bot.log_debug("[core] Unloading modules...")
+        bot.pm.unload_all()
+
+    # Save all state
+    if manager:
+        bot.log_debug("[core] Saving state...")
+        manager.force_save()
+
+
 def main():
     CONFIG_DEFAULT_PATH = ROOT / "config.yaml.default"
 
@@ -862,6 +1214,14 @@ def main():
         print("Run 'python3 config_validator.py config/config.yaml' for detailed validation.", file=sys.stderr)
         sys.exit(1)
 
+    # Size limits and the optional on-disk tier for cached API responses
+    try:
+        from modules.http_utils import configure_circuit_breakers, configure_http_cache
+        configure_http_cache(config.get("core", {}).get("http_cache"), CONFIG_DIR)
+        configure_circuit_breakers(config.get("core", {}).get("http_circuit_breaker"))
+    except Exception as e:
+        print(f"[boot] WARNING: could not configure HTTP cache: {e}", file=sys.stderr)
+
     irc_config = config.get("connection", {})
     server = irc_config.get("server", "irc.libera.chat")
     port = irc_config.get("port", 6697)
@@ -916,15 +1276,7 @@ def main():
                 except Exception as e:
                     bot.log_debug(f"[core] Error sending QUIT: {e}")
 
-            # Save all state
-            if state_manager:
-                bot.log_debug("[core] Saving state...")
-                state_manager.force_save()
-
-            # Unload all modules
-            if bot and bot.pm:
-                bot.log_debug("[core] Unloading modules...")
-                bot.pm.unload_all()
+            save_for_shutdown(bot, state_manager)
 
             bot.log_debug("[core] Shutdown complete")
             shutdown_timer.cancel()
@@ -115,6 +115,11 @@ class AbsurdiaDatabase:
                 CREATE INDEX IF NOT EXISTS idx_owner_name ON creatures(owner_id, name)
             ''')
 
+            # Covering index for the web stats' per-owner rarity counts
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_creatures_owner_rarity ON creatures(owner_id, rarity)
+            ''')
+
             # Pending catches table
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS pending_catches (
@@ -1,10 +1,26 @@
 # modules/achievement_hooks.py
-# Helper functions for recording achievement progress from other modules
+# Helper functions for recording achievement progress from other modules.
+# Progress is published on the event bus; achievements and activity consume it
+# off the caller's thread, so producers never touch another module's state.
 
 import logging
 
+from .event_bus import METRIC_BEST, METRIC_INCREMENT, get_event_bus
+
 logger = logging.getLogger(__name__)
 
+
+def _publish(bot, topic: str, **data):
+    try:
+        get_event_bus(bot).publish(topic, **data)
+    except Exception as exc:
+        # Avoid breaking callers if the bus or its consumers misbehave.
+        if hasattr(bot, "log_debug"):
+            bot.log_debug(f"[achievements] publishing {topic} failed for {data.get('username')}/{data.get('metric')}: {exc}")
+        else:
+            logger.exception("publishing %s failed for %s/%s", topic, data.get("username"), data.get("metric"))
+
+
 def record_achievement(bot, username: str, metric: str, amount: int = 1):
     """
     Record progress toward an achievement for a user.
@@ -15,16 +31,12 @@ def record_achievement(bot, username: str, metric: str, amount: int = 1):
         metric: The metric to track (e.g., 'quests_completed', 'coffees_ordered')
         amount: Amount to increment (default: 1)
     """
-    achievements_module = bot.pm.plugins.get("achievements")
-    if achievements_module and hasattr(achievements_module, "record_progress"):
-        try:
-            achievements_module.record_progress(username, metric, amount)
-        except Exception as exc:
-            # Avoid breaking callers if achievements are unavailable.
-            if hasattr(bot, "log_debug"):
-                bot.log_debug(f"[achievements] record_progress failed for {username}/{metric}: {exc}")
-            else:
-                logger.exception("record_progress failed for %s/%s", username, metric)
+    _publish(bot, METRIC_INCREMENT, username=username, metric=metric, amount=amount)
+
+
+def record_best(bot, username: str, metric: str, value: int):
+    """Record a high-water mark (streaks, levels); progress only moves if `value` is higher."""
+    _publish(bot, METRIC_BEST, username=username, metric=metric, value=value)
 
 
 # Convenience functions for common achievements
@@ -91,50 +103,17 @@ def record_gif_posted(bot, username: str):
 
 def record_prestige_level(bot, username: str, prestige: int):
     """Record prestige level reached."""
-    achievements_module = bot.pm.plugins.get("achievements")
-    if not achievements_module:
-        return
-
-    user_id = bot.get_user_id(username)
-    user_achievements = achievements_module.get_state("user_achievements", {})
-    user_data = user_achievements.get(user_id, {})
-    progress = user_data.get("progress", {})
-
-    current_best = progress.get("prestige", 0)
-    if prestige > current_best:
-        record_achievement(bot, username, "prestige", prestige - current_best)
+    record_best(bot, username, "prestige", prestige)
 
 
 def record_win_streak(bot, username: str, streak: int):
     """Record current win streak (only updates if higher)."""
-    achievements_module = bot.pm.plugins.get("achievements")
-    if not achievements_module:
-        return
-
-    user_id = bot.get_user_id(username)
-    user_achievements = achievements_module.get_state("user_achievements", {})
-    user_data = user_achievements.get(user_id, {})
-    progress = user_data.get("progress", {})
-
-    current_best = progress.get("win_streak", 0)
-    if streak > current_best:
-        record_achievement(bot, username, "win_streak", streak - current_best)
+    record_best(bot, username, "win_streak", streak)
 
 
 def record_loss_streak(bot, username: str, streak: int):
     """Record current loss streak (only updates if higher)."""
-    achievements_module = bot.pm.plugins.get("achievements")
-    if not achievements_module:
-        return
-
-    user_id = bot.get_user_id(username)
-    user_achievements = achievements_module.get_state("user_achievements", {})
-    user_data = user_achievements.get(user_id, {})
-    progress = user_data.get("progress", {})
-
-    current_best = progress.get("loss_streak", 0)
-    if streak > current_best:
-        record_achievement(bot, username, "loss_streak", streak - current_best)
+    record_best(bot, username, "loss_streak", streak)
 
 
 # Fishing achievements
@@ -150,18 +129,7 @@ def record_fish_caught(bot, username: str, rarity: str = "common"):
 
 def record_fishing_level(bot, username: str, level: int):
     """Record fishing level reached (only updates if higher)."""
-    achievements_module = bot.pm.plugins.get("achievements")
-    if not achievements_module:
-        return
-
-    user_id = bot.get_user_id(username)
-    user_achievements = achievements_module.get_state("user_achievements", {})
-    user_data = user_achievements.get(user_id, {})
-    progress = user_data.get("progress", {})
-
-    current = progress.get("fishing_level", 0)
-    if level > current:
-        record_achievement(bot, username, "fishing_level", level - current)
+    record_best(bot, username, "fishing_level", level)
 
 
 def record_line_broken(bot, username: str):
@@ -1,10 +1,14 @@
 # modules/achievements.py
 # Achievement tracking system for Jeeves IRC bot
 
+import threading
 import time
 from typing import Dict, Any, List, Optional, Set
 from datetime import datetime
+import schedule
+
 from .base import SimpleCommandModule
+from .event_bus import METRIC_BEST, METRIC_INCREMENT
 
 # Achievement definitions
 ACHIEVEMENTS = {
@@ -380,6 +384,20 @@ ACHIEVEMENTS = {
 }
 
 
+def _build_metric_index(achievements: Dict[str, Dict[str, Any]]) -> Dict[str, tuple]:
+    """Maps each progress metric to the achievements whose requirements mention it."""
+    index: Dict[str, List[str]] = {}
+    for ach_id, ach_def in achievements.items():
+        requirement = ach_def.get("requirement")
+        if isinstance(requirement, dict):
+            for metric in requirement:
+                index.setdefault(metric, []).append(ach_id)
+    return {metric: tuple(ids) for metric, ids in index.items()}
+
+
+METRIC_INDEX = _build_metric_index(ACHIEVEMENTS)
+
+
 class Achievements(SimpleCommandModule):
     """Achievement tracking system."""
     name = "achievements"
@@ -395,6 +413,39 @@ class Achievements(SimpleCommandModule):
         self.set_state("global_unlocks", self.get_state("global_unlocks", {}))
         self.save_state()
 
+        # Set mirror of opted_in_users so every progress event is an O(1) check
+        self._opted_in: Set[str] = set(self.get_state("opted_in_users", []))
+        self._progress_lock = threading.RLock()
+
+    def on_load(self):
+        # Progress arrives from other modules via the event bus, in batches.
+        # A short max_delay keeps unlock announcements prompt.
+        self.subscribe(METRIC_INCREMENT, self._on_metric_events, mode="queued", batch_size=200, max_delay=0.25)
+        self.subscribe(METRIC_BEST, self._on_metric_events, mode="queued", batch_size=200, max_delay=0.25)
+        interval = max(1, int(self.get_config_value("flush_interval_seconds", default=30)))
+        schedule.every(interval).seconds.do(self.save_state).tag(f"{self.name}-flush")
+
+    def on_unload(self):
+        schedule.clear(f"{self.name}-flush")
+        super().on_unload()
+
+    def _on_metric_events(self, events):
+        """Coalesces a batch of bus events into one progress update per user."""
+        updates: Dict[str, Dict[str, Any]] = {}
+        for event in events:
+            data = event.data
+            user_id = self.bot.get_user_id(data["username"])
+            if user_id not in self._opted_in:
+                continue
+            pending = updates.setdefault(user_id, {"username": data["username"], "add": {}, "best": {}})
+            metric = data["metric"]
+            if event.topic == METRIC_BEST:
+                pending["best"][metric] = max(pending["best"].get(metric, 0), data["value"])
+            else:
+                pending["add"][metric] = pending["add"].get(metric, 0) + data["amount"]
+        if updates:
+            self._apply_progress(updates)
+
     def _register_commands(self):
         self.register_command(r"^\s*!achievements?\s*$", self._cmd_achievements_self, name="achievements", description="Show your achievements")
         self.register_command(r"^\s*!achievements?\s+list\s*$", self._cmd_achievements_list, name="achievements list", description="List all available achievements")
@@ -414,8 +465,9 @@ class Achievements(SimpleCommandModule):
             user_id = self.bot.get_user_id(username)
             opted_in = self.get_state("opted_in_users", [])
 
-            if user_id not in opted_in:
+            if user_id not in self._opted_in:
                 opted_in.append(user_id)
+                self._opted_in.add(user_id)
                 self.set_state("opted_in_users", opted_in)
                 self.save_state()
 
@@ -434,62 +486,86 @@ class Achievements(SimpleCommandModule):
 
     def is_tracking(self, username: str) -> bool:
         """Check if user has opted into achievement tracking."""
-        user_id = self.bot.get_user_id(username)
-        return user_id in self.get_state("opted_in_users", [])
+        return self.bot.get_user_id(username) in self._opted_in
 
     def record_progress(self, username: str, metric: str, amount: int = 1):
         """Record progress toward achievements for a user."""
-        if not self.is_tracking(username):
-            return
-
         user_id = self.bot.get_user_id(username)
-        user_achievements = self.get_state("user_achievements", {})
+        if user_id in self._opted_in:
+            self._apply_progress({user_id: {"username": username, "add": {metric: amount}, "best": {}}})
 
-        if user_id not in user_achievements:
-            user_achievements[user_id] = {
-                "unlocked": [],
-                "progress": {},
-                "timestamps": {}
-            }
-
-        # Update progress
-        user_data = user_achievements[user_id]
-        current = user_data["progress"].get(metric, 0)
-        user_data["progress"][metric] = current + amount
-
-        self.set_state("user_achievements", user_achievements)
-        self.save_state()
-
-        # Check for unlocked achievements
-        self._check_achievements(username, user_id)
-
-    def _check_achievements(self, username: str, user_id: str):
-        """Check if user has unlocked any new achievements."""
+    def record_best(self, username: str, metric: str, value: int):
+        """Raise a high-water-mark metric (streaks, levels) to `value` if it is higher."""
+        user_id = self.bot.get_user_id(username)
+        if user_id in self._opted_in:
+            self._apply_progress({user_id: {"username": username, "add": {}, "best": {metric: value}}})
+
+    def _apply_progress(self, updates: Dict[str, Dict[str, Any]]):
+        """
+        Applies coalesced progress ({user_id: {"username", "add", "best"}}) and
+        checks only the achievements indexed under the metrics that moved.
+        State is written to memory here; unlocks save immediately and the
+        periodic flush persists plain progress.
+        """
+        with self._progress_lock:
+            user_achievements = self.get_state("user_achievements", {})
+            touched = []
+            for user_id, pending in updates.items():
+                user_data = user_achievements.setdefault(user_id, {
+                    "unlocked": [],
+                    "progress": {},
+                    "timestamps": {}
+                })
+                progress = user_data["progress"]
+                moved = set()
+                for metric, amount in pending["add"].items():
+                    if amount:
+                        progress[metric] = progress.get(metric, 0) + amount
+                        moved.add(metric)
+                for metric, value in pending["best"].items():
+                    if value > progress.get(metric, 0):
+                        progress[metric] = value
+                        moved.add(metric)
+                if moved:
+                    touched.append((pending["username"], user_id, moved))
+
+            self.set_state("user_achievements", user_achievements)
+            for username, user_id, moved in touched:
+                self._check_achievements(username, user_id, moved)
+
+    def _check_achievements(self, username: str, user_id: str, metrics: Optional[Set[str]] = None):
+        """Check if user has unlocked any new achievements (only those tied to `metrics`, if given)."""
         user_achievements = self.get_state("user_achievements", {})
         user_data = user_achievements.get(user_id, {})
         unlocked = user_data.get("unlocked", [])
         progress = user_data.get("progress", {})
 
+        if metrics is None:
+            candidates = list(ACHIEVEMENTS)
+        else:
+            candidates = sorted({ach_id for metric in metrics for ach_id in METRIC_INDEX.get(metric, ())})
+
         newly_unlocked = []
 
-        for ach_id, ach_def in ACHIEVEMENTS.items():
+        for ach_id in candidates:
             if ach_id in unlocked:
                 continue  # Already unlocked
 
             # Check requirements
-            requirement = ach_def.get("requirement")
+            requirement = ACHIEVEMENTS[ach_id].get("requirement")
             if isinstance(requirement, dict):
                 # All requirements must be met
                 if all(progress.get(key, 0) >= value for key, value in requirement.items()):
                     newly_unlocked.append(ach_id)
-            elif requirement == "special":
-                # Special achievements checked elsewhere
-                continue
 
         # Unlock achievements
         for ach_id in newly_unlocked:
             self._unlock_achievement(username, user_id, ach_id)
 
+        # Unlocking moves the meta metric, which may complete collector achievements.
+        if newly_unlocked and metrics is not None and "achievements_unlocked" not in metrics:
+            self._check_achievements(username, user_id, {"achievements_unlocked"})
+
     def _unlock_achievement(self, username: str, user_id: str, achievement_id: str):
         """Unlock an achievement for a user."""
         user_achievements = self.get_state("user_achievements", {})
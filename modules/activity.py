@@ -3,11 +3,13 @@
 
 from __future__ import annotations
 
+import threading
 import time
 from datetime import datetime, timezone
 from typing import Any, Dict, List
 
 from .base import SimpleCommandModule
+from .event_bus import METRIC_INCREMENT
 
 UTC = timezone.utc
 HEATMAP_BINS = 7 * 24
@@ -54,14 +56,29 @@ class Activity(SimpleCommandModule):
         self.set_state("global", _ensure_bucket(self.get_state("global"), now_iso))
         self.set_state("channels", self.get_state("channels", {}))
         self.set_state("users", self.get_state("users", {}))
+        self.set_state("metric_totals", self.get_state("metric_totals", {}))
         self.save_state()
 
+        # Updated from both the IRC thread and the event bus worker.
+        self._pending_lock = threading.Lock()
         self._pending_updates = 0
         self._last_flush_ts = time.time()
 
     def _register_commands(self) -> None:
         return
 
+    def on_load(self) -> None:
+        # Game counters (fish caught, quests won, ...) published by other modules.
+        self.subscribe(METRIC_INCREMENT, self._on_metric_events, mode="queued", batch_size=100, max_delay=5.0)
+
+    def _on_metric_events(self, events: List[Any]) -> None:
+        totals = self.get_state("metric_totals", {})
+        for event in events:
+            metric = event.data["metric"]
+            totals[metric] = int(totals.get(metric, 0)) + int(event.data["amount"])
+        self.set_state("metric_totals", totals)
+        self._note_pending(len(events))
+
     def on_ambient_message(self, connection: Any, event: Any, msg: str, username: str) -> bool:
         if not self.is_enabled(event.target):
             return False
@@ -105,17 +122,20 @@ class Activity(SimpleCommandModule):
         self.set_state("channels", channels)
         self.set_state("users", users)
 
-        self._pending_updates += 1
+        self._note_pending(1)
+        return False
+
+    def _note_pending(self, count: int) -> None:
         flush_every_messages = int(self.get_config_value("flush_every_messages", default=50))
         flush_interval_seconds = float(self.get_config_value("flush_interval_seconds", default=30))
         now_ts = time.time()
 
-        if self._pending_updates >= max(1, flush_every_messages) or (now_ts - self._last_flush_ts) >= max(1.0, flush_interval_seconds):
-            self.save_state()
-            self._pending_updates = 0
-            self._last_flush_ts = now_ts
-
-        return False
+        with self._pending_lock:
+            self._pending_updates += count
+            if self._pending_updates >= max(1, flush_every_messages) or (now_ts - self._last_flush_ts) >= max(1.0, flush_interval_seconds):
+                self.save_state()
+                self._pending_updates = 0
+                self._last_flush_ts = now_ts
 
     def on_unload(self) -> None:
         self.save_state(force=True)
@@ -7,6 +7,7 @@ import sys
 import yaml
 from pathlib import Path
 from .base import SimpleCommandModule, admin_required
+from .http_utils import circuit_breaker_states
 
 def setup(bot: Any) -> "Admin":
     return Admin(bot)
@@ -56,7 +57,9 @@ class Admin(SimpleCommandModule):
         args = args_str.split()
         subcommand = args[0].lower()
 
-        if subcommand == "reload":
+        if subcommand == "reload" and len(args) > 1 and args[1].lower() == "changed":
+            return self._cmd_hot_reload(connection, event, username)
+        elif subcommand == "reload":
             return self._cmd_reload(connection, event, username)
         elif subcommand == "load" and len(args) > 1:
             return self._cmd_load(connection, event, username, args[1])
@@ -66,6 +69,10 @@ class Admin(SimpleCommandModule):
             return self._cmd_config_reload(connection, event, username)
         elif subcommand == "modules":
              return self._cmd_list_modules(connection, event, username)
+        elif subcommand == "http":
+            return self._cmd_http_stats(connection, event, username)
+        elif subcommand == "geocache":
+            return self._cmd_geocache(connection, event, username, args[1:])
         elif subcommand == "join" and len(args) > 1:
             return self._cmd_join(connection, event, username, args[1])
         elif subcommand == "part" and len(args) > 1:
@@ -175,6 +182,16 @@ class Admin(SimpleCommandModule):
         self.safe_reply(connection, event, f"Modules reloaded: {', '.join(sorted(loaded))}")
         return True
 
+    def _cmd_hot_reload(self, connection, event, username):
+        if not self._require_super_admin(connection, event, username):
+            return True
+        summary = self.bot.core_hot_reload_plugins()
+        parts = [f"{label}: {', '.join(summary[key])}" for label, key in
+                 (("Reloaded", "reloaded"), ("Loaded", "loaded"), ("Unloaded", "unloaded"), ("Failed", "failed"))
+                 if summary[key]]
+        self.safe_reply(connection, event, "; ".join(parts) if parts else "No module files have changed.")
+        return True
+
     def _cmd_load(self, connection, event, username, module_name):
         if not self._require_super_admin(connection, event, username):
             return True
@@ -197,7 +214,7 @@ class Admin(SimpleCommandModule):
         if not self._require_super_admin(connection, event, username):
             return True
         if self.bot.core_reload_config():
-            self.safe_reply(connection, event, "Configuration reloaded from config.yaml. Modules NOT reloaded (use !admin reload for that).")
+            self.safe_reply(connection, event, f"Configuration reloaded from config.yaml. {self.bot.describe_last_config_reload()}")
         else:
             self.safe_reply(connection, event, "Error reloading configuration.")
         return True
@@ -207,6 +224,61 @@ class Admin(SimpleCommandModule):
         self.safe_reply(connection, event, f"Loaded modules ({len(loaded_modules)}): {', '.join(loaded_modules)}")
         return True
 
+    def _cmd_http_stats(self, connection, event, username):
+        if not self.http:
+            self.safe_reply(connection, event, "The shared HTTP client is not available.")
+            return True
+        stats = self.http.cache.stats()
+        flights = self.http.flight.stats()
+        saved = sum(counts["shared"] for counts in flights.values())
+        timeouts = sum(counts["timeouts"] for counts in flights.values())
+        coalesced = f"Coalesced: {saved} duplicate requests saved, {timeouts} waiter timeouts."
+        tripped = [f"{host} {snap['state'].replace('_', '-')}" for host, snap in sorted(circuit_breaker_states().items())
+                   if snap["state"] != "closed"]
+        if tripped:
+            coalesced += " Circuit breakers: " + ", ".join(tripped) + "."
+        if not stats:
+            self.safe_reply(connection, event, f"No cached API lookups yet. {coalesced}")
+            return True
+        busiest = sorted(stats.items(), key=lambda item: -sum(item[1][field] for field in self.http.cache.STAT_FIELDS))
+        parts = [f"{host} {counts['hit_ratio']:.0%} ({counts['hits'] + counts['stale'] + counts['negative']} hit, "
+                 f"{counts['revalidated']} revalidated, {counts['misses']} miss)" for host, counts in busiest[:6]]
+        self.safe_reply(connection, event, f"HTTP cache ({len(self.http.cache)} entries): " + "; ".join(parts) + f". {coalesced}")
+        return True
+
+    def _cmd_geocache(self, connection, event, username, args):
+        action = args[0].lower() if args else ""
+        query = " ".join(args[1:]).strip()
+        if action == "purge":
+            removed = self.geocache.purge(query or None)
+            self.geocache.save()
+            scope = f" matching '{query}'" if query else ""
+            self.safe_reply(connection, event, f"Purged {removed} cached geocode entr{'y' if removed == 1 else 'ies'}{scope}.")
+            return True
+        if action == "find" and query:
+            matches = self.geocache.find(query, limit=5)
+            if not matches:
+                self.safe_reply(connection, event, f"No cached geocode entries match '{query}'.")
+                return True
+            parts = []
+            for key, value, expires in matches:
+                days = max(0, int((expires - time.time()) // 86400))
+                if isinstance(value, dict):
+                    place = value.get("short_name") or f"{value.get('lat')},{value.get('lon')}"
+                elif value:
+                    place = f"{value[0]},{value[1]}"
+                else:
+                    place = "not found"
+                parts.append(f"{key} -> {place} ({days}d left)")
+            self.safe_reply(connection, event, "; ".join(parts))
+            return True
+        if action:
+            return self._usage(connection, event, "geocache [find <query> | purge [query]]")
+        stats = self.geocache.stats()
+        self.safe_reply(connection, event, f"Geocode cache: {stats['entries']} entries, {stats['hit_ratio']:.0%} hit ratio "
+                                           f"({stats['hits']} hits, {stats['misses']} misses since start).")
+        return True
+
     def _cmd_join(self, connection, event, username, room):
         self.bot.connection.join(room)
         self.safe_reply(connection, event, f"Joined {room}.")
@@ -272,9 +344,10 @@ class Admin(SimpleCommandModule):
                 "SUPER ADMIN COMMANDS (require password authentication):",
                 "!pass <password> - Authenticate as super admin (use in /msg only)",
                 "!admin reload - Reload all modules from disk.",
+                "!admin reload changed - Hot reload only modules whose files changed.",
                 "!admin load <module> - Load a specific module by name.",
                 "!admin unload <module> - Unload a specific module by name.",
-                "!admin config reload - Reload config.yaml (without reloading modules).",
+                "!admin config reload - Reload config.yaml; only modules whose settings changed are notified or restarted.",
                 "!emergency quit [message] - Emergency shutdown.",
                 "",
                 "REGULAR ADMIN COMMANDS (hostname verification only):",
@@ -284,6 +357,8 @@ class Admin(SimpleCommandModule):
 
         help_lines.extend([
             "!admin modules - List all currently loaded modules.",
+            "!admin http - Show API cache hit ratios per host, coalesced request counts and tripped circuit breakers.",
+            "!admin geocache [find <query> | purge [query]] - Inspect or purge cached place lookups.",
             "!admin join <#channel> - Join a channel.",
             "!admin part <#channel> [message] - Leave a channel.",
             "!say [#channel] <message> - Make the bot speak.",
@@ -10,13 +10,25 @@ Provides commands for various fun APIs:
 - Nager.Date: Public holidays worldwide
 - IMDb API: Movie and TV show information
 - MusicBrainz: Artist and band information
+
+Random-content commands (!dad, untagged !cat, bare !brewery) are served from
+small per-endpoint buffers that a background prefetcher keeps topped up under
+a per-endpoint rate limit; an empty buffer falls back to a live call. Lookup
+commands cache their results by query through the shared HTTP client.
 """
 
 import sys
 import json
 import re
+import threading
 import urllib.parse
+from collections import deque
 from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import requests
+import schedule
+
 from .base import SimpleCommandModule
 from .exception_utils import (
     handle_exceptions, safe_api_call, ExternalAPIException,
@@ -33,9 +45,52 @@ class ApiOverload(SimpleCommandModule):
     version = "1.0.0"
     description = "A collection of fun and silly API integrations"
 
+    DAD_JOKE_HEADERS = {
+        "Accept": "application/json",
+        "User-Agent": "JeevesBot IRC Bot (https://github.com/yourusername/jeeves)"
+    }
+
+    PREFETCH_SIZE = 5             # items buffered per endpoint
+    PREFETCH_PER_MINUTE = 6       # upstream calls the prefetcher may make per endpoint
+    PREFETCH_INTERVAL = 30        # seconds between scheduled top-ups
+
+    # Lookup results barely change between requests; "not found" is cached too.
+    LOOKUP_TTLS = {
+        "card": 24 * 3600,
+        "anime": 6 * 3600,
+        "brewery": 6 * 3600,
+        "imdb": 6 * 3600,
+        "music": 24 * 3600,
+    }
+
     def __init__(self, bot):
         super().__init__(bot)
         self.http_session = self.requests_retry_session()
+        # endpoint -> fetcher returning one item; commands take from the matching buffer
+        self._prefetchers: Dict[str, Callable[[], Any]] = {
+            "dad": self._fetch_dad_joke,
+            "cat": self._fetch_random_cat,
+            "brewery": self._fetch_random_brewery,
+        }
+        size = max(0, int(self.get_config_value("prefetch_size", default=self.PREFETCH_SIZE)))
+        self._buffers: Dict[str, deque] = {endpoint: deque(maxlen=size) for endpoint in self._prefetchers}
+        self._refill_locks = {endpoint: threading.Lock() for endpoint in self._prefetchers}
+
+    def on_load(self):
+        self._refill_all()
+        schedule.every(self.PREFETCH_INTERVAL).seconds.do(self._refill_all).tag(f"{self.name}-prefetch")
+
+    def on_unload(self):
+        schedule.clear(f"{self.name}-prefetch")
+        super().on_unload()
+
+    def export_runtime(self) -> Dict[str, Any]:
+        return {"buffers": {endpoint: list(items) for endpoint, items in self._buffers.items()}}
+
+    def import_runtime(self, runtime: Dict[str, Any]) -> None:
+        for endpoint, items in (runtime.get("buffers") or {}).items():
+            if endpoint in self._buffers:
+                self._buffers[endpoint].extend(items)
 
     def _register_commands(self):
         """Register all the silly commands"""
@@ -104,21 +159,90 @@ class ApiOverload(SimpleCommandModule):
             description="Look up artist/band info from MusicBrainz. Usage: !music <artist name>"
         )
 
+    # --- Prefetch buffers ---
+
+    def _take(self, endpoint: str) -> Any:
+        """Pops a buffered item for `endpoint`, fetching live if the buffer is empty."""
+        try:
+            item = self._buffers[endpoint].popleft()
+        except IndexError:
+            item = None
+        self._refill_async(endpoint)
+        if item is None:
+            item = self._prefetchers[endpoint]()
+        return item
+
+    def _refill_all(self):
+        for endpoint in self._prefetchers:
+            self._refill_async(endpoint)
+
+    def _refill_async(self, endpoint: str):
+        buffer = self._buffers[endpoint]
+        if buffer.maxlen and len(buffer) < buffer.maxlen and not self._refill_locks[endpoint].locked():
+            threading.Thread(target=self._refill, args=(endpoint,), daemon=True).start()
+
+    def _refill(self, endpoint: str) -> int:
+        """Tops up one buffer without exceeding the endpoint's prefetch rate. Returns items added."""
+        lock = self._refill_locks[endpoint]
+        if not lock.acquire(blocking=False):
+            return 0
+        added = 0
+        try:
+            buffer = self._buffers[endpoint]
+            per_minute = int(self.get_config_value("prefetch_per_minute", default=self.PREFETCH_PER_MINUTE))
+            while len(buffer) < buffer.maxlen:
+                if not self.cooldowns.allow_window(f"prefetch:{self.name}:{endpoint}", per_minute, 60.0):
+                    break
+                try:
+                    item = self._prefetchers[endpoint]()
+                except Exception as e:
+                    self.log_debug(f"Prefetch for {endpoint} failed: {e}")
+                    break
+                if item is None:
+                    break
+                buffer.append(item)
+                added += 1
+        finally:
+            lock.release()
+        return added
+
+    def _fetch_dad_joke(self) -> str:
+        response = self.http_session.get("https://icanhazdadjoke.com/", headers=self.DAD_JOKE_HEADERS, timeout=10)
+        response.raise_for_status()
+        return response.json().get("joke", "I forgot the punchline!")
+
+    def _fetch_random_cat(self) -> Dict[str, Any]:
+        response = self.http_session.get("https://cataas.com/cat?json=true", timeout=10)
+        response.raise_for_status()
+        return response.json()
+
+    def _fetch_random_brewery(self) -> Any:
+        response = self.http_session.get("https://api.openbrewerydb.org/v1/breweries/random", timeout=10)
+        response.raise_for_status()
+        return response.json()
+
+    def _lookup_json(self, kind: str, url: str, api_name: str, user_message: str,
+                     headers: Optional[Dict[str, str]] = None) -> Tuple[Any, Optional[str]]:
+        """Fetches a lookup result through the shared client, cached per URL for the kind's TTL."""
+        if self.http is None:
+            def fetch():
+                response = self.http_session.get(url, headers=headers, timeout=10)
+                response.raise_for_status()
+                return response.json()
+            return safe_api_call(fetch, api_name=api_name, user_message=user_message)
+        ttl = self.LOOKUP_TTLS[kind]
+        return safe_api_call(
+            self.http.get_json, url, headers=headers, cache_ttl=ttl, negative_ttl=min(ttl, 3600),
+            api_name=api_name, user_message=user_message
+        )
+
     def _cmd_dad(self, connection, event, msg, username, match):
         """Get a random dad joke from icanhazdadjoke"""
         if not self.is_enabled(event.target):
             return False
 
         try:
-            headers = {
-                "Accept": "application/json",
-                "User-Agent": "JeevesBot IRC Bot (https://github.com/yourusername/jeeves)"
-            }
-            response = self.http_session.get("https://icanhazdadjoke.com/", headers=headers, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-
-            joke = data.get("joke", "I forgot the punchline!")
+            joke = self._take("dad")
             self.safe_reply(connection, event, joke)
 
         except Exception as e:
@@ -146,8 +270,8 @@ class ApiOverload(SimpleCommandModule):
 
         # TCGdex API - search for Pokemon cards (most popular TCG)
         url = f"https://api.tcgdex.net/v2/en/cards?name={urllib.parse.quote(search_term)}"
-        response, error = safe_api_call(
-            self.http_session.get, url, timeout=10,
+        data, error = self._lookup_json(
+            "card", url,
             api_name="TCGdex API",
             user_message="Unable to fetch card information at the moment. Please try again later."
         )
@@ -157,8 +281,6 @@ class ApiOverload(SimpleCommandModule):
             self.safe_reply(connection, event, error)
             return False
 
-        data = response.json()
-
         if not data or len(data) == 0:
             self.safe_reply(connection, event, f"No cards found for '{search_term}'")
             return True
@@ -169,8 +291,8 @@ class ApiOverload(SimpleCommandModule):
 
         # Fetch full card details to get flavor text
         detail_url = f"https://api.tcgdex.net/v2/en/cards/{card_id}"
-        detail_response, error = safe_api_call(
-            self.http_session.get, detail_url, timeout=10,
+        full_card, error = self._lookup_json(
+            "card", detail_url,
             api_name="TCGdex Detail API",
             user_message="Unable to fetch card details at the moment."
         )
@@ -178,8 +300,6 @@ class ApiOverload(SimpleCommandModule):
         if error:
             self.safe_reply(connection, event, error)
             return False
-        detail_response.raise_for_status()
-        full_card = detail_response.json()
 
         card_name = full_card.get("name", "Unknown Card")
         set_name = full_card.get("set", {}).get("name", "Unknown Set")
@@ -231,8 +351,8 @@ class ApiOverload(SimpleCommandModule):
             "User-Agent": "JeevesBot IRC Bot"
         }
 
-        response, error = safe_api_call(
-            self.http_session.get, url, headers=headers, timeout=10,
+        data, error = self._lookup_json(
+            "anime", url, headers=headers,
             api_name="Jikan API",
             user_message="Unable to fetch anime information at the moment."
         )
@@ -241,7 +361,6 @@ class ApiOverload(SimpleCommandModule):
             self.safe_reply(connection, event, error)
             return False
 
-        data = response.json()
         anime_list = data.get("data", [])
 
         if not anime_list:
@@ -321,8 +440,12 @@ class ApiOverload(SimpleCommandModule):
         search_term = match.group(1)
 
         if not search_term:
-            # Get a random brewery
-            url = "https://api.openbrewerydb.org/v1/breweries/random"
+            # Get a random brewery, from the prefetch buffer when possible
+            data, error = safe_api_call(
+                self._take, "brewery",
+                api_name="Brewery API",
+                user_message="Unable to fetch brewery information at the moment."
+            )
         else:
             search_term = search_term.strip()
             # Validate search term
@@ -330,21 +453,17 @@ class ApiOverload(SimpleCommandModule):
                 raise UserInputException("Search term too long", "Search term is too long. Please use a shorter search term.")
             # Search by city or name
             url = f"https://api.openbrewerydb.org/v1/breweries?by_city={urllib.parse.quote(search_term)}&per_page=1"
-
-        response, error = safe_api_call(
-            self.http_session.get, url, timeout=10,
-            api_name="Brewery API",
-            user_message="Unable to fetch brewery information at the moment."
-        )
+            data, error = self._lookup_json(
+                "brewery", url,
+                api_name="Brewery API",
+                user_message="Unable to fetch brewery information at the moment."
+            )
 
         if error:
             # safe_api_call already logged the error details
             self.safe_reply(connection, event, error)
             return False
 
-        response.raise_for_status()
-        data = response.json()
-
         # Handle both single object and array responses
         if isinstance(data, list):
             if len(data) == 0:
@@ -386,20 +505,18 @@ class ApiOverload(SimpleCommandModule):
             if tag:
                 tag = tag.strip()
                 url = f"https://cataas.com/cat/{urllib.parse.quote(tag)}"
-            else:
-                url = "https://cataas.com/cat"
 
-            # CATAAS returns the image directly, so we just return the URL
-            # We could also get JSON with /cat?json=true
-            json_url = url + ("&json=true" if "?" in url else "?json=true")
-            response = self.http_session.get(json_url, timeout=10)
+                # CATAAS returns the image directly, so we ask for JSON to get a stable URL
+                response = self.http_session.get(url + "?json=true", timeout=10)
 
-            if response.status_code == 404:
-                self.safe_reply(connection, event, f"No cats found with tag '{tag}'. Try another tag or use !cat for a random cat.")
-                return True
+                if response.status_code == 404:
+                    self.safe_reply(connection, event, f"No cats found with tag '{tag}'. Try another tag or use !cat for a random cat.")
+                    return True
 
-            response.raise_for_status()
-            data = response.json()
+                response.raise_for_status()
+                data = response.json()
+            else:
+                data = self._take("cat")
 
             # Build the full URL
             cat_url = f"{data.get('url', '/cat')}"
@@ -431,15 +548,19 @@ class ApiOverload(SimpleCommandModule):
                 country_code = country_code.strip().upper()
                 year = datetime.now().year
                 url = f"https://date.nager.at/api/v3/PublicHolidays/{year}/{country_code}"
-                response = self.http_session.get(url, timeout=10)
-
-                if response.status_code == 404:
-                    self.safe_reply(connection, event, f"Country code '{country_code}' not found. Try a 2-letter ISO code like US, GB, DE, etc.")
+                try:
+                    # A country's holiday list only changes yearly; unknown codes are cached too.
+                    data = self.http.get_json(url, cache_ttl=12 * 3600, negative_ttl=24 * 3600)
+                except requests.HTTPError as e:
+                    if getattr(e.response, "status_code", None) == 404:
+                        self.safe_reply(connection, event, f"Country code '{country_code}' not found. Try a 2-letter ISO code like US, GB, DE, etc.")
+                        return True
+                    raise
+
+                if not isinstance(data, list):
+                    self.safe_reply(connection, event, "Unable to fetch holiday information at the moment. Please try again later.")
                     return True
 
-                response.raise_for_status()
-                data = response.json()
-
                 # Filter for today's date
                 today_holidays = [h for h in data if h.get("date") == today]
 
@@ -454,9 +575,10 @@ class ApiOverload(SimpleCommandModule):
             else:
                 # Get worldwide holidays happening today
                 url = "https://date.nager.at/api/v3/NextPublicHolidaysWorldwide"
-                response = self.http_session.get(url, timeout=10)
-                response.raise_for_status()
-                data = response.json()
+                data = self.http.get_json(url, cache_ttl=3600, stale_ttl=3600)
+                if not isinstance(data, list):
+                    self.safe_reply(connection, event, "Unable to fetch holiday information at the moment. Please try again later.")
+                    return True
 
                 # Filter for today's date
                 today_holidays = [h for h in data if h.get("date") == today]
@@ -517,8 +639,8 @@ class ApiOverload(SimpleCommandModule):
             "User-Agent": "JeevesBot IRC Bot"
         }
 
-        response, error = safe_api_call(
-            self.http_session.get, url, headers=headers, timeout=10,
+        data, error = self._lookup_json(
+            "imdb", url, headers=headers,
             api_name="IMDb API",
             user_message="Unable to fetch movie/TV information at the moment."
         )
@@ -527,7 +649,6 @@ class ApiOverload(SimpleCommandModule):
             self.safe_reply(connection, event, error)
             return False
 
-        data = response.json()
         titles = data.get("titles", [])
 
         if not titles:
@@ -615,8 +736,8 @@ class ApiOverload(SimpleCommandModule):
             "User-Agent": "JeevesBot/1.0 (IRC Bot; contact: https://github.com/jeeves-bot)"
         }
 
-        response, error = safe_api_call(
-            self.http_session.get, url, headers=headers, timeout=10,
+        data, error = self._lookup_json(
+            "music", url, headers=headers,
             api_name="MusicBrainz API",
             user_message="Unable to fetch artist information at the moment."
         )
@@ -625,7 +746,6 @@ class ApiOverload(SimpleCommandModule):
             self.safe_reply(connection, event, error)
             return False
 
-        data = response.json()
         artists = data.get("artists", [])
 
         if not artists:
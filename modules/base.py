@@ -2,7 +2,6 @@
 # Enhanced base class for all Jeeves modules with common utilities and patterns
 
 import re
-import time
 import threading
 import functools
 import requests
@@ -54,10 +53,19 @@ except ImportError:
 
 # Import centralized HTTP client
 try:
-    from .http_utils import get_http_client
+    from .http_utils import get_http_client, get_pooled_session, latency_budget
 except ImportError:
     # Should not happen in production, but safe fallback
+    from contextlib import nullcontext as _nullcontext
     get_http_client = None
+    get_pooled_session = None
+
+    def latency_budget(seconds):
+        return _nullcontext()
+
+from .cooldowns import get_cooldown_store
+from .event_bus import get_event_bus
+from .geocache import get_geocode_cache
 
 def admin_required(func):
     """Decorator to require admin privileges for a command."""
@@ -105,6 +113,12 @@ class ModuleBase(ABC):
     version = "2.1.0" # Updated to use http_utils
     description = "Base module class"
 
+    # Config reload targeting: on_config_reload fires when the module's own section
+    # or any of config_sections changes; a change under any dotted key in
+    # config_restart_keys unloads and re-imports the module instead.
+    config_sections: Tuple[str, ...] = ()
+    config_restart_keys: Tuple[str, ...] = ()
+
     # US state abbreviations for geocoding expansion
     STATE_ABBREVS = {
         'al': 'alabama', 'ak': 'alaska', 'az': 'arizona', 'ar': 'arkansas',
@@ -138,8 +152,12 @@ class ModuleBase(ABC):
         self._state_dirty = False
         self._state_lock = threading.RLock()
         self._commands: Dict[str, Dict[str, Any]] = {}
-        self._rate_limits = {}
-        self._user_cooldowns = {}
+        # Bot-wide expiring store shared by every module (survives reloads)
+        self.cooldowns = get_cooldown_store(bot)
+        # Bot-wide event bus; subscriptions are dropped when the module unloads
+        self.events = get_event_bus(bot)
+        # Bot-wide persistent geocoding cache
+        self.geocache = get_geocode_cache(bot)
         self._load_state()
         
         # Initialize shared HTTP client
@@ -152,8 +170,13 @@ class ModuleBase(ABC):
                                 status_forcelist: tuple = (500, 502, 504)) -> requests.Session:
         """
         Compatibility method for modules still using the old session pattern.
-        Returns a requests session with retry logic.
+        Returns the shared pooled session for this retry policy; it honours
+        per-host circuit breakers and the command's latency budget.
         """
+        if get_pooled_session:
+            return get_pooled_session(retries=retries, backoff_factor=backoff_factor,
+                                      status_forcelist=status_forcelist)
+
         from requests.adapters import HTTPAdapter
         from urllib3.util.retry import Retry
 
@@ -182,12 +205,30 @@ class ModuleBase(ABC):
         """Called when config is reloaded. Override in subclasses to react to changes."""
         pass
 
+    def export_runtime(self) -> Optional[Dict[str, Any]]:
+        """
+        Called before a hot reload unloads this instance. Return in-memory data
+        (caches, locks, sessions) to hand to the replacement, or None for nothing.
+        """
+        return None
+
+    def import_runtime(self, runtime: Dict[str, Any]) -> None:
+        """Receives export_runtime() data from the previous instance, before on_load."""
+        pass
+
+    def subscribe(self, topic: str, handler: Callable, **options: Any):
+        """Subscribes to a bus topic on behalf of this module (see modules/event_bus.py)."""
+        return self.events.subscribe(topic, handler, owner=self.name, **options)
+
     # --- Geolocation Helpers ---
 
     def _get_geocode_data(self, location: str) -> Optional[Tuple[str, str, Dict[str, Any]]]:
         """Fetches geographic coordinates and structured address for a location string."""
         geo_url = "https://nominatim.openstreetmap.org/search"
         expanded = self._expand_state_abbrevs(location)
+        cached = self.geocache.get("nominatim", expanded)
+        if cached is not self.geocache.MISS:
+            return tuple(cached) if cached else None
         params = {
             "q": expanded,
             "format": "json",
@@ -209,8 +250,11 @@ class ModuleBase(ABC):
                 geo_data = response.json()
 
             if not geo_data:
+                self.geocache.put("nominatim", expanded, None)
                 return None
-            return (geo_data[0]["lat"], geo_data[0]["lon"], geo_data[0])
+            result = (geo_data[0]["lat"], geo_data[0]["lon"], geo_data[0])
+            self.geocache.put("nominatim", expanded, list(result))
+            return result
         except Exception as e:
             self._record_error(f"Geocoding request failed for '{location}' (expanded: '{expanded}'): {e}")
             return None
@@ -350,25 +394,29 @@ class ModuleBase(ABC):
         }
 
     def check_rate_limit(self, key: str, limit: float) -> bool:
-        now = time.time()
-        last_time = self._rate_limits.get(key, 0)
-        if now - last_time >= limit:
-            self._rate_limits[key] = now
-            return True
-        return False
+        """Module-wide rate limit: True (and records the hit) if `limit` seconds have passed."""
+        return self.cooldowns.hit(f"rate:{self.name}:{key}", limit)
 
     def check_user_cooldown(self, username: str, command: str, cooldown: float) -> bool:
         """Check if a user is on cooldown for a command. Does NOT record the cooldown."""
         if cooldown <= 0: return True
-        key = f"{username.lower()}:{command}"
-        now = time.time()
-        last_use = self._user_cooldowns.get(key, 0)
-        return now - last_use >= cooldown
+        return self.cooldowns.check(self._user_cooldown_key(username, command), cooldown)
+
+    # Longest a command handler's outbound HTTP calls may take in total, retries
+    # included (override per module with the latency_budget_seconds config key).
+    DEFAULT_LATENCY_BUDGET = 15.0
+
+    # How long a use is remembered when the caller doesn't pass its cooldown.
+    DEFAULT_COOLDOWN_RETENTION = 3600.0
+
+    def record_user_cooldown(self, username: str, command: str, cooldown: Optional[float] = None) -> None:
+        """Record that a user has used a command (for cooldown tracking). Expires after `cooldown` seconds."""
+        if cooldown is None:
+            cooldown = self.DEFAULT_COOLDOWN_RETENTION
+        self.cooldowns.record(self._user_cooldown_key(username, command), cooldown)
 
-    def record_user_cooldown(self, username: str, command: str) -> None:
-        """Record that a user has used a command (for cooldown tracking)."""
-        key = f"{username.lower()}:{command}"
-        self._user_cooldowns[key] = time.time()
+    def _user_cooldown_key(self, username: str, command: str) -> str:
+        return f"user:{self.name}:{username.lower()}:{command}"
 
     def is_mentioned(self, msg: str) -> bool:
         pattern = re.compile(self.bot.JEEVES_NAME_RE, re.IGNORECASE)
@@ -453,12 +501,15 @@ class ModuleBase(ABC):
                 if not self.check_user_cooldown(username, cmd_id, cooldown_val):
                     self.log_debug(f"Command '{cmd_info['name']}' on cooldown for user {username}")
                     continue
+                budget = self.get_config_value("latency_budget_seconds", event.target, self.DEFAULT_LATENCY_BUDGET)
                 try:
-                    if cmd_info["handler"](connection, event, msg, username, match):
+                    with latency_budget(budget):
+                        handled = cmd_info["handler"](connection, event, msg, username, match)
+                    if handled:
                         self.log_debug(f"Command '{cmd_info['name']}' handled successfully.")
                         # Record cooldown after successful command execution
                         if cooldown_val > 0:
-                            self.record_user_cooldown(username, cmd_id)
+                            self.record_user_cooldown(username, cmd_id, cooldown_val)
                         if hasattr(self, "_update_stats"):
                             self._update_stats(cmd_info["name"])
                         return True
@@ -1,6 +1,7 @@
 # modules/clock.py
 # A module for providing accurate, timezone-aware time for users and locations.
 import re
+from collections import OrderedDict
 from datetime import datetime
 import pytz
 from timezonefinder import TimezoneFinder
@@ -15,9 +16,14 @@ class Clock(SimpleCommandModule):
     version = "3.2.0" # Added storage of user-supplied location names
     description = "Provides the local time for users based on their set location."
 
+    # ~100 m grid: far finer than any timezone boundary we could care about
+    TZ_COORD_PRECISION = 3
+    TZ_CACHE_SIZE = 4096
+
     def __init__(self, bot):
         super().__init__(bot)
         self.tf = TimezoneFinder()
+        self._tz_cache: "OrderedDict[tuple, Optional[str]]" = OrderedDict()
 
     def _register_commands(self):
         self.register_command(r"^\s*!time\s*$", self._cmd_time_self,
@@ -33,9 +39,21 @@ class Clock(SimpleCommandModule):
                               description="Get the time for another user, a location, or the server.",
                               cooldown=10.0)
 
+    def _timezone_at(self, lat: float, lon: float) -> Optional[str]:
+        """TimezoneFinder lookup memoised on rounded coordinates (LRU)."""
+        key = (round(lat, self.TZ_COORD_PRECISION), round(lon, self.TZ_COORD_PRECISION))
+        if key in self._tz_cache:
+            self._tz_cache.move_to_end(key)
+            return self._tz_cache[key]
+        tz_name = self.tf.timezone_at(lng=key[1], lat=key[0])
+        self._tz_cache[key] = tz_name
+        if len(self._tz_cache) > self.TZ_CACHE_SIZE:
+            self._tz_cache.popitem(last=False)
+        return tz_name
+
     def _get_time_for_coords(self, lat: str, lon: str, country_code: Optional[str] = None, user_id: Optional[str] = None) -> Optional[str]:
         """Gets the formatted local time string for a given latitude and longitude."""
-        tz_name = self.tf.timezone_at(lng=float(lon), lat=float(lat))
+        tz_name = self._timezone_at(float(lat), float(lon))
         if not tz_name: return None
         try:
             timezone = pytz.timezone(tz_name)
@@ -5,9 +5,12 @@ import xml.etree.ElementTree as ET
 import random
 import html
 import time
+import threading
 import requests
+from collections import OrderedDict
+from contextlib import nullcontext
 from urllib.parse import quote_plus
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 
 try:
     from modules.exception_utils import (
@@ -33,13 +36,14 @@ from .base import ModuleBase
 
 # Import shared utilities
 try:
-    from .http_utils import get_http_client
+    from .http_utils import get_http_client, latency_budget
     from .config_manager import create_config_manager
     HTTP_CLIENT = get_http_client()
 except ImportError:
     # Fallback for when shared utilities are not available
     HTTP_CLIENT = None
-    create_config_manager = None 
+    create_config_manager = None
+    latency_budget = lambda seconds: nullcontext()
 
 try:
     from bs4 import BeautifulSoup
@@ -51,6 +55,73 @@ try:
 except ImportError:
     build = None
 
+class _TitleScanner:
+    """
+    Finds <title> in a streamed HTML head in linear time.
+
+    Each chunk is searched only from where the previous search left off (less
+    a small overlap, so tags split across chunks are still found). Scanning
+    stops at </title> or </head>. The title bytes are decoded once at the end,
+    using the charset from the Content-Type header or a <meta> tag.
+    """
+
+    OPEN_TAG = re.compile(rb'<title\b[^>]*>', re.IGNORECASE)
+    CLOSE_TAG = re.compile(rb'</title\s*>', re.IGNORECASE)
+    HEAD_END = re.compile(rb'</head\s*>|<body\b', re.IGNORECASE)
+    META_CHARSET = re.compile(rb'<meta[^>]+charset=["\']?\s*([\w.:-]+)', re.IGNORECASE)
+    OVERLAP = 256  # longest <title ...> opening tag we expect to straddle chunks
+
+    def __init__(self, header_charset: Optional[str] = None):
+        self.buffer = bytearray()
+        self.header_charset = header_charset
+        self._open_end: Optional[int] = None  # index just past <title ...>
+        self._close_start: Optional[int] = None
+        self._scanned = 0
+        self.done = False
+
+    def feed(self, chunk: bytes) -> bool:
+        """Adds a chunk; returns True once there is nothing more worth reading."""
+        if self.done:
+            return True
+        self.buffer += chunk
+        start = max(0, self._scanned - self.OVERLAP)
+        if self._open_end is None:
+            match = self.OPEN_TAG.search(self.buffer, start)
+            if match:
+                self._open_end = match.end()
+                start = self._open_end
+            elif self.HEAD_END.search(self.buffer, start):
+                self.done = True
+                return True
+        if self._open_end is not None:
+            match = self.CLOSE_TAG.search(self.buffer, max(start, self._open_end))
+            if match:
+                self._close_start = match.start()
+                self.done = True
+        self._scanned = len(self.buffer)
+        return self.done
+
+    @property
+    def charset(self) -> str:
+        if self.header_charset:
+            return self.header_charset
+        limit = self._open_end if self._open_end is not None else len(self.buffer)
+        match = self.META_CHARSET.search(self.buffer, 0, limit)
+        return match.group(1).decode("ascii", "ignore") if match else "utf-8"
+
+    def title(self) -> Optional[str]:
+        """The decoded, tag-stripped title, or None if no complete title was seen."""
+        if self._open_end is None or self._close_start is None:
+            return None
+        raw = bytes(self.buffer[self._open_end:self._close_start])
+        try:
+            text = raw.decode(self.charset, errors="ignore")
+        except LookupError:
+            text = raw.decode("utf-8", errors="ignore")
+        text = re.sub(r'<[^>]+>', '', text).strip()
+        return html.unescape(text) or None
+
+
 def setup(bot):
     if not BeautifulSoup:
         print("[convenience] beautifulsoup4 is not installed. !g and title fetching will be limited.")
@@ -62,20 +133,24 @@ class Convenience(ModuleBase):
     name = "convenience"
     version = "1.9.2" # Anti-spam: suppress repeated title announcements
     description = "Provides convenient, common search commands and URL title fetching."
+    config_restart_keys = ("api_keys.youtube",)
 
     YOUTUBE_URL_PATTERN = re.compile(r'(?:https?://)?(?:www\.)?(?:youtube\.com/watch\?v=|youtu\.be/)([\w\-]{11})')
     URL_PATTERN = re.compile(r'(https?://\S+)')
-    TITLE_PATTERN = re.compile(r'<title>(.*?)</title>', re.IGNORECASE | re.DOTALL)
+    TITLE_CACHE_SIZE = 512
 
     def __init__(self, bot):
         super().__init__(bot)
         self._register_commands()
 
         # Track recently announced titles to avoid spam (title -> list of timestamps)
-        self._recent_titles: Dict[str, list] = {}
         self._title_max_repeats = 2  # Stop announcing after this many repeats
         self._title_window_seconds = 300  # 5 minute window for tracking repeats
 
+        # url -> (title or None, expires_at); repeatedly pasted links are never refetched
+        self._title_cache: "OrderedDict[str, tuple]" = OrderedDict()
+        self._title_cache_lock = threading.Lock()
+
         # Use shared HTTP client if available, otherwise fallback
         if HTTP_CLIENT:
             self.http_session = HTTP_CLIENT.session
@@ -195,70 +270,101 @@ class Convenience(ModuleBase):
         Returns True if the title should be suppressed (spam), False if it's okay to announce.
         Also records this announcement for future spam detection.
         """
-        now = time.time()
-        cutoff = now - self._title_window_seconds
-
-        # Clean up old entries from all tracked titles
-        titles_to_remove = []
-        for tracked_title, timestamps in self._recent_titles.items():
-            # Remove timestamps outside the window
-            self._recent_titles[tracked_title] = [t for t in timestamps if t > cutoff]
-            # Mark empty entries for removal
-            if not self._recent_titles[tracked_title]:
-                titles_to_remove.append(tracked_title)
-        for tracked_title in titles_to_remove:
-            del self._recent_titles[tracked_title]
-
-        # Check if this title has been announced too many times
-        if title in self._recent_titles:
-            if len(self._recent_titles[title]) >= self._title_max_repeats:
-                return True  # Suppress this announcement
-
-        # Record this announcement
-        if title not in self._recent_titles:
-            self._recent_titles[title] = []
-        self._recent_titles[title].append(now)
-
-        return False  # Okay to announce
+        # Sliding window in the shared cooldown store: suppressed repeats aren't counted,
+        # and titles drop out on their own once the window passes.
+        return not self.cooldowns.allow_window(
+            f"title:{self.name}:{title}", self._title_max_repeats, self._title_window_seconds
+        )
+
+    def export_runtime(self) -> Dict[str, Any]:
+        return {"title_cache": self._title_cache}
+
+    def import_runtime(self, runtime: Dict[str, Any]) -> None:
+        self._title_cache = runtime.get("title_cache", self._title_cache)
+
+    def _cached_title(self, url: str):
+        """Returns (hit, title) from the per-URL title cache."""
+        with self._title_cache_lock:
+            entry = self._title_cache.get(url)
+            if entry is None:
+                return False, None
+            if entry[1] <= time.time():
+                del self._title_cache[url]
+                return False, None
+            self._title_cache.move_to_end(url)
+            return True, entry[0]
+
+    def _remember_title(self, url: str, title: Optional[str]) -> None:
+        if title:
+            ttl = self.get_config_value("titles_cache_seconds", default=3600)
+        else:
+            ttl = self.get_config_value("titles_negative_cache_seconds", default=600)
+        if ttl <= 0:
+            return
+        with self._title_cache_lock:
+            self._title_cache[url] = (title, time.time() + ttl)
+            self._title_cache.move_to_end(url)
+            while len(self._title_cache) > self.TITLE_CACHE_SIZE:
+                self._title_cache.popitem(last=False)
 
     def _get_url_title(self, url: str) -> Optional[str]:
+        cache_key = url.split("#", 1)[0]
+        hit, title = self._cached_title(cache_key)
+        if hit:
+            return title
+
+        title, definitive = self._fetch_url_title(url)
+        # Failures that a retry can't fix (4xx, non-HTML, no <title>) are cached
+        # too, for less time, so a dead link pasted repeatedly doesn't cost a
+        # download each time. Timeouts, dropped connections and 5xx are not.
+        if title or definitive:
+            self._remember_title(cache_key, title)
+        return title
+
+    def _fetch_url_title(self, url: str) -> Tuple[Optional[str], bool]:
+        """Returns (title, definitive); definitive is False when fetching again might succeed."""
         headers = {'User-Agent': 'JeevesIRCBot/1.0 (URL Title Fetcher)'}
         max_bytes = self.get_config_value("titles_max_download_bytes", default=32768)
         max_total_time = 10  # Maximum 10 seconds for entire download
 
         try:
-            with self.http_session.get(url, headers=headers, stream=True, timeout=5) as response:
+            with latency_budget(max_total_time), \
+                    self.http_session.get(url, headers=headers, stream=True, timeout=5) as response:
                 response.raise_for_status()
-                content_chunk = response.iter_content(chunk_size=1024, decode_unicode=False)
-                html_head = ""
+                content_type = response.headers.get("Content-Type", "")
+                if content_type and "html" not in content_type.lower():
+                    return None, True
+                charset = re.search(r'charset=["\']?([\w.:-]+)', content_type, re.IGNORECASE)
+                scanner = _TitleScanner(charset.group(1) if charset else None)
                 start_time = time.time()
-                encoding = response.encoding or response.apparent_encoding or "utf-8"
+                complete = True
 
-                for part in content_chunk:
+                for part in response.iter_content(chunk_size=1024, decode_unicode=False):
                     if time.time() - start_time > max_total_time:
                         self.log_module_event("WARNING", f"URL title fetch timed out for {url}")
+                        complete = False
                         break
-
-                    if isinstance(part, bytes):
-                        part = part.decode(encoding, errors="ignore")
-
-                    html_head += part
-                    title_match = self.TITLE_PATTERN.search(html_head)
-                    if title_match:
-                        title_text = title_match.group(1).strip()
-                        title_text = re.sub(r'<[^>]+>', '', title_text)
-                        return html.unescape(title_text)
-                    if len(html_head) > max_bytes:
+                    if scanner.feed(part) or len(scanner.buffer) > max_bytes:
                         break
 
-                if html_head and BeautifulSoup:
-                    soup = BeautifulSoup(html_head, 'html.parser')
+                title = scanner.title()
+                if title:
+                    return title, True
+
+                # Malformed markup (e.g. an unclosed <title>): let a real parser try once.
+                if scanner.buffer and BeautifulSoup:
+                    soup = BeautifulSoup(bytes(scanner.buffer), 'html.parser', from_encoding=scanner.charset)
                     if soup.title and soup.title.string:
-                        return html.unescape(soup.title.string)
+                        return html.unescape(soup.title.string), True
+                return None, complete
+        except requests.exceptions.HTTPError as e:
+            self.log_module_event("WARNING", f"Error parsing title for {url}: {e}")
+            status = e.response.status_code if e.response is not None else None
+            # 408 and 429 are the server asking us to come back later.
+            return None, status is not None and 400 <= status < 500 and status not in (408, 429)
         except Exception as e:
             self.log_module_event("WARNING", f"Error parsing title for {url}: {e}")
-            return None
-        return None
+            return None, False
 
     def _cmd_google(self, connection, event, msg, username, match):
         query = match.group(1).strip()
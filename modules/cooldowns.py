@@ -0,0 +1,213 @@
+"""
+Shared cooldown and rate-limit store for all modules.
+
+One store lives on the bot instance, so cooldowns survive module reloads and
+aren't duplicated per module. Entries are filed into one-second expiry buckets
+(a simple timing wheel); every operation sweeps the buckets that have passed,
+so memory stays bounded by the number of keys that are still cooling down.
+
+Three modes are supported:
+- fixed cooldowns: `check`/`record`/`hit` (one timestamp per key)
+- sliding windows: `allow_window` (at most N hits per window)
+- token buckets: `allow_tokens` (steady rate with a burst allowance)
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+STATE_NAME = "cooldowns"
+
+
+class CooldownStore:
+    """Expiring key store for cooldowns, sliding windows and token buckets."""
+
+    def __init__(self, bucket_seconds: float = 1.0, clock=time.monotonic):
+        self._bucket_seconds = bucket_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._last_used: Dict[str, float] = {}
+        self._windows: Dict[str, deque] = {}
+        self._tokens: Dict[str, list] = {}  # key -> [tokens, last_refill]
+        self._expires: Dict[str, float] = {}
+        self._buckets: Dict[int, set] = {}
+        self._swept_through = int(clock() // bucket_seconds)
+
+    # --- Expiry bookkeeping ---
+
+    def _schedule(self, key: str, expires_at: float) -> None:
+        self._expires[key] = expires_at
+        self._buckets.setdefault(int(expires_at // self._bucket_seconds), set()).add(key)
+
+    def _sweep(self, now: float) -> None:
+        current = int(now // self._bucket_seconds)
+        if current <= self._swept_through:
+            return
+        if current - self._swept_through > len(self._buckets):
+            # Idle for a long stretch: walk the occupied buckets instead of every tick.
+            due = [index for index in self._buckets if index < current]
+        else:
+            due = range(self._swept_through, current)
+        for index in due:
+            for key in self._buckets.pop(index, ()):
+                expires_at = self._expires.get(key)
+                if expires_at is not None and expires_at <= now:
+                    self._drop(key)
+        self._swept_through = current
+
+    def _drop(self, key: str) -> None:
+        self._expires.pop(key, None)
+        self._last_used.pop(key, None)
+        self._windows.pop(key, None)
+        self._tokens.pop(key, None)
+
+    # --- Fixed cooldowns ---
+
+    def check(self, key: str, cooldown: float) -> bool:
+        """True if `key` has not been recorded within the last `cooldown` seconds. Does not record."""
+        if cooldown <= 0:
+            return True
+        with self._lock:
+            now = self._clock()
+            self._sweep(now)
+            last = self._last_used.get(key)
+            return last is None or now - last >= cooldown
+
+    def record(self, key: str, cooldown: float) -> None:
+        """Marks `key` as used now; the entry is evicted once `cooldown` has elapsed."""
+        if cooldown <= 0:
+            return
+        with self._lock:
+            now = self._clock()
+            self._sweep(now)
+            self._last_used[key] = now
+            self._schedule(key, now + cooldown)
+
+    def hit(self, key: str, cooldown: float) -> bool:
+        """Atomic check-and-record. Returns True (and records) if the cooldown has passed."""
+        with self._lock:
+            now = self._clock()
+            self._sweep(now)
+            last = self._last_used.get(key)
+            if last is not None and now - last < cooldown:
+                return False
+            if cooldown > 0:
+                self._last_used[key] = now
+                self._schedule(key, now + cooldown)
+            return True
+
+    def remaining(self, key: str, cooldown: float) -> float:
+        """Seconds left before `key` is usable again (0.0 if it already is)."""
+        with self._lock:
+            last = self._last_used.get(key)
+            if last is None:
+                return 0.0
+            return max(0.0, cooldown - (self._clock() - last))
+
+    # --- Sliding windows ---
+
+    def allow_window(self, key: str, limit: int, window: float) -> bool:
+        """Allows at most `limit` hits per `window` seconds. Denied hits are not counted."""
+        with self._lock:
+            now = self._clock()
+            self._sweep(now)
+            hits = self._windows.get(key)
+            if hits is None:
+                hits = self._windows[key] = deque()
+            cutoff = now - window
+            while hits and hits[0] <= cutoff:
+                hits.popleft()
+            if len(hits) >= limit:
+                return False
+            hits.append(now)
+            self._schedule(key, now + window)
+            return True
+
+    # --- Token buckets ---
+
+    def allow_tokens(self, key: str, rate: float, capacity: float, cost: float = 1.0) -> bool:
+        """Token bucket refilled at `rate` tokens/second up to `capacity`."""
+        with self._lock:
+            now = self._clock()
+            self._sweep(now)
+            bucket = self._tokens.get(key)
+            if bucket is None:
+                bucket = self._tokens[key] = [capacity, now]
+            tokens = min(capacity, bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+            allowed = tokens >= cost
+            bucket[0] = tokens - cost if allowed else tokens
+            # A full bucket is indistinguishable from a fresh one, so it can be evicted then.
+            refill_time = (capacity - bucket[0]) / rate if rate > 0 else 0.0
+            self._schedule(key, now + max(refill_time, self._bucket_seconds))
+            return allowed
+
+    # --- Introspection and persistence ---
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._sweep(self._clock())
+            return len(self._expires)
+
+    def snapshot(self, min_remaining: float = 60.0) -> Dict[str, Dict[str, float]]:
+        """
+        Fixed cooldowns with at least `min_remaining` seconds left, as wall-clock
+        times so they can be written to state and restored after a restart.
+        """
+        with self._lock:
+            now = self._clock()
+            wall_offset = time.time() - now
+            entries = {}
+            for key, last in self._last_used.items():
+                expires_at = self._expires.get(key, 0.0)
+                if expires_at - now >= min_remaining:
+                    entries[key] = {"last_used": last + wall_offset, "expires": expires_at + wall_offset}
+            return entries
+
+    def restore(self, entries: Dict[str, Dict[str, Any]]) -> int:
+        """Loads entries produced by snapshot(), skipping ones that already expired."""
+        restored = 0
+        with self._lock:
+            now = self._clock()
+            wall_offset = time.time() - now
+            for key, entry in (entries or {}).items():
+                try:
+                    last = float(entry["last_used"]) - wall_offset
+                    expires_at = float(entry["expires"]) - wall_offset
+                except (KeyError, TypeError, ValueError):
+                    continue
+                if expires_at <= now:
+                    continue
+                self._last_used[key] = last
+                self._schedule(key, expires_at)
+                restored += 1
+        return restored
+
+
+def _persistence_enabled(bot: Any) -> bool:
+    config = getattr(bot, "config", None) or {}
+    return bool(config.get("core", {}).get("persist_cooldowns", False))
+
+
+def get_cooldown_store(bot: Any) -> CooldownStore:
+    """Returns the bot-wide store, creating it (and restoring persisted cooldowns) on first use."""
+    store = getattr(bot, "cooldowns", None)
+    if store is None:
+        store = CooldownStore()
+        if _persistence_enabled(bot) and hasattr(bot, "get_module_state"):
+            try:
+                store.restore(bot.get_module_state(STATE_NAME).get("entries", {}))
+            except Exception:
+                pass
+        bot.cooldowns = store
+    return store
+
+
+def persist_cooldowns(bot: Any) -> bool:
+    """Writes long-running cooldowns to state if core.persist_cooldowns is enabled."""
+    store: Optional[CooldownStore] = getattr(bot, "cooldowns", None)
+    if store is None or not _persistence_enabled(bot):
+        return False
+    bot.update_module_state(STATE_NAME, {"entries": store.snapshot()})
+    return True
@@ -1,8 +1,20 @@
 """
 Cryptocurrency price checking module using CoinGecko API.
+
+Coin symbols and names are resolved against a locally cached copy of
+CoinGecko's coin list (refreshed daily). Prices are cached briefly and shared
+across channels, several coins are fetched with a single simple/price call,
+and the most-requested coins are refreshed in the background so popular
+lookups answer from cache.
 """
 
-from typing import Any
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+import requests
+import schedule
 
 from .base import SimpleCommandModule
 
@@ -13,7 +25,6 @@ try:
     HTTP_CLIENT = get_http_client()
 except ImportError:
     # Fallback for when shared utilities are not available
-    import requests
     HTTP_CLIENT = None
     def safe_api_call(func, *args, **kwargs):
         try:
@@ -38,6 +49,18 @@ class CryptoModule(SimpleCommandModule):
     # CoinGecko free API endpoint (no key required)
     API_BASE = "https://api.coingecko.com/api/v3"
 
+    INDEX_TTL = 24 * 3600      # coin list changes slowly
+    PRICE_TTL = 60.0           # CoinGecko's free tier refreshes about once a minute
+    MAX_COINS = 10             # per !price request
+    RANKED_COINS = 250         # top coins by market cap win symbol collisions
+    DEMAND_DECAY = 0.9         # per warm cycle; a single request stays warm ~7 cycles
+
+    # vs_currencies we treat as a trailing currency argument in multi-coin queries
+    FIAT_CURRENCIES = {
+        'usd', 'eur', 'gbp', 'jpy', 'cny', 'aud', 'cad', 'chf', 'inr', 'krw',
+        'brl', 'mxn', 'sek', 'nok', 'dkk', 'pln', 'nzd', 'sgd', 'hkd', 'zar',
+    }
+
     # Common crypto symbol mappings (symbol -> coingecko ID)
     SYMBOL_MAP = {
         'btc': 'bitcoin',
@@ -62,25 +85,114 @@ class CryptoModule(SimpleCommandModule):
         'algo': 'algorand',
     }
 
+    def __init__(self, bot):
+        super().__init__(bot)
+        # Coin index built from /coins/list: id set plus name and symbol lookups
+        self._coin_ids = set()
+        self._coin_names: Dict[str, str] = {}
+        self._coin_symbols: Dict[str, str] = {}
+        self._index_loaded_at = 0.0
+        # (coin_id, currency) -> (price data, fetched_at), shared by every channel
+        self._price_cache: Dict[tuple, tuple] = {}
+        self._price_lock = threading.Lock()
+        self._demand: Counter = Counter()  # (coin_id, currency) -> recent request count
+        self._background_lock = threading.Lock()
+
+    def on_load(self):
+        self._run_in_background(self._refresh_coin_index)
+        schedule.every(self.INDEX_TTL).seconds.do(
+            self._run_in_background, self._refresh_coin_index
+        ).tag(f"{self.name}-index")
+        interval = max(10, int(self.get_config_value("warm_interval_seconds", default=self.PRICE_TTL)))
+        schedule.every(interval).seconds.do(
+            self._run_in_background, self._warm_popular_prices
+        ).tag(f"{self.name}-warm")
+
+    def on_unload(self):
+        schedule.clear(f"{self.name}-index")
+        schedule.clear(f"{self.name}-warm")
+        super().on_unload()
+
+    def export_runtime(self) -> Dict[str, Any]:
+        return {
+            "coin_index": (self._coin_ids, self._coin_names, self._coin_symbols, self._index_loaded_at),
+            "price_cache": self._price_cache,
+            "demand": self._demand,
+        }
+
+    def import_runtime(self, runtime: Dict[str, Any]) -> None:
+        if runtime.get("coin_index"):
+            self._coin_ids, self._coin_names, self._coin_symbols, self._index_loaded_at = runtime["coin_index"]
+        self._price_cache = runtime.get("price_cache", self._price_cache)
+        self._demand = runtime.get("demand", self._demand)
+
     def _register_commands(self):
         """Register crypto price commands."""
         self.register_command(
-            r"^\s*!(?:crypto|price)\s+(\S+)(?:\s+(\S+))?(?:\s+(\w+))?$",
+            r"^\s*!(?P<command>crypto|price)\s+(?P<args>\S+(?:\s+\S+)*)\s*$",
             self._cmd_price,
             name="crypto",
             cooldown=5.0,
-            description="!crypto <symbol> [amount|currency] [currency] - Get cryptocurrency price (e.g., !crypto btc, !crypto 1 btc, !crypto btc 1, !crypto eth usd)"
+            description="!crypto <symbol> [amount|currency] [currency] or !price <coin> <coin>... [currency] - Get cryptocurrency prices (e.g., !crypto btc, !crypto 1 btc, !crypto eth usd, !price btc eth sol eur)"
         )
 
+    def _run_in_background(self, fn):
+        """Runs scheduler work off the scheduler thread; skips a run if one is still going."""
+        def run():
+            if not self._background_lock.acquire(blocking=False):
+                return
+            try:
+                fn()
+            except Exception as e:
+                self.log_debug(f"Background refresh failed: {e}")
+            finally:
+                self._background_lock.release()
+
+        threading.Thread(target=run, daemon=True).start()
+
+    # --- Coin index ---
+
+    def _refresh_coin_index(self):
+        """Rebuilds the symbol/name index from CoinGecko's coin list."""
+        if not HTTP_CLIENT:
+            return
+        coins = HTTP_CLIENT.get_json(f"{self.API_BASE}/coins/list",
+                                     cache_ttl=self.INDEX_TTL, stale_ttl=self.INDEX_TTL)
+        try:
+            ranked = HTTP_CLIENT.get_json(
+                f"{self.API_BASE}/coins/markets",
+                params={'vs_currency': 'usd', 'order': 'market_cap_desc', 'per_page': self.RANKED_COINS, 'page': 1},
+                cache_ttl=self.INDEX_TTL, stale_ttl=self.INDEX_TTL,
+            )
+        except Exception as e:
+            self.log_debug(f"CoinGecko market ranking unavailable, symbols resolve by list order: {e}")
+            ranked = []
+        self._set_coin_index(coins, ranked)
+
+    def _set_coin_index(self, coins, ranked=()):
+        ids, names, symbols = set(), {}, {}
+        # Ranked coins first so the best-known coin owns a contested symbol.
+        for coin in list(ranked) + list(coins):
+            coin_id = coin.get('id')
+            if not coin_id:
+                continue
+            ids.add(coin_id)
+            names.setdefault((coin.get('name') or '').lower(), coin_id)
+            symbols.setdefault((coin.get('symbol') or '').lower(), coin_id)
+        if ids:
+            self._coin_ids, self._coin_names, self._coin_symbols = ids, names, symbols
+            self._index_loaded_at = time.time()
+            self.log_debug(f"Coin index loaded: {len(ids)} coins")
+
     def _get_coin_id(self, identifier):
         """
         Convert symbol or name to CoinGecko coin ID.
 
         Args:
-            identifier: Crypto symbol (btc) or name (bitcoin)
+            identifier: Crypto symbol (btc), coin id (bitcoin) or name (Bitcoin Cash)
 
         Returns:
-            CoinGecko coin ID or None if not found
+            CoinGecko coin ID, or None if the index is loaded and doesn't know it
         """
         identifier_lower = identifier.lower()
 
@@ -88,12 +200,17 @@ class CryptoModule(SimpleCommandModule):
         if identifier_lower in self.SYMBOL_MAP:
             return self.SYMBOL_MAP[identifier_lower]
 
-        # Otherwise assume it's already a coin ID or full name
-        return identifier_lower
+        if not self._coin_ids:
+            # Index not loaded yet: assume it's already a coin ID or full name
+            return identifier_lower
+
+        if identifier_lower in self._coin_ids:
+            return identifier_lower
+        return self._coin_symbols.get(identifier_lower) or self._coin_names.get(identifier_lower)
 
     def _fetch_price(self, coin_id, currency='usd'):
         """
-        Fetch price data from CoinGecko API.
+        Fetch price data for one coin.
 
         Args:
             coin_id: CoinGecko coin identifier
@@ -102,10 +219,48 @@ class CryptoModule(SimpleCommandModule):
         Returns:
             Dict with price data or None on error
         """
+        return self._fetch_prices([coin_id], currency).get(coin_id)
+
+    def _fetch_prices(self, coin_ids: List[str], currency: str = 'usd', refresh: bool = False) -> Dict[str, Dict]:
+        """
+        Fetch price data for several coins, answering from the shared cache
+        where possible and requesting the rest with one simple/price call.
+
+        Returns:
+            Dict of coin_id -> price data for the coins CoinGecko knows
+        """
+        currency = currency.lower()
+        now = time.time()
+        results, missing = {}, []
+        with self._price_lock:
+            for coin_id in dict.fromkeys(coin_ids):
+                cached = self._price_cache.get((coin_id, currency))
+                if cached and not refresh and now - cached[1] < self.PRICE_TTL:
+                    results[coin_id] = cached[0]
+                else:
+                    missing.append(coin_id)
+        if not missing:
+            return results
+
+        data = self._request_prices(missing, currency)
+        if data is None:
+            return results
+        with self._price_lock:
+            fetched_at = time.time()
+            for coin_id in missing:
+                if coin_id in data:
+                    self._price_cache[(coin_id, currency)] = (data[coin_id], fetched_at)
+                    results[coin_id] = data[coin_id]
+            # Drop long-expired entries so the cache stays bounded by recent demand.
+            for key in [k for k, (_, at) in self._price_cache.items() if fetched_at - at > 10 * self.PRICE_TTL]:
+                del self._price_cache[key]
+        return results
+
+    def _request_prices(self, coin_ids: List[str], currency: str) -> Optional[Dict[str, Dict]]:
         url = f"{self.API_BASE}/simple/price"
         params = {
-            'ids': coin_id,
-            'vs_currencies': currency.lower(),
+            'ids': ",".join(coin_ids),
+            'vs_currencies': currency,
             'include_24hr_change': 'true',
             'include_market_cap': 'true',
         }
@@ -113,29 +268,20 @@ class CryptoModule(SimpleCommandModule):
         # Use shared HTTP client if available
         if HTTP_CLIENT:
             try:
-                data = HTTP_CLIENT.get_json(url, params=params)
-                
-                if coin_id not in data:
-                    return None
-                
-                return data[coin_id]
+                return HTTP_CLIENT.get_json(url, params=params)
             except (ExternalAPIException, KeyError, ValueError) as e:
                 self.log_debug(f"CoinGecko API error: {e}")
                 return None
+            except Exception as e:
+                self.log_debug(f"CoinGecko request failed: {e}")
+                return None
         else:
             # Fallback to original implementation
-            import requests
             try:
                 session = self.requests_retry_session()
                 response = session.get(url, params=params, timeout=10)
                 response.raise_for_status()
-
-                data = response.json()
-
-                if coin_id not in data:
-                    return None
-
-                return data[coin_id]
+                return response.json()
 
             except requests.exceptions.RequestException as e:
                 self.log_debug(f"CoinGecko API error: {e}")
@@ -144,6 +290,27 @@ class CryptoModule(SimpleCommandModule):
                 self.log_debug(f"Error parsing CoinGecko response: {e}")
                 return None
 
+    def _note_demand(self, coin_ids: List[str], currency: str) -> None:
+        with self._price_lock:
+            for coin_id in coin_ids:
+                self._demand[(coin_id, currency.lower())] += 1.0
+
+    def _warm_popular_prices(self):
+        """Refreshes the most-requested coins so they're answered from cache."""
+        top_n = int(self.get_config_value("warm_top_n", default=10))
+        with self._price_lock:
+            popular = [key for key, _ in self._demand.most_common(top_n)]
+            # Decay demand so yesterday's favourites eventually stop being refreshed.
+            for key in list(self._demand):
+                self._demand[key] *= self.DEMAND_DECAY
+                if self._demand[key] < 0.5:
+                    del self._demand[key]
+        by_currency: Dict[str, List[str]] = {}
+        for coin_id, currency in popular:
+            by_currency.setdefault(currency, []).append(coin_id)
+        for currency, coin_ids in by_currency.items():
+            self._fetch_prices(coin_ids, currency, refresh=True)
+
     def _format_price(self, price, currency):
         """
         Format price with appropriate precision and currency symbol.
@@ -199,34 +366,57 @@ class CryptoModule(SimpleCommandModule):
 
         return f"{arrow} {sign}{change_24h:.2f}%"
 
+    @staticmethod
+    def _is_number(s):
+        if not s:
+            return False
+        try:
+            float(s)
+            return True
+        except ValueError:
+            return False
+
+    def _is_known_coin(self, identifier):
+        identifier = identifier.lower()
+        if identifier in self.SYMBOL_MAP:
+            return True
+        return bool(self._coin_ids) and self._get_coin_id(identifier) is not None
+
     def _cmd_price(self, connection, event, msg, username, match):
         """
         Handle crypto price command.
 
         Usage: !crypto <symbol> [amount|currency] [currency]
-        Examples: !crypto btc, !crypto 1 btc, !crypto btc 1, !crypto 2.5 eth eur
+               !price <coin> <coin>... [currency]
+        Examples: !crypto btc, !crypto 1 btc, !crypto btc 1, !crypto 2.5 eth eur,
+                  !price btc eth sol, !price btc eth eur
         """
-        arg1 = match.group(1)
-        arg2 = match.group(2)
-        arg3 = match.group(3)
+        tokens = match.group("args").split()
 
-        # Smart parsing: figure out which argument is what
+        if len(tokens) <= 3 and any(self._is_number(token) for token in tokens):
+            return self._cmd_single_price(connection, event, *(tokens + [None] * (3 - len(tokens))))
+
+        currency = 'usd'
+        if len(tokens) > 1:
+            last = tokens[-1].lower()
+            # "!crypto <coin> <currency>" keeps its old meaning even when the
+            # currency is also a coin (!crypto eth btc). Otherwise a trailing
+            # token is a currency if it looks like one, or if it isn't a coin we know.
+            legacy = len(tokens) == 2 and match.group("command").lower() == "crypto"
+            if legacy or last in self.FIAT_CURRENCIES or (len(tokens) == 2 and not self._is_known_coin(last)):
+                currency = tokens.pop()
+
+        if len(tokens) == 1:
+            return self._cmd_single_price(connection, event, tokens[0], currency, None)
+        return self._cmd_multi_price(connection, event, tokens[:self.MAX_COINS], currency)
+
+    def _cmd_single_price(self, connection, event, arg1, arg2, arg3):
         amount = 1.0
         identifier = None
         currency = 'usd'
 
-        # Helper to check if a string is a number
-        def is_number(s):
-            if not s:
-                return False
-            try:
-                float(s)
-                return True
-            except ValueError:
-                return False
-
         # Parse arguments based on what they look like
-        if is_number(arg1):
+        if self._is_number(arg1):
             # Pattern: !crypto 1 btc [usd]
             amount = float(arg1)
             identifier = arg2
@@ -234,7 +424,7 @@ class CryptoModule(SimpleCommandModule):
         else:
             # arg1 is the symbol
             identifier = arg1
-            if is_number(arg2):
+            if self._is_number(arg2):
                 # Pattern: !crypto btc 1 [usd]
                 amount = float(arg2)
                 currency = arg3 if arg3 else 'usd'
@@ -253,7 +443,10 @@ class CryptoModule(SimpleCommandModule):
         coin_id = self._get_coin_id(identifier)
 
         # Fetch price data
-        price_data = self._fetch_price(coin_id, currency)
+        price_data = None
+        if coin_id:
+            self._note_demand([coin_id], currency)
+            price_data = self._fetch_price(coin_id, currency)
 
         if not price_data:
             self.safe_reply(
@@ -304,3 +497,43 @@ class CryptoModule(SimpleCommandModule):
 
         self.safe_reply(connection, event, response)
         return True
+
+    def _cmd_multi_price(self, connection, event, identifiers, currency):
+        """Prices for several coins from a single simple/price request."""
+        resolved = {}
+        unknown = []
+        for identifier in identifiers:
+            coin_id = self._get_coin_id(identifier)
+            if coin_id:
+                resolved.setdefault(identifier, coin_id)
+            else:
+                unknown.append(identifier)
+
+        self._note_demand(list(resolved.values()), currency)
+        prices = self._fetch_prices(list(resolved.values()), currency) if resolved else {}
+
+        currency_key = currency.lower()
+        parts = []
+        for identifier, coin_id in resolved.items():
+            price_data = prices.get(coin_id)
+            if not price_data or price_data.get(currency_key) is None:
+                unknown.append(identifier)
+                continue
+            part = f"{identifier.upper()}: {self._format_price(price_data[currency_key], currency)}"
+            change_24h = price_data.get(f"{currency_key}_24h_change")
+            if change_24h is not None:
+                part += f" ({self._format_change(change_24h)})"
+            parts.append(part)
+
+        if not parts:
+            self.safe_reply(
+                connection, event,
+                f"Could not find price data for {', '.join(repr(i) for i in unknown)}. Try common symbols like btc, eth, sol."
+            )
+            return True
+
+        response = " | ".join(parts)
+        if unknown:
+            response += f" | Unknown: {', '.join(unknown)}"
+        self.safe_reply(connection, event, response)
+        return True
@@ -38,6 +38,7 @@ class Discord(SimpleCommandModule):
     name = "discord"
     version = "1.0.0"
     description = "Local Discord-router admin API for Jeeves."
+    config_sections = ("admin_api",)
 
     def __init__(self, bot: Any) -> None:
         super().__init__(bot)
@@ -0,0 +1,302 @@
+"""
+In-process publish/subscribe bus shared by all modules.
+
+Producers publish typed events instead of reaching into other modules through
+`bot.pm.plugins`, so a fishing cast or quest fight no longer pays for the
+consumer's state load/save inline. One bus lives on the bot instance and
+outlives module reloads; the plugin manager drains and drops a module's
+subscriptions when it is unloaded.
+
+Subscribers choose a delivery mode:
+- "sync": the handler runs inside publish(), on the producer's thread
+- "queued": events are buffered per subscriber and delivered by a background
+  worker, in batches of up to `batch_size` or after `max_delay` seconds
+
+Each queued subscriber has its own bounded buffer (`max_pending`). When it is
+full the `overflow` policy applies: "drop_oldest" (default), "drop_newest", or
+"block" (the producer waits up to `block_timeout` seconds, then drops).
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+# --- Topics ---
+# Registered topics list the fields publish() requires in the payload.
+
+METRIC_INCREMENT = "metric.increment"  # a counter moved: username, metric, amount
+METRIC_BEST = "metric.best"  # a high-water mark was reached: username, metric, value
+
+TOPICS: Dict[str, Tuple[str, ...]] = {
+    METRIC_INCREMENT: ("username", "metric", "amount"),
+    METRIC_BEST: ("username", "metric", "value"),
+}
+
+OVERFLOW_POLICIES = ("drop_oldest", "drop_newest", "block")
+
+
+class Event(NamedTuple):
+    topic: str
+    data: Dict[str, Any]
+    timestamp: float
+
+
+class Subscription:
+    """One handler registered for a topic (or a `prefix.*` pattern)."""
+
+    def __init__(self, topic: str, handler: Callable, owner: Optional[str], mode: str,
+                 batch_size: int, max_delay: float, max_pending: int, overflow: str,
+                 block_timeout: float):
+        if mode not in ("sync", "queued"):
+            raise ValueError(f"Unknown delivery mode: {mode}")
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        self.topic = topic
+        self.handler = handler
+        self.owner = owner
+        self.mode = mode
+        self.batch_size = max(1, int(batch_size))
+        self.max_delay = max(0.0, float(max_delay))
+        self.max_pending = max(1, int(max_pending))
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self.pending: deque = deque()  # (enqueued_at, event)
+        self.delivery_lock = threading.Lock()  # keeps batches in order
+        self.delivered = 0
+        self.dropped = 0
+        self.errors = 0
+        self.active = True
+
+    def matches(self, topic: str) -> bool:
+        if self.topic == "*" or self.topic == topic:
+            return True
+        return self.topic.endswith(".*") and topic.startswith(self.topic[:-1])
+
+    def is_ready(self, now: float) -> bool:
+        if not self.pending:
+            return False
+        return len(self.pending) >= self.batch_size or now - self.pending[0][0] >= self.max_delay
+
+
+class EventBus:
+    """Topic-based event bus with sync and batched background delivery."""
+
+    def __init__(self, clock=time.monotonic, logger: Optional[Callable[[str], None]] = None,
+                 threaded: bool = True):
+        self._clock = clock
+        self._log = logger
+        self._threaded = threaded
+        self._cond = threading.Condition()
+        self._subscriptions: List[Subscription] = []
+        self._routes: Dict[str, List[Subscription]] = {}
+        self._worker: Optional[threading.Thread] = None
+        self._stopped = False
+        self.published = 0
+
+    # --- Subscribing ---
+
+    def subscribe(self, topic: str, handler: Callable, owner: Optional[str] = None,
+                  mode: str = "sync", batch_size: int = 1, max_delay: float = 0.5,
+                  max_pending: int = 10000, overflow: str = "drop_oldest",
+                  block_timeout: float = 1.0) -> Subscription:
+        """
+        Registers `handler` for `topic` ("name", "prefix.*" or "*"). Sync and
+        batch_size=1 handlers receive one Event; batched handlers receive a list.
+        """
+        sub = Subscription(topic, handler, owner, mode, batch_size, max_delay,
+                           max_pending, overflow, block_timeout)
+        with self._cond:
+            self._subscriptions.append(sub)
+            self._routes.clear()
+        if mode == "queued":
+            self._ensure_worker()
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        """Removes a subscription. Events still buffered for it are discarded."""
+        with self._cond:
+            sub.active = False
+            if sub in self._subscriptions:
+                self._subscriptions.remove(sub)
+            sub.pending.clear()
+            self._routes.clear()
+            self._cond.notify_all()
+
+    def unsubscribe_owner(self, owner: str) -> int:
+        """Removes every subscription registered by `owner`; returns how many."""
+        with self._cond:
+            owned = [sub for sub in self._subscriptions if sub.owner == owner]
+        for sub in owned:
+            self.unsubscribe(sub)
+        return len(owned)
+
+    def has_subscribers(self, topic: str) -> bool:
+        with self._cond:
+            return bool(self._route(topic))
+
+    def _route(self, topic: str) -> List[Subscription]:
+        # Caller holds self._cond.
+        subs = self._routes.get(topic)
+        if subs is None:
+            subs = self._routes[topic] = [sub for sub in self._subscriptions if sub.matches(topic)]
+        return subs
+
+    # --- Publishing ---
+
+    def publish(self, topic: str, **data: Any) -> int:
+        """Sends an event to every matching subscriber; returns how many received or queued it."""
+        required = TOPICS.get(topic)
+        if required:
+            missing = [field for field in required if field not in data]
+            if missing:
+                raise ValueError(f"Event {topic} is missing fields: {', '.join(missing)}")
+
+        event = Event(topic, data, time.time())
+        sync_subs = []
+        accepted = 0
+        with self._cond:
+            self.published += 1
+            for sub in self._route(topic):
+                if sub.mode == "sync":
+                    sync_subs.append(sub)
+                elif self._enqueue(sub, event):
+                    accepted += 1
+            if accepted:
+                self._cond.notify_all()
+
+        for sub in sync_subs:
+            self._deliver(sub, [event])
+        accepted += len(sync_subs)
+
+        if accepted and not self._threaded:
+            self.flush()
+        return accepted
+
+    def _enqueue(self, sub: Subscription, event: Event) -> bool:
+        # Caller holds self._cond.
+        if len(sub.pending) >= sub.max_pending:
+            if sub.overflow == "drop_newest":
+                sub.dropped += 1
+                return False
+            if sub.overflow == "block" and self._threaded:
+                deadline = self._clock() + sub.block_timeout
+                self._cond.notify_all()
+                while sub.active and len(sub.pending) >= sub.max_pending:
+                    remaining = deadline - self._clock()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                if not sub.active or len(sub.pending) >= sub.max_pending:
+                    sub.dropped += 1
+                    return False
+            else:
+                sub.pending.popleft()
+                sub.dropped += 1
+        sub.pending.append((self._clock(), event))
+        return True
+
+    # --- Delivery ---
+
+    def _take_batch(self, sub: Subscription) -> List[Event]:
+        with self._cond:
+            batch = []
+            while sub.pending and len(batch) < sub.batch_size:
+                batch.append(sub.pending.popleft()[1])
+            if batch:
+                self._cond.notify_all()  # wake producers blocked on a full buffer
+            return batch
+
+    def _deliver(self, sub: Subscription, batch: List[Event]) -> None:
+        try:
+            if sub.mode == "queued" and sub.batch_size > 1:
+                sub.handler(batch)
+            else:
+                for event in batch:
+                    sub.handler(event)
+            sub.delivered += len(batch)
+        except Exception as exc:
+            sub.errors += 1
+            if self._log:
+                self._log(f"[events] {sub.owner or 'handler'} failed on {batch[0].topic}: {exc}")
+
+    def _drain(self, sub: Subscription) -> None:
+        with sub.delivery_lock:
+            while sub.active:
+                batch = self._take_batch(sub)
+                if not batch:
+                    break
+                self._deliver(sub, batch)
+
+    def flush(self, owner: Optional[str] = None) -> None:
+        """Delivers everything currently buffered (optionally only for `owner`), on this thread."""
+        with self._cond:
+            subs = [sub for sub in self._subscriptions
+                    if sub.mode == "queued" and (owner is None or sub.owner == owner)]
+        for sub in subs:
+            self._drain(sub)
+
+    def _ensure_worker(self) -> None:
+        if not self._threaded:
+            return
+        with self._cond:
+            if self._worker is not None and self._worker.is_alive():
+                return
+            self._stopped = False
+            self._worker = threading.Thread(target=self._run, name="jeeves-events", daemon=True)
+            self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if self._stopped:
+                    return
+                now = self._clock()
+                ready = [sub for sub in self._subscriptions if sub.mode == "queued" and sub.is_ready(now)]
+                if not ready:
+                    deadlines = [sub.pending[0][0] + sub.max_delay for sub in self._subscriptions
+                                 if sub.mode == "queued" and sub.pending]
+                    timeout = max(0.01, min(deadlines) - now) if deadlines else None
+                    self._cond.wait(timeout)
+                    continue
+            for sub in ready:
+                with sub.delivery_lock:
+                    batch = self._take_batch(sub)
+                    if batch:
+                        self._deliver(sub, batch)
+
+    def close(self) -> None:
+        """Flushes buffered events and stops the worker thread."""
+        self.flush()
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+            worker = self._worker
+        if worker is not None and worker is not threading.current_thread():
+            worker.join(timeout=5)
+
+    # --- Introspection ---
+
+    def stats(self) -> List[Dict[str, Any]]:
+        with self._cond:
+            return [
+                {
+                    "topic": sub.topic,
+                    "owner": sub.owner,
+                    "mode": sub.mode,
+                    "pending": len(sub.pending),
+                    "delivered": sub.delivered,
+                    "dropped": sub.dropped,
+                    "errors": sub.errors,
+                }
+                for sub in self._subscriptions
+            ]
+
+
+def get_event_bus(bot: Any) -> EventBus:
+    """Returns the bot-wide bus, creating it on first use."""
+    bus = getattr(bot, "events", None)
+    if bus is None:
+        bus = EventBus(logger=getattr(bot, "log_debug", None))
+        bot.events = bus
+    return bus
@@ -63,7 +63,7 @@ class Fortune(SimpleCommandModule):
         success = self._give_fortune(connection, event, username, category)
         # Record cooldown only after fortune is successfully given
         if success:
-            self.record_user_cooldown(username, "fortune")
+            self.record_user_cooldown(username, "fortune", cooldown)
         return True
 
     @admin_required
@@ -97,7 +97,7 @@ class Fortune(SimpleCommandModule):
             success = self._give_fortune(connection, event, username, category)
             # Record cooldown only after fortune is successfully given
             if success:
-                self.record_user_cooldown(username, "fortune")
+                self.record_user_cooldown(username, "fortune", cooldown)
             return True
         return False
 
@@ -0,0 +1,201 @@
+"""
+Shared, persistent cache of geocoding results.
+
+Place names are looked up far more often than they change, so weather2, clock
+and anything else that goes through ModuleBase._get_geocode_data share one
+LRU cache on the bot. Keys are `provider:normalised query`; misses ("no such
+place") are remembered for a shorter time than hits. The cache is written to
+module state every few minutes and on shutdown, so a restart doesn't pay the
+geocoding latency again for every known place.
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+STATE_NAME = "geocode_cache"
+
+DEFAULT_MAX_ENTRIES = 2000
+DEFAULT_TTL = 90 * 86400         # places rarely move
+DEFAULT_NEGATIVE_TTL = 86400     # but new spellings get added upstream
+DEFAULT_SAVE_INTERVAL = 300.0
+
+MISS = object()
+
+
+def normalize_query(query: str) -> str:
+    """Case-folds and collapses whitespace and comma spacing so trivial variants share a key."""
+    cleaned = re.sub(r"\s*,\s*", ", ", query.strip())
+    return re.sub(r"\s+", " ", cleaned).casefold()
+
+
+class GeocodeCache:
+    """Bounded LRU of geocoding results with per-entry expiry.
+
+    Callers compare lookups against `cache.MISS`, not a module-level import:
+    the cache lives on the bot and can outlive a re-import of this module.
+    """
+
+    MISS = MISS
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl: float = DEFAULT_TTL,
+                 negative_ttl: float = DEFAULT_NEGATIVE_TTL, save=None,
+                 save_interval: float = DEFAULT_SAVE_INTERVAL, clock=time.time):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._save = save
+        self._save_interval = save_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()  # key -> {"value", "expires"}
+        self._dirty = False
+        self._last_save = clock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(provider: str, query: str) -> str:
+        return f"{provider}:{normalize_query(query)}"
+
+    def get(self, provider: str, query: str) -> Any:
+        """Returns the cached value (None for a remembered miss), or MISS if there is no live entry."""
+        key = self.key(provider, query)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry["expires"] <= self._clock():
+                if entry is not None:
+                    del self._entries[key]
+                    self._dirty = True
+                self.misses += 1
+                return MISS
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry["value"]
+
+    def put(self, provider: str, query: str, value: Any) -> None:
+        """Stores a result; None records that the place could not be found."""
+        ttl = self.ttl if value is not None else self.negative_ttl
+        if ttl <= 0:
+            return
+        key = self.key(provider, query)
+        with self._lock:
+            now = self._clock()
+            self._entries[key] = {"value": value, "expires": now + ttl}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._dirty = True
+            due = self._save is not None and now - self._last_save >= self._save_interval
+        if due:
+            self.save()
+
+    def purge(self, pattern: Optional[str] = None) -> int:
+        """Drops every entry, or those whose key contains `pattern`. Returns how many were removed."""
+        with self._lock:
+            if pattern is None:
+                removed = len(self._entries)
+                self._entries.clear()
+            else:
+                needle = normalize_query(pattern)
+                doomed = [key for key in self._entries if needle in key]
+                for key in doomed:
+                    del self._entries[key]
+                removed = len(doomed)
+            if removed:
+                self._dirty = True
+        return removed
+
+    def find(self, pattern: str, limit: int = 10) -> List[Tuple[str, Any, float]]:
+        """Live entries whose key contains `pattern`, most recently used first, as (key, value, expires)."""
+        needle = normalize_query(pattern)
+        with self._lock:
+            now = self._clock()
+            matches = [(key, entry["value"], entry["expires"]) for key, entry in reversed(self._entries.items())
+                       if needle in key and entry["expires"] > now]
+        return matches[:limit]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+            }
+
+    # --- Persistence ---
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            now = self._clock()
+            return {key: dict(entry) for key, entry in self._entries.items() if entry["expires"] > now}
+
+    def restore(self, entries: Dict[str, Dict[str, Any]]) -> int:
+        """Loads entries produced by snapshot(), oldest first, skipping expired or malformed ones."""
+        restored = 0
+        with self._lock:
+            now = self._clock()
+            for key, entry in (entries or {}).items():
+                try:
+                    expires = float(entry["expires"])
+                    value = entry["value"]
+                except (KeyError, TypeError, ValueError):
+                    continue
+                if expires <= now:
+                    continue
+                self._entries[key] = {"value": value, "expires": expires}
+                restored += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return restored
+
+    def save(self, force: bool = False) -> bool:
+        """Writes the cache through the save callback if anything changed."""
+        if self._save is None or not (self._dirty or force):
+            return False
+        entries = self.snapshot()
+        with self._lock:
+            self._dirty = False
+            self._last_save = self._clock()
+        self._save(entries)
+        return True
+
+
+def get_geocode_cache(bot: Any) -> GeocodeCache:
+    """Returns the bot-wide geocode cache, creating and restoring it on first use."""
+    cache = getattr(bot, "geocode_cache", None)
+    if cache is None:
+        config = getattr(bot, "config", None) or {}
+        settings = config.get("core", {}).get("geocode_cache") or {}
+        save = None
+        if hasattr(bot, "update_module_state"):
+            save = lambda entries: bot.update_module_state(STATE_NAME, {"entries": entries})
+        cache = GeocodeCache(
+            max_entries=int(settings.get("max_entries", DEFAULT_MAX_ENTRIES)),
+            ttl=float(settings.get("ttl_days", DEFAULT_TTL / 86400)) * 86400,
+            negative_ttl=float(settings.get("negative_ttl_hours", DEFAULT_NEGATIVE_TTL / 3600)) * 3600,
+            save=save,
+        )
+        if hasattr(bot, "get_module_state"):
+            try:
+                cache.restore(bot.get_module_state(STATE_NAME).get("entries", {}))
+            except Exception:
+                pass
+        bot.geocode_cache = cache
+    return cache
+
+
+def persist_geocode_cache(bot: Any) -> bool:
+    """Writes unsaved geocode results to state; called on shutdown."""
+    cache: Optional[GeocodeCache] = getattr(bot, "geocode_cache", None)
+    if cache is None:
+        return False
+    return cache.save()
@@ -1,10 +1,16 @@
 # modules/gif.py
 # A module for searching Giphy and returning a random GIF.
+#
+# Each search's result page is cached per normalised query, and repeat !gif
+# requests pick from it locally until it expires instead of searching again.
 import random
 import re
 import requests
 import sys
-from typing import Optional, Dict, Any
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Tuple
 from .base import SimpleCommandModule, admin_required
 from . import achievement_hooks
 
@@ -20,6 +26,9 @@ class Gif(SimpleCommandModule):
     name = "gif"
     version = "2.0.0" # Dynamic configuration refactor
     description = "Searches Giphy for a GIF and posts the link."
+    config_restart_keys = ("api_keys.giphy",)
+
+    RESULTS_CACHE_SIZE = 256
 
     def __init__(self, bot, api_key):
         """Initializes the module's state and configuration."""
@@ -29,6 +38,16 @@ class Gif(SimpleCommandModule):
         self.set_state("gifs_found", self.get_state("gifs_found", 0))
         self.save_state()
         self.http_session = self.requests_retry_session()
+        # normalised query -> (gif URLs, expires_at); an empty list remembers "no results"
+        self._results: "OrderedDict[str, Tuple[List[str], float]]" = OrderedDict()
+        self._results_lock = threading.Lock()
+        self.cache_hits = 0
+
+    def export_runtime(self) -> Dict[str, Any]:
+        return {"results": self._results}
+
+    def import_runtime(self, runtime: Dict[str, Any]) -> None:
+        self._results = runtime.get("results", self._results)
 
     def _register_commands(self):
         """Registers the !gif command."""
@@ -43,34 +62,60 @@ class Gif(SimpleCommandModule):
             description="Show GIF module statistics."
         )
 
+    @staticmethod
+    def _normalize_query(query: str) -> str:
+        return re.sub(r"\s+", " ", query).strip().casefold()
+
     def _get_gif_url(self, query: str) -> Optional[str]:
-        """Fetches a GIF URL from the Giphy API."""
+        """Picks a random GIF URL for the query from its (cached) Giphy result page."""
         self.set_state("gifs_requested", self.get_state("gifs_requested", 0) + 1)
         self.save_state()
 
+        urls = self._search_results(query)
+        if not urls:
+            return None
+
+        self.set_state("gifs_found", self.get_state("gifs_found") + 1)
+        self.save_state()
+        return random.choice(urls)
+
+    def _search_results(self, query: str) -> Optional[List[str]]:
+        """Returns the GIF URLs of a query's result page, searching Giphy only when the cached page expired."""
+        key = self._normalize_query(query)
+        with self._results_lock:
+            entry = self._results.get(key)
+            if entry is not None and entry[1] > time.time():
+                self._results.move_to_end(key)
+                self.cache_hits += 1
+                return entry[0]
+
         api_url = "https://api.giphy.com/v1/gifs/search"
-        params = {'api_key': self.API_KEY, 'q': query, 'limit': 25, 'rating': 'pg-13', 'lang': 'en'}
+        params = {'api_key': self.API_KEY, 'q': key, 'limit': 25, 'rating': 'pg-13', 'lang': 'en'}
 
         try:
             response = self.http_session.get(api_url, params=params, timeout=10)
             response.raise_for_status()
             data = response.json()
-
-            if data and data['data']:
-                gif_obj = random.choice(data['data'])
-                self.set_state("gifs_found", self.get_state("gifs_found") + 1)
-                self.save_state()
-                return gif_obj['images']['original']['url']
-            
-            return None
-            
+            urls = [gif_obj['images']['original']['url'] for gif_obj in (data or {}).get('data') or []]
         except requests.exceptions.RequestException as e:
             self._record_error(f"Giphy API request failed for query '{query}': {e}")
             return None
-        except (KeyError, IndexError, ValueError):
+        except (KeyError, IndexError, TypeError, ValueError):
             self._record_error(f"Failed to parse Giphy response for query '{query}'")
             return None
 
+        if urls:
+            ttl = self.get_config_value("results_cache_seconds", default=3600)
+        else:
+            ttl = self.get_config_value("empty_results_cache_seconds", default=600)
+        if ttl > 0:
+            with self._results_lock:
+                self._results[key] = (urls, time.time() + ttl)
+                self._results.move_to_end(key)
+                while len(self._results) > self.RESULTS_CACHE_SIZE:
+                    self._results.popitem(last=False)
+        return urls
+
     def _cmd_gif(self, connection, event, msg, username, match):
         """Handles the !gif command."""
         query = match.group(1).strip()
@@ -96,7 +141,8 @@ class Gif(SimpleCommandModule):
         found = self.get_state("gifs_found", 0)
         success_rate = (found / requested * 100) if requested > 0 else 0
 
-        self.safe_reply(connection, event, f"GIF stats: {found}/{requested} successful requests ({success_rate:.1f}% success rate).")
+        self.safe_reply(connection, event, f"GIF stats: {found}/{requested} successful requests ({success_rate:.1f}% success rate), "
+                                           f"{self.cache_hits} served from {len(self._results)} cached searches.")
         return True
 
     # ── Matrix admin integration ──────────────────────────────
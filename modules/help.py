@@ -183,7 +183,7 @@ class Help(SimpleCommandModule):
             self.safe_privmsg(username, f"Use 'help <command>' for details on a specific command.{note}")
 
         # Record cooldown after successfully sending help
-        self.record_user_cooldown(username, "help_request")
+        self.record_user_cooldown(username, "help_request", cooldown)
 
         last_times = self.get_state("last_help_time", {})
         last_times[user_id] = time.time()
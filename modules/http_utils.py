@@ -1,14 +1,36 @@
 """
 Centralized HTTP client utilities for API requests.
 Eliminates duplicate HTTP request patterns across modules.
+
+GET helpers accept an opt-in `cache_ttl` (seconds). Cached responses live in
+a size-bounded in-memory LRU with an optional on-disk tier, are revalidated
+with ETag/Last-Modified once they expire, can be served stale for
+`stale_ttl` more seconds while a background refresh runs, and 404s can be
+cached for `negative_ttl` seconds. Hit ratios are tracked per host.
+
+Identical GETs (same URL, params and headers) that are in flight at the same
+time are coalesced into one request whether or not they are cached.
+
+Sessions are pooled per retry policy and shared. Their adapter fails fast
+while a host's circuit breaker is open, and caps timeouts and retry backoff
+to the calling thread's `latency_budget()`.
 """
 
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from pathlib import Path
+from urllib.parse import urlsplit
+
 import requests
 import logging
 import re
 from typing import Optional, Dict, Any, Union
 from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 
 from .exception_utils import (
     ExternalAPIException,
@@ -88,45 +110,586 @@ def redact_api_key_from_url(url: str) -> str:
     return redacted
 
 
+# --- Resilience: circuit breakers, latency budgets and pooled sessions ---
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+RETRY_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"})
+POOL_HOSTS = 32       # distinct hosts kept in a session's pool
+POOL_PER_HOST = 10    # concurrent connections kept open per host
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Raised without touching the network while a host's circuit breaker is open."""
+
+
+class LatencyBudgetExceeded(requests.Timeout):
+    """Raised when the caller's latency budget runs out before a request can be sent."""
+
+
+class CircuitBreaker:
+    """
+    Per-host breaker. Closed: requests flow and outcomes are tracked over a
+    rolling window. Open (error rate >= threshold over at least
+    `min_requests`): requests fail fast for `cooldown` seconds. Half-open:
+    one probe is let through; success closes the breaker, failure re-opens it.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, error_rate: float = 0.5, min_requests: int = 5,
+                 window: float = 60.0, cooldown: float = 30.0, clock=time.monotonic):
+        self.error_rate = error_rate
+        self.min_requests = min_requests
+        self.window = window
+        self.cooldown = cooldown
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._outcomes: deque = deque()  # (timestamp, ok)
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state(self._clock())
+
+    def _current_state(self, now: float) -> str:
+        # Caller holds self._lock.
+        if self._state == self.OPEN and now - self._opened_at >= self.cooldown:
+            self._state = self.HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self._current_state(self._clock())
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def release(self) -> None:
+        """Gives back a half-open probe slot for a request that ended without an outcome."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            now = self._clock()
+            if self._current_state(now) == self.HALF_OPEN:
+                self._state = self.CLOSED
+                self._outcomes.clear()
+            self._outcomes.append((now, True))
+            self._trim(now)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            now = self._clock()
+            state = self._current_state(now)
+            if state == self.HALF_OPEN:
+                self._open(now)
+                return
+            self._outcomes.append((now, False))
+            self._trim(now)
+            failures = sum(1 for _, ok in self._outcomes if not ok)
+            if (state == self.CLOSED and len(self._outcomes) >= self.min_requests
+                    and failures / len(self._outcomes) >= self.error_rate):
+                self._open(now)
+
+    def _open(self, now: float) -> None:
+        self._state = self.OPEN
+        self._opened_at = now
+        self._probe_in_flight = False
+        self._outcomes.clear()
+
+    def _trim(self, now: float) -> None:
+        cutoff = now - self.window
+        while self._outcomes and self._outcomes[0][0] < cutoff:
+            self._outcomes.popleft()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            now = self._clock()
+            self._trim(now)
+            failures = sum(1 for _, ok in self._outcomes if not ok)
+            total = len(self._outcomes)
+            return {
+                "state": self._current_state(now),
+                "requests": total,
+                "error_rate": (failures / total) if total else 0.0,
+            }
+
+
+MAX_BREAKERS = 128     # hosts tracked at once; user-pasted URLs can name any host
+
+_breaker_settings: Dict[str, Any] = {}
+_breakers: "OrderedDict[str, CircuitBreaker]" = OrderedDict()
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(host: str) -> CircuitBreaker:
+    """Returns the shared breaker for `host`, creating it with the configured settings.
+
+    Breakers are kept in LRU order; the least recently used host is dropped
+    once MAX_BREAKERS is exceeded.
+    """
+    with _breakers_lock:
+        breaker = _breakers.get(host)
+        if breaker is None:
+            breaker = _breakers[host] = CircuitBreaker(**_breaker_settings)
+            while len(_breakers) > MAX_BREAKERS:
+                _breakers.popitem(last=False)
+        else:
+            _breakers.move_to_end(host)
+        return breaker
+
+
+def circuit_breaker_states() -> Dict[str, Dict[str, Any]]:
+    with _breakers_lock:
+        breakers = dict(_breakers)
+    return {host: breaker.snapshot() for host, breaker in breakers.items()}
+
+
+def configure_circuit_breakers(settings: Optional[Dict[str, Any]]) -> None:
+    """Applies core.http_circuit_breaker settings to existing and future breakers."""
+    settings = settings or {}
+    mapping = {"error_rate": "error_rate", "min_requests": "min_requests",
+               "window_seconds": "window", "cooldown_seconds": "cooldown"}
+    _breaker_settings.clear()
+    for key, attr in mapping.items():
+        if key in settings:
+            _breaker_settings[attr] = settings[key]
+    with _breakers_lock:
+        for breaker in _breakers.values():
+            for attr, value in _breaker_settings.items():
+                setattr(breaker, attr, value)
+
+
+_budget = threading.local()
+
+
+@contextmanager
+def latency_budget(seconds: Optional[float]):
+    """
+    Caps the total time HTTP requests made on this thread may take, retries
+    and backoff included. Nested budgets can only shrink the deadline.
+    """
+    previous = getattr(_budget, "deadline", None)
+    if seconds is not None and seconds > 0:
+        deadline = time.monotonic() + seconds
+        _budget.deadline = deadline if previous is None else min(previous, deadline)
+    try:
+        yield
+    finally:
+        _budget.deadline = previous
+
+
+def remaining_budget() -> Optional[float]:
+    """Seconds left in this thread's latency budget, or None if there is none."""
+    deadline = getattr(_budget, "deadline", None)
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def _clamp_timeout(timeout, limit: float):
+    if timeout is None:
+        return limit
+    if isinstance(timeout, tuple):
+        return tuple(limit if part is None else min(part, limit) for part in timeout)
+    return min(timeout, limit)
+
+
+class ResilientAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that consults the host's circuit breaker, clamps timeouts to
+    the thread's latency budget, and retries idempotent requests with
+    exponential backoff only while the budget allows it.
+    """
+
+    def __init__(self, retries: int = 0, backoff_factor: float = 0.0,
+                 status_forcelist=RETRY_STATUSES, **kwargs):
+        kwargs.setdefault("pool_connections", POOL_HOSTS)
+        kwargs.setdefault("pool_maxsize", POOL_PER_HOST)
+        super().__init__(max_retries=0, **kwargs)
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.status_forcelist = frozenset(status_forcelist)
+
+    def _backoff(self, attempt: int, response) -> float:
+        if response is not None and response.status_code == 429:
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                return float(retry_after)
+        return self.backoff_factor * (2 ** (attempt - 1))
+
+    def send(self, request, **kwargs):
+        host = urlsplit(request.url).hostname or ""
+        breaker = get_circuit_breaker(host)
+        retries = self.retries if request.method in RETRY_METHODS else 0
+        attempt = 0
+        while True:
+            # Check the budget first: a half-open breaker hands out a single
+            # probe slot, which must not be taken by a request that never runs.
+            remaining = remaining_budget()
+            if remaining is not None:
+                if remaining <= 0:
+                    raise LatencyBudgetExceeded(f"Latency budget exhausted before request to {host}", request=request)
+                kwargs["timeout"] = _clamp_timeout(kwargs.get("timeout"), remaining)
+            if not breaker.allow():
+                raise CircuitOpenError(f"Circuit open for {host}; not sending request", request=request)
+
+            response, error = None, None
+            try:
+                response = super().send(request, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                breaker.record_failure()
+                error = e
+            except BaseException:
+                breaker.release()
+                raise
+            else:
+                if response.status_code >= 500 or response.status_code == 429:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+                if response.status_code not in self.status_forcelist:
+                    return response
+
+            attempt += 1
+            delay = self._backoff(attempt, response)
+            remaining = remaining_budget()
+            # A failed half-open probe reopens the breaker; retrying would only
+            # raise CircuitOpenError, so hand back what the probe got instead.
+            if (attempt > retries or (remaining is not None and delay >= remaining)
+                    or breaker.state == breaker.OPEN):
+                if response is not None:
+                    return response
+                raise error
+            if response is not None:
+                response.close()
+            time.sleep(delay)
+
+
+_sessions: Dict[tuple, requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+
+def get_pooled_session(retries: int = 0, backoff_factor: float = 0.0,
+                       status_forcelist=RETRY_STATUSES,
+                       headers: Optional[Dict[str, str]] = None) -> requests.Session:
+    """
+    Returns a process-wide session for this retry policy and header set, so
+    connections are pooled per host instead of per caller.
+    """
+    key = (retries, backoff_factor, tuple(status_forcelist), tuple(sorted((headers or {}).items())))
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = requests.Session()
+            adapter = ResilientAdapter(retries=retries, backoff_factor=backoff_factor,
+                                       status_forcelist=status_forcelist)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            if headers:
+                session.headers.update(headers)
+            _sessions[key] = session
+        return session
+
+
+class CacheEntry:
+    """A cached GET response (or a cached 404 when status == 404)."""
+
+    __slots__ = ("key", "host", "status", "text", "etag", "last_modified",
+                 "stored_at", "expires_at", "stale_until")
+
+    def __init__(self, key: str, host: str, status: int, text: str,
+                 etag: Optional[str] = None, last_modified: Optional[str] = None,
+                 stored_at: float = 0.0, expires_at: float = 0.0, stale_until: float = 0.0):
+        self.key = key
+        self.host = host
+        self.status = status
+        self.text = text
+        self.etag = etag
+        self.last_modified = last_modified
+        self.stored_at = stored_at
+        self.expires_at = expires_at
+        self.stale_until = stale_until
+
+    @property
+    def size(self) -> int:
+        return len(self.text)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CacheEntry":
+        return cls(**{slot: data[slot] for slot in cls.__slots__})
+
+
+class ResponseCache:
+    """
+    LRU response cache bounded by entry count and total body size, with an
+    optional directory of JSON files as a second tier that survives restarts.
+    """
+
+    STAT_FIELDS = ("hits", "stale", "negative", "revalidated", "misses")
+
+    def __init__(self, max_entries: int = 512, max_bytes: int = 8 * 1024 * 1024,
+                 disk_dir: Optional[Union[str, Path]] = None, disk_max_entries: int = 5000,
+                 clock=time.time):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.disk_max_entries = disk_max_entries
+        self.disk_dir: Optional[Path] = None
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self._disk_writes = 0
+        self._stats: Dict[str, Dict[str, int]] = {}
+        if disk_dir:
+            self.set_disk_dir(disk_dir)
+
+    def set_disk_dir(self, disk_dir: Optional[Union[str, Path]]) -> None:
+        with self._lock:
+            self.disk_dir = Path(disk_dir) if disk_dir else None
+            if self.disk_dir is not None:
+                self.disk_dir.mkdir(parents=True, exist_ok=True)
+
+    def now(self) -> float:
+        return self._clock()
+
+    # --- Lookup and storage ---
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+        entry = self._read_disk(key)
+        if entry is not None:
+            with self._lock:
+                self._insert(entry)
+        return entry
+
+    def put(self, entry: CacheEntry) -> None:
+        with self._lock:
+            self._insert(entry)
+        self._write_disk(entry)
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._bytes -= entry.size
+        path = self._disk_path(key)
+        if path is not None:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._stats.clear()
+        if self.disk_dir is not None:
+            for path in self.disk_dir.glob("*.json"):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _insert(self, entry: CacheEntry) -> None:
+        # Caller holds self._lock.
+        if entry.size > self.max_bytes:
+            return
+        previous = self._entries.pop(entry.key, None)
+        if previous is not None:
+            self._bytes -= previous.size
+        self._entries[entry.key] = entry
+        self._bytes += entry.size
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+
+    # --- Disk tier ---
+
+    def _disk_path(self, key: str) -> Optional[Path]:
+        if self.disk_dir is None:
+            return None
+        return self.disk_dir / f"{key}.json"
+
+    def _read_disk(self, key: str) -> Optional[CacheEntry]:
+        path = self._disk_path(key)
+        if path is None or not path.exists():
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = CacheEntry.from_dict(json.load(f))
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        if max(entry.expires_at, entry.stale_until) <= self.now() and not (entry.etag or entry.last_modified):
+            # Expired and can't be revalidated: not worth keeping.
+            try:
+                path.unlink()
+            except OSError:
+                pass
+            return None
+        return entry
+
+    def _write_disk(self, entry: CacheEntry) -> None:
+        path = self._disk_path(entry.key)
+        if path is None:
+            return
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry.to_dict(), f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logging.getLogger(__name__).debug("http cache disk write failed: %s", e)
+            return
+        self._disk_writes += 1
+        if self._disk_writes % 64 == 0:
+            self._prune_disk()
+
+    def _prune_disk(self) -> None:
+        try:
+            files = sorted(self.disk_dir.glob("*.json"), key=lambda p: p.stat().st_mtime)
+        except OSError:
+            return
+        for path in files[:max(0, len(files) - self.disk_max_entries)]:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    # --- Statistics ---
+
+    def record(self, host: str, outcome: str) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(host, dict.fromkeys(self.STAT_FIELDS, 0))
+            stats[outcome] += 1
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-host counters; hit_ratio counts fresh, stale and negative hits as hits."""
+        with self._lock:
+            report = {}
+            for host, counts in self._stats.items():
+                served = counts["hits"] + counts["stale"] + counts["negative"]
+                total = served + counts["revalidated"] + counts["misses"]
+                report[host] = dict(counts, hit_ratio=(served / total) if total else 0.0)
+            return report
+
+
+class _Flight:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Collapses concurrent identical calls into one. The first caller for a key
+    runs the function; callers arriving while it is in flight wait (up to
+    their own timeout) and receive the same result or exception.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[str, _Flight] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def do(self, key: str, fn, timeout: Optional[float] = None, label: str = ""):
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                flight.waiters += 1
+            stats = self._stats.setdefault(label, {"calls": 0, "shared": 0, "timeouts": 0})
+            stats["calls"] += 1
+
+        if leader:
+            try:
+                flight.result = fn()
+            except BaseException as e:
+                flight.error = e
+            finally:
+                with self._lock:
+                    self._flights.pop(key, None)
+                flight.done.set()
+        elif not flight.done.wait(timeout):
+            with self._lock:
+                stats["timeouts"] += 1
+            raise requests.Timeout(f"Timed out after {timeout}s waiting for a shared request")
+        else:
+            with self._lock:
+                stats["shared"] += 1
+
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._flights)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Per-label counters; `shared` is the number of requests that never hit the network."""
+        with self._lock:
+            return {label: dict(counts) for label, counts in self._stats.items()}
+
+
 class HTTPClient:
     """Centralized HTTP client with standardized error handling and retry logic."""
     
-    def __init__(self, timeout: int = 30, max_retries: int = 3):
+    def __init__(self, timeout: int = 30, max_retries: int = 3,
+                 cache: Optional[ResponseCache] = None,
+                 flight: Optional[SingleFlight] = None):
         """Initialize HTTP client with configuration.
 
         Args:
             timeout: Request timeout in seconds
             max_retries: Maximum number of retries for failed requests
+            cache: Response cache to use (defaults to the shared cache)
+            flight: Request coalescer to use (defaults to the shared one)
         """
         self.timeout = timeout
         self.max_retries = max_retries
+        self.cache = cache if cache is not None else get_response_cache()
+        self.flight = flight if flight is not None else get_singleflight()
         self._closed = False
+        self._refreshing = set()
+        self._refresh_lock = threading.Lock()
         self.session = self._create_session()
     
     def _create_session(self) -> requests.Session:
-        """Create a requests session with retry strategy."""
-        session = requests.Session()
-
-        # Configure retry strategy
-        retry_strategy = Retry(
-            total=self.max_retries,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["HEAD", "GET", "OPTIONS"],
-            backoff_factor=1
+        """Get the shared pooled session for this client's retry policy."""
+        return get_pooled_session(
+            retries=self.max_retries,
+            backoff_factor=1,
+            status_forcelist=RETRY_STATUSES,
+            headers={
+                'User-Agent': 'JeevesBot/1.0',
+                'Accept': 'application/json'
+            },
         )
 
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
-
-        # Set default headers
-        session.headers.update({
-            'User-Agent': 'JeevesBot/1.0',
-            'Accept': 'application/json'
-        })
-
-        return session
-
     def _ensure_not_closed(self):
         """Verify that the session is not closed.
 
@@ -137,13 +700,17 @@ class HTTPClient:
             raise RuntimeError("HTTP session is closed. Cannot perform request on a closed session.")
     
     def get_json(self, url: str, params: Optional[Dict] = None,
-                headers: Optional[Dict] = None) -> Dict[str, Any]:
+                headers: Optional[Dict] = None, cache_ttl: Optional[float] = None,
+                stale_ttl: float = 0.0, negative_ttl: float = 0.0) -> Dict[str, Any]:
         """Make GET request and return JSON response.
 
         Args:
             url: Target URL
             params: Query parameters
             headers: Additional headers
+            cache_ttl: Cache the response for this many seconds (None = don't cache)
+            stale_ttl: After cache_ttl, serve the stale copy this much longer while refreshing
+            negative_ttl: Cache 404 responses for this many seconds
 
         Returns:
             JSON response as dictionary
@@ -154,31 +721,26 @@ class HTTPClient:
         """
         self._ensure_not_closed()
 
-        log_module_event("http_client", "api_request", {
-            "url": redact_api_key_from_url(url),
-            "method": "GET",
-            "params": sanitize_params(params),
-            "headers": sanitize_params(headers)
-        })
+        if cache_ttl is not None:
+            return json.loads(self._cached_get(url, params, headers, cache_ttl, stale_ttl, negative_ttl).text)
 
-        response = self.session.get(
-            url,
-            params=params,
-            headers=headers,
-            timeout=self.timeout
-        )
+        response = self._shared_send(url, params, headers)
         response.raise_for_status()
 
         return response.json()
     
     def get_text(self, url: str, params: Optional[Dict] = None,
-                headers: Optional[Dict] = None) -> str:
+                headers: Optional[Dict] = None, cache_ttl: Optional[float] = None,
+                stale_ttl: float = 0.0, negative_ttl: float = 0.0) -> str:
         """Make GET request and return text response.
 
         Args:
             url: Target URL
             params: Query parameters
             headers: Additional headers
+            cache_ttl: Cache the response for this many seconds (None = don't cache)
+            stale_ttl: After cache_ttl, serve the stale copy this much longer while refreshing
+            negative_ttl: Cache 404 responses for this many seconds
 
         Returns:
             Response text
@@ -189,6 +751,28 @@ class HTTPClient:
         """
         self._ensure_not_closed()
 
+        if cache_ttl is not None:
+            return self._cached_get(url, params, headers, cache_ttl, stale_ttl, negative_ttl).text
+
+        response = self._shared_send(url, params, headers)
+        response.raise_for_status()
+
+        return response.text
+
+    def _wait_timeout(self) -> float:
+        # Long enough for the leader to exhaust its own retries.
+        return float(self.timeout) * (self.max_retries + 1)
+
+    def _shared_send(self, url: str, params: Optional[Dict], headers: Optional[Dict]) -> requests.Response:
+        """_send(), coalesced with identical requests already in flight."""
+        return self.flight.do(
+            self.cache_key("GET", url, params, headers),
+            lambda: self._send(url, params, headers),
+            timeout=self._wait_timeout(),
+            label=urlsplit(url).hostname or "",
+        )
+
+    def _send(self, url: str, params: Optional[Dict], headers: Optional[Dict]) -> requests.Response:
         log_module_event("http_client", "api_request", {
             "url": redact_api_key_from_url(url),
             "method": "GET",
@@ -196,37 +780,171 @@ class HTTPClient:
             "headers": sanitize_params(headers)
         })
 
-        response = self.session.get(
+        return self.session.get(
             url,
             params=params,
             headers=headers,
             timeout=self.timeout
         )
-        response.raise_for_status()
 
-        return response.text
+    # --- Response cache ---
+
+    @staticmethod
+    def cache_key(method: str, url: str, params: Optional[Dict] = None,
+                  headers: Optional[Dict] = None) -> str:
+        """Stable key for a request; hashed so secrets in params never reach disk."""
+        material = json.dumps([method.upper(), url, sorted((params or {}).items()),
+                               sorted((headers or {}).items())], default=str)
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _cached_get(self, url: str, params: Optional[Dict], headers: Optional[Dict],
+                    cache_ttl: float, stale_ttl: float, negative_ttl: float) -> CacheEntry:
+        key = self.cache_key("GET", url, params, headers)
+        host = urlsplit(url).hostname or ""
+        entry = self.cache.get(key)
+        now = self.cache.now()
+
+        if entry is not None and now < entry.expires_at:
+            self.cache.record(host, "negative" if entry.status == 404 else "hits")
+            return self._serve(entry, url)
+
+        if entry is not None and entry.status != 404 and now < entry.stale_until:
+            self.cache.record(host, "stale")
+            self._refresh_in_background(key, url, params, headers, entry, cache_ttl, stale_ttl, negative_ttl)
+            return entry
+
+        fetched = self.flight.do(
+            key,
+            lambda: self._fetch_into_cache(key, host, url, params, headers, entry,
+                                           cache_ttl, stale_ttl, negative_ttl),
+            timeout=self._wait_timeout(),
+            label=host,
+        )
+        return self._serve(fetched, url)
+
+    def _fetch_into_cache(self, key: str, host: str, url: str, params: Optional[Dict],
+                          headers: Optional[Dict], entry: Optional[CacheEntry],
+                          cache_ttl: float, stale_ttl: float, negative_ttl: float) -> CacheEntry:
+        request_headers = dict(headers or {})
+        if entry is not None and entry.status == 200:
+            if entry.etag:
+                request_headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                request_headers["If-Modified-Since"] = entry.last_modified
+
+        response = self._send(url, params, request_headers or None)
+        now = self.cache.now()
+
+        if response.status_code == 304 and entry is not None and entry.status == 200:
+            self.cache.record(host, "revalidated")
+            entry.expires_at = now + cache_ttl
+            entry.stale_until = entry.expires_at + stale_ttl
+            self.cache.put(entry)
+            return entry
+
+        self.cache.record(host, "misses")
+        if response.status_code == 404 and negative_ttl > 0:
+            negative = CacheEntry(key, host, 404, "", stored_at=now, expires_at=now + negative_ttl)
+            self.cache.put(negative)
+            return negative
+
+        response.raise_for_status()
+        fresh = CacheEntry(
+            key, host, response.status_code, response.text,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            stored_at=now,
+            expires_at=now + cache_ttl,
+            stale_until=now + cache_ttl + stale_ttl,
+        )
+        if "no-store" not in response.headers.get("Cache-Control", "").lower():
+            self.cache.put(fresh)
+        return fresh
+
+    def _serve(self, entry: CacheEntry, url: str) -> CacheEntry:
+        if entry.status == 404:
+            response = requests.Response()
+            response.status_code = 404
+            response.url = url
+            raise requests.HTTPError(f"404 Client Error: Not Found (cached) for url: {redact_api_key_from_url(url)}",
+                                     response=response)
+        return entry
+
+    def _refresh_in_background(self, key: str, url: str, params: Optional[Dict],
+                               headers: Optional[Dict], entry: CacheEntry,
+                               cache_ttl: float, stale_ttl: float, negative_ttl: float) -> None:
+        with self._refresh_lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                self.flight.do(
+                    key,
+                    lambda: self._fetch_into_cache(key, entry.host, url, params, headers, entry,
+                                                   cache_ttl, stale_ttl, negative_ttl),
+                    timeout=self._wait_timeout(),
+                    label=entry.host,
+                )
+            except Exception as e:
+                logging.getLogger(__name__).debug("http cache refresh failed for %s: %s", entry.host, e)
+            finally:
+                with self._refresh_lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, name="http-cache-refresh", daemon=True).start()
     
     def close(self):
-        """Close the HTTP session.
+        """Detach from the HTTP session.
 
+        The pooled session itself is shared and stays open for other clients.
         After closing, any subsequent calls to get_json() or get_text()
         will raise a RuntimeError.
         """
-        if self.session:
-            self.session.close()
-            self.session = None
+        self.session = None
         self._closed = True
 
 
-# Global HTTP client instance for shared use
+# Shared response cache and HTTP client instance
+_response_cache = ResponseCache()
+
+
+_singleflight = SingleFlight()
+
+
+def get_response_cache() -> ResponseCache:
+    """Get the response cache shared by all HTTP clients."""
+    return _response_cache
+
+
+def get_singleflight() -> SingleFlight:
+    """Get the request coalescer shared by all HTTP clients."""
+    return _singleflight
+
+
 _http_client = HTTPClient()
 
 
+def configure_http_cache(settings: Optional[Dict[str, Any]], base_dir: Optional[Path] = None) -> ResponseCache:
+    """Applies core.http_cache settings (sizes and the optional disk tier) to the shared cache."""
+    settings = settings or {}
+    cache = _response_cache
+    cache.max_entries = int(settings.get("max_entries", cache.max_entries))
+    cache.max_bytes = int(settings.get("max_bytes", cache.max_bytes))
+    cache.disk_max_entries = int(settings.get("disk_max_entries", cache.disk_max_entries))
+    disk_dir = settings.get("disk_dir")
+    if disk_dir and base_dir is not None and not Path(disk_dir).is_absolute():
+        disk_dir = Path(base_dir) / disk_dir
+    cache.set_disk_dir(disk_dir or None)
+    return cache
+
+
 def get_http_client() -> HTTPClient:
     """Get the shared HTTP client instance."""
     return _http_client
 
 
 def create_http_client(timeout: int = 30, max_retries: int = 3) -> HTTPClient:
-    """Create a new HTTP client with custom configuration."""
+    """Create a new HTTP client with custom configuration (sharing the response cache)."""
     return HTTPClient(timeout=timeout, max_retries=max_retries)
\ No newline at end of file
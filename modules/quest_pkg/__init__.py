@@ -139,6 +139,14 @@ class Quest(SimpleCommandModule):
         schedule.clear(f"{self.name}-mob_close")
         schedule.clear(f"{self.name}-energy_regen")
 
+    def export_runtime(self) -> Dict[str, Any]:
+        # Share the mob lock so a fight still running in another thread keeps
+        # serialising against the reloaded instance.
+        return {"mob_lock": self.mob_lock}
+
+    def import_runtime(self, runtime: Dict[str, Any]) -> None:
+        self.mob_lock = runtime.get("mob_lock", self.mob_lock)
+
     def house_status(self, channel: str = None) -> str:
         players = self.get_state("players", {})
         active_mob = self.get_state("active_mob")
@@ -241,7 +249,7 @@ class Quest(SimpleCommandModule):
                             try:
                                 if cmd_info["handler"](connection, event, msg, username, match):
                                     self.log_debug(f"DM Command '{cmd_info['name']}' handled successfully.")
-                                    self.record_user_cooldown(username, cmd_id)
+                                    self.record_user_cooldown(username, cmd_id, cooldown_val)
                                     return True
                             except Exception as e:
                                 import traceback
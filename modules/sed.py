@@ -23,6 +23,12 @@ class Sed(SimpleCommandModule):
         # This module has no !commands.
         pass
 
+    def export_runtime(self) -> Dict[str, Any]:
+        return {"history": self.history}
+
+    def import_runtime(self, runtime: Dict[str, Any]) -> None:
+        self.history = runtime.get("history", self.history)
+
     def _add_to_history(self, channel: str, username: str, message: str) -> None:
         history_size = self.get_config_value("history_size", channel, 20)
         if channel not in self.history:
@@ -3,6 +3,8 @@
 import re
 import requests
 import json
+import threading
+from collections import OrderedDict
 from typing import Optional
 from urllib.parse import urlparse
 from .base import SimpleCommandModule
@@ -21,8 +23,10 @@ class Shorten(SimpleCommandModule):
     name = "shorten"
     version = "3.2.0"  # Added user opt-out for automatic URL shortening
     description = "Shortens URLs using a self-hosted Shlink instance."
+    config_restart_keys = ("api_keys.shlink_url", "api_keys.shlink_key")
 
     URL_PATTERN = re.compile(r'(https?://\S+)')
+    SHORT_URL_MAP_SIZE = 5000
 
     def __init__(self, bot, shlink_url, shlink_key):
         """Initializes the module's state and configuration."""
@@ -33,6 +37,17 @@ class Shorten(SimpleCommandModule):
         if self.get_state("ignored_users") is None:
             self.set_state("ignored_users", {})
             self.save_state()
+        # Cleaned long URL -> short URL in least-recently-used order, persisted so
+        # repeats never reach Shlink. Links from another Shlink server are dropped.
+        # The map is written to state when it grows and on unload, not on lookups.
+        self._short_urls_lock = threading.Lock()
+        server = self.SHLINK_API_URL.rstrip('/')
+        saved = self.get_state("short_urls") or {}
+        if self.get_state("short_urls_server") != server:
+            saved = {}
+        self._short_urls: "OrderedDict[str, str]" = OrderedDict(saved)
+        self.set_state("short_urls", dict(self._short_urls))
+        self.set_state("short_urls_server", server)
 
         # Regex to extract Amazon product ASIN from various URL formats
         # Matches patterns like /dp/ASIN, /gp/product/ASIN, /product/ASIN, etc.
@@ -101,6 +116,12 @@ class Shorten(SimpleCommandModule):
         # Clean the URL before shortening (removes tracking parameters, etc.)
         cleaned_url = self._clean_url(url_to_shorten)
 
+        with self._short_urls_lock:
+            known = self._short_urls.get(cleaned_url)
+            if known:
+                self._short_urls.move_to_end(cleaned_url)
+                return known
+
         api_endpoint = f"{self.SHLINK_API_URL.rstrip('/')}/rest/v2/short-urls"
         headers = {"X-Api-Key": self.SHLINK_API_KEY, "Content-Type": "application/json"}
         payload = {"longUrl": cleaned_url, "findIfExists": True}
@@ -109,7 +130,10 @@ class Shorten(SimpleCommandModule):
             response = self.http_session.post(api_endpoint, headers=headers, json=payload, timeout=10)
             response.raise_for_status()
             data = response.json()
-            return data.get("shortUrl")
+            short_url = data.get("shortUrl")
+            if short_url:
+                self._remember_short_url(cleaned_url, short_url)
+            return short_url
         except requests.exceptions.RequestException as e:
             self._record_error(f"Shlink API request failed: {e}")
             return None
@@ -117,6 +141,22 @@ class Shorten(SimpleCommandModule):
             self._record_error(f"Failed to parse Shlink response: {e}")
             return None
 
+    def _remember_short_url(self, cleaned_url: str, short_url: str) -> None:
+        """Records a shortened URL, dropping the least recently used entries beyond SHORT_URL_MAP_SIZE."""
+        with self._short_urls_lock:
+            self._short_urls[cleaned_url] = short_url
+            self._short_urls.move_to_end(cleaned_url)
+            while len(self._short_urls) > self.SHORT_URL_MAP_SIZE:
+                self._short_urls.popitem(last=False)
+            self.set_state("short_urls", dict(self._short_urls))
+        self.save_state()
+
+    def on_unload(self):
+        # Keep the recency order lookups built up since the last new entry.
+        with self._short_urls_lock:
+            self.set_state("short_urls", dict(self._short_urls))
+        super().on_unload()
+
     def _shorten_url(self, url_to_shorten: str) -> Optional[str]:
         """Deprecated: Use shorten_url() instead. Kept for backwards compatibility."""
         return self.shorten_url(url_to_shorten)
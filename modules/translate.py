@@ -1,7 +1,16 @@
 # modules/translate.py
 # A module for translating text using the DeepL API.
+#
+# Results are cached by (normalised text, source, target language), so a line
+# that several people !tr gets translated once. Cache misses that arrive within
+# a short window are sent to DeepL together, one request per target language,
+# and the characters each channel sends are tallied for quota tracking.
 import re
-from typing import Optional, List, Dict, Any
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional, List, Dict, Any, Tuple
+import schedule
 
 from .base import SimpleCommandModule, admin_required
 from . import achievement_hooks
@@ -22,11 +31,89 @@ def setup(bot):
         return None
     return Translate(bot, api_key)
 
+
+def normalize_text(text: str) -> str:
+    """Collapses whitespace so trivially different copies of a line share a cache entry."""
+    return re.sub(r"\s+", " ", text).strip()
+
+
+class TranslationBatcher:
+    """
+    Collects translation requests for a short window and sends each target
+    language's texts to DeepL in a single call.
+
+    `translate(texts, target_lang)` must return one result per text, in order.
+    Callbacks are invoked as callback(result, error, sent) from the flushing
+    thread, where `sent` is False for a repeat of a text already in the batch;
+    with a window of 0 the request is translated immediately in the caller.
+    """
+
+    MAX_TEXTS = 50  # DeepL's limit per request
+
+    def __init__(self, translate: Callable[[List[str], str], List[Any]], window: float = 0.3):
+        self._translate = translate
+        self.window = window
+        self._lock = threading.Lock()
+        self._pending: Dict[str, List[Tuple[str, Callable]]] = {}
+        self._timers: Dict[str, threading.Timer] = {}
+        self.requests = 0
+        self.batches = 0
+
+    def submit(self, text: str, target_lang: str, callback: Callable[[Any, Optional[Exception]], None]) -> None:
+        with self._lock:
+            self.requests += 1
+            pending = self._pending.setdefault(target_lang, [])
+            pending.append((text, callback))
+            full = len(pending) >= self.MAX_TEXTS
+            if self.window > 0 and not full:
+                if target_lang not in self._timers:
+                    timer = threading.Timer(self.window, self.flush, args=(target_lang,))
+                    timer.daemon = True
+                    self._timers[target_lang] = timer
+                    timer.start()
+                return
+        self.flush(target_lang)
+
+    def flush(self, target_lang: str) -> int:
+        """Sends everything pending for `target_lang`. Returns the number of texts sent."""
+        with self._lock:
+            batch = self._pending.pop(target_lang, [])
+            timer = self._timers.pop(target_lang, None)
+            if batch:
+                self.batches += 1
+        if timer is not None:
+            timer.cancel()
+        if not batch:
+            return 0
+
+        # Identical texts in one window are only sent (and billed) once.
+        texts = list(dict.fromkeys(text for text, _ in batch))
+        try:
+            results = dict(zip(texts, self._translate(texts, target_lang)))
+            error = None
+        except Exception as e:
+            results, error = {}, e
+        unsent = set(texts)
+        for text, callback in batch:
+            sent = text in unsent
+            unsent.discard(text)
+            callback(results.get(text), error, sent)
+        return len(texts)
+
+    def cancel(self) -> None:
+        with self._lock:
+            timers = list(self._timers.values())
+            self._timers.clear()
+            self._pending.clear()
+        for timer in timers:
+            timer.cancel()
+
 class Translate(SimpleCommandModule):
     """A module for text translation using the DeepL API."""
     name = "translate"
-    version = "2.2.0" # Added !tr with no args to translate last message
+    version = "2.3.0" # Cached, batched translations with per-channel usage
     description = "Translates text using the DeepL API."
+    config_restart_keys = ("api_keys.deepl_api_key",)
 
     def __init__(self, bot, api_key):
         super().__init__(bot)
@@ -42,6 +129,32 @@ class Translate(SimpleCommandModule):
         # Track recent messages per channel (max 50 per channel)
         self.recent_messages = {}  # {channel: [(username, message), ...]}
 
+        # (normalised text, source, target) -> (detected_lang, translated_text, expires_at)
+        self._cache: "OrderedDict[Tuple[str, str, str], Tuple[str, str, float]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._usage_lock = threading.Lock()
+        window_ms = float(self.get_config_value("batch_window_ms", default=300))
+        self.batcher = TranslationBatcher(self._translate_batch, window=max(0.0, window_ms / 1000.0))
+
+    def on_load(self):
+        # Counters are updated in memory on every translation and written out here.
+        interval = max(1, int(self.get_config_value("flush_interval_seconds", default=30)))
+        schedule.every(interval).seconds.do(self.save_state).tag(f"{self.name}-flush")
+
+    def on_unload(self):
+        schedule.clear(f"{self.name}-flush")
+        self.batcher.cancel()
+        super().on_unload()
+
+    def export_runtime(self) -> Dict[str, Any]:
+        return {"recent_messages": self.recent_messages, "cache": self._cache}
+
+    def import_runtime(self, runtime: Dict[str, Any]) -> None:
+        self.recent_messages = runtime.get("recent_messages", self.recent_messages)
+        self._cache = runtime.get("cache", self._cache)
+
     def _register_commands(self):
         """Registers all commands for the module."""
         self.register_command(
@@ -50,6 +163,13 @@ class Translate(SimpleCommandModule):
             name="translate langs",
             description="Get a link to supported language codes."
         )
+        self.register_command(
+            r"^\s*!translate\s+usage\s*$",
+            self._cmd_usage,
+            name="translate usage",
+            admin_only=True,
+            description="Show DeepL character usage per channel and cache statistics."
+        )
         self.register_command(
             r"^\s*!tr\s*$",
             self._cmd_translate_last,
@@ -129,31 +249,114 @@ class Translate(SimpleCommandModule):
         return self._do_translation(connection, event, username, last_message, target_lang, has_flavor)
 
     def _do_translation(self, connection, event, username, text_to_translate, target_lang, has_flavor):
-        """Shared translation logic."""
-        try:
-            normalized_lang = self._normalize_target_lang(target_lang, event.target)
-            result = self.translator.translate_text(text_to_translate, target_lang=normalized_lang)
-            detected_lang = result.detected_source_lang
-            translated_text = result.text
-
-            self.set_state("translations_done", self.get_state("translations_done", 0) + 1)
-            self.save_state()
+        """Shared translation logic: answers from the cache, otherwise queues the text for DeepL."""
+        normalized_lang = self._normalize_target_lang(target_lang, event.target)
+        text = normalize_text(text_to_translate)
+        channel = event.target
 
-            # Record achievement progress
-            achievement_hooks.record_translation(self.bot, username)
+        cached = self._cache_get(text, normalized_lang)
+        if cached is not None:
+            self._record_usage(channel, cached_chars=len(text))
+            self._reply_translation(connection, event, username, cached[0], cached[1], normalized_lang, has_flavor)
+            return True
 
-            if has_flavor:
-                self.safe_reply(connection, event, f"{self.bot.title_for(username)}, ({detected_lang} -> {normalized_lang}): \"{translated_text}\"")
+        def deliver(result, error, sent):
+            if error is not None or result is None:
+                self._reply_translation_error(connection, event, username, error, has_flavor)
+                return
+            # Only billed characters count as sent; a repeat in the same batch rode along for free.
+            if sent:
+                self._record_usage(channel, chars=len(text))
             else:
-                self.safe_reply(connection, event, f"({detected_lang} -> {normalized_lang}): \"{translated_text}\"")
+                self._record_usage(channel, cached_chars=len(text))
+            self._cache_put(text, normalized_lang, result.detected_source_lang, result.text)
+            self._reply_translation(connection, event, username, result.detected_source_lang, result.text,
+                                    normalized_lang, has_flavor)
 
-        except deepl.DeepLException as e:
-            self._record_error(f"DeepL API error: {e}")
-            if has_flavor:
-                self.safe_reply(connection, event, f"My apologies, {self.bot.title_for(username)}, an error occurred during translation. Please check the language code or try again later.")
-            else:
-                self.safe_reply(connection, event, "Translation error. Check language code or try again.")
+        self.batcher.submit(text, normalized_lang, deliver)
+        return True
 
+    def _translate_batch(self, texts: List[str], target_lang: str) -> List[Any]:
+        """One DeepL request for every text queued for `target_lang`."""
+        results = self.translator.translate_text(texts, target_lang=target_lang)
+        return results if isinstance(results, list) else [results]
+
+    def _reply_translation(self, connection, event, username, detected_lang, translated_text, normalized_lang, has_flavor):
+        self.set_state("translations_done", self.get_state("translations_done", 0) + 1)
+
+        # Record achievement progress
+        achievement_hooks.record_translation(self.bot, username)
+
+        if has_flavor:
+            self.safe_reply(connection, event, f"{self.bot.title_for(username)}, ({detected_lang} -> {normalized_lang}): \"{translated_text}\"")
+        else:
+            self.safe_reply(connection, event, f"({detected_lang} -> {normalized_lang}): \"{translated_text}\"")
+
+    def _reply_translation_error(self, connection, event, username, error, has_flavor):
+        self._record_error(f"DeepL API error: {error}")
+        if has_flavor:
+            self.safe_reply(connection, event, f"My apologies, {self.bot.title_for(username)}, an error occurred during translation. Please check the language code or try again later.")
+        else:
+            self.safe_reply(connection, event, "Translation error. Check language code or try again.")
+
+    # --- Translation cache ---
+
+    def _cache_get(self, text: str, target_lang: str, source_lang: str = "auto") -> Optional[Tuple[str, str]]:
+        key = (text, source_lang, target_lang)
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is None or entry[2] <= time.time():
+                if entry is not None:
+                    del self._cache[key]
+                self.cache_misses += 1
+                return None
+            self._cache.move_to_end(key)
+            self.cache_hits += 1
+            return entry[0], entry[1]
+
+    def _cache_put(self, text: str, target_lang: str, detected_lang: str, translated_text: str,
+                   source_lang: str = "auto") -> None:
+        ttl = float(self.get_config_value("cache_ttl_seconds", default=86400))
+        if ttl <= 0:
+            return
+        max_entries = int(self.get_config_value("cache_size", default=1000))
+        with self._cache_lock:
+            self._cache[(text, source_lang, target_lang)] = (detected_lang, translated_text, time.time() + ttl)
+            self._cache.move_to_end((text, source_lang, target_lang))
+            while len(self._cache) > max_entries:
+                self._cache.popitem(last=False)
+
+    # --- Usage tracking ---
+
+    def _record_usage(self, channel: str, chars: int = 0, cached_chars: int = 0) -> None:
+        """Tallies characters DeepL translated (and characters answered without a DeepL call) per channel."""
+        with self._usage_lock:
+            usage = self.get_state("char_usage", {})
+            entry = usage.setdefault(channel, {"chars": 0, "requests": 0, "cached_chars": 0})
+            entry["chars"] += chars
+            entry["cached_chars"] += cached_chars
+            entry["requests"] += 1
+            self.set_state("char_usage", usage)
+
+    def _cmd_usage(self, connection, event, msg, username, match):
+        """Handles !translate usage (admin)."""
+        usage = self.get_state("char_usage", {})
+        ranked = sorted(usage.items(), key=lambda item: item[1].get("chars", 0), reverse=True)
+        parts = [f"{channel}: {entry.get('chars', 0):,} chars / {entry.get('requests', 0)} req"
+                 f" ({entry.get('cached_chars', 0):,} from cache)" for channel, entry in ranked[:5]]
+        if len(ranked) > 5:
+            parts.append(f"+{len(ranked) - 5} more")
+        lookups = self.cache_hits + self.cache_misses
+        hit_ratio = (self.cache_hits / lookups * 100) if lookups else 0.0
+        parts.append(f"cache: {len(self._cache)} entries, {hit_ratio:.0f}% hits; "
+                     f"{self.batcher.requests} requests in {self.batcher.batches} DeepL calls")
+        try:
+            account = self.translator.get_usage().character if self.translator else None
+            if account is not None and account.limit:
+                parts.append(f"account: {account.count:,}/{account.limit:,} chars")
+        except Exception as e:
+            self.log_debug(f"DeepL usage lookup failed: {e}")
+        self.safe_reply(connection, event, "Translation usage: " + " | ".join(parts))
         return True
 
     def _cmd_translate(self, connection, event, msg, username, match):
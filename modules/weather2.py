@@ -3,12 +3,13 @@
 
 import re
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Any, Dict, Optional
 
 from .base import SimpleCommandModule
 from . import achievement_hooks
-from .http_utils import create_http_client
+from .http_utils import create_http_client, latency_budget
 
 
 # WMO Weather Code → Description mapping
@@ -47,8 +48,32 @@ WMO_CODES: Dict[int, str] = {
 OPEN_METEO_FORECAST_URL = "https://api.open-meteo.com/v1/forecast"
 OPEN_METEO_GEO_URL = "https://geocoding-api.open-meteo.com/v1/search"
 NWS_ALERTS_URL = "https://api.weather.gov/alerts/active"
+NWS_POINTS_URL = "https://api.weather.gov/points/{lat},{lon}"
+NWS_HEADERS = {
+    "User-Agent": "(jeeves-irc-bot)",
+    "Accept": "application/json",
+}
 WTTR_URL = "https://wttr.in"
 
+# Most of a command's latency budget Open-Meteo may use before we give up and
+# leave the rest for the wttr.in fallback. While Open-Meteo's circuit breaker
+# is open its calls fail immediately, so the fallback gets the whole budget.
+PRIMARY_BUDGET_SECONDS = 6.0
+
+# Lookups are cached per grid cell: coordinates rounded to 2 decimals (~1 km),
+# well inside the resolution of Open-Meteo's models. TTLs follow how often each
+# source actually changes.
+GRID_DECIMALS = 2
+CURRENT_CACHE_TTL = 600           # current conditions refresh every 15 min
+FORECAST_CACHE_TTL = 3600         # models run hourly at best
+FORECAST_STALE_TTL = 3 * 3600     # an hour-old forecast beats no forecast
+ALERT_ZONES_TTL = 30 * 86400      # NWS point -> zone mapping is static
+ALERTS_CACHE_TTL = 120
+
+# Batch "!w channel" replies: one Open-Meteo request for every grid cell.
+MAX_BATCH_CELLS = 9
+BATCH_CELLS_PER_LINE = 3
+
 CURRENT_PARAMS = (
     "temperature_2m,relative_humidity_2m,apparent_temperature,"
     "weather_code,wind_speed_10m,wind_gusts_10m,is_day"
@@ -68,12 +93,23 @@ class Weather2(SimpleCommandModule):
     description = (
         "Weather information using Open-Meteo (worldwide, no API key)."
     )
+    DEFAULT_LATENCY_BUDGET = 12.0
+    DEFAULT_MAX_WORKERS = 4
+    DEFAULT_MAX_QUEUED = 16
 
     def __init__(self, bot):
         super().__init__(bot)
         self.forecast_http = create_http_client(timeout=8, max_retries=0)
         self.fallback_http = create_http_client(timeout=8, max_retries=0)
 
+        # Lookups run on a small pool; requests beyond the queue limit are refused.
+        workers = int(self.get_config_value("max_workers", default=self.DEFAULT_MAX_WORKERS))
+        queued = int(self.get_config_value("max_queued", default=self.DEFAULT_MAX_QUEUED))
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, workers), thread_name_prefix="weather2"
+        )
+        self._slots = threading.BoundedSemaphore(max(1, workers) + max(0, queued))
+
         # Auto-migrate locations from the old 'weather' module on first load.
         if not self.get_state("user_locations"):
             old_state = self.bot.get_module_state("weather")
@@ -94,10 +130,24 @@ class Weather2(SimpleCommandModule):
 
     def on_unload(self) -> None:
         """Close module-specific HTTP sessions and persist state."""
-        self.forecast_http.close()
-        self.fallback_http.close()
+        if not getattr(self, "_sessions_exported", False):
+            self.forecast_http.close()
+            self.fallback_http.close()
+        self._executor.shutdown(wait=False)
         super().on_unload()
 
+    def export_runtime(self) -> Optional[Dict[str, Any]]:
+        """Hand the pooled HTTP sessions to the reloaded instance instead of closing them."""
+        self._sessions_exported = True
+        return {"forecast_http": self.forecast_http, "fallback_http": self.fallback_http}
+
+    def import_runtime(self, runtime: Dict[str, Any]) -> None:
+        for attr in ("forecast_http", "fallback_http"):
+            client = runtime.get(attr)
+            if client is not None:
+                getattr(self, attr).close()
+                setattr(self, attr, client)
+
     # ------------------------------------------------------------------
     # Command registration
     # ------------------------------------------------------------------
@@ -135,6 +185,13 @@ class Weather2(SimpleCommandModule):
             name="weather",
             description="Get weather for your location",
         )
+        self.register_command(
+            r"^\s*!(?:weather|w)\s+(?:channel|all)\s*$",
+            self._cmd_weather_channel,
+            name="weather channel",
+            description="Current weather for everyone here with a saved location",
+            cooldown=60.0,
+        )
         self.register_command(
             r"^\s*!weather\s+(.+)$",
             self._cmd_weather_other,
@@ -191,22 +248,58 @@ class Weather2(SimpleCommandModule):
                     self.safe_reply(connection, event, "No default location set.")
                 return True
 
-            self._run_async(
-                self._reply_with_weather, connection, event, location_obj, username
+            return self._submit(
+                connection, event, username,
+                self._reply_with_weather, connection, event, location_obj, username,
             )
-            return True
         return False
 
     # ------------------------------------------------------------------
     # Async runner
     # ------------------------------------------------------------------
 
-    def _run_async(self, fn, *args, **kwargs):
-        """Run fn(*args, **kwargs) in a daemon thread."""
-        t = threading.Thread(
-            target=fn, args=args, kwargs=kwargs, daemon=True
+    def _run_async(self, fn, *args, **kwargs) -> bool:
+        """Queue fn(*args, **kwargs) on the worker pool, under the module's latency budget.
+
+        Returns False without queueing anything if the pool's queue is full.
+        """
+        if not self._slots.acquire(blocking=False):
+            self._record_error("Weather request queue is full; refusing request", severity="WARNING")
+            return False
+
+        budget = self.get_config_value(
+            "latency_budget_seconds", default=self.DEFAULT_LATENCY_BUDGET
         )
-        t.start()
+
+        def run():
+            try:
+                with latency_budget(budget):
+                    fn(*args, **kwargs)
+            except Exception as exc:
+                self._record_error(f"Weather lookup failed: {exc}")
+            finally:
+                self._slots.release()
+
+        try:
+            self._executor.submit(run)
+        except RuntimeError:  # pool already shut down by an unload
+            self._slots.release()
+            return False
+        return True
+
+    def _submit(self, connection, event, requester: str, fn, *args, **kwargs) -> bool:
+        """_run_async for command handlers: tells the requester when we're too busy."""
+        if not self._run_async(fn, *args, **kwargs):
+            if self.has_flavor_enabled(requester):
+                self.safe_reply(
+                    connection,
+                    event,
+                    f"Forgive me, {self.bot.title_for(requester)}, I am "
+                    "swamped with weather requests. Do ask again shortly.",
+                )
+            else:
+                self.safe_reply(connection, event, "Weather service busy; try again shortly.")
+        return True
 
     # ------------------------------------------------------------------
     # Open-Meteo API calls
@@ -307,6 +400,24 @@ class Weather2(SimpleCommandModule):
             self._record_error("HTTP client not available for geocoding")
             return None
 
+        cache_query = self._expand_state_abbrevs(query)
+        cached = self.geocache.get("open-meteo", cache_query)
+        if cached is not self.geocache.MISS:
+            return dict(cached, user_input=query) if cached else None
+
+        try:
+            geo = self._geocode_lookup(query)
+        except Exception as exc:
+            self._record_error(
+                f"Geocoding request failed for '{query}': {exc}"
+            )
+            return None
+
+        self.geocache.put("open-meteo", cache_query, geo)
+        return dict(geo, user_input=query) if geo else None
+
+    def _geocode_lookup(self, query: str) -> Optional[Dict[str, Any]]:
+        """Query Open-Meteo geocoding, trying name variants; raises on HTTP errors."""
         state_query = self._split_us_state_query(query)
         country_query = None if state_query else self._split_us_country_query(query)
         lookup_name = (
@@ -328,14 +439,7 @@ class Weather2(SimpleCommandModule):
             if state_query or country_query:
                 params["countryCode"] = "US"
 
-            try:
-                data = self.http.get_json(OPEN_METEO_GEO_URL, params=params)
-            except Exception as exc:
-                self._record_error(
-                    f"Geocoding request failed for '{query}': {exc}"
-                )
-                return None
-
+            data = self.http.get_json(OPEN_METEO_GEO_URL, params=params)
             results = data.get("results")
             if not results:
                 continue
@@ -391,25 +495,35 @@ class Weather2(SimpleCommandModule):
             "lon": lon,
             "short_name": short_name,
             "display_name": display_name,
-            "user_input": query,
         }
 
+    @staticmethod
+    def _grid(lat, lon) -> tuple[str, str]:
+        """Snap coordinates to the cache grid cell containing them."""
+        return (
+            f"{round(float(lat), GRID_DECIMALS):.{GRID_DECIMALS}f}",
+            f"{round(float(lon), GRID_DECIMALS):.{GRID_DECIMALS}f}",
+        )
+
     def _fetch_current(
         self, lat: str, lon: str
     ) -> Optional[Dict[str, Any]]:
         """Fetch current conditions from Open-Meteo forecast API."""
+        lat, lon = self._grid(lat, lon)
         try:
-            data = self.forecast_http.get_json(
-                OPEN_METEO_FORECAST_URL,
-                params={
-                    "latitude": lat,
-                    "longitude": lon,
-                    "current": CURRENT_PARAMS,
-                    "temperature_unit": "celsius",
-                    "wind_speed_unit": "kmh",
-                    "timezone": "auto",
-                },
-            )
+            with latency_budget(PRIMARY_BUDGET_SECONDS):
+                data = self.forecast_http.get_json(
+                    OPEN_METEO_FORECAST_URL,
+                    params={
+                        "latitude": lat,
+                        "longitude": lon,
+                        "current": CURRENT_PARAMS,
+                        "temperature_unit": "celsius",
+                        "wind_speed_unit": "kmh",
+                        "timezone": "auto",
+                    },
+                    cache_ttl=CURRENT_CACHE_TTL,
+                )
         except Exception as exc:
             self._record_error(
                 f"Open-Meteo current request failed; trying wttr.in: {exc}",
@@ -423,19 +537,23 @@ class Weather2(SimpleCommandModule):
         self, lat: str, lon: str
     ) -> Optional[Dict[str, Any]]:
         """Fetch daily forecast from Open-Meteo (today + 3 days)."""
+        lat, lon = self._grid(lat, lon)
         try:
-            data = self.forecast_http.get_json(
-                OPEN_METEO_FORECAST_URL,
-                params={
-                    "latitude": lat,
-                    "longitude": lon,
-                    "daily": DAILY_PARAMS,
-                    "temperature_unit": "celsius",
-                    "wind_speed_unit": "kmh",
-                    "timezone": "auto",
-                    "forecast_days": 4,
-                },
-            )
+            with latency_budget(PRIMARY_BUDGET_SECONDS):
+                data = self.forecast_http.get_json(
+                    OPEN_METEO_FORECAST_URL,
+                    params={
+                        "latitude": lat,
+                        "longitude": lon,
+                        "daily": DAILY_PARAMS,
+                        "temperature_unit": "celsius",
+                        "wind_speed_unit": "kmh",
+                        "timezone": "auto",
+                        "forecast_days": 4,
+                    },
+                    cache_ttl=FORECAST_CACHE_TTL,
+                    stale_ttl=FORECAST_STALE_TTL,
+                )
         except Exception as exc:
             self._record_error(
                 f"Open-Meteo forecast request failed; trying wttr.in: {exc}",
@@ -445,6 +563,40 @@ class Weather2(SimpleCommandModule):
 
         return data.get("daily")
 
+    def _fetch_current_batch(
+        self, cells: list[tuple[str, str]]
+    ) -> Optional[list]:
+        """Fetch current conditions for several grid cells in one request.
+
+        Returns one ``current`` dict (or None) per cell, in order.
+        """
+        try:
+            with latency_budget(PRIMARY_BUDGET_SECONDS):
+                data = self.forecast_http.get_json(
+                    OPEN_METEO_FORECAST_URL,
+                    params={
+                        "latitude": ",".join(lat for lat, _ in cells),
+                        "longitude": ",".join(lon for _, lon in cells),
+                        "current": CURRENT_PARAMS,
+                        "temperature_unit": "celsius",
+                        "wind_speed_unit": "kmh",
+                        "timezone": "auto",
+                    },
+                    cache_ttl=CURRENT_CACHE_TTL,
+                )
+        except Exception as exc:
+            self._record_error(
+                f"Open-Meteo batch request failed: {exc}", severity="WARNING"
+            )
+            return None
+
+        # Open-Meteo answers a single location with an object, several with a list.
+        results = data if isinstance(data, list) else [data]
+        if len(results) != len(cells):
+            self._record_error("Open-Meteo batch response did not match the request")
+            return None
+        return [item.get("current") if isinstance(item, dict) else None for item in results]
+
     def _fetch_wttr_current(
         self, lat: str, lon: str
     ) -> Optional[Dict[str, Any]]:
@@ -655,6 +807,34 @@ class Weather2(SimpleCommandModule):
     # Alerts
     # ------------------------------------------------------------------
 
+    def _alert_zones(self, lat: str, lon: str) -> Optional[str]:
+        """NWS forecast and county zone ids for a grid cell, e.g. ``"FLZ151,FLC057"``.
+
+        Returns "" for points NWS doesn't cover (cached, so non-US locations
+        stop costing a request) and None if the lookup failed.
+        """
+        try:
+            data = self.http.get_json(
+                NWS_POINTS_URL.format(lat=lat, lon=lon),
+                headers=NWS_HEADERS,
+                cache_ttl=ALERT_ZONES_TTL,
+                negative_ttl=ALERT_ZONES_TTL,
+            )
+        except Exception as exc:
+            response = getattr(exc, "response", None)
+            if response is not None and response.status_code == 404:
+                return ""
+            self._record_error(f"NWS zone lookup failed: {exc}", severity="WARNING")
+            return None
+
+        props = data.get("properties") or {}
+        zones = [
+            props[field].rstrip("/").rsplit("/", 1)[-1]
+            for field in ("forecastZone", "county")
+            if isinstance(props.get(field), str) and props[field]
+        ]
+        return ",".join(zones) or None
+
     def _fetch_alerts(self, lat: str, lon: str) -> list:
         """Fetch active weather alerts from the US NWS API.
 
@@ -665,18 +845,20 @@ class Weather2(SimpleCommandModule):
             self._record_error("HTTP client not available for alerts")
             return []
 
+        lat, lon = self._grid(lat, lon)
+        zones = self._alert_zones(lat, lon)
+        if zones == "":
+            return []  # outside NWS coverage
+
+        # Alerts are cached per zone, so everyone in the same county shares them.
+        params = {"zone": zones} if zones else {"point": f"{lat},{lon}"}
+        params.update({"status": "actual", "message_type": "alert"})
         try:
             data = self.http.get_json(
                 NWS_ALERTS_URL,
-                params={
-                    "point": f"{lat},{lon}",
-                    "status": "actual",
-                    "message_type": "alert",
-                },
-                headers={
-                    "User-Agent": "(jeeves-irc-bot)",
-                    "Accept": "application/json",
-                },
+                params=params,
+                headers=NWS_HEADERS,
+                cache_ttl=ALERTS_CACHE_TTL,
             )
         except Exception as exc:
             self._record_error(f"Alerts request failed: {exc}")
@@ -831,10 +1013,85 @@ class Weather2(SimpleCommandModule):
             else:
                 self.safe_reply(connection, event, "Could not fetch forecast.")
 
+    def _reply_with_channel_weather(
+        self, connection, event, cells: Dict[tuple, Dict[str, Any]],
+        requester: str,
+    ) -> None:
+        """Answer a channel-wide request with one Open-Meteo call for all cells."""
+        shown = list(cells.items())[:MAX_BATCH_CELLS]
+        results = self._fetch_current_batch([cell for cell, _ in shown])
+        if results is None:
+            if self.has_flavor_enabled(requester):
+                self.safe_reply(
+                    connection,
+                    event,
+                    f"My apologies, {self.bot.title_for(requester)}, "
+                    "I could not fetch the weather.",
+                )
+            else:
+                self.safe_reply(connection, event, "Could not fetch weather.")
+            return
+
+        parts = []
+        for (_, group), current in zip(shown, results):
+            summary = self._format_batch_summary(current) if current else "unavailable"
+            parts.append(f"{group['name']} ({', '.join(group['nicks'])}): {summary}")
+        lines = [
+            " | ".join(parts[i:i + BATCH_CELLS_PER_LINE])
+            for i in range(0, len(parts), BATCH_CELLS_PER_LINE)
+        ]
+        if len(cells) > len(shown):
+            lines.append(f"...and {len(cells) - len(shown)} more places.")
+        self.safe_reply(connection, event, "\n".join(lines))
+
+    def _format_batch_summary(self, current: Dict[str, Any]) -> str:
+        """One-cell summary for channel-wide replies: condition and temperature."""
+        condition = self._describe_weather_code(current.get("weather_code"))
+        temp_c = current.get("temperature_2m")
+        if temp_c is None:
+            return condition
+        return f"{condition}, {self._c_to_f(temp_c)}°F/{temp_c}°C"
+
+    def _channel_location_cells(self, channel: str) -> Dict[tuple, Dict[str, Any]]:
+        """Group the channel's members with saved locations by grid cell."""
+        channel_obj = (getattr(self.bot, "channels", None) or {}).get(channel)
+        if channel_obj is None:
+            return {}
+        users_module = self.bot.pm.plugins.get("users")
+        nick_map = users_module.get_state("nick_map", {}) if users_module else {}
+        locations = self.get_state("user_locations", {})
+
+        cells: Dict[tuple, Dict[str, Any]] = {}
+        for nick in sorted(channel_obj.users(), key=str.casefold):
+            location_obj = locations.get(nick_map.get(nick.lower()))
+            if not location_obj:
+                continue
+            cell = self._grid(location_obj["lat"], location_obj["lon"])
+            group = cells.setdefault(cell, {
+                "name": location_obj.get("short_name")
+                or location_obj.get("user_input")
+                or f"{cell[0]},{cell[1]}",
+                "nicks": [],
+            })
+            group["nicks"].append(nick)
+        return cells
+
     # ------------------------------------------------------------------
     # Command handlers
     # ------------------------------------------------------------------
 
+    def _cmd_weather_channel(self, connection, event, msg, username, match):
+        cells = self._channel_location_cells(event.target)
+        if not cells:
+            self.safe_reply(
+                connection, event, "Nobody here has set a location with !location yet."
+            )
+            return True
+        return self._submit(
+            connection, event, username,
+            self._reply_with_channel_weather, connection, event, cells, username,
+        )
+
     def _cmd_set_location(self, connection, event, msg, username, match):
         location_input = match.group(1).strip()
         geo = self._geocode(location_input)
@@ -940,10 +1197,10 @@ class Weather2(SimpleCommandModule):
             else:
                 self.safe_reply(connection, event, "No location set.")
             return True
-        self._run_async(
-            self._reply_with_weather, connection, event, location_obj, username
+        return self._submit(
+            connection, event, username,
+            self._reply_with_weather, connection, event, location_obj, username,
         )
-        return True
 
     def _cmd_weather_other(self, connection, event, msg, username, match):
         query = match.group(1).strip()
@@ -958,12 +1215,12 @@ class Weather2(SimpleCommandModule):
         if target_user_id and (
             location_obj := self.get_state("user_locations", {}).get(target_user_id)
         ):
-            self._run_async(
+            return self._submit(
+                connection, event, username,
                 self._reply_with_weather,
                 connection, event, location_obj, username,
                 target_user=query,
             )
-            return True
 
         def _lookup_and_reply():
             geo = self._geocode(query)
@@ -984,8 +1241,7 @@ class Weather2(SimpleCommandModule):
                 return
             self._reply_with_weather(connection, event, geo, username)
 
-        self._run_async(_lookup_and_reply)
-        return True
+        return self._submit(connection, event, username, _lookup_and_reply)
 
     def _cmd_forecast_self(self, connection, event, msg, username, match):
         user_id = self.bot.get_user_id(username)
@@ -1001,10 +1257,10 @@ class Weather2(SimpleCommandModule):
             else:
                 self.safe_reply(connection, event, "No location set.")
             return True
-        self._run_async(
-            self._reply_with_forecast, connection, event, location_obj, username
+        return self._submit(
+            connection, event, username,
+            self._reply_with_forecast, connection, event, location_obj, username,
         )
-        return True
 
     def _cmd_forecast_other(self, connection, event, msg, username, match):
         query = match.group(1).strip()
@@ -1019,11 +1275,11 @@ class Weather2(SimpleCommandModule):
         if target_user_id and (
             location_obj := self.get_state("user_locations", {}).get(target_user_id)
         ):
-            self._run_async(
+            return self._submit(
+                connection, event, username,
                 self._reply_with_forecast,
                 connection, event, location_obj, username,
             )
-            return True
 
         def _lookup_and_reply():
             geo = self._geocode(query)
@@ -1044,8 +1300,7 @@ class Weather2(SimpleCommandModule):
                 return
             self._reply_with_forecast(connection, event, geo, username)
 
-        self._run_async(_lookup_and_reply)
-        return True
+        return self._submit(connection, event, username, _lookup_and_reply)
 
 
 def setup(bot):
@@ -0,0 +1,90 @@
+import json
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+from web.stats.absurdia import AbsurdiaReader
+from web.stats.data_loader import JeevesStatsLoader
+
+
+def _create_db(path: Path) -> None:
+    with sqlite3.connect(path) as conn:
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("""CREATE TABLE players (
+            user_id TEXT PRIMARY KEY, username TEXT NOT NULL, coins INTEGER DEFAULT 1000,
+            total_arena_wins INTEGER DEFAULT 0, total_arena_losses INTEGER DEFAULT 0,
+            current_win_streak INTEGER DEFAULT 0, best_win_streak INTEGER DEFAULT 0)""")
+        conn.execute("""CREATE TABLE creatures (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, owner_id TEXT NOT NULL, name TEXT NOT NULL,
+            rarity TEXT NOT NULL, creature_type TEXT NOT NULL)""")
+        conn.execute("CREATE INDEX idx_creatures_owner_rarity ON creatures(owner_id, rarity)")
+        conn.executemany("INSERT INTO players (user_id, username, total_arena_wins, total_arena_losses) VALUES (?, ?, ?, ?)",
+                         [("u1", "alice", 3, 1), ("u2", "bob", 0, 0)])
+        conn.executemany("INSERT INTO creatures (owner_id, name, rarity, creature_type) VALUES (?, ?, ?, 'blob')",
+                         [("u1", "a", "common"), ("u1", "b", "rare"), ("u1", "c", "rare"), ("ghost", "d", "epic")])
+    conn.close()
+
+
+class TestAbsurdiaReader(unittest.TestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.db = Path(tmpdir.name) / "absurdia.db"
+        _create_db(self.db)
+        self.reader = AbsurdiaReader(self.db)
+        self.addCleanup(self.reader.close)
+
+    def test_aggregates_in_sql(self):
+        players = self.reader.load()["players"]
+        self.assertEqual(set(players), {"u1", "u2"})
+        self.assertEqual(players["u1"]["win_rate"], 0.75)
+        self.assertEqual(players["u1"]["creature_count"], 3)
+        self.assertEqual((players["u1"]["common_count"], players["u1"]["rare_count"], players["u1"]["epic_count"]), (1, 2, 0))
+        self.assertNotIn("creature_count", players["u2"])
+
+    def test_cached_until_another_connection_commits(self):
+        first = self.reader.load()
+        self.assertIs(self.reader.load(), first)
+        self.assertEqual(self.reader.queries, 1)
+
+        with sqlite3.connect(self.db) as writer:
+            writer.execute("UPDATE players SET total_arena_wins = 9 WHERE user_id = 'u2'")
+        writer.close()
+
+        second = self.reader.load()
+        self.assertIsNot(second, first)
+        self.assertEqual(second["players"]["u2"]["total_arena_wins"], 9)
+        self.assertEqual(self.reader.queries, 2)
+
+    def test_connections_are_read_only_and_reused(self):
+        with self.reader.connection() as conn:
+            with self.assertRaises(sqlite3.OperationalError):
+                conn.execute("DELETE FROM players")
+        with self.reader.connection() as again:
+            pass
+        self.assertIs(again, conn)
+
+    def test_missing_database(self):
+        reader = AbsurdiaReader(self.db.with_name("missing.db"))
+        self.assertEqual(reader.load(), {"players": {}})
+        self.assertIsNone(reader.version())
+
+
+class TestLoaderIntegration(unittest.TestCase):
+    def test_unchanged_database_keeps_the_category_object(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config = Path(tmpdir)
+            (config / "games.json").write_text(json.dumps({"modules": {}}))
+            _create_db(config / "absurdia.db")
+            loader = JeevesStatsLoader(config)
+            self.addCleanup(loader.close)
+
+            first = loader.load_all()
+            self.assertIs(loader.load_all()["absurdia"], first["absurdia"])
+            self.assertEqual(loader.absurdia.queries, 1)
+            self.assertEqual(first["absurdia"]["players"]["u1"]["total_arena_wins"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
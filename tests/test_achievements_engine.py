@@ -0,0 +1,120 @@
+import json
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+import jeeves
+from modules.achievements import ACHIEVEMENTS, METRIC_INDEX, Achievements
+from modules.event_bus import METRIC_BEST, METRIC_INCREMENT, Event, EventBus
+
+
+class _BotStub:
+    def __init__(self):
+        self.config = {}
+        self._states = {}
+        self.saves = 0
+        self.events = EventBus(threaded=False)
+        self.connection = SimpleNamespace(sent=[], privmsg=lambda target, text: self.connection.sent.append((target, text)))
+
+    def get_module_state(self, name):
+        return self._states.setdefault(name, {})
+
+    def update_module_state(self, name, updates):
+        self.saves += 1
+        self._states.setdefault(name, {}).update(updates)
+
+    def get_user_id(self, username):
+        return username.lower()
+
+    def log_debug(self, message):
+        pass
+
+
+def _event(topic, **data):
+    return Event(topic, data, time.time())
+
+
+class TestMetricIndex(unittest.TestCase):
+    def test_index_covers_every_dict_requirement(self):
+        for ach_id, ach_def in ACHIEVEMENTS.items():
+            requirement = ach_def.get("requirement")
+            if isinstance(requirement, dict):
+                for metric in requirement:
+                    self.assertIn(ach_id, METRIC_INDEX[metric])
+
+    def test_index_does_not_cross_metrics(self):
+        self.assertNotIn("quest_novice", METRIC_INDEX["fish_caught"])
+
+
+class TestAchievementsEngine(unittest.TestCase):
+    def setUp(self):
+        self.bot = _BotStub()
+        self.achievements = Achievements(self.bot)
+        self.achievements._opted_in.add("alice")
+
+    def test_batch_is_coalesced_into_one_state_update(self):
+        saves_before = self.bot.saves
+        batch = [_event(METRIC_INCREMENT, username="Alice", metric="coffees_ordered", amount=1) for _ in range(24)]
+        batch.append(_event(METRIC_BEST, username="Alice", metric="win_streak", value=3))
+        batch.append(_event(METRIC_BEST, username="Alice", metric="win_streak", value=2))
+
+        self.achievements._on_metric_events(batch)
+
+        progress = self.achievements.get_state("user_achievements")["alice"]["progress"]
+        self.assertEqual(progress["coffees_ordered"], 24)
+        self.assertEqual(progress["win_streak"], 3)
+        # Plain progress stays in memory until the periodic flush.
+        self.assertEqual(self.bot.saves, saves_before)
+
+        self.achievements.save_state()
+        self.assertEqual(self.bot.saves, saves_before + 1)
+
+    def test_unlock_is_announced_and_saved_immediately(self):
+        saves_before = self.bot.saves
+        batch = [_event(METRIC_INCREMENT, username="Alice", metric="coffees_ordered", amount=1) for _ in range(25)]
+
+        self.achievements._on_metric_events(batch)
+
+        self.assertIn(("#achievements", "🏆 Alice unlocked achievement: Coffee Drinker!"), self.bot.connection.sent)
+        self.assertGreater(self.bot.saves, saves_before)
+
+    def test_untracked_users_are_skipped(self):
+        self.achievements._on_metric_events([_event(METRIC_INCREMENT, username="Bob", metric="fish_caught", amount=1)])
+        self.assertNotIn("bob", self.achievements.get_state("user_achievements"))
+
+    def test_joining_channel_opts_in(self):
+        join = SimpleNamespace(target="#achievements", source=SimpleNamespace(nick="Carol"))
+        self.achievements.safe_privmsg = lambda *args: True
+
+        self.achievements.on_join(None, join)
+
+        self.assertTrue(self.achievements.is_tracking("carol"))
+        self.assertIn("carol", self.achievements.get_state("opted_in_users"))
+
+
+class TestShutdownSave(unittest.TestCase):
+    def test_pending_progress_reaches_disk_on_shutdown(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        manager = jeeves.MultiFileStateManager(tmpdir.name)
+        bot = _BotStub()
+        bot.get_module_state = manager.get_module_state
+        # Copy on the way in, so only what the module hands over counts as saved.
+        bot.update_module_state = lambda name, updates: manager.update_module_state(name, json.loads(json.dumps(updates)))
+        bot.pm = jeeves.PluginManager(bot)
+        achievements = bot.pm.plugins["achievements"] = Achievements(bot)
+        achievements.on_load()
+        achievements._opted_in.add("alice")
+
+        bot.events.publish(METRIC_INCREMENT, username="Alice", metric="coffees_ordered", amount=3)
+        jeeves.save_for_shutdown(bot, manager)
+
+        saved = json.loads((Path(tmpdir.name) / "state.json").read_text())
+        progress = saved["modules"]["achievements"]["user_achievements"]["alice"]["progress"]
+        self.assertEqual(progress["coffees_ordered"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
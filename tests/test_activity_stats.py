@@ -58,6 +58,14 @@ class TestActivityStats(unittest.TestCase):
         self.assertEqual(top_hours[0][0], 13)
         self.assertGreater(top_hours[0][1], 0)
 
+    def test_bucket_defaults_do_not_touch_the_shared_stats(self) -> None:
+        stored = {"grid": [1] * (7 * 24)}
+        agg = StatsAggregator({"activity": {"global": stored, "channels": {}, "users": {}}})
+
+        bucket = agg.get_activity_bucket_global()
+        self.assertEqual((bucket["total"], bucket["updated_at"]), (0, None))
+        self.assertEqual(stored, {"grid": [1] * (7 * 24)})
+
     def test_channel_filtering(self) -> None:
         available = ["#a", "#b", "#c"]
         self.assertEqual(filter_channels(available, visible_channels=None, hidden_channels=["#b"]), ["#a", "#c"])
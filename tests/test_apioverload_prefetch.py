@@ -0,0 +1,122 @@
+import unittest
+from unittest import mock
+
+from modules.apioverload import ApiOverload
+from tests.test_weather2_geocode import BotStub, ConnectionStub, event
+
+
+class _Response:
+    def __init__(self, data, status_code=200):
+        self.data = data
+        self.status_code = status_code
+
+    def json(self):
+        return self.data
+
+    def raise_for_status(self):
+        pass
+
+
+class _Session:
+    def __init__(self):
+        self.calls = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.calls.append(url)
+        if "icanhazdadjoke" in url:
+            return _Response({"joke": f"joke {len(self.calls)}"})
+        if "cataas" in url:
+            return _Response({"url": f"https://cataas.com/cat/{len(self.calls)}", "tags": []})
+        return _Response([{"name": "Brew", "brewery_type": "micro", "city": "Bend"}])
+
+
+class LookupHTTP:
+    def __init__(self, data):
+        self.data = data
+        self.calls = []
+
+    def get_json(self, url, params=None, headers=None, **cache_options):
+        self.calls.append((url, cache_options))
+        return self.data
+
+
+class TestPrefetchBuffers(unittest.TestCase):
+    def setUp(self):
+        self.module = ApiOverload(BotStub())
+        self.session = self.module.http_session = _Session()
+        patcher = mock.patch.object(self.module, "_refill_async")
+        self.refill_async = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _say(self, text):
+        self.requests = getattr(self, "requests", 0) + 1
+        connection = ConnectionStub()
+        self.assertTrue(self.module._dispatch_commands(connection, event(), text, f"user{self.requests}"))
+        return connection.messages[-1][1]
+
+    def test_commands_answer_from_the_buffer(self):
+        self.assertEqual(self.module._refill("dad"), 5)
+        fetched = len(self.session.calls)
+
+        self.assertEqual(self._say("!dad"), "joke 1")
+        self.assertEqual(len(self.session.calls), fetched)
+        self.refill_async.assert_called_with("dad")
+
+    def test_empty_buffer_falls_back_to_a_live_call(self):
+        reply = self._say("!cat")
+        self.assertEqual(reply, "Here's a cat: https://cataas.com/cat/1")
+        self.assertEqual(len(self.session.calls), 1)
+
+    def test_refills_respect_the_per_endpoint_rate(self):
+        self.module.bot.config["apioverload"] = {"prefetch_per_minute": 2}
+        self.assertEqual(self.module._refill("brewery"), 2)
+        self.assertEqual(self.module._refill("brewery"), 0)
+        self.assertEqual(len(self.module._buffers["brewery"]), 2)
+        self.assertTrue(self._say("!brewery").startswith("Brew (Micro) - Bend"))
+
+    def test_buffers_survive_a_reload(self):
+        self.module._refill("dad")
+        reloaded = ApiOverload(BotStub())
+        reloaded.import_runtime(self.module.export_runtime())
+        self.assertEqual(list(reloaded._buffers["dad"]), list(self.module._buffers["dad"]))
+
+
+class TestLookupCaches(unittest.TestCase):
+    def test_lookups_go_through_the_shared_cache_with_a_ttl(self):
+        module = ApiOverload(BotStub())
+        module.http = LookupHTTP({"artists": [{"name": "Boards of Canada", "type": "Group"}]})
+        connection = ConnectionStub()
+
+        module._dispatch_commands(connection, event(), "!music boards of canada", "nick")
+
+        self.assertTrue(connection.messages[-1][1].startswith("\x02Boards of Canada\x02 (Group)"))
+        url, options = module.http.calls[0]
+        self.assertIn("musicbrainz.org", url)
+        self.assertEqual(options["cache_ttl"], ApiOverload.LOOKUP_TTLS["music"])
+
+    def test_holiday_lookups_without_a_list_report_a_fetch_failure(self):
+        module = ApiOverload(BotStub())
+        for n, (data, command) in enumerate([(None, "!holiday"), (None, "!holiday de"),
+                                             ({"message": "rate limited"}, "!holiday de")]):
+            module.http = LookupHTTP(data)
+            connection = ConnectionStub()
+            module._dispatch_commands(connection, event(), command, f"nick{n}")
+            self.assertEqual(connection.messages[-1][1],
+                             "Unable to fetch holiday information at the moment. Please try again later.")
+
+    def test_fallback_session_errors_are_returned_not_raised(self):
+        module = ApiOverload(BotStub())
+        module.http = None
+        failing = mock.Mock()
+        failing.get.return_value.raise_for_status.side_effect = RuntimeError("503")
+        module.http_session = failing
+
+        self.assertEqual(module._lookup_json("music", "https://example/x", "Example", "Try later."), (None, "Try later."))
+
+        failing.get.return_value.raise_for_status.side_effect = None
+        failing.get.return_value.json.side_effect = ValueError("not JSON")
+        self.assertEqual(module._lookup_json("music", "https://example/x", "Example", "Try later."), (None, "Try later."))
+
+
+if __name__ == "__main__":
+    unittest.main()
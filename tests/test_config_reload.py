@@ -0,0 +1,114 @@
+import unittest
+
+from jeeves import Jeeves, config_paths_overlap, diff_config
+
+
+class _ModuleStub:
+    def __init__(self, config_sections=(), config_restart_keys=()):
+        self.config_sections = config_sections
+        self.config_restart_keys = config_restart_keys
+        self.reloads = []
+
+    def on_config_reload(self, new_config):
+        self.reloads.append(new_config)
+
+
+class _PluginManagerStub:
+    def __init__(self, plugins):
+        self.plugins = plugins
+        self.restarted = []
+        self.blacklist_synced = False
+        self.retried = False
+
+    def reload_module(self, name):
+        self.restarted.append(name)
+        return True
+
+    def sync_blacklist(self):
+        self.blacklist_synced = True
+        return ["gif"], []
+
+    def retry_unavailable(self):
+        self.retried = True
+        return ["translate"]
+
+
+def _make_bot(plugins, config):
+    bot = Jeeves.__new__(Jeeves)
+    bot.pm = _PluginManagerStub(plugins)
+    bot.config = config
+    bot.log_debug = lambda message: None
+    return bot
+
+
+class TestDiffConfig(unittest.TestCase):
+    def test_nested_changes_produce_dotted_paths(self):
+        old = {"weather2": {"units": "metric", "channels": {"#a": {"x": 1}}}, "core": {"admins": ["Alice"]}}
+        new = {"weather2": {"units": "imperial", "channels": {"#a": {"x": 1}}}, "core": {"admins": ["Alice"]}, "gif": {}}
+        self.assertEqual(diff_config(old, new), ["gif", "weather2.units"])
+
+    def test_identical_configs_have_no_changes(self):
+        config = {"core": {"admins": ["Alice"]}, "quest": {"xp": [1, 2, 3]}}
+        self.assertEqual(diff_config(config, {"core": {"admins": ["Alice"]}, "quest": {"xp": [1, 2, 3]}}), [])
+
+    def test_overlap_matches_parents_and_children(self):
+        self.assertTrue(config_paths_overlap(["api_keys.giphy"], ("api_keys",)))
+        self.assertTrue(config_paths_overlap(["api_keys"], ("api_keys.giphy",)))
+        self.assertFalse(config_paths_overlap(["api_keys.deepl_api_key"], ("api_keys.giphy",)))
+        self.assertFalse(config_paths_overlap(["weather2x.units"], ("weather2",)))
+
+
+class TestTargetedConfigReload(unittest.TestCase):
+    def test_only_changed_sections_are_notified(self):
+        weather = _ModuleStub()
+        quest = _ModuleStub()
+        bot = _make_bot({"weather2": weather, "quest": quest}, {"weather2": {"units": "imperial"}})
+
+        summary = bot._apply_config_changes(["weather2.units"])
+
+        self.assertEqual(weather.reloads, [{"units": "imperial"}])
+        self.assertEqual(quest.reloads, [])
+        self.assertEqual(summary["notified"], ["weather2"])
+        self.assertEqual(bot.pm.restarted, [])
+
+    def test_extra_config_sections_are_watched(self):
+        discord = _ModuleStub(config_sections=("admin_api",))
+        bot = _make_bot({"discord": discord}, {})
+
+        bot._apply_config_changes(["admin_api.port"])
+
+        self.assertEqual(discord.reloads, [{}])
+
+    def test_restart_keys_reload_module_instead_of_notifying(self):
+        gif = _ModuleStub(config_restart_keys=("api_keys.giphy",))
+        shorten = _ModuleStub(config_restart_keys=("api_keys.shlink_key",))
+        bot = _make_bot({"gif": gif, "shorten": shorten}, {})
+
+        summary = bot._apply_config_changes(["api_keys.giphy"])
+
+        self.assertEqual(bot.pm.restarted, ["gif"])
+        self.assertEqual(gif.reloads, [])
+        self.assertEqual(summary["loaded"], ["translate"])
+        self.assertTrue(bot.pm.retried)
+
+    def test_blacklist_change_syncs_modules(self):
+        bot = _make_bot({}, {})
+
+        summary = bot._apply_config_changes(["core.module_blacklist"])
+
+        self.assertTrue(bot.pm.blacklist_synced)
+        self.assertEqual(summary["loaded"], ["gif"])
+        self.assertFalse(bot.pm.retried)
+
+    def test_no_changes_touches_nothing(self):
+        weather = _ModuleStub()
+        bot = _make_bot({"weather2": weather}, {})
+
+        bot.last_config_reload = bot._apply_config_changes([])
+
+        self.assertEqual(weather.reloads, [])
+        self.assertEqual(bot.describe_last_config_reload(), "No configuration changes detected.")
+
+
+if __name__ == "__main__":
+    unittest.main()
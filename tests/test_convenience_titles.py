@@ -0,0 +1,120 @@
+import unittest
+
+import requests
+
+from modules.convenience import Convenience, _TitleScanner
+from tests.test_weather2_geocode import BotStub
+
+
+def _scan(chunks, header_charset=None):
+    scanner = _TitleScanner(header_charset)
+    for chunk in chunks:
+        if scanner.feed(chunk):
+            break
+    return scanner
+
+
+class _Response:
+    def __init__(self, body, content_type="text/html", status_code=200):
+        self.body = body
+        self.headers = {"Content-Type": content_type}
+        self.status_code = status_code
+        self.read = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code} error", response=self)
+
+    def iter_content(self, chunk_size=1024, decode_unicode=False):
+        for i in range(0, len(self.body), chunk_size):
+            self.read += 1
+            yield self.body[i:i + chunk_size]
+
+
+class _Session:
+    def __init__(self, body, content_type="text/html", status_code=200, error=None):
+        self.body = body
+        self.content_type = content_type
+        self.status_code = status_code
+        self.error = error
+        self.responses = []
+
+    def get(self, url, **kwargs):
+        if self.error:
+            self.responses.append(self.error)
+            raise self.error
+        response = _Response(self.body, self.content_type, self.status_code)
+        self.responses.append(response)
+        return response
+
+
+class TestTitleScanner(unittest.TestCase):
+    def test_tags_split_across_chunks(self):
+        page = b"<html><head><TITLE lang='en'>Hello &amp; welcome</title></head>"
+        scanner = _scan([page[i:i + 3] for i in range(0, len(page), 3)])
+        self.assertTrue(scanner.done)
+        self.assertEqual(scanner.title(), "Hello & welcome")
+
+    def test_stops_at_end_of_head_without_title(self):
+        scanner = _scan([b"<html><head><meta x></head>", b"<body>" + b"x" * 5000])
+        self.assertTrue(scanner.done)
+        self.assertIsNone(scanner.title())
+        self.assertLess(len(scanner.buffer), 100)
+
+    def test_charset_from_meta_tag_when_header_has_none(self):
+        page = '<head><meta charset="iso-8859-1"><title>Café</title>'.encode("iso-8859-1")
+        self.assertEqual(_scan([page]).title(), "Café")
+
+    def test_header_charset_wins(self):
+        page = '<meta charset="iso-8859-1"><title>Crème</title>'.encode("utf-8")
+        self.assertEqual(_scan([page], header_charset="utf-8").title(), "Crème")
+
+
+class TestUrlTitleCache(unittest.TestCase):
+    def setUp(self):
+        self.convenience = Convenience(BotStub())
+
+    def test_title_is_fetched_once_and_stops_early(self):
+        session = _Session(b"<head><title>Example</title></head>" + b"<p>filler</p>" * 5000)
+        self.convenience.http_session = session
+
+        self.assertEqual(self.convenience._get_url_title("https://example.com/a#top"), "Example")
+        self.assertEqual(self.convenience._get_url_title("https://example.com/a"), "Example")
+
+        self.assertEqual(len(session.responses), 1)
+        self.assertEqual(session.responses[0].read, 1)
+
+    def test_pages_without_titles_are_cached_negatively(self):
+        session = _Session(b"<head></head><body>nothing here</body>")
+        self.convenience.http_session = session
+
+        self.assertIsNone(self.convenience._get_url_title("https://example.com/b"))
+        self.assertIsNone(self.convenience._get_url_title("https://example.com/b"))
+        self.assertEqual(len(session.responses), 1)
+
+    def test_client_errors_and_non_html_are_cached_negatively(self):
+        for session in (_Session(b"", status_code=404), _Session(b"\x89PNG", content_type="image/png")):
+            self.convenience.http_session = session
+            url = f"https://example.com/{session.status_code}/{session.content_type}"
+            self.assertIsNone(self.convenience._get_url_title(url))
+            self.assertIsNone(self.convenience._get_url_title(url))
+            self.assertEqual(len(session.responses), 1)
+
+    def test_transient_failures_are_not_cached(self):
+        for session in (_Session(b"", status_code=503), _Session(b"", status_code=429),
+                        _Session(b"", error=requests.exceptions.ConnectTimeout("timed out")),
+                        _Session(b"", error=requests.exceptions.ConnectionError("reset"))):
+            self.convenience.http_session = session
+            self.assertIsNone(self.convenience._get_url_title("https://example.com/flaky"))
+            self.assertIsNone(self.convenience._get_url_title("https://example.com/flaky"))
+            self.assertEqual(len(session.responses), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
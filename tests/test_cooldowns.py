@@ -0,0 +1,103 @@
+import unittest
+from types import SimpleNamespace
+
+from modules.cooldowns import CooldownStore, get_cooldown_store, persist_cooldowns
+
+
+class _Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestCooldownStore(unittest.TestCase):
+    def setUp(self):
+        self.clock = _Clock()
+        self.store = CooldownStore(clock=self.clock)
+
+    def test_check_and_record_fixed_cooldown(self):
+        self.assertTrue(self.store.check("alice:fortune", 10))
+        self.store.record("alice:fortune", 10)
+        self.assertFalse(self.store.check("alice:fortune", 10))
+        self.clock.now += 10
+        self.assertTrue(self.store.check("alice:fortune", 10))
+
+    def test_hit_records_only_when_allowed(self):
+        self.assertTrue(self.store.hit("url_title", 5))
+        self.assertFalse(self.store.hit("url_title", 5))
+        self.clock.now += 5
+        self.assertTrue(self.store.hit("url_title", 5))
+
+    def test_expired_entries_are_evicted(self):
+        for i in range(500):
+            self.store.record(f"nick{i}:cmd", 30)
+        self.assertEqual(len(self.store), 500)
+        self.clock.now += 31
+        self.assertEqual(len(self.store), 0)
+
+    def test_long_idle_gap_sweeps_occupied_buckets(self):
+        self.store.record("a", 5)
+        self.clock.now += 10 ** 7
+        self.assertEqual(len(self.store), 0)
+
+    def test_rerecorded_key_survives_sweep_of_its_old_bucket(self):
+        self.store.record("bob:cmd", 5)
+        self.clock.now += 4
+        self.store.record("bob:cmd", 5)
+        self.clock.now += 2
+        self.assertFalse(self.store.check("bob:cmd", 5))
+        self.assertEqual(len(self.store), 1)
+
+    def test_sliding_window_limits_hits(self):
+        self.assertTrue(self.store.allow_window("title", 2, 300))
+        self.clock.now += 100
+        self.assertTrue(self.store.allow_window("title", 2, 300))
+        self.assertFalse(self.store.allow_window("title", 2, 300))
+        self.clock.now += 201
+        self.assertTrue(self.store.allow_window("title", 2, 300))
+
+    def test_token_bucket_refills(self):
+        for _ in range(3):
+            self.assertTrue(self.store.allow_tokens("api", rate=1.0, capacity=3))
+        self.assertFalse(self.store.allow_tokens("api", rate=1.0, capacity=3))
+        self.clock.now += 1
+        self.assertTrue(self.store.allow_tokens("api", rate=1.0, capacity=3))
+
+    def test_snapshot_round_trip_skips_short_cooldowns(self):
+        self.store.record("short", 5)
+        self.store.record("long", 600)
+        entries = self.store.snapshot(min_remaining=60)
+        self.assertEqual(list(entries), ["long"])
+
+        restored = CooldownStore()
+        self.assertEqual(restored.restore(entries), 1)
+        self.assertFalse(restored.check("long", 600))
+
+
+class TestBotWideStore(unittest.TestCase):
+    def test_store_is_shared_and_persisted_when_enabled(self):
+        states = {}
+        bot = SimpleNamespace(
+            config={"core": {"persist_cooldowns": True}},
+            get_module_state=lambda name: dict(states.get(name, {})),
+            update_module_state=lambda name, updates: states.setdefault(name, {}).update(updates),
+        )
+        store = get_cooldown_store(bot)
+        self.assertIs(get_cooldown_store(bot), store)
+
+        store.record("user:quest:alice:quest_solo", 900)
+        self.assertTrue(persist_cooldowns(bot))
+
+        fresh_bot = SimpleNamespace(config=bot.config, get_module_state=bot.get_module_state)
+        self.assertFalse(get_cooldown_store(fresh_bot).check("user:quest:alice:quest_solo", 900))
+
+    def test_persistence_is_opt_in(self):
+        bot = SimpleNamespace(config={})
+        get_cooldown_store(bot).record("k", 900)
+        self.assertFalse(persist_cooldowns(bot))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+from unittest import mock
+
+from modules import crypto
+from modules.crypto import CryptoModule
+from tests.test_weather2_geocode import BotStub, ConnectionStub, event
+
+
+class PriceHTTP:
+    def __init__(self, prices):
+        self.prices = prices
+        self.calls = []
+
+    def get_json(self, url, params=None, headers=None, **cache_options):
+        self.calls.append((url, dict(params or {})))
+        ids = params["ids"].split(",")
+        currency = params["vs_currencies"]
+        if currency not in ("usd", "eur", "gbp"):
+            # CoinGecko answers unknown vs_currencies with empty coin entries.
+            return {coin_id: {} for coin_id in ids if coin_id in self.prices}
+        return {
+            coin_id: {currency: self.prices[coin_id], f"{currency}_24h_change": 1.5}
+            for coin_id in ids if coin_id in self.prices
+        }
+
+
+class TestCryptoPrices(unittest.TestCase):
+    def setUp(self):
+        self.http = PriceHTTP({"bitcoin": 50000.0, "ethereum": 3000.0, "solana": 150.0, "pepe": 0.00001})
+        patcher = mock.patch.object(crypto, "HTTP_CLIENT", self.http)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.module = CryptoModule(BotStub())
+        self.module._set_coin_index(
+            coins=[{"id": "pepe-fake", "symbol": "pepe", "name": "Fake Pepe"},
+                   {"id": "pepe", "symbol": "pepe", "name": "Pepe"},
+                   {"id": "solana", "symbol": "sol", "name": "Solana"}],
+            ranked=[{"id": "pepe", "symbol": "pepe", "name": "Pepe"}],
+        )
+
+    def _say(self, text):
+        # A fresh nick each time keeps the per-user command cooldown out of the way.
+        self.requests = getattr(self, "requests", 0) + 1
+        connection = ConnectionStub()
+        self.assertTrue(self.module._dispatch_commands(connection, event(), text, f"user{self.requests}"))
+        return connection.messages[-1][1]
+
+    def test_index_resolves_symbols_names_and_ids(self):
+        self.assertEqual(self.module._get_coin_id("PEPE"), "pepe")
+        self.assertEqual(self.module._get_coin_id("fake pepe"), "pepe-fake")
+        self.assertEqual(self.module._get_coin_id("btc"), "bitcoin")
+        self.assertIsNone(self.module._get_coin_id("notacoin"))
+
+    def test_several_coins_share_one_request(self):
+        reply = self._say("!price btc eth sol eur")
+
+        self.assertEqual(len(self.http.calls), 1)
+        self.assertEqual(self.http.calls[0][1]["ids"], "bitcoin,ethereum,solana")
+        self.assertEqual(self.http.calls[0][1]["vs_currencies"], "eur")
+        self.assertEqual(reply, "BTC: €50,000.00 (↑ +1.50%) | ETH: €3,000.00 (↑ +1.50%) | SOL: €150.00 (↑ +1.50%)")
+
+    def test_cached_prices_are_shared_and_only_missing_coins_fetched(self):
+        self._say("!price btc")
+        self._say("!price btc eth notacoin")
+
+        self.assertEqual([call[1]["ids"] for call in self.http.calls], ["bitcoin", "ethereum"])
+        self.assertTrue(self._say("!price btc eth notacoin").endswith("| Unknown: notacoin"))
+        self.assertEqual(len(self.http.calls), 2)
+
+    def test_single_coin_forms_still_work(self):
+        self.assertEqual(self._say("!crypto 2 btc"), "2.0 BTC: $100,000.00 (↑ +1.50% 24h)")
+        self.assertEqual(self._say("!crypto eth gbp"), "ETH: £3,000.00 (↑ +1.50% 24h)")
+        # An unknown trailing word is still read as the currency, not a second coin.
+        self._say("!crypto btc xyz")
+        self.assertEqual(self.http.calls[-1][1], {**self.http.calls[-1][1], "ids": "bitcoin", "vs_currencies": "xyz"})
+
+    def test_crypto_coin_currency_form_accepts_coin_currencies(self):
+        self._say("!crypto eth btc")
+        self.assertEqual(self.http.calls[-1][1], {**self.http.calls[-1][1], "ids": "ethereum", "vs_currencies": "btc"})
+
+        self._say("!price eth sol")
+        self.assertEqual(self.http.calls[-1][1], {**self.http.calls[-1][1], "ids": "ethereum,solana", "vs_currencies": "usd"})
+
+    def test_warm_refresher_refetches_popular_coins(self):
+        self._say("!price btc eth")
+        self._say("!price btc")
+        self.module.bot.config["crypto"] = {"warm_top_n": 1}
+
+        self.module._warm_popular_prices()
+
+        self.assertEqual(self.http.calls[-1][1]["ids"], "bitcoin")
+        self.assertEqual(len(self.http.calls), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,169 @@
+import threading
+import unittest
+from types import SimpleNamespace
+
+from modules import achievement_hooks
+from modules.achievements import Achievements
+from modules.event_bus import METRIC_INCREMENT, EventBus, get_event_bus
+
+
+class _Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestEventBus(unittest.TestCase):
+    def setUp(self):
+        self.clock = _Clock()
+        self.bus = EventBus(clock=self.clock, threaded=False)
+
+    def test_sync_subscriber_runs_inline(self):
+        seen = []
+        self.bus.subscribe("quest.won", seen.append)
+
+        self.assertEqual(self.bus.publish("quest.won", username="alice"), 1)
+        self.assertEqual([event.data["username"] for event in seen], ["alice"])
+
+    def test_wildcards_and_unrelated_topics(self):
+        seen = []
+        self.bus.subscribe("fishing.*", lambda event: seen.append(event.topic))
+
+        self.bus.publish("fishing.cast", username="bob")
+        self.bus.publish("quest.won", username="bob")
+
+        self.assertEqual(seen, ["fishing.cast"])
+
+    def test_registered_topics_require_their_fields(self):
+        with self.assertRaises(ValueError):
+            self.bus.publish(METRIC_INCREMENT, username="alice", metric="fish_caught")
+
+    def test_queued_subscriber_receives_batches(self):
+        bus = EventBus(clock=self.clock, threaded=True)
+        batches = []
+        sub = bus.subscribe("metric.*", batches.append, mode="queued", batch_size=3, max_delay=60)
+        try:
+            for amount in range(7):
+                bus.publish("metric.tick", amount=amount)
+            bus.flush()
+        finally:
+            bus.close()
+
+        self.assertEqual([len(batch) for batch in batches], [3, 3, 1])
+        self.assertEqual([event.data["amount"] for batch in batches for event in batch], list(range(7)))
+        self.assertEqual(sub.delivered, 7)
+
+    def test_worker_delivers_after_max_delay(self):
+        bus = EventBus()
+        delivered = threading.Event()
+        bus.subscribe("metric.tick", lambda batch: delivered.set(), mode="queued", batch_size=100, max_delay=0.01)
+        try:
+            bus.publish("metric.tick", amount=1)
+            self.assertTrue(delivered.wait(2))
+        finally:
+            bus.close()
+
+    def test_overflow_drops_oldest_by_default(self):
+        bus = EventBus(clock=self.clock, threaded=True)
+        batches = []
+        sub = bus.subscribe("metric.tick", batches.append, mode="queued", batch_size=10,
+                            max_delay=60, max_pending=2)
+        for amount in range(4):
+            bus.publish("metric.tick", amount=amount)
+        bus.flush()
+        bus.close()
+
+        self.assertEqual([event.data["amount"] for event in batches[0]], [2, 3])
+        self.assertEqual(sub.dropped, 2)
+
+    def test_overflow_can_drop_newest(self):
+        bus = EventBus(clock=self.clock, threaded=True)
+        batches = []
+        sub = bus.subscribe("metric.tick", batches.append, mode="queued", batch_size=10,
+                            max_delay=60, max_pending=2, overflow="drop_newest")
+        for amount in range(4):
+            bus.publish("metric.tick", amount=amount)
+        bus.flush()
+        bus.close()
+
+        self.assertEqual([event.data["amount"] for event in batches[0]], [0, 1])
+        self.assertEqual(sub.dropped, 2)
+
+    def test_failing_handler_is_isolated(self):
+        seen = []
+        self.bus.subscribe("x", lambda event: 1 / 0, owner="broken")
+        self.bus.subscribe("x", seen.append)
+
+        self.bus.publish("x")
+
+        self.assertEqual(len(seen), 1)
+        self.assertEqual([s["errors"] for s in self.bus.stats() if s["owner"] == "broken"], [1])
+
+    def test_unsubscribe_owner(self):
+        seen = []
+        self.bus.subscribe("x", seen.append, owner="fishing")
+        self.bus.subscribe("y", seen.append, owner="fishing")
+
+        self.assertEqual(self.bus.unsubscribe_owner("fishing"), 2)
+        self.assertEqual(self.bus.publish("x"), 0)
+        self.assertFalse(self.bus.has_subscribers("y"))
+
+
+class _BotStub:
+    def __init__(self):
+        self.config = {}
+        self._states = {}
+        self.events = EventBus(threaded=False)
+        self.connection = SimpleNamespace(sent=[], privmsg=lambda target, text: self.connection.sent.append((target, text)))
+
+    def get_module_state(self, name):
+        return self._states.setdefault(name, {})
+
+    def update_module_state(self, name, updates):
+        self._states.setdefault(name, {}).update(updates)
+
+    def get_user_id(self, username):
+        return username.lower()
+
+    def log_debug(self, message):
+        pass
+
+
+class TestAchievementHooksOverBus(unittest.TestCase):
+    def setUp(self):
+        self.bot = _BotStub()
+        self.achievements = Achievements(self.bot)
+        self.achievements.on_load()
+        self.achievements.set_state("opted_in_users", ["alice"])
+        self.achievements._opted_in.add("alice")
+
+    def tearDown(self):
+        self.achievements.on_unload()
+
+    def test_progress_reaches_achievements_and_unlocks(self):
+        achievement_hooks.record_fish_caught(self.bot, "Alice")
+
+        progress = self.achievements.get_state("user_achievements")["alice"]["progress"]
+        self.assertEqual(progress["fish_caught"], 1)
+        self.assertIn(("#achievements", "🏆 Alice unlocked achievement: First Catch!"), self.bot.connection.sent)
+
+    def test_best_values_only_move_up(self):
+        achievement_hooks.record_win_streak(self.bot, "Alice", 4)
+        achievement_hooks.record_win_streak(self.bot, "Alice", 2)
+
+        progress = self.achievements.get_state("user_achievements")["alice"]["progress"]
+        self.assertEqual(progress["win_streak"], 4)
+
+    def test_untracked_users_are_ignored(self):
+        achievement_hooks.record_coffee_order(self.bot, "Bob")
+        self.assertNotIn("bob", self.achievements.get_state("user_achievements"))
+
+    def test_bus_is_created_lazily_on_the_bot(self):
+        bot = SimpleNamespace()
+        self.assertIs(get_event_bus(bot), get_event_bus(bot))
+
+
+if __name__ == "__main__":
+    unittest.main()
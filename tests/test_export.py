@@ -0,0 +1,91 @@
+import gzip
+import http.client
+import json
+import os
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from web.app import JeevesWebApp
+from web.server import PooledHTTPServer, create_handler_class
+
+
+def _write_games(path: Path, players: dict, bump: int) -> None:
+    path.write_text(json.dumps({"modules": {"quest": {"players": players, "player_classes": {}}}}))
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + bump * 1_000_000))
+
+
+def _records(lines) -> list:
+    return [json.loads(line) for line in b"".join(lines).splitlines()]
+
+
+class TestExporter(unittest.TestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.root = Path(tmpdir.name)
+        self.games = self.root / "games.json"
+        self.players = {f"u{i}": {"name": f"Hero{i}", "level": i, "xp": 0} for i in range(5)}
+        _write_games(self.games, self.players, bump=1)
+        self.app = JeevesWebApp(self.games, self.root, self.root)
+
+    def test_full_export_with_projection(self):
+        version, lines = self.app.exports.export("players", fields=["level"])
+        rows = _records(lines)
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[2], {"id": "u2", "level": 2})
+        self.assertTrue(version.endswith("-1"))
+
+    def test_since_returns_only_changes(self):
+        version, lines = self.app.exports.export("players")
+        list(lines)
+        again, lines = self.app.exports.export("players", since=version)
+        self.assertEqual(again, version)
+        self.assertEqual(list(lines), [])
+
+        self.players["u3"]["xp"] = 40
+        del self.players["u4"]
+        _write_games(self.games, self.players, bump=2)
+        newer, lines = self.app.exports.export("players", fields=["xp"], since=version)
+        self.assertNotEqual(newer, version)
+        self.assertEqual(_records(lines), [{"id": "u3", "xp": 40}, {"id": "u4", "deleted": True}])
+
+    def test_unknown_since_falls_back_to_everything(self):
+        _, lines = self.app.exports.export("players", since="stale-7")
+        self.assertEqual(len(_records(lines)), 5)
+
+
+class TestExportEndpoint(unittest.TestCase):
+    def test_streams_chunked_gzip_ndjson(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            games = root / "games.json"
+            _write_games(games, {f"u{i}": {"name": f"Hero{i}", "level": i} for i in range(3000)}, bump=1)
+            app = JeevesWebApp(games, root, root)
+            server = PooledHTTPServer(("127.0.0.1", 0), create_handler_class(app), workers=1)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            self.addCleanup(server.server_close)
+            self.addCleanup(server.shutdown)
+
+            connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+            connection.request("GET", "/api/export/players?fields=level", headers={"Accept-Encoding": "gzip"})
+            response = connection.getresponse()
+            self.assertEqual(response.status, 200)
+            self.assertEqual(response.getheader("Transfer-Encoding"), "chunked")
+            self.assertEqual(response.getheader("Content-Encoding"), "gzip")
+            self.assertEqual(response.getheader("Content-Type"), "application/x-ndjson; charset=utf-8")
+            lines = gzip.decompress(response.read()).splitlines()
+            self.assertEqual(len(lines), 3000)
+            self.assertEqual(lines[1], b'{"id":"u1","level":1}')
+            connection.close()
+
+            connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+            connection.request("GET", "/stats/api/export/nothing")
+            self.assertEqual(connection.getresponse().status, 404)
+            connection.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+from types import SimpleNamespace
+
+from modules.geocache import MISS, GeocodeCache, get_geocode_cache, normalize_query
+
+
+class _Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestGeocodeCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = _Clock()
+        self.cache = GeocodeCache(max_entries=3, ttl=100, negative_ttl=10, clock=self.clock)
+
+    def test_normalised_queries_share_an_entry(self):
+        self.cache.put("osm", "Paris ,  France", {"lat": "48.8"})
+        self.assertEqual(self.cache.get("osm", "paris, france"), {"lat": "48.8"})
+        self.assertEqual(normalize_query("  New   York,NY "), "new york, ny")
+        self.assertIs(self.cache.get("other", "paris, france"), MISS)
+
+    def test_misses_are_remembered_for_the_negative_ttl(self):
+        self.cache.put("osm", "Atlantis", None)
+        self.assertIsNone(self.cache.get("osm", "atlantis"))
+        self.clock.now += 11
+        self.assertIs(self.cache.get("osm", "atlantis"), MISS)
+
+    def test_lru_eviction(self):
+        for place in ("a", "b", "c"):
+            self.cache.put("osm", place, place)
+        self.cache.get("osm", "a")
+        self.cache.put("osm", "d", "d")
+
+        self.assertIs(self.cache.get("osm", "b"), MISS)
+        self.assertEqual(self.cache.get("osm", "a"), "a")
+
+    def test_find_and_purge(self):
+        self.cache.put("osm", "Springfield, IL", "il")
+        self.cache.put("osm", "Springfield, MO", "mo")
+        self.cache.put("osm", "Shelbyville", "x")
+
+        self.assertEqual([key for key, _, _ in self.cache.find("springfield")],
+                         ["osm:springfield, mo", "osm:springfield, il"])
+        self.assertEqual(self.cache.purge("springfield"), 2)
+        self.assertEqual(len(self.cache), 1)
+        self.assertEqual(self.cache.purge(), 1)
+
+    def test_saves_are_throttled_and_restorable(self):
+        saved = []
+        cache = GeocodeCache(ttl=100, save=saved.append, save_interval=60, clock=self.clock)
+        cache.put("osm", "a", 1)
+        self.assertEqual(saved, [])
+
+        self.clock.now += 60
+        cache.put("osm", "b", 2)
+        self.assertEqual(set(saved[-1]), {"osm:a", "osm:b"})
+
+        restored = GeocodeCache(clock=self.clock)
+        self.assertEqual(restored.restore(saved[-1]), 2)
+        self.clock.now += 100
+        self.assertIs(restored.get("osm", "a"), MISS)
+
+
+class TestBotWideCache(unittest.TestCase):
+    def test_cache_is_created_once_and_restored_from_state(self):
+        states = {"geocode_cache": {"entries": {"osm:rome": {"value": [1, 2], "expires": 9e12}}}}
+        bot = SimpleNamespace(
+            config={"core": {"geocode_cache": {"max_entries": 10}}},
+            get_module_state=lambda name: states.get(name, {}),
+            update_module_state=lambda name, updates: states.setdefault(name, {}).update(updates),
+        )
+
+        cache = get_geocode_cache(bot)
+
+        self.assertIs(cache, get_geocode_cache(bot))
+        self.assertEqual(cache.max_entries, 10)
+        self.assertEqual(cache.get("osm", "Rome"), [1, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+import unittest
+
+from modules.gif import Gif
+from modules.shorten import Shorten
+from tests.test_weather2_geocode import BotStub
+
+
+class _Response:
+    def __init__(self, data):
+        self.data = data
+
+    def json(self):
+        return self.data
+
+    def raise_for_status(self):
+        pass
+
+
+class _GiphySession:
+    def __init__(self, urls):
+        self.urls = urls
+        self.calls = []
+
+    def get(self, url, params=None, timeout=None):
+        self.calls.append(params["q"])
+        return _Response({"data": [{"images": {"original": {"url": u}}} for u in self.urls]})
+
+
+class _ShlinkSession:
+    def __init__(self):
+        self.calls = []
+
+    def post(self, url, headers=None, json=None, timeout=None):
+        self.calls.append(json["longUrl"])
+        return _Response({"shortUrl": f"https://s.example/{len(self.calls)}"})
+
+
+class TestGifResultCache(unittest.TestCase):
+    def setUp(self):
+        self.module = Gif(BotStub(), "key")
+        self.session = self.module.http_session = _GiphySession(["https://g/1", "https://g/2"])
+
+    def test_result_page_is_reused_for_normalised_queries(self):
+        picks = {self.module._get_gif_url(q) for q in ("Happy  Cat", "happy cat", " HAPPY cat ")}
+
+        self.assertEqual(self.session.calls, ["happy cat"])
+        self.assertTrue(picks <= {"https://g/1", "https://g/2"})
+        self.assertEqual(self.module.cache_hits, 2)
+
+    def test_expired_pages_are_searched_again(self):
+        self.module._get_gif_url("dog")
+        urls, _ = self.module._results["dog"]
+        self.module._results["dog"] = (urls, 0)
+        self.module._get_gif_url("dog")
+        self.assertEqual(self.session.calls, ["dog", "dog"])
+
+    def test_empty_results_are_remembered(self):
+        self.session.urls = []
+        self.assertIsNone(self.module._get_gif_url("zzzz"))
+        self.assertIsNone(self.module._get_gif_url("zzzz"))
+        self.assertEqual(len(self.session.calls), 1)
+
+
+class TestShortUrlMap(unittest.TestCase):
+    def setUp(self):
+        self.bot = BotStub()
+        self.module = Shorten(self.bot, "https://s.example", "key")
+        self.session = self.module.http_session = _ShlinkSession()
+
+    def test_known_urls_skip_shlink(self):
+        first = self.module.shorten_url("https://www.amazon.com/Widget/dp/B000123456/ref=sr_1?tag=x")
+        second = self.module.shorten_url("https://www.amazon.com/dp/B000123456?psc=1")
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.session.calls, ["https://amzn.com/B000123456"])
+
+    def test_map_is_persisted_and_bounded(self):
+        self.module.SHORT_URL_MAP_SIZE = 2
+        for n in range(3):
+            self.module.shorten_url(f"https://example.com/{n}")
+
+        saved = self.bot.get_module_state("shorten")["short_urls"]
+        self.assertEqual(list(saved), ["https://example.com/1", "https://example.com/2"])
+
+        restarted = Shorten(self.bot, "https://s.example", "key")
+        restarted.http_session = self.session
+        self.assertEqual(restarted.shorten_url("https://example.com/2"), "https://s.example/3")
+        self.assertEqual(len(self.session.calls), 3)
+
+    def test_hits_keep_an_entry_from_being_evicted(self):
+        self.module.SHORT_URL_MAP_SIZE = 2
+        self.module.shorten_url("https://example.com/a")
+        self.module.shorten_url("https://example.com/b")
+        self.module.shorten_url("https://example.com/a")
+        self.module.shorten_url("https://example.com/c")
+
+        self.assertEqual(list(self.module.get_state("short_urls")), ["https://example.com/a", "https://example.com/c"])
+
+    def test_lookups_do_not_rewrite_the_map(self):
+        self.module.shorten_url("https://example.com/a")
+        self.module.shorten_url("https://example.com/b")
+        saved = self.module.get_state("short_urls")
+
+        self.module.shorten_url("https://example.com/a")
+        self.assertIs(self.module.get_state("short_urls"), saved)
+
+        self.module.on_unload()
+        self.assertEqual(list(self.bot.get_module_state("shorten")["short_urls"]),
+                         ["https://example.com/b", "https://example.com/a"])
+
+    def test_map_is_dropped_when_the_shlink_server_changes(self):
+        self.module.shorten_url("https://example.com/a")
+        self.module.on_unload()
+
+        moved = Shorten(self.bot, "https://other.example/", "key")
+        moved.http_session = self.session
+        moved.shorten_url("https://example.com/a")
+        self.assertEqual(len(self.session.calls), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
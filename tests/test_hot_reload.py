@@ -0,0 +1,182 @@
+import os
+import sys
+import tempfile
+import textwrap
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import jeeves
+from jeeves import PluginManager
+from modules import http_utils
+
+
+PLUGIN_TEMPLATE = textwrap.dedent('''
+    def setup(bot):
+        return Plugin()
+
+    class Plugin:
+        generation = {generation}
+
+        def __init__(self):
+            self.cache = {{}}
+
+        def export_runtime(self):
+            return {{"cache": self.cache}}
+
+        def import_runtime(self, runtime):
+            self.cache = runtime["cache"]
+''')
+
+
+class _BotStub:
+    def __init__(self):
+        self.config = {}
+        self.messages = []
+
+    def log_debug(self, message):
+        self.messages.append(message)
+
+
+def _write_plugin(modules_dir, name, generation):
+    path = modules_dir / f"{name}.py"
+    path.write_text(PLUGIN_TEMPLATE.format(generation=generation), encoding="utf-8")
+    # Make sure the mtime moves even on coarse-grained filesystems.
+    stamp = path.stat().st_mtime + generation
+    os.utime(path, (stamp, stamp))
+    return path
+
+
+class TestSourceDependencies(unittest.TestCase):
+    def test_quest_depends_on_its_package_and_helpers(self):
+        pm = PluginManager(_BotStub())
+        modules_dir = jeeves.ROOT / "modules"
+
+        deps = pm._source_dependencies(modules_dir / "quest.py")
+
+        self.assertIn(modules_dir / "quest_pkg" / "quest_combat.py", deps)
+        self.assertIn(modules_dir / "base.py", deps)
+        self.assertIn(modules_dir / "achievement_hooks.py", deps)
+        self.assertNotIn(modules_dir / "fishing.py", deps)
+
+    def test_plain_module_does_not_pull_in_packages(self):
+        pm = PluginManager(_BotStub())
+        modules_dir = jeeves.ROOT / "modules"
+
+        deps = pm._source_dependencies(modules_dir / "sed.py")
+
+        self.assertNotIn(modules_dir / "quest_pkg" / "__init__.py", deps)
+        self.assertIn(modules_dir / "base.py", deps)
+
+
+class TestReloadChanged(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.modules_dir = self.root / "modules"
+        self.modules_dir.mkdir()
+        self._patch = patch.object(jeeves, "ROOT", self.root)
+        self._patch.start()
+
+    def tearDown(self):
+        self._patch.stop()
+        for name in ("hot_alpha", "hot_beta", "hot_gamma", "hot_helper", "hot_session"):
+            sys.modules.pop(f"modules.{name}", None)
+        self._tmp.cleanup()
+
+    def test_only_changed_module_is_reloaded_with_runtime(self):
+        _write_plugin(self.modules_dir, "hot_alpha", 1)
+        _write_plugin(self.modules_dir, "hot_beta", 1)
+        pm = PluginManager(_BotStub())
+        self.assertEqual(sorted(pm.load_all()), ["hot_alpha", "hot_beta"])
+        beta_before = pm.plugins["hot_beta"]
+        pm.plugins["hot_alpha"].cache["seen"] = True
+
+        _write_plugin(self.modules_dir, "hot_alpha", 2)
+        summary = pm.reload_changed()
+
+        self.assertEqual(summary["reloaded"], ["hot_alpha"])
+        self.assertEqual(pm.plugins["hot_alpha"].generation, 2)
+        self.assertEqual(pm.plugins["hot_alpha"].cache, {"seen": True})
+        self.assertIs(pm.plugins["hot_beta"], beta_before)
+
+    def test_no_changes_is_a_no_op(self):
+        _write_plugin(self.modules_dir, "hot_alpha", 1)
+        pm = PluginManager(_BotStub())
+        pm.load_all()
+        before = pm.plugins["hot_alpha"]
+
+        summary = pm.reload_changed()
+
+        self.assertEqual(summary, {"reloaded": [], "loaded": [], "unloaded": [], "failed": []})
+        self.assertIs(pm.plugins["hot_alpha"], before)
+
+    def test_new_and_removed_files(self):
+        _write_plugin(self.modules_dir, "hot_alpha", 1)
+        pm = PluginManager(_BotStub())
+        pm.load_all()
+
+        _write_plugin(self.modules_dir, "hot_gamma", 1)
+        (self.modules_dir / "hot_alpha.py").unlink()
+        summary = pm.reload_changed()
+
+        self.assertEqual(summary["loaded"], ["hot_gamma"])
+        self.assertEqual(summary["unloaded"], ["hot_alpha"])
+        self.assertEqual(sorted(pm.plugins), ["hot_gamma"])
+
+
+    def test_helpers_without_setup_are_not_re_executed(self):
+        (self.modules_dir / "hot_helper.py").write_text("SENTINEL = object()\n", encoding="utf-8")
+        _write_plugin(self.modules_dir, "hot_alpha", 1)
+        helper = type(sys)("modules.hot_helper")
+        sys.modules["modules.hot_helper"] = helper
+        pm = PluginManager(_BotStub())
+
+        self.assertEqual(pm.load_all(), ["hot_alpha"])
+        self.assertFalse(pm.load_module("hot_helper"))
+        self.assertEqual(pm.sync_blacklist(), ([], []))
+
+        self.assertIs(sys.modules["modules.hot_helper"], helper)
+        self.assertNotIn("hot_helper", pm.unavailable)
+
+    def test_reimported_http_utils_is_configured_again(self):
+        self.addCleanup(setattr, sys.modules["modules"], "http_utils", http_utils)
+        self.addCleanup(sys.modules.__setitem__, "modules.http_utils", http_utils)
+        # Stands in for http_utils' source; the re-import still loads the real module.
+        (self.modules_dir / "http_utils.py").write_text("# v1\n", encoding="utf-8")
+        _write_plugin(self.modules_dir, "hot_alpha", 1)
+        bot = _BotStub()
+        bot.config = {"core": {"http_circuit_breaker": {"cooldown_seconds": 7}}}
+        pm = PluginManager(bot)
+        pm.load_all()
+
+        (self.modules_dir / "http_utils.py").write_text("# v2\n", encoding="utf-8")
+        pm.reload_changed()
+
+        fresh = sys.modules["modules.http_utils"]
+        self.assertIsNot(fresh, http_utils)
+        self.assertEqual(fresh._breaker_settings, {"cooldown": 7})
+
+    def test_failed_reload_closes_handed_over_sessions(self):
+        class Session:
+            closed = False
+
+            def close(self):
+                self.closed = True
+
+        path = self.modules_dir / "hot_session.py"
+        path.write_text(PLUGIN_TEMPLATE.format(generation=1), encoding="utf-8")
+        pm = PluginManager(_BotStub())
+        pm.load_all()
+        session = pm.plugins["hot_session"].cache = Session()
+
+        path.write_text("def setup(bot):\n    raise RuntimeError('broken')\n", encoding="utf-8")
+        stamp = path.stat().st_mtime + 5
+        os.utime(path, (stamp, stamp))
+        summary = pm.reload_changed()
+
+        self.assertEqual(summary["failed"], ["hot_session"])
+        self.assertTrue(session.closed)
+
+if __name__ == "__main__":
+    unittest.main()
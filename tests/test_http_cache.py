@@ -0,0 +1,226 @@
+import json
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+import requests
+
+from jeeves import PluginManager
+from modules.http_utils import CacheEntry, HTTPClient, ResponseCache, SingleFlight, configure_http_cache, get_response_cache
+
+
+class _Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class _Response:
+    def __init__(self, status_code=200, text="{}", headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+
+    def json(self):
+        return json.loads(self.text)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} error", response=self)
+
+
+class _Session:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        self.calls.append({"url": url, "params": params, "headers": headers or {}})
+        return self.responses.pop(0)
+
+    def close(self):
+        pass
+
+
+def _client(responses, clock):
+    client = HTTPClient(cache=ResponseCache(clock=clock), flight=SingleFlight())
+    client.session = _Session(responses)
+    return client
+
+
+class TestHTTPClientCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = _Clock()
+
+    def test_uncached_calls_always_hit_the_network(self):
+        client = _client([_Response(text='{"n": 1}'), _Response(text='{"n": 2}')], self.clock)
+        self.assertEqual(client.get_json("https://api.example/x"), {"n": 1})
+        self.assertEqual(client.get_json("https://api.example/x"), {"n": 2})
+
+    def test_fresh_entries_are_served_from_memory(self):
+        client = _client([_Response(text='{"price": 1}')], self.clock)
+
+        self.assertEqual(client.get_json("https://api.example/p", params={"id": "btc"}, cache_ttl=60), {"price": 1})
+        self.assertEqual(client.get_json("https://api.example/p", params={"id": "btc"}, cache_ttl=60), {"price": 1})
+
+        self.assertEqual(len(client.session.calls), 1)
+        stats = client.cache.stats()["api.example"]
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+        self.assertAlmostEqual(stats["hit_ratio"], 0.5)
+
+    def test_expired_entries_are_revalidated_with_etag(self):
+        client = _client([
+            _Response(text='{"v": 1}', headers={"ETag": '"abc"'}),
+            _Response(status_code=304),
+        ], self.clock)
+
+        client.get_json("https://api.example/v", cache_ttl=10)
+        self.clock.now += 11
+        self.assertEqual(client.get_json("https://api.example/v", cache_ttl=10), {"v": 1})
+
+        self.assertEqual(client.session.calls[1]["headers"].get("If-None-Match"), '"abc"')
+        self.assertEqual(client.cache.stats()["api.example"]["revalidated"], 1)
+        # The 304 restarted the TTL.
+        self.assertEqual(client.get_json("https://api.example/v", cache_ttl=10), {"v": 1})
+        self.assertEqual(len(client.session.calls), 2)
+
+    def test_stale_while_revalidate_serves_old_copy_and_refreshes(self):
+        client = _client([_Response(text='{"v": 1}'), _Response(text='{"v": 2}')], self.clock)
+
+        client.get_json("https://api.example/s", cache_ttl=10, stale_ttl=60)
+        self.clock.now += 20
+        self.assertEqual(client.get_json("https://api.example/s", cache_ttl=10, stale_ttl=60), {"v": 1})
+
+        deadline = time.time() + 2
+        while len(client.session.calls) < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        while client._refreshing and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(client.get_json("https://api.example/s", cache_ttl=10, stale_ttl=60), {"v": 2})
+
+    def test_404s_are_cached_when_negative_ttl_is_set(self):
+        client = _client([_Response(status_code=404)], self.clock)
+
+        for _ in range(2):
+            with self.assertRaises(requests.HTTPError) as ctx:
+                client.get_json("https://api.example/missing", cache_ttl=60, negative_ttl=300)
+            self.assertEqual(ctx.exception.response.status_code, 404)
+
+        self.assertEqual(len(client.session.calls), 1)
+        self.assertEqual(client.cache.stats()["api.example"]["negative"], 1)
+
+    def test_no_store_responses_are_not_cached(self):
+        client = _client([
+            _Response(text='{"v": 1}', headers={"Cache-Control": "no-store"}),
+            _Response(text='{"v": 2}'),
+        ], self.clock)
+
+        client.get_json("https://api.example/n", cache_ttl=60)
+        self.assertEqual(client.get_json("https://api.example/n", cache_ttl=60), {"v": 2})
+
+
+class TestSingleFlight(unittest.TestCase):
+    def test_concurrent_identical_calls_share_one_execution(self):
+        flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+        results = []
+
+        def slow():
+            calls.append(1)
+            release.wait(2)
+            return {"price": 42}
+
+        threads = [threading.Thread(target=lambda: results.append(flight.do("btc", slow, timeout=2, label="api")))
+                   for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        deadline = time.time() + 2
+        while time.time() < deadline and getattr(flight._flights.get("btc"), "waiters", 0) < 4:
+            time.sleep(0.01)
+        release.set()
+        for thread in threads:
+            thread.join(2)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{"price": 42}] * 5)
+        self.assertEqual(flight.stats()["api"], {"calls": 5, "shared": 4, "timeouts": 0})
+
+    def test_errors_are_shared_and_key_is_released(self):
+        flight = SingleFlight()
+        with self.assertRaises(ValueError):
+            flight.do("k", lambda: (_ for _ in ()).throw(ValueError("boom")))
+        self.assertEqual(flight.do("k", lambda: "ok"), "ok")
+
+    def test_waiters_time_out_independently(self):
+        flight = SingleFlight()
+        release = threading.Event()
+        leader = threading.Thread(target=lambda: flight.do("slow", lambda: release.wait(2)))
+        leader.start()
+        while flight.in_flight() == 0:
+            time.sleep(0.01)
+
+        with self.assertRaises(requests.Timeout):
+            flight.do("slow", lambda: None, timeout=0.05, label="h")
+        release.set()
+        leader.join(2)
+        self.assertEqual(flight.stats()["h"]["timeouts"], 1)
+
+
+class TestResponseCache(unittest.TestCase):
+    def test_lru_respects_entry_and_byte_bounds(self):
+        cache = ResponseCache(max_entries=2, max_bytes=10)
+        for key, text in (("a", "1234"), ("b", "1234"), ("c", "1234")):
+            cache.put(CacheEntry(key, "h", 200, text, expires_at=float("inf")))
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(len(cache), 2)
+
+        cache.get("b")  # b becomes most recently used
+        cache.put(CacheEntry("d", "h", 200, "123456", expires_at=float("inf")))
+        self.assertIsNotNone(cache.get("d"))
+        self.assertIsNone(cache.get("c"))
+
+    def test_disk_tier_survives_a_new_cache(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            first = ResponseCache(disk_dir=tmpdir)
+            first.put(CacheEntry("k", "h", 200, '{"x": 1}', expires_at=time.time() + 60))
+
+            second = ResponseCache(disk_dir=tmpdir)
+            entry = second.get("k")
+            self.assertIsNotNone(entry)
+            self.assertEqual(entry.text, '{"x": 1}')
+
+    def test_cache_key_hides_params(self):
+        key = HTTPClient.cache_key("GET", "https://api.example/x", {"api_key": "secret"})
+        self.assertNotIn("secret", key)
+        self.assertNotEqual(key, HTTPClient.cache_key("GET", "https://api.example/x", {"api_key": "other"}))
+
+
+
+class _BotStub:
+    config = {}
+
+    def log_debug(self, message):
+        pass
+
+
+class TestConfiguredCacheSurvivesPluginLoading(unittest.TestCase):
+    def test_plugin_loader_does_not_re_run_http_utils(self):
+        cache = get_response_cache()
+        original = cache.max_entries
+        self.addCleanup(setattr, cache, "max_entries", original)
+        module = sys.modules["modules.http_utils"]
+
+        configure_http_cache({"max_entries": original + 7})
+        self.assertFalse(PluginManager(_BotStub()).load_module("http_utils"))
+
+        self.assertIs(sys.modules["modules.http_utils"], module)
+        self.assertIs(module.get_response_cache(), cache)
+        self.assertEqual(cache.max_entries, original + 7)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,246 @@
+import io
+import unittest
+from unittest import mock
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from modules import http_utils
+from modules.http_utils import (
+    CircuitBreaker,
+    CircuitOpenError,
+    LatencyBudgetExceeded,
+    ResilientAdapter,
+    get_pooled_session,
+    latency_budget,
+    remaining_budget,
+)
+
+
+class _Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _response(status):
+    response = requests.Response()
+    response.status_code = status
+    response.raw = io.BytesIO(b"")
+    return response
+
+
+def _request(url="https://api.example/x", method="GET"):
+    return requests.Request(method, url).prepare()
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def setUp(self):
+        self.clock = _Clock()
+        self.breaker = CircuitBreaker(error_rate=0.5, min_requests=4, window=60, cooldown=30, clock=self.clock)
+
+    def test_opens_once_error_rate_is_reached(self):
+        for _ in range(2):
+            self.breaker.record_success()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, "closed")
+
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, "open")
+        self.assertFalse(self.breaker.allow())
+
+    def test_old_outcomes_fall_out_of_the_window(self):
+        for _ in range(3):
+            self.breaker.record_failure()
+        self.clock.now += 61
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, "closed")
+
+    def test_half_open_allows_a_single_probe(self):
+        for _ in range(4):
+            self.breaker.record_failure()
+        self.clock.now += 30
+
+        self.assertEqual(self.breaker.state, "half_open")
+        self.assertTrue(self.breaker.allow())
+        self.assertFalse(self.breaker.allow())
+
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, "closed")
+
+    def test_failed_probe_reopens(self):
+        for _ in range(4):
+            self.breaker.record_failure()
+        self.clock.now += 30
+        self.breaker.allow()
+        self.breaker.record_failure()
+
+        self.assertEqual(self.breaker.state, "open")
+        self.clock.now += 29
+        self.assertFalse(self.breaker.allow())
+
+
+class TestResilientAdapter(unittest.TestCase):
+    def setUp(self):
+        self.breakers = http_utils.OrderedDict()
+        patcher = mock.patch.object(http_utils, "_breakers", self.breakers)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        sleeper = mock.patch.object(http_utils.time, "sleep")
+        self.sleep = sleeper.start()
+        self.addCleanup(sleeper.stop)
+
+    def _send(self, adapter, outcomes, request=None):
+        outcomes = list(outcomes)
+        calls = []
+
+        def fake_send(self, request, **kwargs):
+            calls.append(kwargs.get("timeout"))
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return _response(outcome)
+
+        with mock.patch.object(HTTPAdapter, "send", fake_send):
+            try:
+                return adapter.send(request or _request(), timeout=10), calls
+            except Exception as e:
+                e.calls = calls
+                raise
+
+    def test_retries_retryable_statuses_with_backoff(self):
+        adapter = ResilientAdapter(retries=2, backoff_factor=1)
+
+        response, calls = self._send(adapter, [503, 502, 200])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(calls), 3)
+        self.assertEqual([c.args[0] for c in self.sleep.call_args_list], [1, 2])
+
+    def test_returns_last_response_when_retries_run_out(self):
+        adapter = ResilientAdapter(retries=1)
+        response, calls = self._send(adapter, [503, 503])
+        self.assertEqual((response.status_code, len(calls)), (503, 2))
+
+    def test_non_idempotent_methods_are_not_retried(self):
+        adapter = ResilientAdapter(retries=3)
+        response, calls = self._send(adapter, [503], request=_request(method="POST"))
+        self.assertEqual((response.status_code, len(calls)), (503, 1))
+
+    def test_open_breaker_fails_fast(self):
+        adapter = ResilientAdapter(retries=0)
+        for _ in range(5):
+            http_utils.get_circuit_breaker("api.example").record_failure()
+
+        with self.assertRaises(CircuitOpenError) as ctx:
+            self._send(adapter, [200])
+        self.assertEqual(ctx.exception.calls, [])
+
+    def test_budget_clamps_timeout_and_stops_retries(self):
+        adapter = ResilientAdapter(retries=5, backoff_factor=10)
+
+        with latency_budget(2):
+            with self.assertRaises(requests.ConnectionError) as ctx:
+                self._send(adapter, [requests.ConnectionError("down")] * 6)
+
+        self.assertEqual(len(ctx.exception.calls), 1)
+        self.assertLessEqual(ctx.exception.calls[0], 2)
+        self.sleep.assert_not_called()
+
+    def test_spent_budget_refuses_to_send(self):
+        adapter = ResilientAdapter()
+        with mock.patch.object(http_utils, "remaining_budget", return_value=0):
+            with self.assertRaises(LatencyBudgetExceeded):
+                self._send(adapter, [200])
+
+
+    def _half_open_breaker(self):
+        clock = _Clock()
+        breaker = self.breakers["api.example"] = CircuitBreaker(min_requests=1, cooldown=30, clock=clock)
+        breaker.record_failure()
+        clock.now += 30
+        return breaker
+
+    def test_unsent_or_aborted_probes_release_the_slot(self):
+        breaker = self._half_open_breaker()
+        adapter = ResilientAdapter()
+
+        with mock.patch.object(http_utils, "remaining_budget", return_value=0):
+            with self.assertRaises(LatencyBudgetExceeded):
+                self._send(adapter, [200])
+        with self.assertRaises(ValueError):
+            self._send(adapter, [ValueError("bad request")])
+
+        self.assertEqual(breaker.state, "half_open")
+        self.assertTrue(breaker.allow())
+
+    def test_failed_probe_returns_its_response(self):
+        breaker = self._half_open_breaker()
+        adapter = ResilientAdapter(retries=2)
+
+        response, calls = self._send(adapter, [503, 200])
+
+        self.assertEqual((response.status_code, len(calls)), (503, 1))
+        self.assertEqual(breaker.state, "open")
+
+
+class TestLatencyBudget(unittest.TestCase):
+    def test_nested_budgets_only_shrink(self):
+        self.assertIsNone(remaining_budget())
+        with latency_budget(5):
+            with latency_budget(60):
+                self.assertLessEqual(remaining_budget(), 5)
+            with latency_budget(1):
+                self.assertLessEqual(remaining_budget(), 1)
+        self.assertIsNone(remaining_budget())
+
+
+class TestPooledSessions(unittest.TestCase):
+    def test_sessions_are_shared_per_policy(self):
+        first = get_pooled_session(retries=3, backoff_factor=0.3)
+        self.assertIs(first, get_pooled_session(retries=3, backoff_factor=0.3))
+        self.assertIsNot(first, get_pooled_session(retries=1, backoff_factor=0.3))
+        self.assertIsInstance(first.get_adapter("https://api.example"), ResilientAdapter)
+
+
+
+class _BotStub:
+    config = {}
+
+    def log_debug(self, message):
+        pass
+
+
+class TestSharedBreakers(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(http_utils, "_breakers", http_utils.OrderedDict())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_breakers_are_bounded_lru(self):
+        with mock.patch.object(http_utils, "MAX_BREAKERS", 3):
+            first = http_utils.get_circuit_breaker("a.example")
+            http_utils.get_circuit_breaker("b.example")
+            http_utils.get_circuit_breaker("c.example")
+            self.assertIs(http_utils.get_circuit_breaker("a.example"), first)  # now most recent
+            http_utils.get_circuit_breaker("d.example")
+
+            self.assertEqual(list(http_utils.circuit_breaker_states()), ["c.example", "a.example", "d.example"])
+
+    def test_configured_settings_survive_plugin_loading(self):
+        from jeeves import PluginManager
+
+        patcher = mock.patch.dict(http_utils._breaker_settings)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        http_utils.configure_circuit_breakers({"min_requests": 42})
+
+        self.assertFalse(PluginManager(_BotStub()).load_module("http_utils"))
+        from modules.http_utils import get_circuit_breaker
+
+        self.assertEqual(get_circuit_breaker("api.example").min_requests, 42)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+import http.client
+import json
+import os
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from web.app import JeevesWebApp
+from web.live import LiveHub, diff_summaries
+from web.server import PooledHTTPServer, create_handler_class
+
+
+def _write_games(path: Path, xp: int, boss_hp: int = 50) -> None:
+    path.write_text(json.dumps({"modules": {"quest": {
+        "players": {"u1": {"name": "Alice", "level": 3, "xp": xp}, "u2": {"name": "Bob", "level": 1}},
+        "player_classes": {},
+        "boss_hunt": {"current_boss": {"name": "Moriarty", "current_hp": boss_hp, "max_hp": 100}},
+    }}}))
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + xp * 1_000_000))
+
+
+class TestDiff(unittest.TestCase):
+    def test_only_changed_fields_are_sent(self):
+        old = {"players": {"a": {"xp": 1}, "b": {"xp": 2}}, "names": {}, "boss": {"current_hp": 5},
+               "cooldowns": {"#c": 1.0}, "achievements": {("a", "first")}}
+        new = {"players": {"a": {"xp": 3}, "c": {"xp": 0}}, "names": {"a": "Alice"}, "boss": {"current_hp": 5},
+               "cooldowns": {"#c": 1.0, "#d": 9.0}, "achievements": {("a", "first"), ("a", "second")}}
+        self.assertEqual(diff_summaries(old, new), {
+            "players": {"a": {"xp": 3}, "c": {"xp": 0}},
+            "removed": ["b"],
+            "cooldowns": {"#d": 9.0},
+            "achievements": [{"user_id": "a", "name": "Alice", "achievement": "second"}],
+        })
+        self.assertEqual(diff_summaries(new, new), {})
+
+
+class TestLiveHub(unittest.TestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.root = Path(tmpdir.name)
+        self.games = self.root / "games.json"
+        _write_games(self.games, xp=10)
+        self.app = JeevesWebApp(self.games, self.root, self.root, live_clients=2)
+        self.hub = LiveHub(self.app, max_clients=2, poll_interval=60)
+        self.addCleanup(self.hub.close)
+
+    def test_one_diff_is_shared_by_every_client(self):
+        first, second = self.hub.subscribe(), self.hub.subscribe()
+        self.assertIsNone(self.hub.subscribe())  # at capacity
+
+        _write_games(self.games, xp=20, boss_hp=40)
+        self.assertTrue(self.hub.poll())
+        self.assertFalse(self.hub.poll())
+
+        message = first.get(timeout=1)
+        self.assertIs(second.get(timeout=1), message)
+        self.assertEqual(self.hub.diffs, 1)
+        lines = message.decode().splitlines()
+        self.assertEqual(lines[:2], ["id: 1", "event: delta"])
+        self.assertEqual(json.loads(lines[2][len("data: "):]), {
+            "players": {"u1": {"level": 3, "xp": 20, "xp_to_next_level": 0, "prestige": 0}},
+            "boss": {"current_hp": 40, "max_hp": 100},
+        })
+
+    def test_reconnecting_clients_catch_up_from_last_event_id(self):
+        self.hub.subscribe()
+        _write_games(self.games, xp=20)
+        self.hub.poll()
+        _write_games(self.games, xp=30)
+        self.hub.poll()
+
+        caught_up = self.hub.subscribe(last_event_id="1")
+        self.assertTrue(caught_up.get(timeout=1).startswith(b"id: 2\nevent: delta"))
+
+
+class TestLiveEndpoint(unittest.TestCase):
+    def test_stream_delivers_deltas(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            games = root / "games.json"
+            _write_games(games, xp=10)
+            app = JeevesWebApp(games, root, root, live_clients=1)
+            app.live.poll_interval = 0.05
+            server = PooledHTTPServer(("127.0.0.1", 0), create_handler_class(app), workers=1, stream_slots=1)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            self.addCleanup(server.server_close)
+            self.addCleanup(server.shutdown)
+            self.addCleanup(app.live.close)
+
+            connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+            connection.request("GET", "/quest/api/live")
+            response = connection.getresponse()
+            self.assertEqual(response.getheader("Content-Type"), "text/event-stream; charset=utf-8")
+            self.assertEqual(response.readline(), b"retry: 5000\n")
+            response.readline()
+
+            _write_games(games, xp=25)
+            self.assertEqual(response.readline(), b"id: 1\n")
+            self.assertEqual(response.readline(), b"event: delta\n")
+            self.assertIn(b'"xp":25', response.readline())
+            connection.close()
+
+    def test_quest_pages_include_the_live_script(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            games = root / "games.json"
+            _write_games(games, xp=10)
+            engine = JeevesWebApp(games, root, root).template_engine()
+            self.assertIn('new EventSource("/quest/api/live")', engine.render_page("Quest", ""))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import json
+import tempfile
+import threading
+import unittest
+import urllib.request
+from pathlib import Path
+
+from web.app import JeevesWebApp
+from web.quest.leaderboard import MAX_PER_PAGE, LeaderboardIndex
+from web.quest.templates import TemplateEngine
+from web.quest.themes import ThemeManager
+from web.server import PooledHTTPServer, create_handler_class
+
+
+def _players(count):
+    return {
+        f"u{i}": {"user_id": f"u{i}", "username": f"Hero{i:03d}", "prestige": i % 3, "level": i % 40, "xp": i}
+        for i in range(count)
+    }
+
+
+class TestLeaderboardIndex(unittest.TestCase):
+    def setUp(self):
+        self.players = _players(250)
+        self.index = LeaderboardIndex(self.players.values())
+
+    def test_ranking_is_by_prestige_level_then_xp(self):
+        expected = sorted(self.players.values(), key=lambda p: (-p["prestige"], -p["level"], -p["xp"]))
+        self.assertEqual(self.index.ranked, expected)
+
+    def test_search_matches_a_substring_scan_in_rank_order(self):
+        for term in ("hero1", "O12", "9", "zzz", "ero24"):
+            expected = [pos for pos, p in enumerate(self.index.ranked) if term.lower() in p["username"].lower()]
+            self.assertEqual(self.index.search(term), expected, term)
+        expected = [pos for pos, p in enumerate(self.index.ranked) if p["username"].lower().startswith("hero00")]
+        self.assertEqual(self.index.search_prefix("HERO00"), expected)
+        self.assertEqual(len(expected), 10)
+
+    def test_pages_are_bounded_and_carry_totals(self):
+        page = self.index.page(3, 100)
+        self.assertEqual((page.page, page.pages, page.offset, len(page.players)), (3, 3, 200, 50))
+        self.assertEqual(page.total_prestige, sum(p["prestige"] for p in self.players.values()))
+        self.assertEqual(self.index.page(99, 10).page, 25)
+        self.assertEqual(self.index.page(1, 10_000).per_page, MAX_PER_PAGE)
+        found = self.index.page(1, 5, self.index.search("hero1"))
+        self.assertEqual(found.total, 100)
+        self.assertEqual(len(found.players), 5)
+
+
+class TestFragmentCache(unittest.TestCase):
+    def test_only_changed_players_are_re_rendered(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            engine = TemplateEngine(ThemeManager(Path(tmpdir)), mount_path="/quest")
+        players = list(_players(30).values())
+        first = engine.render_leaderboard(players, {})
+        self.assertEqual(engine.row_renders, 30)
+
+        players[5] = dict(players[5], xp=99_999)
+        second = engine.render_leaderboard(players, {})
+        self.assertEqual(engine.row_renders, 31)
+        self.assertIn("99,999", second)
+        self.assertNotIn("99,999", first)
+
+    def test_stylesheet_is_compiled_once_and_linked(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            engine = TemplateEngine(ThemeManager(Path(tmpdir)), mount_path="/quest")
+        page = engine.render_page("Title", "<p>body</p>")
+        self.assertNotIn("<style>", page)
+        self.assertIn(f'href="/quest/theme.css?v={engine.stylesheet_version()}"', page)
+        self.assertIs(engine.stylesheet(), engine.stylesheet())
+        self.assertIn(":root", engine.stylesheet())
+
+
+class TestLeaderboardRoutes(unittest.TestCase):
+    def test_html_and_json_pages(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            games = root / "games.json"
+            raw = {uid: {"name": p["username"], "prestige": p["prestige"], "level": p["level"], "xp": p["xp"]}
+                   for uid, p in _players(120).items()}
+            games.write_text(json.dumps({"modules": {"quest": {"players": raw, "player_classes": {}}}}))
+            server = PooledHTTPServer(("127.0.0.1", 0), create_handler_class(JeevesWebApp(games, root, root)))
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            self.addCleanup(server.server_close)
+            self.addCleanup(server.shutdown)
+            base = f"http://127.0.0.1:{server.server_address[1]}"
+
+            with urllib.request.urlopen(base + "/quest/api/leaderboard?page=2&per_page=25", timeout=5) as response:
+                data = json.load(response)
+            self.assertEqual((data["page"], data["pages"], data["total"]), (2, 5, 120))
+            self.assertEqual(data["players"][0]["rank"], 26)
+
+            with urllib.request.urlopen(base + "/quest?search=hero1&page=2&per_page=10", timeout=5) as response:
+                html = response.read().decode()
+            self.assertIn("Page 2 of 2", html)
+            self.assertIn("/quest/?search=hero1&amp;per_page=10", html)
+            self.assertEqual(html.count('class="player-name"'), 10)
+
+            with urllib.request.urlopen(base + "/quest?search=hero0&match=prefix&per_page=10", timeout=5) as response:
+                html = response.read().decode()
+            self.assertIn("Page 1 of 10", html)
+            self.assertIn("/quest/?search=hero0&amp;match=prefix&amp;page=2&amp;per_page=10", html)
+            self.assertIn('<input type="hidden" name="match" value="prefix">', html)
+
+            stylesheet = html.split('rel="stylesheet" href="', 1)[1].split('"', 1)[0]
+            with urllib.request.urlopen(base + stylesheet, timeout=5) as response:
+                self.assertEqual(response.headers["Content-Type"], "text/css; charset=utf-8")
+                self.assertIn("immutable", response.headers["Cache-Control"])
+
+
+if __name__ == "__main__":
+    unittest.main()
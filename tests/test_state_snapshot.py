@@ -0,0 +1,67 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from web.quest.utils import load_boss_hunt_data, load_mob_cooldowns, load_quest_state
+from web.snapshot import SnapshotLoader, snapshot_stats
+from web.stats.data_loader import JeevesStatsLoader
+
+
+class TestSnapshotLoader(unittest.TestCase):
+    def test_file_is_parsed_once_per_change(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "games.json"
+            path.write_text(json.dumps({"modules": {"bell": {"scores": {"u1": 3}}}}))
+            loader = SnapshotLoader()
+
+            first = loader.get(path)
+            self.assertIs(loader.get(path), first)
+            self.assertEqual(first.section("bell", "scores"), {"u1": 3})
+            self.assertEqual(first.module("missing"), {})
+
+            path.write_text(json.dumps({"modules": {"bell": {"scores": {"u1": 30}}}}))
+            second = loader.get(path)
+            self.assertNotEqual(second.version, first.version)
+            self.assertEqual(loader.stats()["parses"], 2)
+
+    def test_missing_and_malformed_files_are_empty(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            loader = SnapshotLoader()
+            self.assertEqual(loader.get(Path(tmpdir) / "nope.json").version, "0")
+            bad = Path(tmpdir) / "bad.json"
+            bad.write_text("{not json")
+            self.assertEqual(dict(loader.get(bad).data), {})
+
+
+class TestSharedConsumers(unittest.TestCase):
+    def test_quest_and_stats_loaders_share_one_parse_per_file(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config = Path(tmpdir)
+            (config / "games.json").write_text(json.dumps({"modules": {
+                "quest": {"players": {"u1": {"name": "Alice", "level": 2}},
+                          "mob_cooldowns": {"#c": 1.0}, "boss_hunt": {"hp": 5}},
+                "hunt": {"scores": {"u1": {"duck_hunted": 2}}},
+                "fishing": {"players": {"u1": {"rare_catches": [{"rarity": "rare"}], "catches": {}}}},
+            }}))
+            (config / "users.json").write_text(json.dumps({"modules": {"users": {"user_map": {
+                "u1": {"canonical_nick": "Alice", "seen_nicks": ["alice", "al"]}}}}}))
+            loader = JeevesStatsLoader(config)
+            before = snapshot_stats()["parses"]
+
+            stats = loader.load_all()
+            load_quest_state(config / "games.json")
+            load_mob_cooldowns(config / "games.json")
+            load_boss_hunt_data(config / "games.json")
+            loader.load_all()
+
+            self.assertEqual(snapshot_stats()["parses"] - before, 2)
+            self.assertEqual(stats["hunt"]["u1"]["total_hunted"], 2)
+            self.assertEqual(stats["users"]["u1"]["nick_change_count"], 1)
+            # Derived fields are added to copies, not the shared snapshot.
+            shared = loader.snapshots()["games.json"].section("hunt", "scores")["u1"]
+            self.assertNotIn("total_hunted", shared)
+
+
+if __name__ == "__main__":
+    unittest.main()
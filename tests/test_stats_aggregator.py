@@ -0,0 +1,148 @@
+import json
+import random
+import tempfile
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from web.stats.data_loader import JeevesStatsLoader, StatsAggregator
+from web.stats.templates import render_overview_page
+
+
+def synthetic_stats(users=200, seed=7):
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    ids = [f"u{i}" for i in range(users)]
+    pick = lambda share: [uid for uid in ids if rng.random() < share]
+    iso = lambda days: (now - timedelta(days=days)).isoformat()
+    return {
+        "users": {uid: {"canonical_nick": f"Nick{uid}", "seen_nicks": [f"nick{uid}", f"alt{uid}"],
+                        "nick_change_count": rng.randint(0, 3)} for uid in ids},
+        "quest": {uid: {"prestige": rng.randint(0, 3), "level": rng.randint(1, 40),
+                        "last_win_date": iso(rng.randint(0, 200))[:10]} for uid in pick(0.6)},
+        "hunt": {uid: {"total_interactions": rng.randint(0, 50)} for uid in pick(0.4)},
+        "duel": {key: {uid: rng.randint(1, 9) for uid in pick(0.3)}
+                 for key in ("wins", "losses", "duels_started", "duels_received")},
+        "adventure": {},
+        "roadtrip": {
+            "history": [{"started": iso(rng.randint(0, 200)), "participants": rng.sample(ids, 3)}
+                        for _ in range(users // 10)],
+            "participation_counts": {uid: rng.randint(1, 5) for uid in pick(0.2)},
+        },
+        "absurdia": {"players": {uid: {"creature_count": rng.randint(0, 5), "total_arena_wins": rng.randint(0, 9),
+                                       "total_arena_losses": rng.randint(0, 9)} for uid in pick(0.2)}},
+        "karma": {uid: rng.randint(-5, 20) for uid in pick(0.3)},
+        "coffee": {uid: {"count": rng.randint(1, 30), "timestamp": (now - timedelta(days=rng.randint(0, 200))).timestamp()}
+                   for uid in pick(0.3)},
+        "bell": {uid: rng.randint(1, 9) for uid in pick(0.2)},
+        "achievements": {"user_achievements": {}, "global_first_unlocks": {}, "achievement_holders": {}},
+        "activity": {"global": {"grid": [0] * 168, "total": 0}, "channels": {}, "users": {}},
+        "fishing": {uid: {"total_fish": rng.randint(0, 99)} for uid in pick(0.3)},
+    }
+
+
+def naive_top_activity(stats, limit):
+    scores = {}
+    for uid in stats["users"]:
+        score = 0
+        if uid in stats["quest"]:
+            score += stats["quest"][uid].get("prestige", 0) * 10 + stats["quest"][uid].get("level", 0)
+        if uid in stats["hunt"]:
+            score += stats["hunt"][uid].get("total_interactions", 0)
+        score += (stats["duel"]["duels_started"].get(uid, 0) + stats["duel"]["duels_received"].get(uid, 0)) * 2
+        if uid in stats["absurdia"]["players"]:
+            data = stats["absurdia"]["players"][uid]
+            score += data["creature_count"] * 5 + data["total_arena_wins"] + data["total_arena_losses"]
+        score += stats["roadtrip"]["participation_counts"].get(uid, 0) * 3
+        if uid in stats["coffee"]:
+            score += stats["coffee"][uid]["count"] * 0.5
+        score += stats["bell"].get(uid, 0)
+        if score > 0:
+            scores[uid] = score
+    return sorted(scores.items(), key=lambda x: x[1], reverse=True)[:limit]
+
+
+class TestIndexedAggregator(unittest.TestCase):
+    def setUp(self):
+        self.stats = synthetic_stats()
+        self.aggregator = StatsAggregator(self.stats)
+
+    def test_results_match_a_full_sort(self):
+        self.assertEqual(self.aggregator.get_top_users_by_activity(10), naive_top_activity(self.stats, 10))
+        self.assertEqual(self.aggregator.get_top_users_by_activity(500), naive_top_activity(self.stats, 500))
+        by_value = lambda items: sorted(items, key=lambda x: x[1], reverse=True)[:5]
+        self.assertEqual(self.aggregator.get_leaderboard("karma", "karma", 5), by_value(self.stats["karma"].items()))
+        self.assertEqual(self.aggregator.get_leaderboard("duel", "wins", 5), by_value(self.stats["duel"]["wins"].items()))
+        self.assertEqual(self.aggregator.get_leaderboard("roadtrip", "participation_counts", 5),
+                         by_value(self.stats["roadtrip"]["participation_counts"].items()))
+        self.assertEqual(self.aggregator.get_leaderboard("absurdia", "total_arena_wins", 5),
+                         by_value((uid, d["total_arena_wins"]) for uid, d in self.stats["absurdia"]["players"].items()))
+
+    def test_active_users_count(self):
+        cutoff = datetime.now(timezone.utc) - timedelta(days=90)
+        active = {uid for uid, d in self.stats["coffee"].items() if d["timestamp"] > cutoff.timestamp()}
+        active |= {uid for uid, d in self.stats["quest"].items()
+                   if datetime.fromisoformat(d["last_win_date"]).date() >= cutoff.date()}
+        for trip in self.stats["roadtrip"]["history"]:
+            if datetime.fromisoformat(trip["started"]) > cutoff:
+                active.update(trip["participants"])
+        self.assertEqual(self.aggregator.get_active_users_count(90), len(active))
+
+    def test_find_user_id_uses_the_nick_index(self):
+        self.assertEqual(self.aggregator.find_user_id("ALTu5"), "u5")
+        self.assertEqual(self.aggregator.find_user_id("Nicku7"), "u7")
+        self.assertEqual(self.aggregator.find_user_id("u9"), "u9")
+        self.assertIsNone(self.aggregator.find_user_id("nobody"))
+
+    def test_unchanged_categories_keep_their_indices(self):
+        self.aggregator.get_top_users_by_activity(10)
+        quest_board = self.aggregator.get_leaderboard("quest", "prestige", 5)
+        self.aggregator.get_leaderboard("karma", "karma", 5)
+
+        changed = dict(self.stats, karma={"u1": 999})
+        updated = StatsAggregator(changed, previous=self.aggregator)
+
+        self.assertIs(updated._leaderboards[("quest", "prestige")], self.aggregator._leaderboards[("quest", "prestige")])
+        self.assertEqual(updated.get_leaderboard("quest", "prestige", 5), quest_board)
+        self.assertEqual(updated.get_leaderboard("karma", "karma", 5), [("u1", 999)])
+        self.assertIs(updated._top_activity, self.aggregator._top_activity)
+        self.assertEqual(updated.builds, 1)
+
+    def test_overview_at_scale_is_served_from_indices(self):
+        stats = synthetic_stats(users=50_000)
+        aggregator = StatsAggregator(stats)
+        render_overview_page(stats, aggregator)
+        builds = aggregator.builds
+
+        started = time.perf_counter()
+        render_overview_page(stats, aggregator)
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(aggregator.builds, builds)
+        self.assertLess(elapsed, 0.1)
+
+
+class TestIncrementalLoad(unittest.TestCase):
+    def test_only_changed_modules_are_reloaded(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config = Path(tmpdir)
+            games = {"modules": {"quest": {"players": {"u1": {"prestige": 1, "level": 3}}},
+                                 "bell": {"scores": {"u1": 2}}}}
+            (config / "games.json").write_text(json.dumps(games))
+            (config / "stats.json").write_text(json.dumps({"modules": {"karma": {"karma_scores": {"u1": 1}}}}))
+            loader = JeevesStatsLoader(config)
+            first = loader.load_all()
+
+            games["modules"]["bell"]["scores"]["u1"] = 5
+            (config / "games.json").write_text(json.dumps(games, indent=1))
+            second = loader.load_all()
+
+            self.assertIs(second["quest"], first["quest"])
+            self.assertIs(second["karma"], first["karma"])
+            self.assertIsNot(second["bell"], first["bell"])
+            self.assertEqual(second["bell"], {"u1": 5})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from modules import translate
+from modules.translate import Translate, TranslationBatcher
+from tests.test_weather2_geocode import BotStub, ConnectionStub, event
+
+
+class FakeTranslator:
+    def __init__(self, api_key):
+        self.calls = []
+
+    def translate_text(self, text, target_lang=None):
+        self.calls.append((text, target_lang))
+        texts = text if isinstance(text, list) else [text]
+        results = [SimpleNamespace(text=f"[{target_lang}] {t}", detected_source_lang="DE") for t in texts]
+        return results if isinstance(text, list) else results[0]
+
+
+class TestTranslationCache(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(translate.deepl, "Translator", FakeTranslator)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        bot = BotStub()
+        bot.config["translate"] = {"batch_window_ms": 0}
+        self.module = Translate(bot, "key")
+        self.translator = self.module.translator
+
+    def _say(self, text, channel="#test"):
+        self.requests = getattr(self, "requests", 0) + 1
+        connection = ConnectionStub()
+        ev = event()
+        ev.target = channel
+        self.assertTrue(self.module._dispatch_commands(connection, ev, text, f"user{self.requests}"))
+        return connection.messages[-1][1]
+
+    def test_repeat_translations_are_served_from_cache(self):
+        first = self._say("!tr FR guten   Morgen")
+        second = self._say("!translate FR guten Morgen")
+
+        self.assertEqual(first, second)
+        self.assertTrue(first.endswith('"[FR] guten Morgen"'))
+        self.assertEqual(len(self.translator.calls), 1)
+        self.assertNotEqual(self._say("!tr DE guten Morgen"), first)
+        self.assertEqual(len(self.translator.calls), 2)
+
+    def test_translate_last_reuses_a_cached_translation(self):
+        self.module.recent_messages["#test"] = [("hans", "Wie geht's?")]
+        self._say("!tr EN-US Wie geht's?")
+        self._say("!tr")
+        self.assertEqual(len(self.translator.calls), 1)
+
+    def test_character_usage_is_tracked_per_channel(self):
+        self._say("!tr FR hallo", channel="#a")
+        self._say("!tr FR hallo", channel="#b")
+        self._say("!tr FR tschuess", channel="#b")
+
+        usage = self.module.get_state("char_usage")
+        self.assertEqual(usage["#a"], {"chars": 5, "requests": 1, "cached_chars": 0})
+        self.assertEqual(usage["#b"], {"chars": 8, "requests": 2, "cached_chars": 5})
+
+    def test_usage_is_written_on_flush_not_per_translation(self):
+        self._say("!tr FR hallo")
+        saved = self.module.bot._states.get(self.module.name, {})
+        self.assertNotIn("char_usage", saved)
+
+        self.module.on_unload()
+        saved = self.module.bot._states[self.module.name]
+        self.assertEqual(saved["char_usage"]["#test"]["requests"], 1)
+        self.assertEqual(saved["translations_done"], 1)
+
+    def test_usage_counts_only_texts_deepl_translated(self):
+        self.module.batcher.window = 60
+        for channel in ("#a", "#b"):
+            ev = event()
+            ev.target = channel
+            self.module._dispatch_commands(ConnectionStub(), ev, "!tr FR hallo", "user")
+        self.module.batcher.flush("FR")
+
+        usage = self.module.get_state("char_usage")
+        self.assertEqual(usage["#a"], {"chars": 5, "requests": 1, "cached_chars": 0})
+        self.assertEqual(usage["#b"], {"chars": 0, "requests": 1, "cached_chars": 5})
+        self.assertEqual(len(self.translator.calls), 1)
+
+    def test_failed_translations_are_not_counted(self):
+        with mock.patch.object(self.translator, "translate_text", side_effect=RuntimeError("quota exceeded")):
+            self._say("!tr FR hallo")
+        self.assertEqual(self.module.get_state("char_usage", {}), {})
+
+
+class TestTranslationBatcher(unittest.TestCase):
+    def test_requests_in_one_window_share_a_call(self):
+        calls = []
+        done = threading.Event()
+        received = []
+
+        def translate_batch(texts, target):
+            calls.append((list(texts), target))
+            return [t.upper() for t in texts]
+
+        def callback(result, error, sent):
+            received.append(result)
+            if len(received) == 3:
+                done.set()
+
+        batcher = TranslationBatcher(translate_batch, window=0.05)
+        for text in ("eins", "zwei", "eins"):
+            batcher.submit(text, "EN-US", callback)
+
+        self.assertTrue(done.wait(2))
+        self.assertEqual(calls, [(["eins", "zwei"], "EN-US")])
+        self.assertEqual(sorted(received), ["EINS", "EINS", "ZWEI"])
+
+    def test_errors_reach_every_waiting_request(self):
+        errors = []
+
+        def fail(texts, target):
+            raise RuntimeError("quota exceeded")
+
+        batcher = TranslationBatcher(fail, window=0)
+        batcher.submit("eins", "FR", lambda result, error, sent: errors.append(error))
+        self.assertIsInstance(errors[0], RuntimeError)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+import threading
+import unittest
+from types import SimpleNamespace
+
+import requests
+
+from modules.weather2 import (
+    ALERTS_CACHE_TTL,
+    CURRENT_CACHE_TTL,
+    NWS_ALERTS_URL,
+    OPEN_METEO_FORECAST_URL,
+    Weather2,
+)
+from tests.test_weather2_geocode import BotStub, ConnectionStub, event
+
+
+class RecordingHTTP:
+    def __init__(self, responses):
+        self.responses = responses
+        self.calls = []
+
+    def get_json(self, url, params=None, headers=None, **cache_options):
+        self.calls.append((url, dict(params or {}), cache_options))
+        response = self.responses[url]
+        if isinstance(response, Exception):
+            raise response
+        return response(params) if callable(response) else response
+
+    def close(self):
+        pass
+
+
+class UsersStub:
+    def __init__(self, nick_map):
+        self.nick_map = nick_map
+
+    def has_flavor_enabled(self, username):
+        return False
+
+    def get_state(self, key=None, default=None):
+        return self.nick_map if key == "nick_map" else default
+
+
+def _not_found():
+    response = requests.Response()
+    response.status_code = 404
+    return requests.HTTPError("404", response=response)
+
+
+class TestWeather2Caching(unittest.TestCase):
+    def setUp(self):
+        self.weather = Weather2(BotStub())
+        self.addCleanup(self.weather.on_unload)
+
+    def test_forecast_requests_are_snapped_to_grid_and_cached(self):
+        http = RecordingHTTP({OPEN_METEO_FORECAST_URL: {"current": {"temperature_2m": 20}}})
+        self.weather.forecast_http = http
+
+        self.weather._fetch_current("27.95123", "-82.45876")
+
+        _, params, options = http.calls[-1]
+        self.assertEqual((params["latitude"], params["longitude"]), ("27.95", "-82.46"))
+        self.assertEqual(options["cache_ttl"], CURRENT_CACHE_TTL)
+
+    def test_alerts_are_fetched_per_nws_zone(self):
+        points_url = "https://api.weather.gov/points/27.95,-82.46"
+        self.weather.http = RecordingHTTP({
+            points_url: {"properties": {
+                "forecastZone": "https://api.weather.gov/zones/forecast/FLZ151",
+                "county": "https://api.weather.gov/zones/county/FLC057",
+            }},
+            NWS_ALERTS_URL: {"features": [{"properties": {"severity": "Severe", "event": "Flood Warning"}}]},
+        })
+
+        alerts = self.weather._fetch_alerts("27.951", "-82.459")
+
+        self.assertEqual([a["event"] for a in alerts], ["Flood Warning"])
+        url, params, options = self.weather.http.calls[-1]
+        self.assertEqual((url, params["zone"]), (NWS_ALERTS_URL, "FLZ151,FLC057"))
+        self.assertEqual(options["cache_ttl"], ALERTS_CACHE_TTL)
+
+    def test_points_outside_nws_coverage_skip_the_alerts_request(self):
+        self.weather.http = RecordingHTTP({"https://api.weather.gov/points/51.51,-0.13": _not_found()})
+
+        self.assertEqual(self.weather._fetch_alerts("51.5072", "-0.1276"), [])
+        self.assertEqual(len(self.weather.http.calls), 1)
+
+
+class TestWeather2Executor(unittest.TestCase):
+    def test_requests_beyond_the_queue_limit_are_refused(self):
+        bot = BotStub()
+        bot.config["weather2"].update({"max_workers": 1, "max_queued": 1})
+        weather = Weather2(bot)
+        release = threading.Event()
+        try:
+            self.assertTrue(weather._run_async(release.wait, 2))
+            self.assertTrue(weather._run_async(release.wait, 2))
+            connection = ConnectionStub()
+            weather._submit(connection, event(), "Alice", release.wait, 2)
+            self.assertEqual(connection.messages[-1], ("#test", "Weather service busy; try again shortly."))
+        finally:
+            release.set()
+            weather.on_unload()
+
+
+class TestWeather2ChannelBatch(unittest.TestCase):
+    def setUp(self):
+        bot = BotStub()
+        bot.channels = {"#test": SimpleNamespace(users=lambda: ["carol", "Alice", "bob", "dave"])}
+        bot.pm.plugins["users"] = UsersStub({"alice": "u1", "bob": "u2", "carol": "u3"})
+        bot._states["weather2"] = {"user_locations": {
+            "u1": {"lat": "27.951", "lon": "-82.459", "short_name": "Tampa, Florida, US"},
+            "u2": {"lat": "27.949", "lon": "-82.461", "short_name": "Tampa, FL"},
+            "u3": {"lat": "51.5072", "lon": "-0.1276", "short_name": "London, England, GB"},
+        }}
+        self.weather = Weather2(bot)
+        self.addCleanup(self.weather.on_unload)
+        self.weather._run_async = lambda fn, *args, **kwargs: fn(*args, **kwargs) or True
+
+    def test_one_request_covers_every_grid_cell(self):
+        self.weather.forecast_http = RecordingHTTP({OPEN_METEO_FORECAST_URL: [
+            {"current": {"weather_code": 0, "temperature_2m": 30}},
+            {"current": {"weather_code": 3, "temperature_2m": 15}},
+        ]})
+        connection = ConnectionStub()
+
+        handled = self.weather._dispatch_commands(connection, event(), "!w channel", "Alice")
+
+        self.assertTrue(handled)
+        self.assertEqual(len(self.weather.forecast_http.calls), 1)
+        _, params, _ = self.weather.forecast_http.calls[0]
+        self.assertEqual(params["latitude"], "27.95,51.51")
+        self.assertEqual(
+            connection.messages[-1],
+            ("#test", "Tampa, Florida, US (Alice, bob): Clear sky, 86°F/30°C | "
+                      "London, England, GB (carol): Overcast, 59°F/15°C"),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -27,7 +27,7 @@ class FallbackHTTP:
         self.wttr_data = wttr_data
         self.calls = []
 
-    def get_json(self, url, params=None, headers=None):
+    def get_json(self, url, params=None, headers=None, **cache_options):
         self.calls.append((url, dict(params or {}), dict(headers or {})))
         if url.startswith(WTTR_URL):
             if self.wttr_data is None:
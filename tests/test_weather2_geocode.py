@@ -1,6 +1,11 @@
+import importlib.util
+import sys
 import unittest
 from types import SimpleNamespace
 
+import jeeves
+from jeeves import PluginManager
+
 from modules.weather2 import OPEN_METEO_GEO_URL, Weather2
 
 
@@ -181,6 +186,25 @@ class TestWeather2Geocoding(unittest.TestCase):
 
         self.assertIsNone(weather._geocode("oviedo, ca"))
 
+    def test_repeat_lookups_are_served_from_the_geocode_cache(self):
+        _, weather = make_weather([SPAIN_OVIEDO, FLORIDA_OVIEDO])
+
+        weather._geocode("oviedo, fl")
+        calls = len(weather.http.calls)
+        geo = weather._geocode("Oviedo,  Florida")
+
+        self.assertEqual(len(weather.http.calls), calls)
+        self.assertEqual(geo["short_name"], "Oviedo, Florida, US")
+        self.assertEqual(geo["user_input"], "Oviedo,  Florida")
+
+    def test_failed_lookups_are_not_cached(self):
+        _, weather = make_weather([FLORIDA_OVIEDO])
+        weather.http.get_json = lambda *args, **kwargs: 1 / 0
+
+        self.assertIsNone(weather._geocode("oviedo"))
+        weather.http = FakeHTTP([FLORIDA_OVIEDO])
+        self.assertIsNotNone(weather._geocode("oviedo"))
+
     def test_location_command_accepts_state_code(self):
         bot, weather = make_weather([SPAIN_OVIEDO, FLORIDA_OVIEDO])
         connection = ConnectionStub()
@@ -198,5 +222,28 @@ class TestWeather2Geocoding(unittest.TestCase):
         self.assertEqual(stored["short_name"], "Oviedo, Florida, US")
 
 
+
+class TestGeocodeCacheAcrossModuleLoads(unittest.TestCase):
+    def test_uncached_lookup_when_the_cache_came_from_another_module_copy(self):
+        # The bot-wide cache may have been built by an earlier execution of geocache.py,
+        # whose MISS sentinel differs from the one currently importable.
+        spec = importlib.util.spec_from_file_location("geocache_copy", jeeves.ROOT / "modules" / "geocache.py")
+        geocache_copy = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(geocache_copy)
+        bot = BotStub()
+        bot.geocode_cache = geocache_copy.GeocodeCache()
+
+        pm = PluginManager(bot)
+        self.addCleanup(pm.unload_all)
+        self.assertTrue(pm.load_module("weather2"))
+        weather = pm.plugins["weather2"]
+        weather.http = FakeHTTP([FLORIDA_OVIEDO])
+
+        geo = weather._geocode("oviedo, fl")
+        self.assertEqual(geo["short_name"], "Oviedo, Florida, US")
+        self.assertEqual(weather._geocode("Oviedo,  FL")["user_input"], "Oviedo,  FL")
+        self.assertEqual(len(weather.http.calls), 1)
+        self.assertIs(sys.modules["modules.weather2"], pm.modules["weather2"])
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,147 @@
+import gzip
+import json
+import os
+import tempfile
+import threading
+import unittest
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from web.app import JeevesWebApp, MtimeCache
+from web.server import PooledHTTPServer, choose_encoding, create_handler_class, etag_matches
+
+
+def _write_games(path: Path, players: dict) -> None:
+    path.write_text(json.dumps({"modules": {"quest": {"players": players, "player_classes": {}}}}))
+
+
+class TestMtimeCache(unittest.TestCase):
+    def test_values_are_rebuilt_only_when_a_source_changes(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source = Path(tmpdir) / "a.json"
+            source.write_text("1")
+            cache = MtimeCache()
+            builds = []
+
+            def build():
+                builds.append(1)
+                return source.read_text()
+
+            self.assertEqual(cache.get("a", [source], build), "1")
+            self.assertEqual(cache.get("a", [source], build), "1")
+            source.write_text("22")
+            self.assertEqual(cache.get("a", [source], build), "22")
+            self.assertEqual(len(builds), 2)
+
+    def test_concurrent_misses_share_one_build(self):
+        cache = MtimeCache()
+        release = threading.Event()
+        builds = []
+
+        def build():
+            builds.append(1)
+            release.wait(2)
+            return "value"
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            futures = [pool.submit(cache.get, "k", [], build) for _ in range(4)]
+            release.set()
+            self.assertEqual({f.result() for f in futures}, {"value"})
+        self.assertEqual(len(builds), 1)
+
+
+class TestJeevesWebApp(unittest.TestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.root = Path(tmpdir.name)
+        self.games = self.root / "games.json"
+        _write_games(self.games, {"u1": {"name": "Alice", "level": 3}})
+        self.app = JeevesWebApp(self.games, self.root, self.root)
+
+    def test_quest_state_is_parsed_once_per_change(self):
+        first = self.app.quest_state()
+        self.assertIs(self.app.quest_state(), first)
+        self.assertEqual(first.players["u1"]["username"], "Alice")
+
+        _write_games(self.games, {"u1": {"name": "Alice", "level": 3}, "u2": {"name": "Bob"}})
+        stat = os.stat(self.games)
+        os.utime(self.games, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        self.assertEqual(len(self.app.quest_state().players), 2)
+
+    def test_threaded_server_shares_the_app_caches(self):
+        server = PooledHTTPServer(("127.0.0.1", 0), create_handler_class(self.app), workers=4)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+
+        def fetch(path):
+            with urllib.request.urlopen(base + path, timeout=5) as response:
+                return response.status, response.read()
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(fetch, ["/quest", "/api/status", "/", "/quest"] * 4))
+
+        self.assertTrue(all(status == 200 for status, _ in results))
+        self.assertIn(b'"players": 1', results[1][1])
+        builds = self.app.cache.stats()["builds"]
+        self.assertEqual(builds, 3)  # templates, quest state, stats
+
+
+class TestHTTPCaching(unittest.TestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.root = Path(tmpdir.name)
+        self.games = self.root / "games.json"
+        _write_games(self.games, {"u1": {"name": "Alice", "level": 3}})
+        self.app = JeevesWebApp(self.games, self.root, self.root)
+        server = PooledHTTPServer(("127.0.0.1", 0), create_handler_class(self.app), workers=2)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self.base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    def fetch(self, path, **headers):
+        request = urllib.request.Request(self.base + path, headers=headers)
+        try:
+            with urllib.request.urlopen(request, timeout=5) as response:
+                return response.status, response.headers, response.read()
+        except urllib.error.HTTPError as exc:
+            return exc.code, exc.headers, exc.read()
+
+    def test_pages_are_compressed_and_revalidated_by_etag(self):
+        status, headers, body = self.fetch("/quest", **{"Accept-Encoding": "gzip, deflate;q=0.5"})
+        self.assertEqual(status, 200)
+        self.assertEqual(headers["Content-Encoding"], "gzip")
+        self.assertIn(b"Alice", gzip.decompress(body))
+        self.assertEqual(headers["Cache-Control"], "no-cache")
+
+        status, headers, body = self.fetch("/quest", **{"If-None-Match": headers["ETag"]})
+        self.assertEqual((status, body), (304, b""))
+
+        _write_games(self.games, {"u1": {"name": "Alicia", "level": 4}})
+        stat = os.stat(self.games)
+        os.utime(self.games, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        status, _, body = self.fetch("/quest", **{"If-None-Match": headers["ETag"]})
+        self.assertEqual(status, 200)
+        self.assertIn(b"Alicia", body)
+
+    def test_rendered_pages_are_shared_per_route_and_query(self):
+        for path in ("/quest", "/quest/", "/quest?search=ali", "/quest?search=ali"):
+            self.assertEqual(self.fetch(path)[0], 200)
+        self.assertEqual(self.app.pages.stats()["renders"], 2)
+
+    def test_header_parsing(self):
+        self.assertEqual(choose_encoding("br, gzip;q=0.8, deflate"), "deflate")
+        self.assertEqual(choose_encoding("gzip;q=0"), "identity")
+        self.assertTrue(etag_matches('W/"abc-gzip", "zzz"', '"abc"'))
+        self.assertFalse(etag_matches('"abd"', '"abc"'))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import signal
+import tempfile
+import unittest
+from pathlib import Path
+
+from web.bench import ROUTES, benchmark, format_report, percentile, write_fixtures
+from web.stats.data_loader import JeevesStatsLoader
+
+
+class TestFixtures(unittest.TestCase):
+    def test_fixtures_load_through_the_stats_loader(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            write_fixtures(Path(tmpdir), users=200, creatures_per_player=3)
+            stats = JeevesStatsLoader(Path(tmpdir)).load_all()
+            self.assertEqual(len(stats["users"]), 200)
+            self.assertTrue(stats["quest"])
+            self.assertTrue(stats["achievements"]["user_achievements"])
+            players = stats["absurdia"]["players"]
+            self.assertTrue(players)
+            self.assertTrue(any(player.get("creature_count") for player in players.values()))
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_percentile(self):
+        samples = [float(n) for n in range(1, 101)]
+        self.assertEqual(percentile(samples, 50), 50.0)
+        self.assertEqual(percentile(samples, 99), 99.0)
+        self.assertEqual(percentile([], 90), 0.0)
+
+    def test_small_run_covers_every_route(self):
+        handlers = {sig: signal.getsignal(sig) for sig in (signal.SIGINT, signal.SIGTERM)}
+        self.addCleanup(lambda: [signal.signal(sig, handler) for sig, handler in handlers.items()])
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            report = benchmark(Path(tmpdir), users=60, requests=48, concurrency=4, workers=2)
+
+        self.assertEqual(report["errors"], 0)
+        self.assertEqual(set(report["routes"]), set(ROUTES))
+        self.assertEqual(sum(row["requests"] for row in report["routes"].values()), 48)
+        # Everything was parsed and rendered during warm-up.
+        self.assertEqual(report["parses_per_request"], 0)
+        self.assertIn("throughput", format_report(report))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,281 @@
+# web/app.py
+# Application object shared by every request of the unified web server
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+from web.export import Exporter
+from web.live import DEFAULT_MAX_CLIENTS, LiveHub
+from web.quest.leaderboard import LeaderboardIndex
+from web.quest.templates import TemplateEngine
+from web.quest.themes import ThemeManager
+from web.quest.utils import load_boss_hunt_data, load_challenge_paths, load_mob_cooldowns, load_quest_state
+from web.stats.config import load_stats_web_config
+from web.snapshot import file_signature
+from web.stats.data_loader import JeevesStatsLoader, StatsAggregator
+
+
+class MtimeCache:
+    """Thread-safe cache of values derived from files, rebuilt when a source file changes.
+
+    Concurrent requests for a stale key wait for a single rebuild instead of
+    each parsing the files themselves.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Tuple[tuple, Any]] = {}
+        self._build_locks: Dict[str, threading.Lock] = {}
+        self.hits = 0
+        self.builds = 0
+
+    def get(self, key: str, paths: Iterable[Path], build: Callable[[], Any]) -> Any:
+        paths = list(paths)
+        signature = file_signature(paths)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == signature:
+                self.hits += 1
+                return entry[1]
+            build_lock = self._build_locks.setdefault(key, threading.Lock())
+
+        with build_lock:
+            # Another thread may have rebuilt while we waited.
+            signature = file_signature(paths)
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] == signature:
+                    self.hits += 1
+                    return entry[1]
+            # The signature is taken before building, so a write during the
+            # build is picked up by the next request.
+            value = build()
+            with self._lock:
+                self._entries[key] = (signature, value)
+                self.builds += 1
+            return value
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "builds": self.builds}
+
+
+COMPRESSORS: Dict[str, Callable[[bytes], bytes]] = {
+    "gzip": lambda body: gzip.compress(body, compresslevel=6, mtime=0),
+    "deflate": lambda body: zlib.compress(body, 6),
+}
+
+
+def page_etag(key: Hashable) -> str:
+    """Strong ETag for the page cached under `key` (which includes the state version)."""
+    return '"%s"' % hashlib.blake2b(repr(key).encode("utf-8"), digest_size=12).hexdigest()
+
+
+class RenderedPage:
+    """A rendered response body; compressed variants are built on first request."""
+
+    __slots__ = ("body", "etag", "_encoded", "_lock")
+
+    def __init__(self, body: bytes, etag: str):
+        self.body = body
+        self.etag = etag
+        self._encoded: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def encoded(self, encoding: str) -> bytes:
+        if encoding not in COMPRESSORS:
+            return self.body
+        with self._lock:
+            data = self._encoded.get(encoding)
+            if data is None:
+                data = self._encoded[encoding] = COMPRESSORS[encoding](self.body)
+            return data
+
+
+class PageCache:
+    """LRU of rendered pages keyed by (route, query, state version).
+
+    Keys embed the version of the files a page was rendered from, so entries
+    never need invalidating; stale ones simply age out.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._pages: "OrderedDict[Hashable, RenderedPage]" = OrderedDict()
+        self.hits = 0
+        self.renders = 0
+
+    def get(self, key: Hashable, render: Callable[[], Optional[str]]) -> Optional[RenderedPage]:
+        """Cached page for `key`, rendering it on a miss. A None render is not cached."""
+        with self._lock:
+            page = self._pages.get(key)
+            if page is not None:
+                self._pages.move_to_end(key)
+                self.hits += 1
+                return page
+
+        html = render()
+        if html is None:
+            return None
+        page = RenderedPage(html.encode("utf-8"), page_etag(key))
+        with self._lock:
+            self._pages[key] = page
+            self._pages.move_to_end(key)
+            while len(self._pages) > self.max_entries:
+                self._pages.popitem(last=False)
+            self.renders += 1
+        return page
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pages.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._pages), "hits": self.hits, "renders": self.renders}
+
+
+@dataclass(frozen=True)
+class QuestState:
+    """Everything the quest pages read from games.json and challenge_paths.json."""
+
+    players: Dict[str, dict]
+    classes: Dict[str, str]
+    challenge_info: Dict[str, Any]
+    mob_cooldowns: Dict[str, float]
+    boss_hunt_data: Dict[str, Any]
+    leaderboard: LeaderboardIndex
+
+
+class JeevesWebApp:
+    """Owns the state shared by all requests: theme, templates and parsed game/stats files.
+
+    Request handlers are created per request and must stay cheap; anything that
+    reads files goes through `self.cache` so it is parsed once per change.
+    Cached values are shared between threads and must be treated as read-only.
+    """
+
+    def __init__(self, games_path: Path, content_path: Path, config_path: Path, debug: bool = False,
+                 live_clients: int = DEFAULT_MAX_CLIENTS):
+        self.games_path = Path(games_path)
+        self.content_path = Path(content_path)
+        self.config_path = Path(config_path)
+        self.debug = bool(debug)
+        self.cache = MtimeCache()
+        self.pages = PageCache()
+        self.generation = 0  # bumped by reload() so edits that keep the mtime get new ETags
+        self.stats_loader = JeevesStatsLoader(self.config_path)
+        self._aggregator: Optional[StatsAggregator] = None
+        self.live = LiveHub(self, max_clients=live_clients)
+        self.exports = Exporter(self)
+
+    # --- Source files ---
+
+    def _theme_sources(self) -> Tuple[Path, ...]:
+        return (
+            self.content_path / "quest_content.json",
+            self.content_path / "theme.json",
+            self.content_path / "config" / "config.yaml",
+            self.content_path / "config.yaml",
+        )
+
+    def _quest_sources(self) -> Tuple[Path, ...]:
+        return (self.games_path, self.content_path / "challenge_paths.json")
+
+    def _stats_sources(self) -> Tuple[Path, ...]:
+        loader = self.stats_loader
+        return (
+            loader.games_path,
+            loader.stats_path,
+            loader.state_path,
+            loader.users_path,
+            loader.absurdia_db_path,
+            Path(f"{loader.absurdia_db_path}-wal"),
+        )
+
+    def _page_sources(self, kind: str) -> Tuple[Path, ...]:
+        if kind == "quest":
+            return self._quest_sources() + self._theme_sources()
+        if kind == "stats":
+            return self._stats_sources() + (self.config_path / "config.yaml",)
+        return self._theme_sources()
+
+    def page_version(self, kind: str, refresh: int = 0) -> str:
+        """Token that changes whenever a file behind `kind` pages ("quest", "stats", "theme") does.
+
+        With `refresh` the token also rolls over every `refresh` seconds, for
+        pages that show times relative to now.
+        """
+        signature = file_signature(self._page_sources(kind))
+        bucket = int(time.time() // refresh) if refresh else 0
+        token = (signature, bucket, self.generation)
+        return hashlib.blake2b(repr(token).encode("utf-8"), digest_size=8).hexdigest()
+
+    # --- Shared views ---
+
+    def template_engine(self) -> TemplateEngine:
+        return self.cache.get(
+            "quest_templates",
+            self._theme_sources(),
+            lambda: TemplateEngine(ThemeManager(self.content_path), mount_path="/quest", live_updates=True),
+        )
+
+    def theme_manager(self) -> ThemeManager:
+        return self.template_engine().theme
+
+    def quest_state(self) -> QuestState:
+        return self.cache.get("quest_state", self._quest_sources(), self._build_quest_state)
+
+    def _build_quest_state(self) -> QuestState:
+        players, classes = load_quest_state(self.games_path)
+        return QuestState(
+            players=players,
+            classes=classes,
+            challenge_info=load_challenge_paths(self.content_path / "challenge_paths.json"),
+            mob_cooldowns=load_mob_cooldowns(self.games_path),
+            boss_hunt_data=load_boss_hunt_data(self.games_path),
+            leaderboard=LeaderboardIndex(players.values()),
+        )
+
+    def stats(self) -> Tuple[Dict[str, Any], StatsAggregator]:
+        """Loaded stats and their aggregator; raises if the state files can't be read."""
+        return self.cache.get("stats", self._stats_sources(), self._build_stats)
+
+    def _build_stats(self) -> Tuple[Dict[str, Any], StatsAggregator]:
+        # Categories that didn't change keep their leaderboards and scores.
+        stats = self.stats_loader.load_all()
+        self._aggregator = StatsAggregator(stats, previous=self._aggregator)
+        return stats, self._aggregator
+
+    def stats_web_config(self) -> Dict[str, Any]:
+        return self.cache.get(
+            "stats_web_config",
+            (self.config_path / "config.yaml",),
+            lambda: load_stats_web_config(self.config_path),
+        )
+
+    def reload(self) -> None:
+        """Drops every cached view so the next request re-reads all files."""
+        self.cache.invalidate()
+        self.pages.clear()
+        self.generation += 1
+        self.stats_loader.close()
+        self.stats_loader = JeevesStatsLoader(self.config_path)
+        self._aggregator = None
@@ -0,0 +1,323 @@
+# web/bench.py
+# Load-test benchmark for the web dashboards against synthetic state files
+
+"""
+Generates games.json, users.json, stats.json and absurdia.db at a chosen
+scale, starts JeevesWebServer on them and drives concurrent GET requests at
+the dashboard pages:
+
+    python -m web.bench --users 5000 --requests 2000 --concurrency 16
+    python -m web.bench --users 5000 --touch-interval 0.5   # bot saving state mid-run
+
+Reports throughput, latency percentiles per route, peak RSS and how many
+state-file parses and cache rebuilds each request cost. The server runs in
+this process, so peak RSS includes the (small) client side.
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import math
+import os
+import random
+import resource
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from web.server import DEFAULT_WORKERS, JeevesWebServer
+from web.snapshot import snapshot_stats
+
+ROUTES = ("/", "/quest", "/quest/player", "/achievements", "/activity", "/api/stats")
+RARITIES = ("common", "uncommon", "rare", "epic", "legendary")
+CHANNELS = ("#jeeves", "#games", "#random", "#dev")
+HEATMAP_BINS = 168
+
+
+def _bucket(rng: random.Random, scale: int) -> Dict[str, Any]:
+    grid = [rng.randint(0, scale) for _ in range(HEATMAP_BINS)]
+    return {"grid": grid, "total": sum(grid)}
+
+
+def write_fixtures(root: Path, users: int = 1000, creatures_per_player: int = 10, seed: int = 1) -> Dict[str, Path]:
+    """Writes a synthetic bot state for `users` users under `root`; returns the paths used."""
+    rng = random.Random(seed)
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    now = datetime.now(timezone.utc)
+    ids = [f"user{i:06d}" for i in range(users)]
+    some = lambda share: [uid for uid in ids if rng.random() < share]
+    ago = lambda days: now - timedelta(days=rng.uniform(0, days))
+
+    user_map = {uid: {"canonical_nick": f"Hero{i}", "seen_nicks": [f"hero{i}", f"hero{i}_away"],
+                      "nick_change_count": rng.randint(0, 4)} for i, uid in enumerate(ids)}
+
+    quest_players = {}
+    for uid in some(0.7):
+        quest_players[uid] = {
+            "name": user_map[uid]["canonical_nick"], "level": rng.randint(1, 60), "xp": rng.randint(0, 5000),
+            "xp_to_next_level": rng.randint(100, 9000), "prestige": rng.randint(0, 5),
+            "energy": rng.randint(0, 10), "wins": rng.randint(0, 500), "losses": rng.randint(0, 500),
+            "streak": rng.randint(0, 9), "last_win_date": ago(120).date().isoformat(),
+            "inventory": {"small_xp_potion": rng.randint(0, 3)},
+        }
+    games = {"modules": {
+        "quest": {"players": quest_players,
+                  "player_classes": {uid: rng.choice(("fighter", "rogue", "mage")) for uid in list(quest_players)[::3]},
+                  "mob_cooldowns": {channel: time.time() + rng.randint(0, 600) for channel in CHANNELS}},
+        "hunt": {"scores": {uid: {"hunted": {"duck": rng.randint(0, 40)}, "befriended": {"duck": rng.randint(0, 40)}}
+                            for uid in some(0.4)}},
+        "bell": {"scores": {uid: rng.randint(1, 50) for uid in some(0.2)}},
+        "roadtrip": {"history": [{"started": ago(200).isoformat(), "participants": rng.sample(ids, min(4, users))}
+                                 for _ in range(max(1, users // 20))]},
+        "fishing": {"players": {uid: {"level": rng.randint(1, 30), "xp": rng.randint(0, 9000),
+                                      "total_fish": rng.randint(0, 400),
+                                      "catches": {f"fish{n}": rng.randint(1, 5) for n in range(rng.randint(0, 12))},
+                                      "rare_catches": [{"rarity": rng.choice(("rare", "legendary"))}
+                                                       for _ in range(rng.randint(0, 4))]}
+                                for uid in some(0.3)}},
+    }}
+
+    achievement_ids = [f"achievement_{n}" for n in range(40)]
+    user_achievements = {}
+    for uid in some(0.5):
+        unlocked = rng.sample(achievement_ids, rng.randint(1, 12))
+        user_achievements[uid] = {"unlocked": unlocked,
+                                  "unlock_times": {ach: ago(300).timestamp() for ach in unlocked}}
+    stats = {"modules": {
+        "duel": {"stats": {key: {uid: rng.randint(1, 30) for uid in some(0.3)}
+                           for key in ("wins", "losses", "duels_started", "duels_received")}},
+        "karma": {"karma_scores": {uid: rng.randint(-20, 80) for uid in some(0.3)}},
+        "coffee": {"user_beverage_counts": {uid: {"count": rng.randint(1, 90), "timestamp": ago(200).timestamp()}
+                                            for uid in some(0.3)}},
+        "achievements": {"user_achievements": user_achievements, "global_first_unlocks": {}},
+        "activity": {"global": _bucket(rng, 500),
+                     "channels": {channel: _bucket(rng, 200) for channel in CHANNELS},
+                     "users": {uid: _bucket(rng, 5) for uid in some(0.5)}},
+    }}
+
+    paths = {
+        "games": root / "games.json",
+        "users": root / "users.json",
+        "stats": root / "stats.json",
+        "state": root / "state.json",
+        "absurdia": root / "absurdia.db",
+    }
+    paths["games"].write_text(json.dumps(games))
+    paths["users"].write_text(json.dumps({"modules": {"users": {"user_map": user_map}}}))
+    paths["stats"].write_text(json.dumps(stats))
+    paths["state"].write_text(json.dumps({"modules": {}}))
+    _write_absurdia(paths["absurdia"], rng, some(0.2), creatures_per_player)
+    return paths
+
+
+def _write_absurdia(path: Path, rng: random.Random, owners: Sequence[str], creatures_per_player: int) -> None:
+    path.unlink(missing_ok=True)
+    with sqlite3.connect(path) as conn:
+        # The columns the web tier reads, as created by modules/absurdia_pkg/absurdia_db.py.
+        conn.execute("""CREATE TABLE players (
+            user_id TEXT PRIMARY KEY, username TEXT NOT NULL, coins INTEGER DEFAULT 1000,
+            total_arena_wins INTEGER DEFAULT 0, total_arena_losses INTEGER DEFAULT 0,
+            current_win_streak INTEGER DEFAULT 0, best_win_streak INTEGER DEFAULT 0)""")
+        conn.execute("""CREATE TABLE creatures (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, owner_id TEXT NOT NULL, name TEXT NOT NULL,
+            rarity TEXT NOT NULL, creature_type TEXT NOT NULL, total_wins INTEGER DEFAULT 0,
+            total_losses INTEGER DEFAULT 0, UNIQUE(owner_id, name))""")
+        conn.execute("CREATE INDEX idx_creatures_owner_rarity ON creatures(owner_id, rarity)")
+        conn.executemany(
+            "INSERT INTO players VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(uid, uid, rng.randint(0, 5000), rng.randint(0, 90), rng.randint(0, 90), rng.randint(0, 5), rng.randint(0, 12))
+             for uid in owners],
+        )
+        conn.executemany(
+            "INSERT INTO creatures (owner_id, name, rarity, creature_type, total_wins, total_losses) VALUES (?, ?, ?, ?, ?, ?)",
+            [(uid, f"creature{n}", rng.choice(RARITIES), "blob", rng.randint(0, 20), rng.randint(0, 20))
+             for uid in owners for n in range(rng.randint(0, 2 * creatures_per_player))],
+        )
+    conn.close()
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of already sorted `samples` (0 for none)."""
+    if not samples:
+        return 0.0
+    rank = max(1, min(len(samples), math.ceil(pct / 100 * len(samples))))
+    return samples[rank - 1]
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024  # bytes on macOS, KiB elsewhere
+
+
+def run_load(host: str, port: int, paths: Sequence[str], requests: int, concurrency: int,
+             accept_encoding: str = "gzip", revalidate: bool = False) -> Dict[str, List[float]]:
+    """Issues `requests` GETs spread round-robin over `paths`; returns latencies (s) per path.
+
+    Failed requests are recorded under the key "<path> errors". With
+    `revalidate` each client repeats its last ETag per path, as a browser would.
+    """
+    results: Dict[str, List[float]] = {}
+    lock = threading.Lock()
+    etags = threading.local()
+
+    def fetch(n: int) -> None:
+        path = paths[n % len(paths)]
+        route = path.split("?", 1)[0]
+        route = "/quest/player" if route.startswith("/quest/player/") else route
+        headers = {"Accept-Encoding": accept_encoding}
+        seen = getattr(etags, "by_route", None)
+        if seen is None:
+            seen = etags.by_route = {}
+        if revalidate and route in seen:
+            headers["If-None-Match"] = seen[route]
+        started = time.perf_counter()
+        try:
+            connection = http.client.HTTPConnection(host, port, timeout=30)
+            connection.request("GET", path, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            connection.close()
+            ok = response.status in (200, 304)
+            if response.getheader("ETag"):
+                seen[route] = response.getheader("ETag")
+        except OSError:
+            ok = False
+        elapsed = time.perf_counter() - started
+        with lock:
+            results.setdefault(route if ok else f"{route} errors", []).append(elapsed)
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        list(pool.map(fetch, range(requests)))
+    return results
+
+
+def benchmark(root: Path, users: int = 1000, requests: int = 1000, concurrency: int = 8,
+              workers: int = DEFAULT_WORKERS, creatures_per_player: int = 10, seed: int = 1,
+              revalidate: bool = False, touch_interval: float = 0.0) -> Dict[str, Any]:
+    """Generates fixtures under `root`, serves them and load-tests every route; returns a report.
+
+    With `touch_interval` the state files' mtimes are bumped that often during
+    the run, as if the bot were saving, so re-parse costs show up in the numbers.
+    """
+    started = time.perf_counter()
+    paths = write_fixtures(root, users=users, creatures_per_player=creatures_per_player, seed=seed)
+    fixture_seconds = time.perf_counter() - started
+
+    server = JeevesWebServer(host="127.0.0.1", port=0, games_path=paths["games"], config_path=root,
+                             workers=workers, live_clients=0)
+    thread = threading.Thread(target=server.start, name="jeeves-web-bench", daemon=True)
+    thread.start()
+    while server.server is None and thread.is_alive():
+        time.sleep(0.01)
+    if server.server is None:
+        raise RuntimeError("web server failed to start")
+    port = server.server.server_address[1]
+
+    player_ids = sorted(json.loads(paths["games"].read_text())["modules"]["quest"]["players"])
+    rng = random.Random(seed)
+    targets = [route for route in ROUTES if route != "/quest/player"]
+    targets += [f"/quest/player/{rng.choice(player_ids)}" for _ in range(len(targets))] if player_ids else []
+
+    stop_touching = threading.Event()
+
+    def touch() -> None:
+        while not stop_touching.wait(touch_interval):
+            for name in ("games", "stats"):
+                os.utime(paths[name])
+
+    try:
+        run_load("127.0.0.1", port, targets, len(targets), 1)  # warm-up: first parse and render
+        if touch_interval > 0:
+            threading.Thread(target=touch, name="jeeves-web-bench-touch", daemon=True).start()
+        parses_before = snapshot_stats()["parses"]
+        cache_before = server.app.cache.stats()["builds"]
+        pages_before = server.app.pages.stats()["renders"]
+        started = time.perf_counter()
+        latencies = run_load("127.0.0.1", port, targets, requests, concurrency, revalidate=revalidate)
+        elapsed = time.perf_counter() - started
+    finally:
+        stop_touching.set()
+        server.stop()
+        thread.join(timeout=5)
+
+    routes = {}
+    for route, samples in sorted(latencies.items()):
+        samples.sort()
+        routes[route] = {
+            "requests": len(samples),
+            "p50_ms": percentile(samples, 50) * 1000,
+            "p90_ms": percentile(samples, 90) * 1000,
+            "p99_ms": percentile(samples, 99) * 1000,
+            "max_ms": samples[-1] * 1000,
+        }
+    return {
+        "users": users,
+        "requests": requests,
+        "concurrency": concurrency,
+        "workers": workers,
+        "fixture_seconds": fixture_seconds,
+        "seconds": elapsed,
+        "throughput_rps": requests / elapsed if elapsed else 0.0,
+        "errors": sum(len(samples) for route, samples in latencies.items() if route.endswith(" errors")),
+        "peak_rss_mb": _peak_rss_mb(),
+        "parses_per_request": (snapshot_stats()["parses"] - parses_before) / requests,
+        "cache_builds_per_request": (server.app.cache.stats()["builds"] - cache_before) / requests,
+        "page_renders_per_request": (server.app.pages.stats()["renders"] - pages_before) / requests,
+        "routes": routes,
+    }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    lines = [
+        f"users={report['users']} requests={report['requests']} concurrency={report['concurrency']} "
+        f"workers={report['workers']} (fixtures built in {report['fixture_seconds']:.1f}s)",
+        f"throughput: {report['throughput_rps']:.1f} req/s over {report['seconds']:.2f}s, errors: {report['errors']}",
+        f"peak RSS: {report['peak_rss_mb']:.1f} MiB",
+        f"per request: {report['parses_per_request']:.3f} file parses, "
+        f"{report['cache_builds_per_request']:.3f} cache builds, {report['page_renders_per_request']:.3f} page renders",
+        "",
+        f"{'route':<24}{'requests':>9}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}",
+    ]
+    for route, row in report["routes"].items():
+        lines.append(f"{route:<24}{row['requests']:>9}{row['p50_ms']:>10.2f}{row['p90_ms']:>10.2f}"
+                     f"{row['p99_ms']:>10.2f}{row['max_ms']:>10.2f}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    import tempfile
+
+    parser = argparse.ArgumentParser(description="Load-test the Jeeves web dashboards on synthetic data")
+    parser.add_argument("--users", type=int, default=1000, help="Number of synthetic users (default: 1000)")
+    parser.add_argument("--creatures", type=int, default=10,
+                        help="Average absurdia creatures per player (default: 10)")
+    parser.add_argument("--requests", type=int, default=1000, help="Total requests to send (default: 1000)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent clients (default: 8)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Server worker threads (default: {DEFAULT_WORKERS})")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for the fixtures (default: 1)")
+    parser.add_argument("--revalidate", action="store_true", help="Send If-None-Match like a browser would")
+    parser.add_argument("--touch-interval", type=float, default=0.0,
+                        help="Bump the state files' mtimes every N seconds during the run (default: never)")
+    parser.add_argument("--dir", type=Path, help="Write fixtures here instead of a temporary directory")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        report = benchmark(args.dir or Path(tmpdir), users=args.users, requests=args.requests,
+                           concurrency=args.concurrency, workers=args.workers,
+                           creatures_per_player=args.creatures, seed=args.seed, revalidate=args.revalidate,
+                           touch_interval=args.touch_interval)
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+# web/export.py
+# Incremental NDJSON export of quest and stats records
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, Mapping, Optional, Sequence, Tuple
+
+from web.quest.utils import record_digest
+
+_compact = json.JSONEncoder(separators=(",", ":"), default=str).encode
+
+
+class ChangeLog:
+    """Remembers in which export version each record of one entity last changed.
+
+    Versions look like "<epoch>-<seq>": `seq` grows by one whenever the
+    entity's records change, and `epoch` identifies this process, so a
+    `since` from before a restart falls back to a full export.
+    """
+
+    def __init__(self, epoch: str):
+        self.epoch = epoch
+        self.seq = 0
+        self._lock = threading.Lock()
+        self._source: Any = None
+        self._records: Mapping[str, Any] = {}
+        self._digests: Dict[str, str] = {}
+        self._changed: Dict[str, int] = {}
+        self._deleted: Dict[str, int] = {}
+
+    @property
+    def version(self) -> str:
+        return f"{self.epoch}-{self.seq}"
+
+    def update(self, source: Any, build: Callable[[], Mapping[str, Any]]) -> None:
+        """Diffs the records built from `source` against the last ones, unless `source` is unchanged."""
+        with self._lock:
+            if source is self._source:
+                return
+            records = build()
+            digests = {key: record_digest(record) if isinstance(record, dict) else repr(record)
+                       for key, record in records.items()}
+            changed = [key for key, digest in digests.items() if self._digests.get(key) != digest]
+            deleted = [key for key in self._digests if key not in digests]
+            if changed or deleted or self.seq == 0:
+                self.seq += 1
+                for key in changed:
+                    self._changed[key] = self.seq
+                    self._deleted.pop(key, None)
+                for key in deleted:
+                    self._changed.pop(key, None)
+                    self._deleted[key] = self.seq
+            self._source, self._records, self._digests = source, records, digests
+
+    def parse_since(self, since: Optional[str]) -> int:
+        """The sequence number a `since` version refers to; 0 (everything) if it is unusable."""
+        if not since:
+            return 0
+        epoch, _, seq = since.rpartition("-")
+        if epoch != self.epoch:
+            return 0
+        try:
+            return max(0, int(seq))
+        except ValueError:
+            return 0
+
+    def snapshot(self, since: int) -> Tuple[str, Mapping[str, Any], list, list]:
+        """(version, records, keys changed after `since`, keys deleted after `since`)."""
+        with self._lock:
+            if since <= 0:
+                return self.version, self._records, list(self._records), []
+            changed = [key for key in self._records if self._changed.get(key, 0) > since]
+            deleted = [key for key, seq in self._deleted.items() if seq > since]
+            return self.version, self._records, changed, deleted
+
+
+def _activity_records(activity: Mapping[str, Any]) -> Dict[str, Any]:
+    records: Dict[str, Any] = {"global": activity.get("global", {})}
+    for channel, bucket in (activity.get("channels") or {}).items():
+        records[f"channel:{channel}"] = bucket
+    for user_id, bucket in (activity.get("users") or {}).items():
+        records[f"user:{user_id}"] = bucket
+    return records
+
+
+class Exporter:
+    """Streams one entity's records as NDJSON, optionally only those changed since a version."""
+
+    ENTITIES = ("players", "users", "fishing", "achievements", "activity")
+
+    def __init__(self, app):
+        self.app = app
+        epoch = f"{int(time.time()):x}"
+        self._logs = {entity: ChangeLog(epoch) for entity in self.ENTITIES}
+
+    def _source(self, entity: str) -> Tuple[Any, Callable[[], Mapping[str, Any]]]:
+        if entity == "players":
+            players = self.app.quest_state().players
+            return players, lambda: players
+        stats, _ = self.app.stats()
+        if entity == "achievements":
+            achievements = stats["achievements"]
+            return achievements, lambda: achievements["user_achievements"]
+        if entity == "activity":
+            activity = stats["activity"]
+            return activity, lambda: _activity_records(activity)
+        records = stats[entity]
+        return records, lambda: records
+
+    def export(self, entity: str, fields: Sequence[str] = (), since: Optional[str] = None) -> Tuple[str, Iterator[bytes]]:
+        """(current version, NDJSON lines) for `entity`; raises KeyError for unknown entities."""
+        log = self._logs[entity]
+        log.update(*self._source(entity))
+        version, records, changed, deleted = log.snapshot(log.parse_since(since))
+        return version, self._lines(records, changed, deleted, tuple(fields))
+
+    @staticmethod
+    def _lines(records: Mapping[str, Any], keys: list, deleted: list, fields: tuple) -> Iterator[bytes]:
+        for key in keys:
+            record = records.get(key)
+            if isinstance(record, dict):
+                if fields:
+                    row = {"id": key, **{field: record[field] for field in fields if field in record}}
+                else:
+                    row = {"id": key, **record}
+            else:
+                row = {"id": key, "value": record}
+            yield _compact(row).encode("utf-8") + b"\n"
+        for key in deleted:
+            yield _compact({"id": key, "deleted": True}).encode("utf-8") + b"\n"
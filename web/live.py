@@ -0,0 +1,221 @@
+# web/live.py
+# Server-Sent Events hub pushing state deltas to dashboard pages
+
+from __future__ import annotations
+
+import json
+import logging
+import queue
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from web.snapshot import file_signature
+
+DEFAULT_MAX_CLIENTS = 32
+
+
+def format_event(event_id: int, event: str, data: Any) -> bytes:
+    """One SSE message with compact JSON data."""
+    payload = json.dumps(data, separators=(",", ":"))
+    return f"id: {event_id}\nevent: {event}\ndata: {payload}\n\n".encode("utf-8")
+
+
+def diff_summaries(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """Changes between two LiveHub summaries; empty if nothing visible changed."""
+    delta: Dict[str, Any] = {}
+    players = {uid: fields for uid, fields in new["players"].items() if old["players"].get(uid) != fields}
+    if players:
+        delta["players"] = players
+    removed = [uid for uid in old["players"] if uid not in new["players"]]
+    if removed:
+        delta["removed"] = removed
+    if new["boss"] != old["boss"]:
+        delta["boss"] = new["boss"]
+    cooldowns = {channel: ts for channel, ts in new["cooldowns"].items() if old["cooldowns"].get(channel) != ts}
+    if cooldowns:
+        delta["cooldowns"] = cooldowns
+    unlocked = new["achievements"] - old["achievements"]
+    if unlocked:
+        delta["achievements"] = [
+            {"user_id": uid, "name": new["names"].get(uid, uid), "achievement": achievement}
+            for uid, achievement in sorted(unlocked)
+        ]
+    return delta
+
+
+class Subscription:
+    """One connected client's bounded queue of encoded messages."""
+
+    def __init__(self, size: int):
+        self._queue: "queue.Queue[Optional[bytes]]" = queue.Queue(maxsize=size)
+        self.lagging = False
+
+    def offer(self, message: Optional[bytes]) -> None:
+        try:
+            self._queue.put_nowait(message)
+        except queue.Full:
+            # The client can't keep up; it is told to reload instead.
+            self.lagging = True
+
+    def get(self, timeout: float) -> Optional[bytes]:
+        """Next message; None once the hub closes. Raises queue.Empty on timeout."""
+        return self._queue.get(timeout=timeout)
+
+
+class LiveHub:
+    """Watches the state files and fans each change out to every SSE client.
+
+    One watcher thread (running only while clients are connected) polls the
+    file signatures, summarises the new state, diffs it against the previous
+    summary and encodes the delta once; every subscriber gets the same bytes.
+    Recent messages are kept so reconnecting clients can catch up from
+    Last-Event-ID; clients that fall too far behind are told to reload.
+    """
+
+    POLL_INTERVAL = 1.0
+    HISTORY = 64
+    QUEUE_SIZE = 32
+
+    def __init__(self, app, max_clients: int = DEFAULT_MAX_CLIENTS, poll_interval: float = POLL_INTERVAL):
+        self.app = app
+        self.max_clients = max(0, int(max_clients))
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._poll_lock = threading.Lock()
+        self._subscribers: set = set()
+        self._history: deque = deque(maxlen=self.HISTORY)
+        self._event_id = 0
+        self._signature = None
+        self._summary: Optional[Dict[str, Any]] = None
+        self._thread: Optional[threading.Thread] = None
+        self._closed = threading.Event()
+        self.polls = 0
+        self.diffs = 0
+
+    # --- State ---
+
+    def _sources(self) -> Tuple[Path, ...]:
+        loader = self.app.stats_loader
+        return (self.app.games_path, loader.stats_path, loader.state_path)
+
+    def summarize(self) -> Dict[str, Any]:
+        """The parts of the state that live pages display."""
+        state = self.app.quest_state()
+        players = {
+            uid: {
+                "level": player.get("level", 1),
+                "xp": player.get("xp", 0),
+                "xp_to_next_level": player.get("xp_to_next_level", 0),
+                "prestige": player.get("prestige", 0),
+            }
+            for uid, player in state.players.items()
+        }
+        names = {uid: player.get("username", uid) for uid, player in state.players.items()}
+        boss = state.boss_hunt_data.get("current_boss") or {}
+        achievements = set()
+        user_achievements = self.app.stats_loader.load_achievements_stats()["user_achievements"]
+        for uid, data in user_achievements.items():
+            if isinstance(data, dict):
+                achievements.update((uid, ach) for ach in data.get("unlocked", []) or [])
+        return {
+            "players": players,
+            "names": names,
+            "boss": {"current_hp": boss.get("current_hp", 0), "max_hp": boss.get("max_hp", 1)} if boss else {},
+            "cooldowns": dict(state.mob_cooldowns),
+            "achievements": achievements,
+        }
+
+    def poll(self) -> bool:
+        """Checks the state files once; returns True if a delta was published."""
+        with self._poll_lock:
+            self.polls += 1
+            signature = file_signature(self._sources())
+            if signature == self._signature:
+                return False
+            try:
+                summary = self.summarize()
+            except Exception as exc:
+                logging.warning(f"Live update skipped: {exc}")
+                return False
+            self._signature = signature
+            previous, self._summary = self._summary, summary
+            if previous is None:
+                return False
+            self.diffs += 1
+            delta = diff_summaries(previous, summary)
+        if not delta:
+            return False
+        self.publish("delta", delta)
+        return True
+
+    def publish(self, event: str, data: Any) -> None:
+        with self._lock:
+            self._event_id += 1
+            message = format_event(self._event_id, event, data)
+            self._history.append((self._event_id, message))
+            for subscription in self._subscribers:
+                subscription.offer(message)
+
+    # --- Clients ---
+
+    def subscribe(self, last_event_id: Optional[str] = None) -> Optional[Subscription]:
+        """Registers a client; None when the hub is full or closed."""
+        if self._summary is None:
+            self.poll()  # baseline for the first delta
+        with self._lock:
+            if self._closed.is_set() or len(self._subscribers) >= self.max_clients:
+                return None
+            subscription = Subscription(self.QUEUE_SIZE)
+            self._replay(subscription, last_event_id)
+            self._subscribers.add(subscription)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._watch, name="jeeves-web-live", daemon=True)
+                self._thread.start()
+        return subscription
+
+    def _replay(self, subscription: Subscription, last_event_id: Optional[str]) -> None:
+        # Called with self._lock held.
+        if not last_event_id:
+            return
+        try:
+            last = int(last_event_id)
+        except ValueError:
+            return
+        if last >= self._event_id:
+            return
+        missed = [message for event_id, message in self._history if event_id > last]
+        if len(missed) < self._event_id - last:
+            subscription.offer(format_event(self._event_id, "reload", {}))
+            return
+        for message in missed:
+            subscription.offer(message)
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def client_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+    def _watch(self) -> None:
+        while not self._closed.wait(self.poll_interval):
+            with self._lock:
+                if not self._subscribers:
+                    self._thread = None
+                    return
+            self.poll()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed.is_set()
+
+    def close(self) -> None:
+        """Stops the watcher and wakes every client so its stream can end."""
+        self._closed.set()
+        with self._lock:
+            for subscription in self._subscribers:
+                subscription.offer(None)
+            self._subscribers.clear()
@@ -54,6 +54,8 @@ class QuestHTTPRequestHandler(BaseHTTPRequestHandler):
                 self._handle_leaderboard()
             elif parsed_path.path == "/commands":
                 self._handle_commands()
+            elif parsed_path.path == "/theme.css":
+                self._handle_stylesheet()
             elif parsed_path.path.startswith("/player/"):
                 self._handle_player_detail()
             elif parsed_path.path == "/api/status":
@@ -119,6 +121,16 @@ class QuestHTTPRequestHandler(BaseHTTPRequestHandler):
         html = self.template_engine.render_page("Quest Commands", content, "commands")
         self._send_html(html)
 
+    def _handle_stylesheet(self) -> None:
+        """Handle the theme stylesheet linked from every page."""
+        css = self.template_engine.stylesheet().encode('utf-8')
+        self.send_response(200)
+        self.send_header("Content-type", "text/css; charset=utf-8")
+        self.send_header("Content-length", str(len(css)))
+        self.send_header("Cache-Control", "public, max-age=3600")
+        self.end_headers()
+        self.wfile.write(css)
+
     def _handle_player_detail(self) -> None:
         """Handle player detail page."""
         # Extract user_id or username from path
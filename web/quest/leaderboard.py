@@ -0,0 +1,120 @@
+# web/quest/leaderboard.py
+# Precomputed leaderboard order, name search and pagination for quest players
+
+import bisect
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional
+
+from .utils import safe_int, sort_players_by_prestige
+
+DEFAULT_PER_PAGE = 50
+MAX_PER_PAGE = 200
+
+
+@dataclass(frozen=True)
+class LeaderboardPage:
+    """One page of a (possibly filtered) leaderboard plus totals over every match."""
+
+    players: List[Dict[str, Any]]
+    page: int
+    per_page: int
+    total: int
+    total_prestige: int
+    avg_level: float
+
+    @property
+    def pages(self) -> int:
+        return max(1, math.ceil(self.total / self.per_page))
+
+    @property
+    def offset(self) -> int:
+        return (self.page - 1) * self.per_page
+
+
+def clamp_page(page: Any, per_page: Any) -> tuple:
+    """Parses ?page=&per_page= values into a valid (page, per_page) pair."""
+    per_page = min(max(safe_int(per_page, DEFAULT_PER_PAGE), 1), MAX_PER_PAGE)
+    return max(safe_int(page, 1), 1), per_page
+
+
+class LeaderboardIndex:
+    """Quest players in leaderboard order with prefix and substring search over names.
+
+    Built once per quest state. Searches return rank positions, so results
+    keep leaderboard order without re-sorting, and a page only touches the
+    players it shows.
+    """
+
+    NGRAM = 3
+
+    def __init__(self, players: Iterable[Dict[str, Any]]):
+        self.ranked: List[Dict[str, Any]] = sort_players_by_prestige(list(players))
+        self._names = [str(player.get("username", "")).lower() for player in self.ranked]
+        self._sorted_names = sorted((name, pos) for pos, name in enumerate(self._names))
+        self._ngrams: Dict[str, List[int]] = {}
+        for pos, name in enumerate(self._names):
+            for gram in {name[i:i + self.NGRAM] for i in range(len(name) - self.NGRAM + 1)}:
+                self._ngrams.setdefault(gram, []).append(pos)
+        self.total_prestige = sum(player.get("prestige", 0) for player in self.ranked)
+        self.total_level = sum(player.get("level", 1) for player in self.ranked)
+
+    def __len__(self) -> int:
+        return len(self.ranked)
+
+    def search_prefix(self, term: str) -> List[int]:
+        """Rank positions of players whose name starts with `term`."""
+        term = term.lower()
+        start = bisect.bisect_left(self._sorted_names, (term, -1))
+        positions = []
+        for name, pos in self._sorted_names[start:]:
+            if not name.startswith(term):
+                break
+            positions.append(pos)
+        return sorted(positions)
+
+    def search(self, term: str) -> List[int]:
+        """Rank positions of players whose name contains `term` (case-insensitive)."""
+        term = term.lower()
+        if len(term) < self.NGRAM:
+            # Too short for the n-gram index; such terms match most names anyway.
+            return [pos for pos, name in enumerate(self._names) if term in name]
+
+        grams = {term[i:i + self.NGRAM] for i in range(len(term) - self.NGRAM + 1)}
+        postings = sorted((self._ngrams.get(gram, []) for gram in grams), key=len)
+        if not postings[0]:
+            return []
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates.intersection_update(posting)
+            if not candidates:
+                return []
+        return sorted(pos for pos in candidates if term in self._names[pos])
+
+    def page(self, page: int = 1, per_page: int = DEFAULT_PER_PAGE,
+             positions: Optional[List[int]] = None) -> LeaderboardPage:
+        """A page of the whole leaderboard, or of the search result `positions`."""
+        page, per_page = clamp_page(page, per_page)
+        if positions is None:
+            total, total_prestige, total_level = len(self.ranked), self.total_prestige, self.total_level
+        else:
+            matched = [self.ranked[pos] for pos in positions]
+            total = len(matched)
+            total_prestige = sum(player.get("prestige", 0) for player in matched)
+            total_level = sum(player.get("level", 1) for player in matched)
+
+        page = min(page, max(1, math.ceil(total / per_page)))
+        start = (page - 1) * per_page
+        if positions is None:
+            players = self.ranked[start:start + per_page]
+        else:
+            players = [self.ranked[pos] for pos in positions[start:start + per_page]]
+
+        return LeaderboardPage(
+            players=players,
+            page=page,
+            per_page=per_page,
+            total=total,
+            total_prestige=total_prestige,
+            avg_level=total_level / total if total > 0 else 1.0,
+        )
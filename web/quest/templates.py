@@ -1,23 +1,105 @@
 # web/quest/templates.py
 # HTML template generation for quest web UI
 
+from collections import OrderedDict
 from typing import Dict, Any, List, Optional
+from urllib.parse import urlencode
+import hashlib
+import json
 import logging
+import threading
 from .utils import (
     sanitize, get_rank_suffix, get_medal_emoji, format_xp, calculate_win_rate,
     format_streak, calculate_level_progress, get_player_display_name,
-    format_cooldown_timestamp, calculate_max_energy, format_injury_time_remaining, to_roman
+    format_cooldown_timestamp, calculate_max_energy, format_injury_time_remaining, to_roman,
+    record_digest
 )
 from .themes import ThemeManager
+from .leaderboard import DEFAULT_PER_PAGE, LeaderboardPage
 import time
 
 logger = logging.getLogger(__name__)
 
+# Patches leaderboard rows, the boss HP bar and mob cooldowns from the
+# /api/live event stream; rows update in place and re-rank on the next load.
+LIVE_SCRIPT = """<script>
+    (function() {
+        if (!window.EventSource) return;
+        var source = new EventSource(__LIVE_URL__);
+
+        function fmt(n) { return Number(n || 0).toLocaleString("en-US"); }
+        function setText(root, selector, text) {
+            var el = root.querySelector(selector);
+            if (el) el.textContent = text;
+        }
+        function remaining(ts) {
+            var left = Math.max(0, Math.floor(ts - Date.now() / 1000));
+            var h = Math.floor(left / 3600), m = Math.floor(left % 3600 / 60), s = left % 60;
+            return h > 0 ? h + "h " + m + "m" : (m > 0 ? m + "m " + s + "s" : s + "s");
+        }
+        function patchPlayer(id, p) {
+            var row = document.querySelector('tr[data-user-id="' + CSS.escape(id) + '"]');
+            if (!row) return;
+            setText(row, '[data-field="level"]', "Level " + p.level);
+            setText(row, '[data-field="prestige"]', "Prestige " + p.prestige);
+            setText(row, '[data-field="xp"]', p.xp_to_next_level > 0 ? fmt(p.xp) + "/" + fmt(p.xp_to_next_level) : fmt(p.xp));
+        }
+        function patchBoss(b) {
+            if (!b.max_hp) return;
+            var pct = Math.floor(b.current_hp / b.max_hp * 100);
+            var filled = Math.floor(b.current_hp / b.max_hp * 20);
+            setText(document, '[data-live="boss-hp"]', "HP: " + fmt(b.current_hp) + " / " + fmt(b.max_hp));
+            setText(document, '[data-live="boss-hp-percent"]', pct + "%");
+            setText(document, '[data-live="boss-hp-ascii"]', "[" + "\\u2588".repeat(filled) + "\\u2591".repeat(20 - filled) + "]");
+            var bar = document.querySelector('[data-live="boss-hp-bar"]');
+            if (bar) bar.style.width = pct + "%";
+        }
+        function patchCooldown(channel, ts) {
+            document.querySelectorAll(".cooldown-card[data-channel]").forEach(function(card) {
+                if (card.dataset.channel !== channel) return;
+                var ready = ts * 1000 <= Date.now();
+                card.classList.toggle("cooldown-ready", ready);
+                card.classList.toggle("cooldown-waiting", !ready);
+                setText(card, ".cooldown-value", ready ? "\\u2713 Ready" : "\\u23f3 " + remaining(ts));
+            });
+        }
+        function toast(text) {
+            var el = document.createElement("div");
+            el.className = "live-toast";
+            el.textContent = text;
+            document.body.appendChild(el);
+            setTimeout(function() { el.remove(); }, 8000);
+        }
+
+        source.addEventListener("delta", function(event) {
+            var delta = JSON.parse(event.data);
+            Object.keys(delta.players || {}).forEach(function(id) { patchPlayer(id, delta.players[id]); });
+            if (delta.boss) patchBoss(delta.boss);
+            Object.keys(delta.cooldowns || {}).forEach(function(ch) { patchCooldown(ch, delta.cooldowns[ch]); });
+            (delta.achievements || []).forEach(function(a) {
+                toast("\\ud83c\\udfc6 " + a.name + " unlocked " + a.achievement);
+            });
+        });
+        source.addEventListener("reload", function() {
+            source.close();
+            location.reload();
+        });
+    })();
+    </script>"""
+
 class TemplateEngine:
-    """HTML template engine for quest web UI."""
+    """HTML template engine for quest web UI.
+
+    Pages are built from lists of fragments joined once. The stylesheet and
+    leaderboard rows are cached on the engine, which lives as long as the
+    theme it was built from.
+    """
 
-    def __init__(self, theme_manager: ThemeManager, mount_path: str = ""):
+    ROW_CACHE_SIZE = 5000
+
+    def __init__(self, theme_manager: ThemeManager, mount_path: str = "", live_updates: bool = False):
         self.theme = theme_manager
+        self.live_updates = live_updates
         mount = (mount_path or "").strip()
         mount = mount.rstrip("/")
         if mount == "/":
@@ -25,6 +107,12 @@ class TemplateEngine:
         elif mount and not mount.startswith("/"):
             mount = "/" + mount
         self.mount_path = mount
+        self._stylesheet: Optional[str] = None
+        self._stylesheet_version: Optional[str] = None
+        self._rows: "OrderedDict[tuple, str]" = OrderedDict()
+        self._rows_lock = threading.Lock()
+        self.row_hits = 0
+        self.row_renders = 0
 
     def url(self, path: str) -> str:
         """Build a URL for quest routes, honoring mount_path."""
@@ -34,27 +122,12 @@ class TemplateEngine:
             path = "/"
         return f"{self.mount_path}{path}"
 
-    def render_page(self, title: str, content: str, active_section: str = "") -> str:
-        """Render complete HTML page."""
-        theme_vars = self.theme.get_css_variables()
-        prestige_css = self.theme.get_prestige_css()
-
-        # Theme methods already sanitize output
-        website_title = self.theme.get_website_title()
-        website_subtitle = self.theme.get_website_subtitle()
-        decoration_left = self.theme.get_website_decoration_left()
-        decoration_right = self.theme.get_website_decoration_right()
-        footer_text = self.theme.get_website_footer()
-        footer_tagline = self.theme.get_website_footer_tagline()
-
-        return f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{sanitize(title)} - Jeeves Quest Leaderboard</title>
-    <style>
-        :root {{
+    def stylesheet(self) -> str:
+        """Page CSS including the theme's variables and prestige styles, compiled once per engine."""
+        if self._stylesheet is None:
+            theme_vars = self.theme.get_css_variables()
+            prestige_css = self.theme.get_prestige_css()
+            self._stylesheet = f"""        :root {{
             {theme_vars}
         }}
 
@@ -196,6 +269,20 @@ class TemplateEngine:
             box-shadow: 0 0 10px var(--accent);
         }}
 
+        .pagination {{
+            display: flex;
+            justify-content: center;
+            align-items: center;
+            gap: 15px;
+            margin-top: 20px;
+            color: var(--fg-dim);
+        }}
+
+        .pagination a {{
+            color: var(--link);
+            text-decoration: none;
+        }}
+
         .action-card {{
             margin-bottom: 30px;
         }}
@@ -611,6 +698,19 @@ class TemplateEngine:
             opacity: 0.6;
         }}
 
+        /* Live update notices */
+        .live-toast {{
+            position: fixed;
+            right: 20px;
+            bottom: 20px;
+            padding: 12px 18px;
+            background: var(--card_background);
+            border: 1px solid var(--accent);
+            border-radius: 6px;
+            box-shadow: 0 4px 20px rgba(0, 0, 0, 0.4);
+            z-index: 10;
+        }}
+
         /* Responsive design */
         @media (max-width: 768px) {{
             .container {{
@@ -638,7 +738,32 @@ class TemplateEngine:
                 grid-template-columns: 1fr;
             }}
         }}
-    </style>
+"""
+        return self._stylesheet
+
+    def stylesheet_version(self) -> str:
+        """Short hash of the stylesheet, used to make its URL cache-busting."""
+        if self._stylesheet_version is None:
+            self._stylesheet_version = hashlib.blake2b(self.stylesheet().encode("utf-8"), digest_size=6).hexdigest()
+        return self._stylesheet_version
+
+    def render_page(self, title: str, content: str, active_section: str = "") -> str:
+        """Render complete HTML page."""
+        # Theme methods already sanitize output
+        website_title = self.theme.get_website_title()
+        website_subtitle = self.theme.get_website_subtitle()
+        decoration_left = self.theme.get_website_decoration_left()
+        decoration_right = self.theme.get_website_decoration_right()
+        footer_text = self.theme.get_website_footer()
+        footer_tagline = self.theme.get_website_footer_tagline()
+
+        return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{sanitize(title)} - Jeeves Quest Leaderboard</title>
+    <link rel="stylesheet" href="{self.url('/theme.css')}?v={self.stylesheet_version()}">
 </head>
 <body>
     <div class="container">
@@ -662,32 +787,50 @@ class TemplateEngine:
             <p style="font-size: 0.9em; opacity: 0.6; margin-top: 5px;">{footer_tagline}</p>
         </div>
     </div>
+    {self._live_script()}
 </body>
 </html>"""
 
+    def _live_script(self) -> str:
+        if not self.live_updates:
+            return ""
+        return LIVE_SCRIPT.replace("__LIVE_URL__", json.dumps(self.url("/api/live")))
+
     def render_leaderboard(self, players: List[Dict[str, Any]], classes: Dict[str, str],
                           search_term: str = "", challenge_info: Optional[Dict[str, Any]] = None,
                           mob_cooldowns: Optional[Dict[str, float]] = None,
                           boss_hunt_data: Optional[Dict[str, Any]] = None,
-                          current_user: Optional[str] = None) -> str:
-        """Render the leaderboard view."""
-        content = ""
+                          current_user: Optional[str] = None,
+                          page: Optional[LeaderboardPage] = None, prefix: bool = False) -> str:
+        """Render the leaderboard view.
+
+        With `page`, `players` is that page's players and the totals, ranks and
+        page links come from it; otherwise the top 50 of `players` are shown.
+        `prefix` marks a prefix-only search, kept in the form and page links.
+        """
+        content = []
 
         # Search box
-        content += f"""
+        content.append(f"""
         <div class="search-box">
             <form method="get" action="{self.url('/')}">
                 <input type="text" name="search" placeholder="Search players..." value="{sanitize(search_term)}" autofocus>
+                {'<input type="hidden" name="match" value="prefix">' if prefix else ''}
             </form>
         </div>
-        """
+        """)
 
         # Stats overview
-        total_players = len(players)
-        total_prestige = sum(p.get("prestige", 0) for p in players)
-        avg_level = sum(p.get("level", 1) for p in players) / total_players if total_players > 0 else 1.0
-
-        content += f"""
+        if page is not None:
+            total_players, total_prestige, avg_level = page.total, page.total_prestige, page.avg_level
+            rows, rank_offset = players, page.offset
+        else:
+            total_players = len(players)
+            total_prestige = sum(p.get("prestige", 0) for p in players)
+            avg_level = sum(p.get("level", 1) for p in players) / total_players if total_players > 0 else 1.0
+            rows, rank_offset = players[:50], 0  # Top 50 players
+
+        content.append(f"""
         <div class="stats-grid">
             <div class="stat-card">
                 <h3>Total Players</h3>
@@ -702,10 +845,10 @@ class TemplateEngine:
                 <div class="value">{avg_level:.1f}</div>
             </div>
         </div>
-        """
+        """)
 
         # Interactive questing features removed for security (read-only web interface)
-        content += """
+        content.append("""
         <div class="card action-card">
             <h3>📜 Quest on IRC</h3>
             <p class="description">
@@ -715,7 +858,7 @@ class TemplateEngine:
                 See the <a href="{self.url('/commands')}" style="color: var(--link);">Commands page</a> for full IRC command reference.
             </p>
         </div>
-        """
+        """)
 
         # Boss Hunt
         if boss_hunt_data:
@@ -764,7 +907,7 @@ class TemplateEngine:
                 total_defeated = stats.get("total_bosses_defeated", 0)
                 total_clues = stats.get("total_clues_found", 0)
 
-                content += f"""
+                content.append(f"""
                 <div class="card boss-hunt-section">
                     <h3 style="margin-bottom: 15px; color: var(--accent);">🔍 Boss Hunt: The Trail</h3>
                     {buff_html}
@@ -773,13 +916,13 @@ class TemplateEngine:
                         <p class="boss-description">{boss_desc}</p>
                         <div class="boss-hp-container">
                             <div class="boss-hp-label">
-                                <span>HP: {current_hp:,} / {max_hp:,}</span>
-                                <span>{hp_percent}%</span>
+                                <span data-live="boss-hp">HP: {current_hp:,} / {max_hp:,}</span>
+                                <span data-live="boss-hp-percent">{hp_percent}%</span>
                             </div>
                             <div class="boss-hp-bar-container">
-                                <div class="boss-hp-bar" style="width: {hp_percent}%"></div>
+                                <div class="boss-hp-bar" data-live="boss-hp-bar" style="width: {hp_percent}%"></div>
                             </div>
-                            <div class="boss-hp-ascii">[{hp_bar}]</div>
+                            <div class="boss-hp-ascii" data-live="boss-hp-ascii">[{hp_bar}]</div>
                         </div>
                         <div class="boss-stats">
                             <div class="boss-stat">
@@ -797,47 +940,47 @@ class TemplateEngine:
                         </div>
                     </div>
                 </div>
-                """
+                """)
 
         # Mob cooldowns
         if mob_cooldowns:
-            cooldown_cards = ""
+            cooldown_cards = []
             for channel, timestamp in mob_cooldowns.items():
                 cooldown_status = format_cooldown_timestamp(timestamp)
                 is_ready = timestamp <= time.time()
                 status_class = "cooldown-ready" if is_ready else "cooldown-waiting"
-                cooldown_cards += f"""
-                <div class="cooldown-card {status_class}">
+                cooldown_cards.append(f"""
+                <div class="cooldown-card {status_class}" data-channel="{sanitize(channel)}">
                     <h4>{sanitize(channel)}</h4>
                     <div class="cooldown-value">{'✓' if is_ready else '⏳'} {cooldown_status}</div>
                 </div>
-                """
+                """)
 
-            content += f"""
+            content.append(f"""
             <div class="card cooldown-section">
                 <h3 style="margin-bottom: 15px; color: var(--accent);">🎯 Mob Encounter Cooldowns</h3>
                 <div class="cooldown-grid">
-                    {cooldown_cards}
+                    {''.join(cooldown_cards)}
                 </div>
             </div>
-            """
+            """)
 
         # Challenge info
         if challenge_info and challenge_info.get("active_path"):
             active_path = challenge_info["active_path"]
             path_data = challenge_info["paths"].get(active_path, {})
-            content += f"""
+            content.append(f"""
             <div class="card">
                 <div class="prestige-banner banner-active-challenge">
                     🎯 ACTIVE CHALLENGE: {path_data.get("name", active_path).upper()}
                 </div>
             </div>
-            """
+            """)
 
         # Leaderboard table
-        content += '<div class="card">'
-        content += '<table class="table">'
-        content += '''
+        content.append('<div class="card">')
+        content.append('<table class="table">')
+        content.append('''
         <thead>
             <tr>
                 <th>Rank</th>
@@ -850,51 +993,25 @@ class TemplateEngine:
             </tr>
         </thead>
         <tbody>
-        '''
+        ''')
 
-        for i, player in enumerate(players[:50], 1):  # Top 50 players
+        for i, player in enumerate(rows, rank_offset + 1):
             user_id = player.get("user_id", "unknown")
             nick = player.get("username", f"Player_{i}")
             player_class = classes.get(user_id, "no class")
-            prestige = player.get("prestige", 0)
-
             rank_display = get_medal_emoji(i) if i <= 3 else f"{i}{get_rank_suffix(i)}"
-            prestige_icons = self.theme.get_prestige_icons(prestige)
-
-            level, xp, progress = calculate_level_progress(player)
-            wins = player.get("wins", 0)
-            losses = player.get("losses", 0)
-            win_rate = calculate_win_rate(wins, losses)
-            streak = format_streak(player.get("win_streak", 0))
-
-            # Get XP progress to next level
-            current_xp = player.get("xp", 0)
-            xp_to_next = player.get("xp_to_next_level", 0)
-            xp_display = f"{current_xp:,}/{xp_to_next:,}" if xp_to_next > 0 else f"{current_xp:,}"
-
-            content += f'''
-            <tr>
-                <td>{rank_display}</td>
-                <td>
-                    <div class="player-name"><a href="{self.url(f'/player/{sanitize(user_id)}')}">{sanitize(nick)}</a></div>
-                    <div class="player-info">{prestige_icons} Prestige {prestige}</div>
-                </td>
-                <td>{sanitize(player_class)}</td>
-                <td>
-                    Level {level}
-                    <div class="progress-bar">
-                        <div class="progress-fill" style="width: {progress:.0f}%"></div>
-                    </div>
-                </td>
-                <td class="xp">{xp_display}</td>
-                <td>{win_rate}</td>
-                <td>{streak}</td>
+            content.append(f'''
+            <tr data-user-id="{sanitize(user_id)}">
+                <td>{rank_display}</td>{self._leaderboard_row_cells(player, nick, player_class)}
             </tr>
-            '''
+            ''')
 
-        content += '</tbody></table></div>'
+        content.append('</tbody></table>')
+        if page is not None and page.pages > 1:
+            content.append(self._render_pagination(page, search_term, prefix))
+        content.append('</div>')
 
-        content += """
+        content.append("""
         <script>
         (function() {
             const linkSection = document.getElementById('link-section');
@@ -921,9 +1038,79 @@ class TemplateEngine:
             // Interactive features removed - this is now a read-only interface
         })();
         </script>
-        """
+        """)
 
-        return content
+        return "".join(content)
+
+    def _leaderboard_row_cells(self, player: Dict[str, Any], nick: str, player_class: str) -> str:
+        """Leaderboard cells after the rank, cached by a hash of the player's record."""
+        key = (record_digest(player), nick, player_class)
+        with self._rows_lock:
+            cells = self._rows.get(key)
+            if cells is not None:
+                self._rows.move_to_end(key)
+                self.row_hits += 1
+                return cells
+
+        user_id = player.get("user_id", "unknown")
+        prestige = player.get("prestige", 0)
+        prestige_icons = self.theme.get_prestige_icons(prestige)
+
+        level, xp, progress = calculate_level_progress(player)
+        wins = player.get("wins", 0)
+        losses = player.get("losses", 0)
+        win_rate = calculate_win_rate(wins, losses)
+        streak = format_streak(player.get("win_streak", 0))
+
+        # Get XP progress to next level
+        current_xp = player.get("xp", 0)
+        xp_to_next = player.get("xp_to_next_level", 0)
+        xp_display = f"{current_xp:,}/{xp_to_next:,}" if xp_to_next > 0 else f"{current_xp:,}"
+
+        cells = f'''
+                <td>
+                    <div class="player-name"><a href="{self.url(f'/player/{sanitize(user_id)}')}">{sanitize(nick)}</a></div>
+                    <div class="player-info">{prestige_icons} <span data-field="prestige">Prestige {prestige}</span></div>
+                </td>
+                <td>{sanitize(player_class)}</td>
+                <td>
+                    <span data-field="level">Level {level}</span>
+                    <div class="progress-bar">
+                        <div class="progress-fill" style="width: {progress:.0f}%"></div>
+                    </div>
+                </td>
+                <td class="xp" data-field="xp">{xp_display}</td>
+                <td>{win_rate}</td>
+                <td>{streak}</td>'''
+
+        with self._rows_lock:
+            self._rows[key] = cells
+            while len(self._rows) > self.ROW_CACHE_SIZE:
+                self._rows.popitem(last=False)
+            self.row_renders += 1
+        return cells
+
+    def _render_pagination(self, page: LeaderboardPage, search_term: str, prefix: bool = False) -> str:
+        def link(number: int) -> str:
+            params = {"search": search_term} if search_term else {}
+            if search_term and prefix:
+                params["match"] = "prefix"
+            if number > 1:
+                params["page"] = number
+            if page.per_page != DEFAULT_PER_PAGE:
+                params["per_page"] = page.per_page
+            query = f"?{urlencode(params)}" if params else ""
+            return sanitize(self.url("/") + query)
+
+        previous_link = f'<a href="{link(page.page - 1)}">&laquo; Previous</a>' if page.page > 1 else ""
+        next_link = f'<a href="{link(page.page + 1)}">Next &raquo;</a>' if page.page < page.pages else ""
+        return f"""
+        <div class="pagination">
+            {previous_link}
+            <span>Page {page.page:,} of {page.pages:,}</span>
+            {next_link}
+        </div>
+        """
 
     def render_commands(self) -> str:
         """Render the commands reference."""
@@ -1138,7 +1325,7 @@ class TemplateEngine:
         # Unlocked abilities
         unlocked_abilities = player.get("unlocked_abilities", [])
 
-        content = f"""
+        content = [f"""
         <div style="margin-bottom: 20px;">
             <a href="{self.url('/')}" style="color: var(--link); text-decoration: none;">&larr; Back to Leaderboard</a>
         </div>
@@ -1171,14 +1358,14 @@ class TemplateEngine:
                 <div class="value" style="font-size: 1.5em;">{xp_display}</div>
             </div>
         </div>
-        """
+        """]
 
         # Hardcore mode display
         hardcore_mode = player.get("hardcore_mode", False)
         if hardcore_mode:
             hardcore_hp = player.get("hardcore_hp", 0)
             hardcore_max_hp = player.get("hardcore_max_hp", 0)
-            content += f"""
+            content.append(f"""
         <div class="card" style="margin-top: 20px; border: 2px solid #ef4444; background: linear-gradient(135deg, var(--card_background), rgba(239, 68, 68, 0.1));">
             <div style="padding: 20px;">
                 <h2 style="color: #ef4444; margin-bottom: 15px;">☠️ HARDCORE MODE ACTIVE</h2>
@@ -1191,7 +1378,7 @@ class TemplateEngine:
                 </div>
             </div>
         </div>
-        """
+        """)
 
         # Hardcore stats (if player has completed or died)
         hardcore_stats = player.get("hardcore_stats", {})
@@ -1199,7 +1386,7 @@ class TemplateEngine:
             completions = hardcore_stats.get("completions", 0)
             deaths = hardcore_stats.get("deaths", 0)
             highest_level = hardcore_stats.get("highest_level_reached", 0)
-            content += f"""
+            content.append(f"""
         <div class="card" style="margin-top: 20px;">
             <div style="padding: 20px;">
                 <h2 style="color: var(--accent); margin-bottom: 15px;">☠️ Hardcore History</h2>
@@ -1222,13 +1409,13 @@ class TemplateEngine:
                 </div>
             </div>
         </div>
-        """
+        """)
 
         # Hardcore permanent items
         hardcore_permanent_items = player.get("hardcore_permanent_items", [])
         if hardcore_permanent_items:
             item_display = ", ".join([sanitize(item.replace('_', ' ').title()) for item in hardcore_permanent_items])
-            content += f"""
+            content.append(f"""
         <div class="card" style="margin-top: 20px;">
             <div style="padding: 20px;">
                 <h2 style="color: var(--accent); margin-bottom: 15px;">✨ Hardcore Permanent Items</h2>
@@ -1238,9 +1425,9 @@ class TemplateEngine:
                 </div>
             </div>
         </div>
-        """
+        """)
 
-        content += f"""
+        content.append(f"""
         <div class="card" style="margin-top: 20px;">
             <div style="padding: 20px;">
                 <h2 style="color: var(--accent); margin-bottom: 15px;">🎒 Inventory</h2>
@@ -1284,25 +1471,25 @@ class TemplateEngine:
                 </div>
             </div>
         </div>
-        """
+        """)
 
         # Active effects and injuries
         if active_effects or active_injuries:
-            content += '<div class="card" style="margin-top: 20px;"><div style="padding: 20px;">'
-            content += '<h2 style="color: var(--accent); margin-bottom: 15px;">🔮 Status Effects</h2>'
+            content.append('<div class="card" style="margin-top: 20px;"><div style="padding: 20px;">')
+            content.append('<h2 style="color: var(--accent); margin-bottom: 15px;">🔮 Status Effects</h2>')
 
             if active_effects:
-                content += '<div style="margin-bottom: 15px;"><strong style="color: #10b981;">✨ Active Buffs:</strong><ul style="margin-top: 5px; margin-left: 20px;">'
+                content.append('<div style="margin-bottom: 15px;"><strong style="color: #10b981;">✨ Active Buffs:</strong><ul style="margin-top: 5px; margin-left: 20px;">')
                 for effect in active_effects:
                     effect_type = effect.get("type", "unknown")
                     if effect_type == "lucky_charm":
                         win_bonus = effect.get("win_bonus", 0)
-                        content += f'<li style="color: #10b981;">🍀 Lucky Charm (+{int(win_bonus * 100)}% win chance)</li>'
+                        content.append(f'<li style="color: #10b981;">🍀 Lucky Charm (+{int(win_bonus * 100)}% win chance)</li>')
                     elif effect_type == "armor_shard":
                         remaining = effect.get("remaining_fights", 0)
-                        content += f'<li style="color: #10b981;">🛡️ Armor ({remaining} fights remaining)</li>'
+                        content.append(f'<li style="color: #10b981;">🛡️ Armor ({remaining} fights remaining)</li>')
                     elif effect_type == "xp_scroll":
-                        content += f'<li style="color: #10b981;">📜 XP Scroll (active for next win)</li>'
+                        content.append(f'<li style="color: #10b981;">📜 XP Scroll (active for next win)</li>')
                     elif effect_type == "dungeon_relic":
                         charges = effect.get("remaining_auto_wins", 0)
                         sigils = effect.get("boss_auto_wins", 0)
@@ -1316,31 +1503,31 @@ class TemplateEngine:
                         if not parts:
                             parts.append("inactive")
                         detail = " + ".join(parts)
-                        content += f'<li style="color: #10b981;">✨ Mythic Relic ({detail})</li>'
+                        content.append(f'<li style="color: #10b981;">✨ Mythic Relic ({detail})</li>')
                     else:
-                        content += f'<li style="color: #10b981;">{sanitize(str(effect))}</li>'
-                content += '</ul></div>'
+                        content.append(f'<li style="color: #10b981;">{sanitize(str(effect))}</li>')
+                content.append('</ul></div>')
 
             if active_injuries:
-                content += '<div><strong style="color: #ef4444;">💔 Active Injuries:</strong><ul style="margin-top: 5px; margin-left: 20px;">'
+                content.append('<div><strong style="color: #ef4444;">💔 Active Injuries:</strong><ul style="margin-top: 5px; margin-left: 20px;">')
                 for injury in active_injuries:
                     injury_name = injury.get("name", "Unknown Injury")
                     expires_at = injury.get("expires_at", "")
                     time_remaining = format_injury_time_remaining(expires_at) if expires_at else "Unknown"
-                    content += f'<li style="color: #ef4444;">💔 {sanitize(injury_name)} ({time_remaining} remaining)</li>'
-                content += '</ul></div>'
+                    content.append(f'<li style="color: #ef4444;">💔 {sanitize(injury_name)} ({time_remaining} remaining)</li>')
+                content.append('</ul></div>')
 
-            content += '</div></div>'
+            content.append('</div></div>')
 
         # Unlocked abilities
         if unlocked_abilities and challenge_info:
             abilities_data = challenge_info.get("abilities", {})
-            content += f"""
+            content.append(f"""
             <div class="card" style="margin-top: 20px;">
                 <div style="padding: 20px;">
                     <h2 style="color: var(--accent); margin-bottom: 15px;">⚔️ Unlocked Abilities</h2>
                     <div style="display: grid; gap: 15px;">
-            """
+            """)
             for ability_id in unlocked_abilities:
                 ability = abilities_data.get(ability_id, {})
                 ability_name = sanitize(ability.get("name", ability_id.replace("_", " ").title()))
@@ -1357,55 +1544,55 @@ class TemplateEngine:
                 else:
                     cooldown_status = f'<div style="font-size: 0.85em; color: #10b981; margin-top: 5px;">✓ Ready (Cooldown: {cooldown_hours} hours)</div>'
 
-                content += f'''
+                content.append(f'''
                 <div style="padding: 15px; background: var(--table_stripe); border-radius: 6px; border-left: 4px solid var(--accent);">
                     <div style="font-size: 1.1em; font-weight: bold; color: var(--accent); margin-bottom: 5px;">⚔️ {ability_name}</div>
                     <div style="margin-bottom: 5px;">{description}</div>
                     <div style="font-family: 'Courier New', monospace; font-size: 0.9em; color: var(--link);">!quest ability {sanitize(command)}</div>
                     {cooldown_status}
                 </div>
-                '''
-            content += "</div></div></div>"
+                ''')
+            content.append("</div></div></div>")
         elif unlocked_abilities:
             # Fallback if challenge_info not available
-            content += f"""
+            content.append(f"""
             <div class="card" style="margin-top: 20px;">
                 <div style="padding: 20px;">
                     <h2 style="color: var(--accent); margin-bottom: 15px;">⚔️ Unlocked Abilities</h2>
                     <div style="display: grid; gap: 10px;">
-            """
+            """)
             for ability in unlocked_abilities:
-                content += f'<div style="padding: 10px; background: var(--table_stripe); border-radius: 6px;">{sanitize(str(ability))}</div>'
-            content += "</div></div></div>"
+                content.append(f'<div style="padding: 10px; background: var(--table_stripe); border-radius: 6px;">{sanitize(str(ability))}</div>')
+            content.append("</div></div></div>")
 
         # Challenge path
         if challenge_path != "None":
-            content += f"""
+            content.append(f"""
             <div class="card" style="margin-top: 20px;">
                 <div style="padding: 20px;">
                     <h2 style="color: var(--accent); margin-bottom: 15px;">🎯 Challenge Path</h2>
                     <div style="font-size: 1.2em; margin-bottom: 10px; font-weight: bold; color: var(--link);">{sanitize(challenge_path_name)}</div>
-            """
+            """)
             if challenge_stats:
-                content += '<div style="margin-top: 10px;"><strong>Progress:</strong><ul style="margin-top: 5px; margin-left: 20px;">'
+                content.append('<div style="margin-top: 10px;"><strong>Progress:</strong><ul style="margin-top: 5px; margin-left: 20px;">')
                 for stat_name, stat_value in challenge_stats.items():
                     formatted_name = stat_name.replace('_', ' ').title()
-                    content += f'<li>{sanitize(formatted_name)}: {sanitize(str(stat_value))}</li>'
-                content += '</ul></div>'
-            content += "</div></div>"
+                    content.append(f'<li>{sanitize(formatted_name)}: {sanitize(str(stat_value))}</li>')
+                content.append('</ul></div>')
+            content.append("</div></div>")
 
         # Last fight
         if last_fight_display:
-            content += f"""
+            content.append(f"""
             <div class="card" style="margin-top: 20px;">
                 <div style="padding: 20px;">
                     <h2 style="color: var(--accent); margin-bottom: 15px;">⚔️ Last Fight</h2>
                     <div style="font-size: 1.1em;">{last_fight_display}</div>
                 </div>
             </div>
-            """
+            """)
 
         # Interactive features JS removed: /api/link/claim, /api/quest/solo,
         # /api/item/use endpoints are not implemented server-side.
 
-        return content
+        return "".join(content)
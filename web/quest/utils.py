@@ -1,11 +1,14 @@
 # web/quest/utils.py
 # Utility functions for quest web UI
 
+import hashlib
 import html
 import json
 from typing import Dict, Any, List, Tuple
 from pathlib import Path
 
+from ..snapshot import load_snapshot
+
 
 def sanitize(text: str) -> str:
     """Sanitize text for HTML output."""
@@ -19,47 +22,24 @@ def load_quest_state(games_path: Path) -> Tuple[Dict[str, dict], Dict[str, str]]
         Tuple of (players_dict, classes_dict) where players_dict has user_id as keys
         and each player object includes 'user_id' and 'username' fields.
     """
-    if not games_path.exists():
-        return {}, {}
-
-    try:
-        with open(games_path, 'r') as f:
-            data = json.load(f)
-            if not isinstance(data, dict):
-                return {}, {}
-
-            # Quest data is nested under modules.quest
-            modules = data.get("modules", {})
-            if not isinstance(modules, dict):
-                return {}, {}
-
-            quest_state = modules.get("quest", {})
-            if not isinstance(quest_state, dict):
-                return {}, {}
-
-            players_raw = quest_state.get("players", {})
-            classes = quest_state.get("player_classes", {})
-
-            if not isinstance(players_raw, dict):
-                players_raw = {}
-            if not isinstance(classes, dict):
-                classes = {}
-
-            # Transform players dict to include user_id and username in each player object
-            players = {}
-            for user_id, player_data in players_raw.items():
-                if isinstance(player_data, dict):
-                    # Create a copy with user_id and username added
-                    player = player_data.copy()
-                    player["user_id"] = user_id
-                    # Use "name" field as "username" for template compatibility
-                    if "name" in player_data:
-                        player["username"] = player_data["name"]
-                    players[user_id] = player
-
-            return players, classes
-    except (json.JSONDecodeError, IOError):
-        return {}, {}
+    # Quest data is nested under modules.quest
+    snapshot = load_snapshot(games_path)
+    players_raw = snapshot.section("quest", "players")
+    classes = dict(snapshot.section("quest", "player_classes"))
+
+    # Transform players dict to include user_id and username in each player object
+    players = {}
+    for user_id, player_data in players_raw.items():
+        if isinstance(player_data, dict):
+            # Create a copy with user_id and username added
+            player = player_data.copy()
+            player["user_id"] = user_id
+            # Use "name" field as "username" for template compatibility
+            if "name" in player_data:
+                player["username"] = player_data["name"]
+            players[user_id] = player
+
+    return players, classes
 
 
 def load_challenge_paths(paths_file: Path) -> Dict[str, Any]:
@@ -90,31 +70,7 @@ def load_mob_cooldowns(games_path: Path) -> Dict[str, float]:
     Returns:
         Dict mapping channel names to cooldown expiry timestamps.
     """
-    if not games_path.exists():
-        return {}
-
-    try:
-        with open(games_path, 'r') as f:
-            data = json.load(f)
-            if not isinstance(data, dict):
-                return {}
-
-            # Quest data is nested under modules.quest
-            modules = data.get("modules", {})
-            if not isinstance(modules, dict):
-                return {}
-
-            quest_state = modules.get("quest", {})
-            if not isinstance(quest_state, dict):
-                return {}
-
-            cooldowns = quest_state.get("mob_cooldowns", {})
-            if not isinstance(cooldowns, dict):
-                return {}
-
-            return cooldowns
-    except (json.JSONDecodeError, IOError):
-        return {}
+    return dict(load_snapshot(games_path).section("quest", "mob_cooldowns"))
 
 
 def format_number(num: int) -> str:
@@ -206,6 +162,12 @@ def validate_search_term(term: str) -> str:
     return truncate_text(term, 100)
 
 
+def record_digest(record: Dict[str, Any]) -> str:
+    """Stable hash of a JSON-like record, used to key rendered fragments."""
+    encoded = json.dumps(record, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
 def sort_players_by_prestige(players: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Sort players by prestige, then level, then XP."""
     def sort_key(player):
@@ -329,31 +291,7 @@ def load_boss_hunt_data(games_path: Path) -> Dict[str, Any]:
     Returns:
         Dict containing boss hunt state (current_boss, buff, stats)
     """
-    if not games_path.exists():
-        return {}
-
-    try:
-        with open(games_path, 'r') as f:
-            data = json.load(f)
-            if not isinstance(data, dict):
-                return {}
-
-            # Quest data is nested under modules.quest
-            modules = data.get("modules", {})
-            if not isinstance(modules, dict):
-                return {}
-
-            quest_state = modules.get("quest", {})
-            if not isinstance(quest_state, dict):
-                return {}
-
-            boss_hunt = quest_state.get("boss_hunt", {})
-            if not isinstance(boss_hunt, dict):
-                return {}
-
-            return boss_hunt
-    except (json.JSONDecodeError, IOError):
-        return {}
+    return dict(load_snapshot(games_path).section("quest", "boss_hunt"))
 
 
 def format_boss_hp_percentage(current_hp: int, max_hp: int) -> str:
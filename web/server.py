@@ -6,91 +6,186 @@ from __future__ import annotations
 import argparse
 import json
 import logging
+import queue
 import signal
 import sys
+import threading
 import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from http import HTTPStatus
 from http.server import BaseHTTPRequestHandler, HTTPServer
 from pathlib import Path
+from typing import Callable, Iterable, Optional
 from urllib.parse import parse_qs, urlparse
 
-from web.quest.templates import TemplateEngine
-from web.quest.themes import ThemeManager
-from web.quest.utils import (
-    load_boss_hunt_data,
-    load_challenge_paths,
-    load_mob_cooldowns,
-    load_quest_state,
-    sort_players_by_prestige,
-    validate_search_term,
-)
-from web.stats.config import filter_channels, get_channel_filters, load_stats_web_config
-from web.stats.data_loader import JeevesStatsLoader, StatsAggregator
+from web.app import COMPRESSORS, JeevesWebApp, RenderedPage, page_etag
+from web.live import DEFAULT_MAX_CLIENTS
+from web.quest.leaderboard import LeaderboardPage, clamp_page
+from web.quest.utils import validate_search_term
+from web.stats.config import filter_channels, get_channel_filters
 from web.stats.templates import render_achievements_page, render_activity_page, render_overview_page
 
+DEFAULT_WORKERS = 8
+
+# Cache-Control per kind of response. Pages revalidate on every view, which
+# is a bodyless 304 while the underlying state is unchanged.
+CACHE_CONTROL = {
+    "page": "no-cache",
+    "static": "public, max-age=3600",
+    # Versioned assets (?v=<hash>) never change under the same URL.
+    "immutable": "public, max-age=31536000, immutable",
+    "api": "no-cache",
+    "uncached": "no-store",
+}
+
+# Seconds after which a page is re-rendered even without a state change,
+# for pages showing times relative to now (cooldowns, active-user windows).
+QUEST_REFRESH_SECONDS = 60
+STATS_REFRESH_SECONDS = 300
+
+COMPRESSIBLE_TYPES = ("text/html", "application/json", "text/css")
+MIN_COMPRESS_BYTES = 512
+
+# Seconds between SSE keep-alive comments on an idle live stream.
+LIVE_HEARTBEAT_SECONDS = 15
+
+# Streamed export bodies are written in chunks of about this many bytes.
+EXPORT_CHUNK_BYTES = 64 * 1024
+# zlib window bits giving the same framing as COMPRESSORS, for streamed bodies.
+STREAM_WBITS = {"gzip": 31, "deflate": 15}
+
+
+def choose_encoding(accept_encoding: str) -> str:
+    """Preferred supported content-coding from an Accept-Encoding header, or "identity"."""
+    best, best_q = "identity", 0.0
+    for item in (accept_encoding or "").split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if name in COMPRESSORS and q > best_q:
+            best, best_q = name, q
+    return best
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header names `etag` (ignoring weak and encoding markers)."""
+    if not if_none_match:
+        return False
+    base = etag.strip('"')
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        candidate = candidate[2:] if candidate.startswith("W/") else candidate
+        candidate = candidate.strip('"')
+        if candidate == base or candidate.split("-", 1)[0] == base:
+            return True
+    return False
 
-class JeevesHTTPRequestHandler(BaseHTTPRequestHandler):
-    """Unified request handler for quest + stats pages."""
-
-    def __init__(
-        self,
-        *args,
-        games_path: Path,
-        content_path: Path,
-        config_path: Path,
-        debug: bool = False,
-        **kwargs,
-    ):
-        self.games_path = games_path
-        self.content_path = content_path
-        self.config_path = config_path
-        self.debug = bool(debug)
-
-        self.quest_theme_manager = ThemeManager(content_path)
-        self.quest_template_engine = TemplateEngine(self.quest_theme_manager, mount_path="/quest")
-        self._quest_reload_state()
 
-        self.stats_loader = JeevesStatsLoader(config_path)
-        self.stats: dict | None = None
-        self.aggregator: StatsAggregator | None = None
-        self._stats_cache_time: float = 0.0
+class JeevesHTTPRequestHandler(BaseHTTPRequestHandler):
+    """Unified request handler for quest + stats pages.
 
-        super().__init__(*args, **kwargs)
+    A handler is created per request; shared state lives on the bound
+    `JeevesWebApp` (see `create_handler_class`).
+    """
 
-    def _quest_reload_state(self) -> None:
-        self.quest_players, self.quest_classes = load_quest_state(self.games_path)
-        self.quest_challenge_info = load_challenge_paths(self.content_path / "challenge_paths.json")
-        self.quest_mob_cooldowns = load_mob_cooldowns(self.games_path)
-        self.quest_boss_hunt_data = load_boss_hunt_data(self.games_path)
+    app: JeevesWebApp
+    timeout = 30  # seconds a worker waits on a slow or idle client
 
-    _STATS_CACHE_TTL = 30.0  # seconds
+    @property
+    def debug(self) -> bool:
+        return self.app.debug
 
     def _load_stats(self) -> bool:
-        now = time.time()
-        if self.stats is not None and (now - self._stats_cache_time) < self._STATS_CACHE_TTL:
-            return True
         try:
-            self.stats = self.stats_loader.load_all()
-            self.aggregator = StatsAggregator(self.stats)
-            self._stats_cache_time = now
+            self.stats, self.aggregator = self.app.stats()
             return True
         except Exception as exc:  # pragma: no cover
             logging.exception(f"Error loading stats: {exc}")
             self.stats = None
             self.aggregator = None
-            self._stats_cache_time = 0.0
             return False
 
-    def _send_response(self, status: HTTPStatus, content: str, content_type: str = "text/html") -> None:
-        self.send_response(status.value)
-        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
-        self.send_header("Content-Length", str(len(content.encode("utf-8"))))
+    def _send_security_headers(self) -> None:
         self.send_header("X-Content-Type-Options", "nosniff")
         self.send_header("X-Frame-Options", "DENY")
         self.send_header("Referrer-Policy", "no-referrer")
-        self.send_header("Content-Security-Policy", "default-src 'self'; script-src 'unsafe-inline'; style-src 'unsafe-inline'")
+        self.send_header("Content-Security-Policy", "default-src 'self'; script-src 'unsafe-inline'; style-src 'self' 'unsafe-inline'")
+
+    def _send_body(
+        self,
+        status: HTTPStatus,
+        body: bytes | RenderedPage,
+        content_type: str,
+        cache_control: str,
+        etag: str | None = None,
+    ) -> None:
+        encoding = "identity"
+        if content_type in COMPRESSIBLE_TYPES:
+            size = len(body.body if isinstance(body, RenderedPage) else body)
+            if size >= MIN_COMPRESS_BYTES:
+                encoding = choose_encoding(self.headers.get("Accept-Encoding", ""))
+        if isinstance(body, RenderedPage):
+            payload = body.encoded(encoding)
+        else:
+            payload = COMPRESSORS[encoding](body) if encoding in COMPRESSORS else body
+
+        self.send_response(status.value)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        if content_type in COMPRESSIBLE_TYPES:
+            self.send_header("Vary", "Accept-Encoding")
+        if encoding != "identity":
+            self.send_header("Content-Encoding", encoding)
+        if etag:
+            # Each encoding is a distinct representation and gets its own strong tag.
+            self.send_header("ETag", etag if encoding == "identity" else f'{etag[:-1]}-{encoding}"')
+        self.send_header("Cache-Control", cache_control)
+        self._send_security_headers()
         self.end_headers()
-        self.wfile.write(content.encode("utf-8"))
+        self.wfile.write(payload)
+
+    def _send_response(self, status: HTTPStatus, content: str, content_type: str = "text/html") -> None:
+        self._send_body(status, content.encode("utf-8"), content_type, CACHE_CONTROL["uncached"])
+
+    def _send_not_modified(self, etag: str, cache_control: str) -> None:
+        self.send_response(HTTPStatus.NOT_MODIFIED.value)
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", cache_control)
+        self.send_header("Vary", "Accept-Encoding")
+        self.end_headers()
+
+    def _send_page(
+        self,
+        route: str,
+        kind: str,
+        render: Callable[[], Optional[str]],
+        query: tuple = (),
+        content_type: str = "text/html",
+        cache_control: str = CACHE_CONTROL["page"],
+        refresh: int = 0,
+    ) -> None:
+        """Serve a page through the rendered-page cache with ETag revalidation.
+
+        `render` may send its own error response and return None; that
+        result is not cached.
+        """
+        key = (route, query, self.app.page_version(kind, refresh))
+        etag = page_etag(key)
+        if etag_matches(self.headers.get("If-None-Match"), etag):
+            self._send_not_modified(etag, cache_control)
+            return
+        page = self.app.pages.get(key, render)
+        if page is not None:
+            self._send_body(HTTPStatus.OK, page, content_type, cache_control, etag=page.etag)
 
     def _send_html(self, html: str, status: HTTPStatus = HTTPStatus.OK) -> None:
         self._send_response(status, html, content_type="text/html")
@@ -99,6 +194,55 @@ class JeevesHTTPRequestHandler(BaseHTTPRequestHandler):
         payload = json.dumps(data, indent=2)
         self._send_response(status, payload, content_type="application/json")
 
+    def _send_stream(self, chunks: Iterable[bytes], content_type: str, headers: dict) -> None:
+        """Stream a body of unknown length, compressed if the client accepts it.
+
+        HTTP/1.1 clients get chunked transfer encoding; HTTP/1.0 clients get
+        the raw body, ended by closing the connection.
+        """
+        encoding = choose_encoding(self.headers.get("Accept-Encoding", ""))
+        compressor = zlib.compressobj(6, zlib.DEFLATED, STREAM_WBITS[encoding]) if encoding in STREAM_WBITS else None
+        chunked = self.request_version == "HTTP/1.1"
+        if chunked:
+            self.protocol_version = "HTTP/1.1"
+        self.close_connection = True
+
+        self.send_response(HTTPStatus.OK.value)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Vary", "Accept-Encoding")
+        if compressor is not None:
+            self.send_header("Content-Encoding", encoding)
+        if chunked:
+            self.send_header("Transfer-Encoding", "chunked")
+        self.send_header("Connection", "close")
+        self.send_header("Cache-Control", CACHE_CONTROL["uncached"])
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self._send_security_headers()
+        self.end_headers()
+
+        def write(data: bytes) -> None:
+            if data:
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data) if chunked else data)
+
+        try:
+            buffer: list = []
+            size = 0
+            for chunk in chunks:
+                buffer.append(chunk)
+                size += len(chunk)
+                if size >= EXPORT_CHUNK_BYTES:
+                    data = b"".join(buffer)
+                    write(compressor.compress(data) if compressor is not None else data)
+                    buffer, size = [], 0
+            data = b"".join(buffer)
+            write(compressor.compress(data) + compressor.flush() if compressor is not None else data)
+            if chunked:
+                self.wfile.write(b"0\r\n\r\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError, TimeoutError):
+            pass
+
     def _send_error_page(
         self,
         status: HTTPStatus,
@@ -175,11 +319,17 @@ class JeevesHTTPRequestHandler(BaseHTTPRequestHandler):
             if path in ("/api/stats", "/stats/api/stats"):
                 self._handle_stats_api_stats()
                 return
+            if path.startswith(("/api/export/", "/stats/api/export/")):
+                self._handle_export(path.rsplit("/", 1)[-1], query)
+                return
 
             # Quest pages (mounted under /quest; keep legacy aliases for compatibility)
             if path in ("/quest", "/quest/", "/quest/index.html"):
                 self._handle_quest_leaderboard(query)
                 return
+            if path in ("/theme.css", "/quest/theme.css"):
+                self._handle_quest_stylesheet(query)
+                return
             if path in ("/commands", "/quest/commands"):
                 self._handle_quest_commands()
                 return
@@ -192,6 +342,12 @@ class JeevesHTTPRequestHandler(BaseHTTPRequestHandler):
             if path in ("/api/status", "/quest/api/status"):
                 self._handle_quest_api_status()
                 return
+            if path in ("/api/live", "/quest/api/live"):
+                self._handle_live()
+                return
+            if path in ("/api/leaderboard", "/quest/api/leaderboard"):
+                self._handle_quest_api_leaderboard(query)
+                return
             self._send_error_page(HTTPStatus.NOT_FOUND, "Page not found.", home_path="/")
         except Exception as exc:  # pragma: no cover
             import traceback
@@ -224,45 +380,110 @@ class JeevesHTTPRequestHandler(BaseHTTPRequestHandler):
             )
 
     # Quest handlers
-    def _handle_quest_leaderboard(self, query: dict) -> None:
+    @staticmethod
+    def _leaderboard_query(query: dict) -> tuple:
+        """(search term, prefix-only, page, per_page) from leaderboard query parameters."""
         search_term = validate_search_term(query.get("search", [""])[0] if "search" in query else "")
+        prefix = query.get("match", [""])[0] == "prefix"
+        page, per_page = clamp_page(query.get("page", [1])[0], query.get("per_page", [None])[0])
+        return search_term, prefix, page, per_page
+
+    def _leaderboard_page(self, search_term: str, prefix: bool, page: int, per_page: int) -> LeaderboardPage:
+        index = self.app.quest_state().leaderboard
+        positions = None
         if search_term:
-            filtered_players = [
-                player for player in self.quest_players.values()
-                if search_term.lower() in player.get("username", "").lower()
-            ]
-        else:
-            filtered_players = list(self.quest_players.values())
+            positions = index.search_prefix(search_term) if prefix else index.search(search_term)
+        return index.page(page, per_page, positions)
 
-        sorted_players = sort_players_by_prestige(filtered_players)
-        content = self.quest_template_engine.render_leaderboard(
-            sorted_players,
-            self.quest_classes,
+    def _handle_quest_leaderboard(self, query: dict) -> None:
+        params = self._leaderboard_query(query)
+        self._send_page(
+            "quest_leaderboard",
+            "quest",
+            lambda: self._render_quest_leaderboard(*params),
+            query=params,
+            refresh=QUEST_REFRESH_SECONDS,
+        )
+
+    def _render_quest_leaderboard(self, search_term: str, prefix: bool, page: int, per_page: int) -> str:
+        state = self.app.quest_state()
+        engine = self.app.template_engine()
+        leaderboard_page = self._leaderboard_page(search_term, prefix, page, per_page)
+        content = engine.render_leaderboard(
+            leaderboard_page.players,
+            state.classes,
             search_term,
-            self.quest_challenge_info,
-            self.quest_mob_cooldowns,
-            self.quest_boss_hunt_data,
+            state.challenge_info,
+            state.mob_cooldowns,
+            state.boss_hunt_data,
             None,
+            page=leaderboard_page,
+            prefix=prefix,
         )
 
-        html = self.quest_template_engine.render_page(
+        return engine.render_page(
             "Quest Leaderboard" + (f" - {search_term}" if search_term else ""),
             content,
             "leaderboard",
         )
-        self._send_html(html)
+
+    def _handle_quest_api_leaderboard(self, query: dict) -> None:
+        params = self._leaderboard_query(query)
+
+        def render() -> str:
+            state = self.app.quest_state()
+            page = self._leaderboard_page(*params)
+            players = [
+                {
+                    "rank": rank,
+                    "user_id": player.get("user_id"),
+                    "username": player.get("username"),
+                    "class": state.classes.get(player.get("user_id"), None),
+                    "prestige": player.get("prestige", 0),
+                    "level": player.get("level", 1),
+                    "xp": player.get("xp", 0),
+                    "wins": player.get("wins", 0),
+                    "losses": player.get("losses", 0),
+                    "win_streak": player.get("win_streak", 0),
+                }
+                for rank, player in enumerate(page.players, page.offset + 1)
+            ]
+            return json.dumps({
+                "page": page.page,
+                "per_page": page.per_page,
+                "pages": page.pages,
+                "total": page.total,
+                "players": players,
+            }, indent=2)
+
+        self._send_page("quest_api_leaderboard", "quest", render, query=params,
+                        content_type="application/json", cache_control=CACHE_CONTROL["api"])
+
+    def _handle_quest_stylesheet(self, query: dict) -> None:
+        engine = self.app.template_engine()
+        versioned = query.get("v", [""])[0] == engine.stylesheet_version()
+        self._send_page(
+            "quest_stylesheet",
+            "theme",
+            engine.stylesheet,
+            content_type="text/css",
+            cache_control=CACHE_CONTROL["immutable" if versioned else "static"],
+        )
 
     def _handle_quest_commands(self) -> None:
-        content = self.quest_template_engine.render_commands()
-        html = self.quest_template_engine.render_page("Quest Commands", content, "commands")
-        self._send_html(html)
+        def render() -> str:
+            engine = self.app.template_engine()
+            return engine.render_page("Quest Commands", engine.render_commands(), "commands")
+
+        self._send_page("quest_commands", "theme", render, cache_control=CACHE_CONTROL["static"])
 
     def _handle_quest_player_detail(self, path: str) -> None:
+        state = self.app.quest_state()
         player_identifier = path.split("/", 2)[2].split("?")[0]
 
         player = None
         user_id = None
-        for uid, candidate in self.quest_players.items():
+        for uid, candidate in state.players.items():
             if uid == player_identifier or candidate.get("username", "").lower() == player_identifier.lower():
                 player = candidate
                 user_id = uid
@@ -272,31 +493,75 @@ class JeevesHTTPRequestHandler(BaseHTTPRequestHandler):
             self._send_error_page(HTTPStatus.NOT_FOUND, "Player not found.", home_path="/quest")
             return
 
-        player_class = self.quest_classes.get(user_id, "No class")
-        content = self.quest_template_engine.render_player_detail(
-            player,
-            player_class,
-            self.quest_challenge_info,
-            None,
-        )
-        html = self.quest_template_engine.render_page(
-            f"{player.get('username', 'Player')} - Profile",
-            content,
-            "",
-        )
-        self._send_html(html)
+        def render() -> str:
+            engine = self.app.template_engine()
+            player_class = state.classes.get(user_id, "No class")
+            content = engine.render_player_detail(
+                player,
+                player_class,
+                state.challenge_info,
+                None,
+            )
+            return engine.render_page(
+                f"{player.get('username', 'Player')} - Profile",
+                content,
+                "",
+            )
+
+        self._send_page("quest_player", "quest", render, query=(user_id,), refresh=QUEST_REFRESH_SECONDS)
 
     def _handle_quest_api_status(self) -> None:
-        status = {
-            "players": len(self.quest_players),
-            "classes": len(self.quest_classes),
-            "theme": self.quest_theme_manager.get_theme().get("name"),
-            "challenge_active": self.quest_challenge_info.get("active_path") is not None,
-        }
-        self._send_json(status)
+        def render() -> str:
+            state = self.app.quest_state()
+            status = {
+                "players": len(state.players),
+                "classes": len(state.classes),
+                "theme": self.app.theme_manager().get_theme().get("name"),
+                "challenge_active": state.challenge_info.get("active_path") is not None,
+            }
+            return json.dumps(status, indent=2)
+
+        self._send_page("quest_api_status", "quest", render,
+                        content_type="application/json", cache_control=CACHE_CONTROL["api"])
+
+    def _handle_live(self) -> None:
+        """Server-Sent Events stream of state deltas (see web/live.py)."""
+        hub = self.app.live
+        subscription = hub.subscribe(self.headers.get("Last-Event-ID"))
+        if subscription is None:
+            self._send_json({"error": "Too many live clients"}, status=HTTPStatus.SERVICE_UNAVAILABLE)
+            return
+
+        try:
+            self.send_response(HTTPStatus.OK.value)
+            self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+            self.send_header("Cache-Control", "no-store")
+            self.send_header("X-Accel-Buffering", "no")
+            self._send_security_headers()
+            self.end_headers()
+            self.wfile.write(b"retry: 5000\n\n")
+            self.wfile.flush()
+
+            while not hub.closed:
+                try:
+                    message = subscription.get(timeout=LIVE_HEARTBEAT_SECONDS)
+                except queue.Empty:
+                    message = b": keep-alive\n\n"
+                if message is None:
+                    break
+                self.wfile.write(message)
+                self.wfile.flush()
+                if subscription.lagging:
+                    self.wfile.write(b"event: reload\ndata: {}\n\n")
+                    break
+        except (BrokenPipeError, ConnectionResetError, TimeoutError):
+            pass
+        finally:
+            hub.unsubscribe(subscription)
 
     # Rate limit: minimum 5 seconds between reloads
     _last_reload_time: float = 0.0
+    _reload_lock = threading.Lock()
 
     def _handle_quest_api_reload(self) -> None:
         # Only allow from localhost
@@ -307,7 +572,11 @@ class JeevesHTTPRequestHandler(BaseHTTPRequestHandler):
 
         # Rate limit reloads
         now = time.time()
-        if now - JeevesHTTPRequestHandler._last_reload_time < 5.0:
+        with JeevesHTTPRequestHandler._reload_lock:
+            limited = now - JeevesHTTPRequestHandler._last_reload_time < 5.0
+            if not limited:
+                JeevesHTTPRequestHandler._last_reload_time = now
+        if limited:
             self._send_json(
                 {"success": False, "error": "Rate limited. Try again in a few seconds."},
                 status=HTTPStatus.TOO_MANY_REQUESTS,
@@ -315,101 +584,149 @@ class JeevesHTTPRequestHandler(BaseHTTPRequestHandler):
             return
 
         try:
-            self._quest_reload_state()
-            JeevesHTTPRequestHandler._last_reload_time = now
+            # Files are re-read on change anyway; this forces it for edits that keep the mtime.
+            self.app.reload()
+            self.app.quest_state()
             self._send_json({"success": True, "message": "Quest data reloaded successfully"})
         except Exception as exc:  # pragma: no cover
             self._send_json({"success": False, "error": "Internal server error"}, status=HTTPStatus.INTERNAL_SERVER_ERROR)
 
     # Stats handlers
+    def _stats_or_error(self) -> bool:
+        """Loads stats, sending the error page if that fails."""
+        if self._load_stats():
+            return True
+        self._send_error_page(
+            HTTPStatus.INTERNAL_SERVER_ERROR,
+            "Failed to load statistics. Please check the config files.",
+            home_path="/",
+        )
+        return False
+
     def _handle_stats_overview(self) -> None:
-        if not self._load_stats():
-            self._send_error_page(
-                HTTPStatus.INTERNAL_SERVER_ERROR,
-                "Failed to load statistics. Please check the config files.",
-                home_path="/",
-            )
-            return
-        html = render_overview_page(self.stats, self.aggregator)
-        self._send_html(html)
+        def render() -> Optional[str]:
+            if not self._stats_or_error():
+                return None
+            return render_overview_page(self.stats, self.aggregator)
+
+        self._send_page("stats_overview", "stats", render, refresh=STATS_REFRESH_SECONDS)
 
     def _handle_stats_achievements(self) -> None:
-        if not self._load_stats():
-            self._send_error_page(
-                HTTPStatus.INTERNAL_SERVER_ERROR,
-                "Failed to load statistics. Please check the config files.",
-                home_path="/",
-            )
-            return
-        html = render_achievements_page(self.stats)
-        self._send_html(html)
+        def render() -> Optional[str]:
+            if not self._stats_or_error():
+                return None
+            return render_achievements_page(self.stats)
+
+        self._send_page("stats_achievements", "stats", render)
 
     def _handle_stats_activity(self, query: dict) -> None:
-        if not self._load_stats():
-            self._send_error_page(
-                HTTPStatus.INTERNAL_SERVER_ERROR,
-                "Failed to load statistics. Please check the config files.",
-                home_path="/",
-            )
-            return
+        selected_channel = (query.get("channel", [None])[0] or None)
+        user_query = (query.get("user", [None])[0] or None)
 
-        full_config = load_stats_web_config(self.config_path)
-        visible_channels, hidden_channels = get_channel_filters(full_config)
+        def render() -> Optional[str]:
+            if not self._stats_or_error():
+                return None
 
-        available_channels = sorted((self.stats.get("activity", {}).get("channels") or {}).keys())
-        channels = filter_channels(available_channels, visible_channels, hidden_channels)
+            full_config = self.app.stats_web_config()
+            visible_channels, hidden_channels = get_channel_filters(full_config)
 
-        selected_channel = (query.get("channel", [None])[0] or None)
-        if selected_channel and selected_channel not in channels:
-            selected_channel = None
+            available_channels = sorted((self.stats.get("activity", {}).get("channels") or {}).keys())
+            channels = filter_channels(available_channels, visible_channels, hidden_channels)
 
-        user_query = (query.get("user", [None])[0] or None)
-        html = render_activity_page(
-            self.stats,
-            self.aggregator,
-            channels=channels,
-            selected_channel=selected_channel,
-            user_query=user_query,
-        )
-        self._send_html(html)
+            channel = selected_channel if selected_channel in channels else None
+            return render_activity_page(
+                self.stats,
+                self.aggregator,
+                channels=channels,
+                selected_channel=channel,
+                user_query=user_query,
+            )
+
+        self._send_page("stats_activity", "stats", render, query=(selected_channel, user_query))
 
     def _handle_stats_api_stats(self) -> None:
-        if not self._load_stats():
-            self._send_json({"error": "Failed to load statistics"}, status=HTTPStatus.INTERNAL_SERVER_ERROR)
+        def render() -> Optional[str]:
+            if not self._load_stats():
+                self._send_json({"error": "Failed to load statistics"}, status=HTTPStatus.INTERNAL_SERVER_ERROR)
+                return None
+            api_stats = {
+                "user_count": len(self.stats["users"]),
+                "quest_players": len(self.stats["quest"]),
+                "hunt_players": len(self.stats["hunt"]),
+                "duel_players": len(self.stats["duel"].get("wins", {})),
+                "absurdia_players": len(self.stats["absurdia"].get("players", {})),
+            }
+            return json.dumps(api_stats, indent=2)
+
+        self._send_page("stats_api_stats", "stats", render,
+                        content_type="application/json", cache_control=CACHE_CONTROL["api"])
+
+    # Export handlers
+    def _handle_export(self, entity: str, query: dict) -> None:
+        """NDJSON export of one entity, one compact JSON record per line (see web/export.py).
+
+        `?fields=a,b` limits each record to those fields plus "id";
+        `?since=<version>` returns only records changed or deleted after a
+        previous response's X-Export-Version.
+        """
+        if entity not in self.app.exports.ENTITIES:
+            self._send_json({"error": f"Unknown export '{entity}'"}, status=HTTPStatus.NOT_FOUND)
             return
-
-        api_stats = {
-            "user_count": len(self.stats["users"]),
-            "quest_players": len(self.stats["quest"]),
-            "hunt_players": len(self.stats["hunt"]),
-            "duel_players": len(self.stats["duel"].get("wins", {})),
-            "absurdia_players": len(self.stats["absurdia"].get("players", {})),
-        }
-        self._send_json(api_stats)
+        fields = [field.strip() for value in query.get("fields", []) for field in value.split(",") if field.strip()]
+        since = query.get("since", [None])[0]
+        try:
+            version, lines = self.app.exports.export(entity, fields, since)
+        except Exception as exc:
+            logging.exception(f"Error exporting {entity}: {exc}")
+            self._send_json({"error": "Failed to load export data"}, status=HTTPStatus.INTERNAL_SERVER_ERROR)
+            return
+        self._send_stream(lines, "application/x-ndjson", {"X-Export-Version": version})
 
     def log_message(self, format: str, *args) -> None:  # noqa: A003
         logging.info(f"{self.address_string()} - {format % args}")
 
 
-def create_handler_class(games_path: Path, content_path: Path, config_path: Path, debug: bool = False) -> type:
-    def handler_init(self, *args, **kwargs):
-        JeevesHTTPRequestHandler.__init__(
-            self,
-            *args,
-            games_path=games_path,
-            content_path=content_path,
-            config_path=config_path,
-            debug=debug,
-            **kwargs,
-        )
-
+def create_handler_class(app: JeevesWebApp) -> type:
     return type(
         "BoundJeevesHTTPRequestHandler",
         (JeevesHTTPRequestHandler,),
-        {"__init__": handler_init},
+        {"app": app},
     )
 
 
+class PooledHTTPServer(HTTPServer):
+    """HTTPServer that handles requests on a fixed pool of worker threads.
+
+    Unlike ThreadingHTTPServer the number of threads is bounded; connections
+    beyond the pool wait in the executor queue and the listen backlog.
+    `stream_slots` extra threads are reserved for long-lived live streams,
+    which the LiveHub caps at the same number, so streams never starve pages.
+    """
+
+    request_queue_size = 128
+
+    def __init__(self, server_address, handler_class, workers: int = DEFAULT_WORKERS, stream_slots: int = 0):
+        self.workers = max(1, int(workers))
+        self.stream_slots = max(0, int(stream_slots))
+        self._pool = ThreadPoolExecutor(max_workers=self.workers + self.stream_slots, thread_name_prefix="jeeves-web")
+        super().__init__(server_address, handler_class)
+
+    def process_request(self, request, client_address) -> None:
+        self._pool.submit(self._process_request_worker, request, client_address)
+
+    def _process_request_worker(self, request, client_address) -> None:
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
 class JeevesWebServer:
     """Web server for unified Jeeves dashboards."""
 
@@ -421,11 +738,14 @@ class JeevesWebServer:
         content_path: Path | None = None,
         config_path: Path | None = None,
         debug: bool = False,
+        workers: int = DEFAULT_WORKERS,
+        live_clients: int = DEFAULT_MAX_CLIENTS,
     ):
         self.host = host
         self.port = port
         self.server: HTTPServer | None = None
         self.debug = bool(debug)
+        self.workers = max(1, int(workers))
         self._shutdown_requested = False
 
         repo_root = Path(__file__).resolve().parent.parent
@@ -449,6 +769,7 @@ class JeevesWebServer:
         self.games_path = games_path
         self.content_path = content_path
         self.config_path = config_path
+        self.app = JeevesWebApp(games_path, content_path, config_path, debug=self.debug, live_clients=live_clients)
 
         signal.signal(signal.SIGINT, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
@@ -461,15 +782,18 @@ class JeevesWebServer:
 
         # `HTTPServer.shutdown()` must not be called from the same thread running
         # `serve_forever()`, otherwise it can deadlock.
-        import threading
-
         threading.Thread(target=self.server.shutdown, daemon=True).start()
 
     def start(self) -> None:
-        handler_class = create_handler_class(self.games_path, self.content_path, self.config_path, debug=self.debug)
+        handler_class = create_handler_class(self.app)
 
         try:
-            self.server = HTTPServer((self.host, self.port), handler_class)
+            self.server = PooledHTTPServer(
+                (self.host, self.port),
+                handler_class,
+                workers=self.workers,
+                stream_slots=self.app.live.max_clients,
+            )
         except OSError as exc:
             print(f"Error: Failed to start server on {self.host}:{self.port}: {exc}", file=sys.stderr)
             sys.exit(1)
@@ -478,6 +802,7 @@ class JeevesWebServer:
         print(f"   Server: http://{self.host}:{self.port}", file=sys.stderr)
         print(f"   Games: {self.games_path}", file=sys.stderr)
         print(f"   Config: {self.config_path}", file=sys.stderr)
+        print(f"   Workers: {self.workers} (+{self.app.live.max_clients} live streams)", file=sys.stderr)
         print("   Pages: / (Stats), /quest, /activity, /achievements", file=sys.stderr)
         print("   Press Ctrl+C to stop the server", file=sys.stderr)
         print("=" * 50, file=sys.stderr)
@@ -490,6 +815,7 @@ class JeevesWebServer:
             print(f"Error: Server encountered an error: {exc}", file=sys.stderr)
             sys.exit(1)
         finally:
+            self.app.live.close()
             try:
                 self.server.server_close()
             except Exception:
@@ -520,6 +846,10 @@ Examples:
     parser.add_argument("--games", type=Path, help="Path to games.json file (default: config/games.json)")
     parser.add_argument("--content", type=Path, help="Path to content directory (default: repo root)")
     parser.add_argument("--config", type=Path, help="Path to config directory (default: config/)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Number of request worker threads (default: {DEFAULT_WORKERS})")
+    parser.add_argument("--live-clients", type=int, default=DEFAULT_MAX_CLIENTS,
+                        help=f"Maximum concurrent live-update streams (default: {DEFAULT_MAX_CLIENTS})")
     parser.add_argument("--debug", action="store_true", help="Enable debug logging")
 
     args = parser.parse_args()
@@ -534,6 +864,8 @@ Examples:
         content_path=args.content,
         config_path=args.config,
         debug=args.debug,
+        workers=args.workers,
+        live_clients=args.live_clients,
     )
     server.start()
 
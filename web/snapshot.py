@@ -0,0 +1,129 @@
+# web/snapshot.py
+# Parse-once snapshots of the bot's JSON state files for the web tier
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
+
+Signature = Optional[Tuple[int, int, int]]
+
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+
+def path_signature(path: Path) -> Signature:
+    """(mtime_ns, size, inode) of a file, or None if it is missing.
+
+    Changes whenever the bot rewrites the file, including atomic replace-by-rename.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def file_signature(paths: Iterable[Path]) -> Tuple[Signature, ...]:
+    return tuple(path_signature(path) for path in paths)
+
+
+class StateSnapshot:
+    """One parse of a state file (games.json, stats.json, ...), shared by every reader.
+
+    The top level is exposed as a read-only mapping. Nested module dicts are
+    shared between all loaders and threads: copy anything before mutating it.
+    """
+
+    __slots__ = ("path", "signature", "data")
+
+    def __init__(self, path: Path, signature: Signature, data: Dict[str, Any]):
+        self.path = path
+        self.signature = signature
+        self.data: Mapping[str, Any] = MappingProxyType(data)
+
+    @property
+    def version(self) -> str:
+        """Short token that changes whenever the file does; "0" for a missing file."""
+        if self.signature is None:
+            return "0"
+        mtime_ns, size, _ = self.signature
+        return f"{mtime_ns:x}-{size:x}"
+
+    def modules(self) -> Mapping[str, Any]:
+        modules = self.data.get("modules")
+        return modules if isinstance(modules, dict) else _EMPTY
+
+    def module(self, name: str) -> Mapping[str, Any]:
+        """State of one bot module, or an empty mapping if absent or malformed."""
+        state = self.modules().get(name)
+        return state if isinstance(state, dict) else _EMPTY
+
+    def section(self, module: str, key: str) -> Mapping[str, Any]:
+        """A dict-valued key of a module's state, e.g. section("quest", "players")."""
+        value = self.module(module).get(key)
+        return value if isinstance(value, dict) else _EMPTY
+
+
+class SnapshotLoader:
+    """Caches one StateSnapshot per path and re-parses only when the file's signature changes."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshots: Dict[str, StateSnapshot] = {}
+        self._parse_locks: Dict[str, threading.Lock] = {}
+        self.parses = 0
+        self.hits = 0
+
+    def get(self, path: Path) -> StateSnapshot:
+        path = Path(path)
+        key = str(path)
+        signature = path_signature(path)
+        with self._lock:
+            snapshot = self._snapshots.get(key)
+            if snapshot is not None and snapshot.signature == signature:
+                self.hits += 1
+                return snapshot
+            parse_lock = self._parse_locks.setdefault(key, threading.Lock())
+
+        with parse_lock:
+            signature = path_signature(path)
+            with self._lock:
+                snapshot = self._snapshots.get(key)
+                if snapshot is not None and snapshot.signature == signature:
+                    self.hits += 1
+                    return snapshot
+            snapshot = StateSnapshot(path, signature, self._parse(path) if signature is not None else {})
+            with self._lock:
+                self._snapshots[key] = snapshot
+                if signature is not None:
+                    self.parses += 1
+            return snapshot
+
+    @staticmethod
+    def _parse(path: Path) -> Dict[str, Any]:
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, OSError, UnicodeDecodeError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"files": len(self._snapshots), "parses": self.parses, "hits": self.hits}
+
+
+_default_loader = SnapshotLoader()
+
+
+def load_snapshot(path: Path) -> StateSnapshot:
+    """Snapshot of `path` from the process-wide loader."""
+    return _default_loader.get(path)
+
+
+def snapshot_stats() -> Dict[str, int]:
+    return _default_loader.stats()
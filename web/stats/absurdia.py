@@ -0,0 +1,163 @@
+# web/stats/absurdia.py
+# Pooled read-only access to the Absurdia SQLite database for the stats pages
+
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+from urllib.parse import quote
+
+RARITIES = ("common", "uncommon", "rare", "epic", "legendary")
+
+# One pass over players, joined with per-owner creature counts. The creature
+# aggregate only reads (owner_id, rarity), which idx_creatures_owner_rarity
+# (created by modules/absurdia_pkg/absurdia_db.py) covers.
+PLAYER_STATS_SQL = """
+    SELECT p.user_id, p.coins, p.total_arena_wins, p.total_arena_losses,
+           p.current_win_streak, p.best_win_streak,
+           c.creature_count, {rarity_columns}
+    FROM players AS p
+    LEFT JOIN (
+        SELECT owner_id, COUNT(*) AS creature_count, {rarity_sums}
+        FROM creatures
+        WHERE owner_id IS NOT NULL
+        GROUP BY owner_id
+    ) AS c ON c.owner_id = p.user_id
+""".format(
+    rarity_columns=", ".join(f"c.{rarity}_count" for rarity in RARITIES),
+    rarity_sums=", ".join(f"SUM(rarity = '{rarity}') AS {rarity}_count" for rarity in RARITIES),
+)
+
+
+class AbsurdiaReader:
+    """Read-only, pooled connections to absurdia.db with results cached per database version.
+
+    Connections are opened with `mode=ro`, so the web tier never takes a write
+    lock, and in WAL mode reads don't block the bot's writes. The cached stats
+    are keyed by `PRAGMA data_version` on a dedicated probe connection, which
+    changes whenever any other connection commits (checkpoints don't count),
+    plus the file's identity so a replaced database is reopened.
+    """
+
+    POOL_SIZE = 4
+
+    def __init__(self, db_path: Path, pool_size: int = POOL_SIZE):
+        self.db_path = Path(db_path)
+        self._pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(maxsize=max(1, pool_size))
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._probe: Optional[sqlite3.Connection] = None
+        self._identity: Optional[Tuple[int, int]] = None
+        self._cached: Optional[Tuple[Any, Dict[str, Any]]] = None
+        self._generation = 0  # bumped when pooled connections go stale
+        self.queries = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        uri = f"file:{quote(str(self.db_path.resolve()))}?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, timeout=2, check_same_thread=False)
+        conn.execute("PRAGMA query_only = ON")
+        return conn
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """A pooled read-only connection; one that raised or went stale is closed rather than returned."""
+        generation = self._generation
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+        try:
+            yield conn
+        except sqlite3.Error:
+            conn.close()
+            raise
+        if generation != self._generation:
+            conn.close()
+            return
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def _drain(self) -> None:
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+
+    def version(self) -> Optional[Tuple[int, int, int]]:
+        """(device, inode, data_version) of the database, or None if it is missing or unreadable."""
+        try:
+            st = os.stat(self.db_path)
+        except OSError:
+            return None
+        identity = (st.st_dev, st.st_ino)
+        with self._lock:
+            try:
+                if identity != self._identity:
+                    # New or replaced file: connections to the old one are stale.
+                    self._close_locked()
+                    self._probe = self._connect()
+                    self._identity = identity
+                (data_version,) = self._probe.execute("PRAGMA data_version").fetchone()
+            except sqlite3.Error:
+                self._close_locked()
+                return None
+        return identity + (data_version,)
+
+    def load(self) -> Dict[str, Any]:
+        """Per-player arena and creature stats; the same object until the database changes.
+
+        Raises sqlite3.Error if the database can't be read.
+        """
+        if not self.db_path.exists():
+            return {"players": {}}
+        version = self.version()
+        cached = self._cached
+        if version is not None and cached is not None and cached[0] == version:
+            return cached[1]
+        with self._load_lock:
+            cached = self._cached
+            if version is not None and cached is not None and cached[0] == version:
+                return cached[1]
+            result = {"players": self._query_players()}
+            self._cached = (version, result) if version is not None else None
+            return result
+
+    def _query_players(self) -> Dict[str, Dict[str, Any]]:
+        self.queries += 1
+        players = {}
+        with self.connection() as conn:
+            for row in conn.execute(PLAYER_STATS_SQL):
+                user_id, coins, wins, losses, streak, best_streak, creature_count = row[:7]
+                wins, losses = wins or 0, losses or 0
+                player = players[user_id] = {
+                    "coins": coins,
+                    "total_arena_wins": wins,
+                    "total_arena_losses": losses,
+                    "current_win_streak": streak,
+                    "best_win_streak": best_streak,
+                    "win_rate": wins / (wins + losses) if wins + losses > 0 else 0,
+                }
+                if creature_count is not None:
+                    player["creature_count"] = creature_count
+                    for rarity, count in zip(RARITIES, row[7:]):
+                        player[f"{rarity}_count"] = count
+        return players
+
+    def _close_locked(self) -> None:
+        if self._probe is not None:
+            self._probe.close()
+            self._probe = None
+        self._identity = None
+        self._cached = None
+        self._generation += 1
+        self._drain()
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_locked()
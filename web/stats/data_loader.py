@@ -1,16 +1,28 @@
 # web/stats/data_loader.py
 # Unified data loader for all Jeeves statistics
 
-import json
+import bisect
+import heapq
 import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional, Any
+from typing import Dict, List, Tuple, Optional, Any, Iterable, Mapping
+
+from ..snapshot import StateSnapshot, load_snapshot
+from .absurdia import AbsurdiaReader
 
 HEATMAP_BINS = 7 * 24
 
 
 class JeevesStatsLoader:
-    """Loads and aggregates statistics from all Jeeves modules."""
+    """Loads and aggregates statistics from all Jeeves modules.
+
+    State files are read through shared snapshots (see web/snapshot.py), so
+    every loader below reuses one parse per file until the file changes.
+    Loaders that add derived fields do so on copies of the shared records.
+    """
 
     def __init__(self, config_path: Path):
         """Initialize the stats loader.
@@ -24,39 +36,76 @@ class JeevesStatsLoader:
         self.state_path = self.config_path / "state.json"
         self.users_path = self.config_path / "users.json"
         self.absurdia_db_path = self.config_path / "absurdia.db"
+        self.absurdia = AbsurdiaReader(self.absurdia_db_path)
+        self._category_lock = threading.Lock()
+        self._categories: Dict[str, Tuple[Any, Any]] = {}
 
     @staticmethod
-    def _load_json_file(path: Path) -> Dict[str, Any]:
-        if not path.exists():
-            return {}
-        try:
-            with open(path, "r") as f:
-                data = json.load(f)
-            return data if isinstance(data, dict) else {}
-        except Exception:
-            return {}
+    def _load_json_file(path: Path) -> Mapping[str, Any]:
+        return load_snapshot(path).data
+
+    def snapshots(self) -> Dict[str, StateSnapshot]:
+        """Current snapshots of the JSON state files, keyed by file name."""
+        return {path.name: load_snapshot(path)
+                for path in (self.games_path, self.stats_path, self.state_path, self.users_path)}
+
+    def _category_sources(self) -> Dict[str, Any]:
+        """Raw module state (or database version) each category is derived from (None: always reload)."""
+        games = load_snapshot(self.games_path)
+        stats = load_snapshot(self.stats_path)
+        return {
+            "users": load_snapshot(self.users_path).section("users", "user_map"),
+            "quest": games.section("quest", "players"),
+            "hunt": games.section("hunt", "scores"),
+            "duel": stats.section("duel", "stats"),
+            "adventure": games.module("adventure"),
+            "roadtrip": games.module("roadtrip"),
+            "absurdia": self.absurdia.version(),
+            "karma": stats.section("karma", "karma_scores"),
+            "coffee": stats.section("coffee", "user_beverage_counts"),
+            "bell": games.section("bell", "scores"),
+            "achievements": (stats.module("achievements"), load_snapshot(self.state_path).module("achievements")),
+            "activity": stats.module("activity"),
+            "fishing": games.section("fishing", "players"),
+        }
 
     def load_all(self) -> Dict[str, Any]:
         """Load all stats from all modules.
 
+        A category whose raw module state is equal to the previous load's is
+        returned as the same object as last time, which lets StatsAggregator
+        keep its indices for it.
+
         Returns:
             Dictionary containing all stats organized by category
         """
-        return {
-            "users": self.load_users(),
-            "quest": self.load_quest_stats(),
-            "hunt": self.load_hunt_stats(),
-            "duel": self.load_duel_stats(),
-            "adventure": self.load_adventure_stats(),
-            "roadtrip": self.load_roadtrip_stats(),
-            "absurdia": self.load_absurdia_stats(),
-            "karma": self.load_karma_stats(),
-            "coffee": self.load_coffee_stats(),
-            "bell": self.load_bell_stats(),
-            "achievements": self.load_achievements_stats(),
-            "activity": self.load_activity_stats(),
-            "fishing": self.load_fishing_stats(),
+        loaders = {
+            "users": self.load_users,
+            "quest": self.load_quest_stats,
+            "hunt": self.load_hunt_stats,
+            "duel": self.load_duel_stats,
+            "adventure": self.load_adventure_stats,
+            "roadtrip": self.load_roadtrip_stats,
+            "absurdia": self.load_absurdia_stats,
+            "karma": self.load_karma_stats,
+            "coffee": self.load_coffee_stats,
+            "bell": self.load_bell_stats,
+            "achievements": self.load_achievements_stats,
+            "activity": self.load_activity_stats,
+            "fishing": self.load_fishing_stats,
         }
+        sources = self._category_sources()
+        all_stats = {}
+        with self._category_lock:
+            for category, load in loaders.items():
+                source = sources[category]
+                cached = self._categories.get(category)
+                if source is not None and cached is not None and (cached[0] is source or cached[0] == source):
+                    all_stats[category] = cached[1]
+                    continue
+                all_stats[category] = load()
+                self._categories[category] = (source, all_stats[category])
+        return all_stats
 
     def load_users(self) -> Dict[str, Dict[str, Any]]:
         """Load user information including nick history.
@@ -64,20 +113,17 @@ class JeevesStatsLoader:
         Returns:
             Dict mapping user_id to user info (canonical_nick, seen_nicks, first_seen)
         """
-        if not self.users_path.exists():
-            return {}
-
-        with open(self.users_path, 'r') as f:
-            data = json.load(f)
-
-        users = data.get("modules", {}).get("users", {}).get("user_map", {})
+        users = load_snapshot(self.users_path).section("users", "user_map")
 
         # Add nick change count to each user
-        for user_id, user_data in users.items():
-            seen_nicks = user_data.get("seen_nicks", [])
-            user_data["nick_change_count"] = len(seen_nicks) - 1  # -1 because first nick isn't a change
-
-        return users
+        return {
+            user_id: {
+                **user_data,
+                "nick_change_count": len(user_data.get("seen_nicks", [])) - 1,  # first nick isn't a change
+            }
+            for user_id, user_data in users.items()
+            if isinstance(user_data, dict)
+        }
 
     def load_quest_stats(self) -> Dict[str, Dict[str, Any]]:
         """Load Quest module statistics.
@@ -85,13 +131,7 @@ class JeevesStatsLoader:
         Returns:
             Dict mapping user_id to quest stats (level, xp, prestige, wins, losses, etc.)
         """
-        if not self.games_path.exists():
-            return {}
-
-        with open(self.games_path, 'r') as f:
-            data = json.load(f)
-
-        return data.get("modules", {}).get("quest", {}).get("players", {})
+        return dict(load_snapshot(self.games_path).section("quest", "players"))
 
     def load_hunt_stats(self) -> Dict[str, Dict[str, int]]:
         """Load Hunt module statistics.
@@ -99,17 +139,13 @@ class JeevesStatsLoader:
         Returns:
             Dict mapping user_id to hunt scores (duck_hunted, duck_hugged, etc.)
         """
-        if not self.games_path.exists():
-            return {}
-
-        with open(self.games_path, 'r') as f:
-            data = json.load(f)
-
-        hunt_data = data.get("modules", {}).get("hunt", {})
-        scores = hunt_data.get("scores", {})
+        scores = {}
 
         # Calculate totals for each user
-        for user_id, user_scores in scores.items():
+        for user_id, raw_scores in load_snapshot(self.games_path).section("hunt", "scores").items():
+            if not isinstance(raw_scores, dict):
+                continue
+            user_scores = scores[user_id] = dict(raw_scores)
             total_hunted = sum(v for k, v in user_scores.items() if k.endswith("_hunted"))
             total_hugged = sum(v for k, v in user_scores.items() if k.endswith("_hugged"))
             total_murdered = sum(v for k, v in user_scores.items() if k.endswith("_murdered"))
@@ -126,13 +162,7 @@ class JeevesStatsLoader:
         Returns:
             Dict with stats categories (wins, losses, duels_started, duels_received)
         """
-        if not self.stats_path.exists():
-            return {}
-
-        with open(self.stats_path, 'r') as f:
-            data = json.load(f)
-
-        return data.get("modules", {}).get("duel", {}).get("stats", {})
+        return dict(load_snapshot(self.stats_path).section("duel", "stats"))
 
     def load_adventure_stats(self) -> Dict[str, Any]:
         """Load Adventure module statistics.
@@ -140,13 +170,7 @@ class JeevesStatsLoader:
         Returns:
             Dict with global adventure stats and user inventories
         """
-        if not self.games_path.exists():
-            return {}
-
-        with open(self.games_path, 'r') as f:
-            data = json.load(f)
-
-        return data.get("modules", {}).get("adventure", {})
+        return dict(load_snapshot(self.games_path).module("adventure"))
 
     def load_roadtrip_stats(self) -> Dict[str, Any]:
         """Load Roadtrip module statistics.
@@ -154,13 +178,7 @@ class JeevesStatsLoader:
         Returns:
             Dict with roadtrip history and participation data
         """
-        if not self.games_path.exists():
-            return {}
-
-        with open(self.games_path, 'r') as f:
-            data = json.load(f)
-
-        roadtrip_data = data.get("modules", {}).get("roadtrip", {})
+        roadtrip_data = dict(load_snapshot(self.games_path).module("roadtrip"))
 
         # Calculate participation counts from history
         history = roadtrip_data.get("history", [])
@@ -178,84 +196,30 @@ class JeevesStatsLoader:
     def load_absurdia_stats(self) -> Dict[str, Any]:
         """Load Absurdia module statistics from SQLite database.
 
+        Reads through pooled read-only connections; the result is cached
+        until the database's data_version changes (see web/stats/absurdia.py).
+
         Returns:
             Dict with player and creature stats from Absurdia
         """
-        if not self.absurdia_db_path.exists():
-            return {"players": {}, "creatures": {}}
-
         try:
-            with sqlite3.connect(self.absurdia_db_path, timeout=2) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-
-                # Load player stats
-                players = {}
-                cursor.execute("""
-                    SELECT user_id, coins, total_arena_wins, total_arena_losses,
-                           current_win_streak, best_win_streak
-                    FROM players
-                """)
-
-                for row in cursor.fetchall():
-                    user_id = row["user_id"]
-                    players[user_id] = {
-                        "coins": row["coins"],
-                        "total_arena_wins": row["total_arena_wins"],
-                        "total_arena_losses": row["total_arena_losses"],
-                        "current_win_streak": row["current_win_streak"],
-                        "best_win_streak": row["best_win_streak"],
-                        "win_rate": (row["total_arena_wins"] /
-                                   (row["total_arena_wins"] + row["total_arena_losses"])
-                                   if (row["total_arena_wins"] + row["total_arena_losses"]) > 0 else 0)
-                    }
-
-                # Load creature counts per player
-                cursor.execute("""
-                    SELECT owner_id, COUNT(*) as creature_count,
-                           SUM(CASE WHEN rarity = 'common' THEN 1 ELSE 0 END) as common_count,
-                           SUM(CASE WHEN rarity = 'uncommon' THEN 1 ELSE 0 END) as uncommon_count,
-                           SUM(CASE WHEN rarity = 'rare' THEN 1 ELSE 0 END) as rare_count,
-                           SUM(CASE WHEN rarity = 'epic' THEN 1 ELSE 0 END) as epic_count,
-                           SUM(CASE WHEN rarity = 'legendary' THEN 1 ELSE 0 END) as legendary_count
-                    FROM creatures
-                    WHERE owner_id IS NOT NULL
-                    GROUP BY owner_id
-                """)
-
-                for row in cursor.fetchall():
-                    user_id = row["owner_id"]
-                    if user_id in players:
-                        players[user_id].update({
-                            "creature_count": row["creature_count"],
-                            "common_count": row["common_count"],
-                            "uncommon_count": row["uncommon_count"],
-                            "rare_count": row["rare_count"],
-                            "epic_count": row["epic_count"],
-                            "legendary_count": row["legendary_count"],
-                        })
-
-            return {"players": players}
-
+            return self.absurdia.load()
         except sqlite3.Error as e:
             print(f"Error loading Absurdia stats: {e}")
             return {"players": {}}
 
+    def close(self) -> None:
+        """Closes the pooled database connections."""
+        self.absurdia.close()
+
     def load_karma_stats(self) -> Dict[str, int]:
         """Load Karma module statistics.
 
         Returns:
             Dict mapping user_id to karma score
         """
-        if not self.stats_path.exists():
-            return {}
-
-        with open(self.stats_path, 'r') as f:
-            data = json.load(f)
-
         # Karma might not exist yet
-        karma_module = data.get("modules", {}).get("karma", {})
-        return karma_module.get("karma_scores", {})
+        return dict(load_snapshot(self.stats_path).section("karma", "karma_scores"))
 
     def load_coffee_stats(self) -> Dict[str, Dict[str, Any]]:
         """Load Coffee module statistics.
@@ -263,13 +227,7 @@ class JeevesStatsLoader:
         Returns:
             Dict mapping user_id to beverage counts
         """
-        if not self.stats_path.exists():
-            return {}
-
-        with open(self.stats_path, 'r') as f:
-            data = json.load(f)
-
-        return data.get("modules", {}).get("coffee", {}).get("user_beverage_counts", {})
+        return dict(load_snapshot(self.stats_path).section("coffee", "user_beverage_counts"))
 
     def load_bell_stats(self) -> Dict[str, int]:
         """Load Bell module statistics.
@@ -277,13 +235,7 @@ class JeevesStatsLoader:
         Returns:
             Dict mapping user_id to bell scores
         """
-        if not self.games_path.exists():
-            return {}
-
-        with open(self.games_path, 'r') as f:
-            data = json.load(f)
-
-        return data.get("modules", {}).get("bell", {}).get("scores", {})
+        return dict(load_snapshot(self.games_path).section("bell", "scores"))
 
     def load_achievements_stats(self) -> Dict[str, Any]:
         """Load Achievements module statistics.
@@ -359,14 +311,8 @@ class JeevesStatsLoader:
         Returns:
             Dict containing global/channel/user heatmap buckets.
         """
-        if not self.stats_path.exists():
-            return {"global": {"grid": [0] * HEATMAP_BINS, "total": 0}, "channels": {}, "users": {}}
-
-        with open(self.stats_path, "r") as f:
-            data = json.load(f)
-
-        activity = data.get("modules", {}).get("activity", {})
-        if not isinstance(activity, dict):
+        activity = load_snapshot(self.stats_path).module("activity")
+        if not activity:
             return {"global": {"grid": [0] * HEATMAP_BINS, "total": 0}, "channels": {}, "users": {}}
 
         global_bucket = activity.get("global") or {"grid": [0] * HEATMAP_BINS, "total": 0}
@@ -386,17 +332,12 @@ class JeevesStatsLoader:
         Returns:
             Dict mapping user_id to fishing stats (level, xp, total_fish, etc.)
         """
-        if not self.games_path.exists():
-            return {}
-
-        with open(self.games_path, 'r') as f:
-            data = json.load(f)
-
-        players = data.get("modules", {}).get("fishing", {}).get("players", {})
+        players = {}
 
         # Calculate some aggregate stats for each player
-        for user_id, player_data in players.items():
-            if isinstance(player_data, dict):
+        for user_id, raw_player in load_snapshot(self.games_path).section("fishing", "players").items():
+            if isinstance(raw_player, dict):
+                player_data = players[user_id] = dict(raw_player)
                 # Count rare and legendary catches
                 rare_catches = player_data.get("rare_catches", [])
                 player_data["rare_count"] = sum(1 for c in rare_catches if c.get("rarity") == "rare")
@@ -409,15 +350,133 @@ class JeevesStatsLoader:
 
 
 class StatsAggregator:
-    """Aggregates and calculates cross-module statistics."""
+    """Aggregates and calculates cross-module statistics.
+
+    Leaderboards, activity scores, last-activity times and the nick index are
+    built on first use and kept for the lifetime of the aggregator. When built
+    with `previous=`, every index whose source categories are the same objects
+    as in the previous aggregator is carried over instead of recomputed, so a
+    state change in one module only rebuilds that module's indices (see
+    JeevesStatsLoader.load_all, which reuses unchanged categories).
+    """
 
-    def __init__(self, all_stats: Dict[str, Any]):
+    # Leaderboards keep this many entries; longer requests are computed on demand.
+    LEADERBOARD_DEPTH = 100
+
+    # Categories feeding get_top_users_by_activity / get_active_users_count.
+    ACTIVITY_CATEGORIES = ("quest", "hunt", "duel", "absurdia", "roadtrip", "coffee", "bell")
+    LAST_ACTIVE_CATEGORIES = ("coffee", "quest", "roadtrip")
+
+    def __init__(self, all_stats: Dict[str, Any], previous: Optional["StatsAggregator"] = None):
         """Initialize aggregator with all loaded stats.
 
         Args:
             all_stats: Dict from JeevesStatsLoader.load_all()
+            previous: Aggregator for the previous load, whose indices are
+                reused for categories that did not change
         """
         self.stats = all_stats
+        self._lock = threading.Lock()
+        self._leaderboards: Dict[Tuple[str, str], List[Tuple[str, Any]]] = {}
+        self._activity_parts: Dict[str, Dict[str, float]] = {}
+        self._last_active_parts: Dict[str, Dict[str, float]] = {}
+        self._activity_scores: Optional[Dict[str, float]] = None
+        self._top_activity: Optional[List[Tuple[str, float]]] = None
+        self._last_active_times: Optional[List[float]] = None
+        self._nick_index: Optional[Dict[str, str]] = None
+        self._duel_player_count: Optional[int] = None
+        self.builds = 0
+        if previous is not None:
+            self._inherit(previous)
+
+    def _inherit(self, previous: "StatsAggregator") -> None:
+        unchanged = {name for name, value in self.stats.items() if previous.stats.get(name) is value}
+        with previous._lock:
+            for key, board in previous._leaderboards.items():
+                if key[0] in unchanged:
+                    self._leaderboards[key] = board
+            self._activity_parts = {name: part for name, part in previous._activity_parts.items()
+                                    if name in unchanged}
+            self._last_active_parts = {name: part for name, part in previous._last_active_parts.items()
+                                       if name in unchanged}
+            if unchanged.issuperset(self.ACTIVITY_CATEGORIES) and "users" in unchanged:
+                self._activity_scores = previous._activity_scores
+                self._top_activity = previous._top_activity
+            if unchanged.issuperset(self.LAST_ACTIVE_CATEGORIES):
+                self._last_active_times = previous._last_active_times
+            if "users" in unchanged:
+                self._nick_index = previous._nick_index
+            if "duel" in unchanged:
+                self._duel_player_count = previous._duel_player_count
+
+    def _cached(self, attr: str, build):
+        with self._lock:
+            value = getattr(self, attr)
+            if value is None:
+                value = build()
+                setattr(self, attr, value)
+                self.builds += 1
+            return value
+
+    def _part(self, parts: Dict[str, Dict[str, float]], category: str, build) -> Dict[str, float]:
+        # Called with self._lock held.
+        part = parts.get(category)
+        if part is None:
+            part = parts[category] = build(self.stats[category])
+            self.builds += 1
+        return part
+
+    # --- Activity windows ---
+
+    @staticmethod
+    def _coffee_last_active(coffee: Dict[str, Any]) -> Dict[str, float]:
+        return {user_id: data.get("timestamp", 0)
+                for user_id, data in coffee.items() if isinstance(data, dict)}
+
+    @staticmethod
+    def _quest_last_active(quest: Dict[str, Any]) -> Dict[str, float]:
+        # Quest only records the day of the last win; a win counts as recent
+        # if that day is on or after the cutoff day, i.e. if the end of that
+        # day is after the cutoff.
+        last_active = {}
+        for user_id, quest_data in quest.items():
+            last_win = quest_data.get("last_win_date")
+            if last_win:
+                try:
+                    day = datetime.fromisoformat(last_win.replace('Z', '+00:00')).date()
+                    end_of_day = datetime.combine(day + timedelta(days=1), datetime.min.time(), timezone.utc)
+                    last_active[user_id] = end_of_day.timestamp()
+                except (ValueError, AttributeError, OverflowError):
+                    pass
+        return last_active
+
+    @staticmethod
+    def _roadtrip_last_active(roadtrip: Dict[str, Any]) -> Dict[str, float]:
+        last_active: Dict[str, float] = {}
+        for trip in roadtrip.get("history", []):
+            started = trip.get("started")
+            if started:
+                try:
+                    started_at = datetime.fromisoformat(started.replace('Z', '+00:00')).timestamp()
+                except (ValueError, AttributeError):
+                    continue
+                for participant in trip.get("participants", []):
+                    if started_at > last_active.get(participant, float("-inf")):
+                        last_active[participant] = started_at
+        return last_active
+
+    def _build_last_active_times(self) -> List[float]:
+        builders = {
+            "coffee": self._coffee_last_active,
+            "quest": self._quest_last_active,
+            "roadtrip": self._roadtrip_last_active,
+        }
+        latest: Dict[str, float] = {}
+        for category in self.LAST_ACTIVE_CATEGORIES:
+            for user_id, ts in self._part(self._last_active_parts, category, builders[category]).items():
+                if ts > latest.get(user_id, float("-inf")):
+                    latest[user_id] = ts
+        return sorted(latest.values())
 
     def get_active_users_count(self, days: int = 90) -> int:
         """Get count of users who have been active in the last N days.
@@ -428,47 +487,70 @@ class StatsAggregator:
         Returns:
             Count of unique users with activity in the time period
         """
-        from datetime import datetime, timezone, timedelta
-
         cutoff_timestamp = (datetime.now(timezone.utc) - timedelta(days=days)).timestamp()
-        cutoff_date = (datetime.now(timezone.utc) - timedelta(days=days)).date()
 
-        active_users = set()
+        # Hunt, duel, absurdia, and bell don't have timestamps currently,
+        # so we can't determine recent activity from them
+        times = self._cached("_last_active_times", self._build_last_active_times)
+        return len(times) - bisect.bisect_right(times, cutoff_timestamp)
 
-        # Check coffee module (has unix timestamps)
-        for user_id, coffee_data in self.stats["coffee"].items():
-            if isinstance(coffee_data, dict):
-                timestamp = coffee_data.get("timestamp", 0)
-                if timestamp > cutoff_timestamp:
-                    active_users.add(user_id)
+    # --- Activity scores ---
 
-        # Check quest module (has last_win_date as string)
-        for user_id, quest_data in self.stats["quest"].items():
-            last_win = quest_data.get("last_win_date")
-            if last_win:
-                try:
-                    last_win_date = datetime.fromisoformat(last_win.replace('Z', '+00:00')).date()
-                    if last_win_date >= cutoff_date:
-                        active_users.add(user_id)
-                except (ValueError, AttributeError):
-                    pass
+    @staticmethod
+    def _quest_score(quest: Dict[str, Any]) -> Dict[str, float]:
+        # 10 points per prestige, 1 per level
+        return {user_id: data.get("prestige", 0) * 10 + data.get("level", 0)
+                for user_id, data in quest.items()}
 
-        # Check roadtrip history
-        for trip in self.stats["roadtrip"].get("history", []):
-            started = trip.get("started")
-            if started:
-                try:
-                    trip_date = datetime.fromisoformat(started.replace('Z', '+00:00'))
-                    if trip_date.timestamp() > cutoff_timestamp:
-                        for participant in trip.get("participants", []):
-                            active_users.add(participant)
-                except (ValueError, AttributeError):
-                    pass
+    @staticmethod
+    def _hunt_score(hunt: Dict[str, Any]) -> Dict[str, float]:
+        # 1 point per interaction
+        return {user_id: data.get("total_interactions", 0) for user_id, data in hunt.items()}
 
-        # Hunt, duel, absurdia, and bell don't have timestamps currently,
-        # so we can't determine recent activity from them
+    @staticmethod
+    def _duel_score(duel: Dict[str, Any]) -> Dict[str, float]:
+        # 2 points per duel
+        started = duel.get("duels_started", {})
+        received = duel.get("duels_received", {})
+        return {user_id: (started.get(user_id, 0) + received.get(user_id, 0)) * 2
+                for user_id in {**started, **received}}
+
+    @staticmethod
+    def _absurdia_score(absurdia: Dict[str, Any]) -> Dict[str, float]:
+        # 5 points per creature, 1 per arena fight
+        return {user_id: data.get("creature_count", 0) * 5
+                + data.get("total_arena_wins", 0) + data.get("total_arena_losses", 0)
+                for user_id, data in absurdia.get("players", {}).items()}
 
-        return len(active_users)
+    @staticmethod
+    def _roadtrip_score(roadtrip: Dict[str, Any]) -> Dict[str, float]:
+        # 3 points per trip
+        return {user_id: count * 3 for user_id, count in roadtrip.get("participation_counts", {}).items()}
+
+    @staticmethod
+    def _coffee_score(coffee: Dict[str, Any]) -> Dict[str, float]:
+        # 0.5 points per coffee
+        return {user_id: data.get("count", 0) * 0.5 for user_id, data in coffee.items()}
+
+    @staticmethod
+    def _bell_score(bell: Dict[str, Any]) -> Dict[str, float]:
+        # 1 point per bell
+        return dict(bell)
+
+    def _build_activity_scores(self) -> Dict[str, float]:
+        parts = [self._part(self._activity_parts, category, getattr(self, f"_{category}_score"))
+                 for category in self.ACTIVITY_CATEGORIES]
+        candidates = set().union(*parts)
+        activity_scores = {}
+        # Iterating users keeps their order for equal scores.
+        for user_id in self.stats["users"]:
+            if user_id in candidates:
+                score = 0
+                for part in parts:
+                    score += part.get(user_id, 0)
+                if score > 0:
+                    activity_scores[user_id] = score
+        return activity_scores
 
     def get_top_users_by_activity(self, limit: int = 10) -> List[Tuple[str, int]]:
         """Get top users by overall activity across all modules.
@@ -481,50 +563,14 @@ class StatsAggregator:
         Returns:
             List of (user_id, activity_score) tuples
         """
-        activity_scores = {}
-
-        for user_id in self.stats["users"].keys():
-            score = 0
-
-            # Quest activity (10 points per prestige, 1 per level)
-            if user_id in self.stats["quest"]:
-                quest_data = self.stats["quest"][user_id]
-                score += quest_data.get("prestige", 0) * 10
-                score += quest_data.get("level", 0)
-
-            # Hunt activity (1 point per interaction)
-            if user_id in self.stats["hunt"]:
-                hunt_data = self.stats["hunt"][user_id]
-                score += hunt_data.get("total_interactions", 0)
-
-            # Duel activity (2 points per duel)
-            duel_started = self.stats["duel"].get("duels_started", {}).get(user_id, 0)
-            duel_received = self.stats["duel"].get("duels_received", {}).get(user_id, 0)
-            score += (duel_started + duel_received) * 2
-
-            # Absurdia activity (5 points per creature, 1 per arena fight)
-            if user_id in self.stats["absurdia"].get("players", {}):
-                abs_data = self.stats["absurdia"]["players"][user_id]
-                score += abs_data.get("creature_count", 0) * 5
-                score += abs_data.get("total_arena_wins", 0) + abs_data.get("total_arena_losses", 0)
-
-            # Roadtrip participation (3 points per trip)
-            roadtrip_count = self.stats["roadtrip"].get("participation_counts", {}).get(user_id, 0)
-            score += roadtrip_count * 3
-
-            # Coffee drinking (0.5 points per coffee)
-            if user_id in self.stats["coffee"]:
-                score += self.stats["coffee"][user_id].get("count", 0) * 0.5
-
-            # Bell ringing (1 point per bell)
-            score += self.stats["bell"].get(user_id, 0)
-
-            if score > 0:
-                activity_scores[user_id] = score
-
-        # Sort by score and return top N
-        sorted_users = sorted(activity_scores.items(), key=lambda x: x[1], reverse=True)
-        return sorted_users[:limit]
+        scores = self._cached("_activity_scores", self._build_activity_scores)
+        if limit > self.LEADERBOARD_DEPTH:
+            return heapq.nlargest(limit, scores.items(), key=itemgetter(1))
+        top = self._cached(
+            "_top_activity",
+            lambda: heapq.nlargest(self.LEADERBOARD_DEPTH, scores.items(), key=itemgetter(1)),
+        )
+        return top[:limit]
 
     def get_user_display_name(self, user_id: str) -> str:
         """Get the display name for a user.
@@ -540,32 +586,70 @@ class StatsAggregator:
             return user_data.get("canonical_nick", user_id)
         return user_id
 
+    # --- Leaderboards ---
+
+    def _leaderboard_entries(self, category: str, stat_key: str) -> Iterable[Tuple[str, Any]]:
+        data = self.stats.get(category)
+        if data is None:
+            return ()
+        if category == "duel" or (category == "roadtrip" and stat_key == "participation_counts"):
+            # These map each stat to its own user_id -> value dict
+            return data.get(stat_key, {}).items()
+        if category in ("karma", "bell"):
+            # Plain user_id -> score mappings
+            return data.items()
+        if category == "absurdia":
+            data = data.get("players", {})
+        return ((user_id, user_data[stat_key]) for user_id, user_data in data.items()
+                if isinstance(user_data, dict) and stat_key in user_data)
+
     def get_leaderboard(self, category: str, stat_key: str, limit: int = 10) -> List[Tuple[str, Any]]:
         """Get a leaderboard for a specific stat.
 
         Args:
-            category: Module category (e.g., "quest", "hunt", "duel")
+            category: Module category (e.g., "quest", "hunt", "duel", "users").
+                Karma and bell map user_id straight to a score, so their
+                stat_key is ignored.
             stat_key: The stat to sort by
             limit: Maximum number of entries
 
         Returns:
-            List of (user_id, stat_value) tuples
+            List of (user_id, stat_value) tuples, highest first
         """
-        results = []
-
-        if category == "duel":
-            # Duel stats have a different structure
-            stat_dict = self.stats["duel"].get(stat_key, {})
-            results = list(stat_dict.items())
-        elif category in self.stats:
-            # For other categories, iterate through users
-            for user_id, user_data in self.stats[category].items():
-                if isinstance(user_data, dict) and stat_key in user_data:
-                    results.append((user_id, user_data[stat_key]))
-
-        # Sort by value (descending) and return top N
-        sorted_results = sorted(results, key=lambda x: x[1], reverse=True)
-        return sorted_results[:limit]
+        if limit > self.LEADERBOARD_DEPTH:
+            return heapq.nlargest(limit, self._leaderboard_entries(category, stat_key), key=itemgetter(1))
+
+        key = (category, stat_key)
+        with self._lock:
+            board = self._leaderboards.get(key)
+            if board is None:
+                board = self._leaderboards[key] = heapq.nlargest(
+                    self.LEADERBOARD_DEPTH, self._leaderboard_entries(category, stat_key), key=itemgetter(1)
+                )
+                self.builds += 1
+        return board[:limit]
+
+    def get_duel_player_count(self) -> int:
+        """Number of users with at least one recorded duel win or loss."""
+        duel = self.stats["duel"]
+        return self._cached(
+            "_duel_player_count",
+            lambda: len(duel.get("wins", {}).keys() | duel.get("losses", {}).keys()),
+        )
+
+    # --- Lookups ---
+
+    def _build_nick_index(self) -> Dict[str, str]:
+        index: Dict[str, str] = {}
+        for user_id, user_data in self.stats.get("users", {}).items():
+            if not isinstance(user_data, dict):
+                continue
+            canonical = str(user_data.get("canonical_nick", "")).lower()
+            if canonical:
+                index.setdefault(canonical, user_id)
+            for nick in user_data.get("seen_nicks", []) or []:
+                index.setdefault(str(nick).lower(), user_id)
+        return index
 
     def find_user_id(self, query: str) -> Optional[str]:
         """Best-effort lookup of a user_id from a nick/user_id string."""
@@ -579,29 +663,17 @@ class StatsAggregator:
         if query in self.stats.get("users", {}):
             return query
 
-        for user_id, user_data in self.stats.get("users", {}).items():
-            if not isinstance(user_data, dict):
-                continue
-            canonical = str(user_data.get("canonical_nick", "")).lower()
-            if canonical and canonical == query_norm:
-                return user_id
-            for nick in user_data.get("seen_nicks", []) or []:
-                if str(nick).lower() == query_norm:
-                    return user_id
-
-        return None
+        return self._cached("_nick_index", self._build_nick_index).get(query_norm)
 
     def _normalize_bucket(self, bucket: Any) -> Dict[str, Any]:
         default = {"grid": [0] * HEATMAP_BINS, "total": 0, "updated_at": None}
         if not isinstance(bucket, dict):
             return default
+        # Buckets belong to the shared, cached stats; build a new dict rather than filling in defaults.
         grid = bucket.get("grid")
         if not isinstance(grid, list) or len(grid) != HEATMAP_BINS:
-            bucket = dict(bucket)
-            bucket["grid"] = [0] * HEATMAP_BINS
-        bucket.setdefault("total", 0)
-        bucket.setdefault("updated_at", None)
-        return bucket
+            grid = [0] * HEATMAP_BINS
+        return {**bucket, "grid": grid, "total": bucket.get("total", 0), "updated_at": bucket.get("updated_at")}
 
     def get_activity_bucket_global(self) -> Dict[str, Any]:
         return self._normalize_bucket(self.stats.get("activity", {}).get("global"))
@@ -24,42 +24,23 @@ def render_overview_page(stats: Dict[str, Any], aggregator) -> str:
     top_fishers = aggregator.get_leaderboard("fishing", "total_fish", limit=5)
 
     # Get nick change leaders
-    nick_changers = sorted(
-        [(uid, data.get("nick_change_count", 0)) for uid, data in stats["users"].items()],
-        key=lambda x: x[1],
-        reverse=True
-    )[:5]
+    nick_changers = aggregator.get_leaderboard("users", "nick_change_count", limit=5)
 
     # Get roadtrip participants
-    roadtrip_participants = sorted(
-        stats["roadtrip"].get("participation_counts", {}).items(),
-        key=lambda x: x[1],
-        reverse=True
-    )[:5]
+    roadtrip_participants = aggregator.get_leaderboard("roadtrip", "participation_counts", limit=5)
 
     # Get absurdia leaders
-    absurdia_arena = sorted(
-        [(uid, data.get("total_arena_wins", 0)) for uid, data in stats["absurdia"].get("players", {}).items()],
-        key=lambda x: x[1],
-        reverse=True
-    )[:5]
+    absurdia_arena = aggregator.get_leaderboard("absurdia", "total_arena_wins", limit=5)
 
     # Get karma leaders
-    karma_leaders = sorted(
-        stats["karma"].items(),
-        key=lambda x: x[1],
-        reverse=True
-    )[:5]
+    karma_leaders = aggregator.get_leaderboard("karma", "karma", limit=5)
 
     # Count stats
     total_nicks = len(stats["users"])
     active_users_90d = aggregator.get_active_users_count(days=90)
     quest_players = len(stats["quest"])
     hunt_players = len(stats["hunt"])
-    duel_players = len(set(
-        list(stats["duel"].get("wins", {}).keys()) +
-        list(stats["duel"].get("losses", {}).keys())
-    ))
+    duel_players = aggregator.get_duel_player_count()
     absurdia_players = len(stats["absurdia"].get("players", {}))
     fishing_players = len(stats.get("fishing", {}))
 
@@ -727,19 +708,19 @@ def _render_heatmap_table(aggregator, bucket: Dict[str, Any]) -> str:
         return f"rgba(102, 126, 234, {alpha:.3f})"
 
     header_cells = "".join([f'<th class="hour">{h}</th>' for h in range(24)])
-    rows_html = ""
+    rows_html = []
     for dow, row in enumerate(matrix):
-        cells = ""
+        cells = []
         for hour, value in enumerate(row):
             title = f"{days[dow]} {hour:02d}:00 — {value}"
-            cells += f'<td class="cell" title="{_escape_html(title)}" style="background:{color_for(int(value))};"></td>'
-        rows_html += f'<tr><th class="label">{days[dow]}</th>{cells}</tr>'
+            cells.append(f'<td class="cell" title="{_escape_html(title)}" style="background:{color_for(int(value))};"></td>')
+        rows_html.append(f'<tr><th class="label">{days[dow]}</th>{"".join(cells)}</tr>')
 
     return f"""
 <div class="heatmap">
   <table class="heatmap-table">
     <thead><tr><th class="label"></th>{header_cells}</tr></thead>
-    <tbody>{rows_html}</tbody>
+    <tbody>{''.join(rows_html)}</tbody>
   </table>
 </div>"""
 
@@ -794,7 +775,7 @@ def _render_leaderboard_list(entries: List[Tuple[str, Any]], aggregator, score_l
     if not entries:
         return '<div class="empty-state">No data available</div>'
 
-    html = '<ul class="leaderboard">'
+    html = ['<ul class="leaderboard">']
     for i, (user_id, score) in enumerate(entries, 1):
         username = aggregator.get_user_display_name(user_id)
         # Format score based on type
@@ -803,15 +784,15 @@ def _render_leaderboard_list(entries: List[Tuple[str, Any]], aggregator, score_l
         else:
             score_str = str(int(score))
 
-        html += f'''
+        html.append(f'''
             <li>
                 <span class="rank">#{i}</span>
                 <span class="username">{_escape_html(username)}</span>
                 <span class="score">{score_str}</span>
-            </li>'''
+            </li>''')
 
-    html += '</ul>'
-    return html
+    html.append('</ul>')
+    return "".join(html)
 
 
 def _render_quest_leaderboard(entries: List[Tuple[str, int]], stats: Dict[str, Any], aggregator) -> str:
@@ -828,7 +809,7 @@ def _render_quest_leaderboard(entries: List[Tuple[str, int]], stats: Dict[str, A
     if not entries:
         return '<div class="empty-state">No quest players yet</div>'
 
-    html = '<ul class="leaderboard">'
+    html = ['<ul class="leaderboard">']
     for i, (user_id, prestige) in enumerate(entries, 1):
         username = aggregator.get_user_display_name(user_id)
         quest_data = stats["quest"].get(user_id, {})
@@ -839,15 +820,15 @@ def _render_quest_leaderboard(entries: List[Tuple[str, int]], stats: Dict[str, A
         else:
             score_str = f"Level {level}"
 
-        html += f'''
+        html.append(f'''
             <li>
                 <span class="rank">#{i}</span>
                 <span class="username">{_escape_html(username)}</span>
                 <span class="score">{score_str}</span>
-            </li>'''
+            </li>''')
 
-    html += '</ul>'
-    return html
+    html.append('</ul>')
+    return "".join(html)
 
 
 def _render_nick_changes(entries: List[Tuple[str, int]], stats: Dict[str, Any], aggregator) -> str:
@@ -868,23 +849,23 @@ def _render_nick_changes(entries: List[Tuple[str, int]], stats: Dict[str, Any],
     top_user_id, top_count = entries[0]
     top_username = aggregator.get_user_display_name(top_user_id)
 
-    html = f'<div class="highlight">{_escape_html(top_username)} has the most nick changes: {top_count}!</div>'
+    html = [f'<div class="highlight">{_escape_html(top_username)} has the most nick changes: {top_count}!</div>']
 
     # Show the leaderboard
-    html += '<ul class="leaderboard">'
+    html.append('<ul class="leaderboard">')
     for i, (user_id, count) in enumerate(entries, 1):
         if count == 0:
             break
         username = aggregator.get_user_display_name(user_id)
-        html += f'''
+        html.append(f'''
             <li>
                 <span class="rank">#{i}</span>
                 <span class="username">{_escape_html(username)}</span>
                 <span class="score">{count} changes</span>
-            </li>'''
+            </li>''')
 
-    html += '</ul>'
-    return html
+    html.append('</ul>')
+    return "".join(html)
 
 
 def _render_karma_leaderboard(entries: List[Tuple[str, int]], aggregator) -> str:
@@ -900,21 +881,21 @@ def _render_karma_leaderboard(entries: List[Tuple[str, int]], aggregator) -> str
     if not entries:
         return '<div class="empty-state">No karma data</div>'
 
-    html = '<ul class="leaderboard">'
+    html = ['<ul class="leaderboard">']
     for i, (user_id, karma) in enumerate(entries, 1):
         username = aggregator.get_user_display_name(user_id)
         score_class = "score"
         prefix = "+" if karma > 0 else ""
 
-        html += f'''
+        html.append(f'''
             <li>
                 <span class="rank">#{i}</span>
                 <span class="username">{_escape_html(username)}</span>
                 <span class="{score_class}">{prefix}{karma}</span>
-            </li>'''
+            </li>''')
 
-    html += '</ul>'
-    return html
+    html.append('</ul>')
+    return "".join(html)
 
 
 def _render_fishing_leaderboard(entries: List[Tuple[str, int]], stats: Dict[str, Any], aggregator) -> str:
@@ -942,12 +923,12 @@ def _render_fishing_leaderboard(entries: List[Tuple[str, int]], stats: Dict[str,
                 longest_cast_distance = furthest
                 longest_cast_user = user_id
 
-    html = ''
+    html = []
     if longest_cast_user and longest_cast_distance > 0:
         cast_username = aggregator.get_user_display_name(longest_cast_user)
-        html += f'<div class="highlight">{_escape_html(cast_username)} has the longest cast: {longest_cast_distance:.1f}m!</div>'
+        html.append(f'<div class="highlight">{_escape_html(cast_username)} has the longest cast: {longest_cast_distance:.1f}m!</div>')
 
-    html += '<ul class="leaderboard">'
+    html.append('<ul class="leaderboard">')
     for i, (user_id, total_fish) in enumerate(entries, 1):
         username = aggregator.get_user_display_name(user_id)
         fishing_data = stats.get("fishing", {}).get(user_id, {})
@@ -959,15 +940,15 @@ def _render_fishing_leaderboard(entries: List[Tuple[str, int]], stats: Dict[str,
         else:
             score_str = f"L{level} | {total_fish} fish"
 
-        html += f'''
+        html.append(f'''
             <li>
                 <span class="rank">#{i}</span>
                 <span class="username">{_escape_html(username)}</span>
                 <span class="score" style="font-size: 0.85em;">{score_str}</span>
-            </li>'''
+            </li>''')
 
-    html += '</ul>'
-    return html
+    html.append('</ul>')
+    return "".join(html)
 
 
 def _escape_html(text: str) -> str:
@@ -1023,7 +1004,7 @@ def render_achievements_page(stats: Dict[str, Any]) -> str:
         categories.setdefault(category, []).append((ach_id, ach_data))
 
     # Build category sections HTML
-    category_sections = ""
+    category_sections = []
     category_icons = {
         "quest": "⚔️",
         "creatures": "🦌",
@@ -1040,7 +1021,7 @@ def render_achievements_page(stats: Dict[str, Any]) -> str:
         if not cat_achievements:
             continue
 
-        cards_html = ""
+        cards_html = []
 
         for ach_id, ach_data in cat_achievements:
             unlock_count = unlock_counts.get(ach_id, 0)
@@ -1090,7 +1071,7 @@ def render_achievements_page(stats: Dict[str, Any]) -> str:
             import json
             holders_json = json.dumps(holders_data).replace('"', '&quot;')
 
-            cards_html += f"""
+            cards_html.append(f"""
             <div class="achievement-card {rarity_class}" data-holders="{holders_json}">
                 <div class="achievement-header">
                     <h4>{_escape_html(ach_data['name'])}</h4>
@@ -1103,25 +1084,25 @@ def render_achievements_page(stats: Dict[str, Any]) -> str:
                     {first_text}
                 </div>
             </div>
-            """
+            """)
 
         if cards_html:
             icon = category_icons.get(cat_name, "🎯")
-            category_sections += f"""
+            category_sections.append(f"""
         <div class="achievement-category">
             <h3>{icon} {cat_name.replace('_', ' ').title()} Achievements</h3>
             <div class="achievement-grid">
-                {cards_html}
+                {''.join(cards_html)}
             </div>
         </div>
-        """
+        """)
 
     if not category_sections:
-        category_sections = """
+        category_sections = ["""
         <div class="achievement-category">
             <div class="empty-state">No achievements discovered yet.</div>
         </div>
-        """
+        """]
 
     html = f"""<!DOCTYPE html>
 <html lang="en">
@@ -1421,7 +1402,7 @@ def render_achievements_page(stats: Dict[str, Any]) -> str:
             </div>
         </div>
 
-        {category_sections}
+        {''.join(category_sections)}
 
         <!-- Tooltip for showing achievement holders -->
         <div id="holders-tooltip" class="holders-tooltip">